@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, g
 from configparser import ConfigParser
 from read_config import load_config_data
 
@@ -97,10 +97,25 @@ def create_app(db=None, test=False, config_override=None) -> Flask:
         print("Attempting to connect to database ", app.config[f"DB_HOST_{db_index}"])
 
         APP_GRAPH_DBASE = GraphAccess(host=app.config[f"DB_HOST_{db_index}"],
-                                      credentials=(app.config[f"DB_USERNAME_{db_index}"], app.config[f"DB_PASSWORD_{db_index}"]))
+                                      credentials=(app.config[f"DB_USERNAME_{db_index}"], app.config[f"DB_PASSWORD_{db_index}"]),
+                                      read_replicas=read_replicas(app.config),
+                                      **driver_options(app.config))
 
     app.config['DATABASE'] = APP_GRAPH_DBASE
 
+    # Have all the database queries made while serving a request share a single database session
+    # (the scope is specific to the thread serving the request)
+    @app.before_request
+    def open_db_session_scope():
+        g.db_session_scope = APP_GRAPH_DBASE.session_scope()
+        g.db_session_scope.__enter__()
+
+    @app.teardown_request
+    def close_db_session_scope(exc):
+        scope = g.pop("db_session_scope", None)
+        if scope is not None:
+            scope.__exit__(None, None, None)
+
     InitializeBrainAnnex.set_dbase(APP_GRAPH_DBASE)
     InitializeBrainAnnex.set_folders(app.config['MEDIA_FOLDER'], app.config['LOG_FOLDER'])
 
@@ -122,6 +137,42 @@ def create_app(db=None, test=False, config_override=None) -> Flask:
 
 
 
+def driver_options(config) -> dict:
+    """
+    Extract, from the app configuration, the optional tuning parameters of the database driver
+    (and of its pool of connections) that were set
+
+    :param config:  The app configuration; typically, the "config" attribute of a Flask object
+    :return:        A dict of keyword arguments for the GraphAccess constructor (possibly empty)
+                        EXAMPLE: {"max_connection_pool_size": 200, "fetch_size": 500}
+    """
+    config_to_arg = {"DB_MAX_CONNECTION_POOL_SIZE":         "max_connection_pool_size",
+                     "DB_CONNECTION_ACQUISITION_TIMEOUT":   "connection_acquisition_timeout",
+                     "DB_MAX_CONNECTION_LIFETIME":          "max_connection_lifetime",
+                     "DB_KEEP_ALIVE":                       "keep_alive",
+                     "DB_FETCH_SIZE":                       "fetch_size",
+                     "DB_READ_YOUR_WRITES_WINDOW":          "read_your_writes_window",
+                     "DB_SLOW_QUERY_THRESHOLD":             "slow_query_threshold"}
+
+    return {arg: config[name] for (name, arg) in config_to_arg.items()
+                if config.get(name) is not None}
+
+
+
+def read_replicas(config) -> list:
+    """
+    Extract, from the app configuration, the hosts and credentials of the databases
+    designated as read-only replicas (by the optional DB_READ_REPLICAS parameter)
+
+    :param config:  The app configuration; typically, the "config" attribute of a Flask object
+    :return:        A (possibly empty) list of pairs (host, credentials)
+                        EXAMPLE: [("bolt://10.0.0.2:7687", ("neo4j", "my_pass"))]
+    """
+    return [(config[f"DB_HOST_{i}"], (config[f"DB_USERNAME_{i}"], config[f"DB_PASSWORD_{i}"]))
+                for i in config.get("DB_READ_REPLICAS", [])]
+
+
+
 def initialize_services(app :Flask) -> None:
     """
     Define the high-level routing.
@@ -61,7 +61,7 @@ class DataManager:
         :return:    None
         """
 
-        assert type(db) == GraphAccess, \
+        assert isinstance(db, GraphAccess), \
             "GraphSchema.set_database(): argument passed isn't a valid `GraphAccess` object"
 
         cls.db = db     # Save the database object
@@ -1242,14 +1242,16 @@ class DataManager:
         #    {'basename': 'notes-3', 'entity_id': '14', 'schema_code': 'n', 'title': 'undefined', 'suffix': 'htm', '_internal_id': 3, '_node_labels': ['BA', 'Note']}}
         #   ]
 
+        # Fetch the Categories of all the found nodes at once
+        # TODO: generalize the following line, to other types of links
+        categories = cls.db.follow_links_many([node["_internal_id"] for node in result],
+                                              rel_name="BA_in_category", rel_dir="OUT", neighbor_labels="Category")
+
         for node in result:
             internal_id = node["_internal_id"]   # Ignore the PyCharm's complain about the data type!
             #print("\n\n--- internal_id: ", internal_id)
 
-
-            # TODO: generalize the following line, to other types of links
-            neighbor_props = cls.db.follow_links(match=internal_id,
-                                                rel_name="BA_in_category", rel_dir="OUT", neighbor_labels="Category")
+            neighbor_props = categories[internal_id]
             # EXAMPLE of neighbor_props:
             #   [{'entity_id': 966, 'schema_code': 'cat', 'name': "Deploying VM's on Oracle cloud"}]
             #print(neighbor_props)
@@ -1325,14 +1327,16 @@ class DataManager:
         #    {'basename': 'notes-3', 'entity_id': '14', 'schema_code': 'n', 'title': 'undefined', 'suffix': 'htm', '_internal_id': 3, '_node_labels': ['BA', 'Note']}}
         #   ]
 
+        # Fetch the Categories of all the found nodes at once
+        # TODO: generalize the following line, to other types of links; for now, just used to extract the Categories
+        categories = cls.db.follow_links_many([node["_internal_id"] for node in result],
+                                              rel_name="BA_in_category", rel_dir="OUT", neighbor_labels="Category")
+
         for node in result:
             internal_id = node["_internal_id"]   # Ignore the PyCharm's complain about the data type!
             #print("\n\n--- internal_id: ", internal_id)
 
-
-            # TODO: generalize the following line, to other types of links; for now, just used to extract the Categories
-            neighbor_props = cls.db.follow_links(match=internal_id,
-                                                 rel_name="BA_in_category", rel_dir="OUT", neighbor_labels="Category")
+            neighbor_props = categories[internal_id]
             # EXAMPLE of neighbor_props:
             #   [{'entity_id': 966, 'schema_code': 'cat', 'name': "Deploying VM's on Oracle cloud"}]
             #print(neighbor_props)
@@ -1617,6 +1621,74 @@ class DataManager:
 
 
 
+    @classmethod
+    def get_filtered_page(cls, filter_dict :dict) -> ([dict], str|None, int|None):
+        """
+        Cursor-based variant of get_filtered(): return one page of the database nodes that match
+        all the requirements spelled out in the given filter, plus a cursor to request the next page.
+        Unlike with "skip", the cost of a page does not grow with its depth
+
+        :param filter_dict: A dictionary, with keys:
+                                "label", "key_name", "key_value", "case_sensitive"      Same as for get_filtered()
+                                "order_by"      [OPTIONAL] The name of a single field to order by, in ascending order
+                                                    (nodes lacking it are left out); by default, order by internal database ID
+                                "cursor"        The cursor returned along with the previous page; or None for the first page
+                                "limit"         The max number of entries to return.  Default: 25
+
+                            EXAMPLES:
+                                {"label": "doctor", "limit": 25, "cursor": None}
+                                {"label": "Quote", "order_by": "attribution", "cursor": "eyJvIjogImF0dHJpYnV0aW9uIiwgLi4ufQ=="}
+
+        :return:            A triplet with:
+                                1. A (possibly-empty) list of dictionaries, as returned by get_filtered()
+                                2. The cursor for the next page, or None if there are no more pages
+                                3. The total number of nodes with the given label (NOT considering the remainder of the filter),
+                                    only for the first page (None otherwise)
+        """
+        assert type(filter_dict) == dict, \
+            f"get_filtered_page(): argument `filter_dict` must be a dictionary.  " \
+            f"The type of the passed argument was {type(filter_dict)}"
+
+        allowed_keys = ["label", "key_name", "key_value", "case_sensitive",
+                        "order_by", "cursor", "limit"]
+
+        # Check the validity of the keys
+        for key in filter_dict:
+            assert key in allowed_keys, \
+                    f"get_filtered_page(): unknown key ('{key}') in argument `filter_dict`.  " \
+                    f"Allowed values are: {allowed_keys})"
+
+        label = filter_dict.get("label")      # It will be None if key isn't present
+
+        key_name = filter_dict.get("key_name")
+        key_value = cls.to_int_if_possible(filter_dict.get("key_value"))
+        case_sensitive = filter_dict.get("case_sensitive")
+
+        order_key = filter_dict.get("order_by") or None
+        if order_key is not None:
+            order_key = order_key.strip()
+            assert ("," not in order_key) and (" " not in order_key), \
+                f"get_filtered_page(): `order_by` must be a single field name, sorted in ascending order (value: `{order_key}`)"
+
+        cursor = filter_dict.get("cursor")
+        limit = filter_dict.get("limit", 25)    # Default value, if not provided
+
+        try:
+            limit = int(limit)
+        except Exception:
+            raise Exception(f"The parameter 'limit', if provided, must be an integer; value received: `{limit}`")
+
+        if limit > 1000:
+            limit = 1000     # Set a sensible upper bound on the page size; there's no limit on the number of pages
+
+        return GraphSchema.get_nodes_by_filter_page(labels=label or None, key_names=key_name, key_value=key_value,
+                                                    string_match="CONTAINS", case_sensitive=case_sensitive,
+                                                    include_id=True, include_labels=True,
+                                                    order_key=order_key, cursor=cursor, limit=limit,
+                                                    approx_count=(cursor is None))
+
+
+
 
 
 
@@ -1655,6 +1727,20 @@ class DataManager:
 
 
 
+    @classmethod
+    def export_full_dbase_iter(cls, compress=False):
+        """
+        Export the entire database as a JSON array, in the same format as export_full_dbase(),
+        but streaming it in chunks of bytes, without the need for APOC and without holding the export in memory.
+        Meant for large databases.  For details, see GraphAccess.export_dbase_json_iter()
+
+        :param compress:    [OPTIONAL] If True, the chunks are gzip-compressed
+        :return:            A generator of bytes objects
+        """
+        return cls.db.export_dbase_json_iter(as_array=True, compress=compress)
+
+
+
     @classmethod
     def upload_import_json(cls, files, upload_dir :str, return_url=None, verbose=False) -> str:
         """
@@ -1681,16 +1767,13 @@ class DataManager:
         except Exception as ex:
             return f"ERROR in upload: {ex} {return_link}"
 
-        try:
-            with open(full_filename, 'r') as fh:
-                file_contents = fh.read()
-                if verbose:
-                    print(f"Contents of uploaded file:\n{file_contents}")
-        except Exception:
-            return f"File I/O failed. {return_link}"
+        if verbose:
+            print(f"Importing the uploaded file `{full_filename}`")
 
         try:
-            details = cls.db.import_json_dump(file_contents)    # THE ACTUAL IMPORT TAKES PLACE HERE
+            # THE ACTUAL IMPORT TAKES PLACE HERE (the file is parsed incrementally, and imported in batches)
+            result = cls.db.import_json_dump_file(full_filename)
+            details = f"Successful import of {result['nodes']} node(s) and {result['relationships']} relationship(s)"
         except Exception as ex:
             return f"Import of JSON data failed: {ex}. {return_link}"
 
@@ -1756,7 +1839,7 @@ class DataManager:
         if post_pars["use_schema"] == "SCHEMA":
             new_ids = GraphSchema.import_json_data(file_contents, post_pars["schema_class"], provenance=original_name)
         else:
-            new_ids = cls.db.import_json(file_contents, post_pars["import_root_label"], provenance=original_name)
+            new_ids = cls.db.import_json(file_contents, post_pars["import_root_label"], provenance=original_name, bulk=True)
 
         status = f"New top-level Neo4j node ID: {new_ids}"
         return f"Upload and import successful. {file_size} characters were read in. {status}"
@@ -93,9 +93,12 @@ class NodeExplorer:
         outbound_data = []
 
 
+        # Fetch the parents and children of all the nodes at once
+        parents_and_children = db.get_parents_and_children_many([node["internal_id"] for node in recordset])
+
         for node in recordset:
             node_id = node["internal_id"]
-            (parent_list, child_list) = db.get_parents_and_children(node_id)
+            (parent_list, child_list) = parents_and_children[node_id]
             # EXAMPLE of individual items in either parent_list or child_list:
             #       {'id': 163, 'labels': ['Subject'], 'rel': 'HAS_TREATMENT'}
             node_inbound_headers = {item["rel"] for item in parent_list}    # Set of headers for Inbound Relationship applying to this node
@@ -5,10 +5,13 @@ __version__ = "5.0.0rc9.3"
 #            should be uncommented,
 #            depending on the graph database being used
 
-from brainannex.intergraph_neo4j_4.intergraph_neo4j_4 import InterGraph      # (Un)comment AS NEEDED!
-#from brainannex.intergraph_neo4j_5.intergraph_neo4j_5 import InterGraph     # (Un)comment AS NEEDED!
+from brainannex.intergraph_neo4j_4.intergraph_neo4j_4 import InterGraph                       # (Un)comment AS NEEDED!
+#from brainannex.intergraph_neo4j_5.intergraph_neo4j_5 import InterGraph, AsyncInterGraph     # (Un)comment AS NEEDED!
 
 from brainannex.graph_access import GraphAccess
+if "AsyncInterGraph" in globals():      # The async classes are only available with version 5 of the Neo4j driver
+    from brainannex.async_graph_access import AsyncGraphAccess
+from brainannex.memory_graph import MemoryGraphAccess
 from brainannex.cypher_utils import (CypherBuilder, CypherUtils)
 from brainannex.graph_schema import (GraphSchema, SchemaCache)
 from brainannex.collections import Collections
@@ -21,6 +24,7 @@ from brainannex.py_graph_visual import (PyGraphVisual, DisplayNetwork)
 __all__ = [
     'InterGraph',
     'GraphAccess',
+    'MemoryGraphAccess',
     'CypherBuilder',
     'CypherUtils',
     'GraphSchema',
@@ -34,6 +38,9 @@ __all__ = [
     'version'
 ]
 
+if "AsyncInterGraph" in globals():
+    __all__ += ['AsyncInterGraph', 'AsyncGraphAccess']
+
 
 def version():
     return __version__
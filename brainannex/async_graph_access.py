@@ -0,0 +1,244 @@
+import asyncio
+from typing import Union
+from brainannex.cypher_utils import CypherUtils, CypherBuilder  # Helper classes
+from brainannex import AsyncInterGraph                      # One of a family of classes, for different (versions) of graph databases;
+                                                            #   make sure to pick the one for your database, in the "brainannex/__init__.py" file!
+from brainannex.graph_access import GraphAccess
+
+
+'''
+    ----------------------------------------------------------------------------------
+	MIT License
+
+        Copyright (c) 2021-2026 Julian A. West and the BrainAnnex.org project.
+	----------------------------------------------------------------------------------
+'''
+
+
+class AsyncGraphAccess(AsyncInterGraph):
+    """
+    Asyncio counterpart of GraphAccess, for use in async code (for example, under an ASGI server.)
+
+    All the methods that access the database are coroutines, with the same arguments and returned values
+    as their GraphAccess namesakes (see their documentation);
+    independent operations can be run concurrently, for example with asyncio.gather() :
+
+        db = AsyncGraphAccess()
+        (car, n_links) = await asyncio.gather(db.get_record_by_primary_key("Car", "vin", 123),
+                                              db.count_links(match=456, rel_name="OWNS"))
+
+    SCOPE: only a core subset of the GraphAccess methods is available - the query methods of AsyncInterGraph, plus
+           get_nodes, get_record_by_primary_key, count_nodes, create_node, delete_nodes, set_fields,
+           follow_links, follow_links_many, count_links, get_parents_and_children, get_parents_and_children_many .
+           The Cypher queries are assembled by the same helper functions used by GraphAccess.
+
+           This class is a building block for an eventual ASGI deployment; nothing in the (synchronous) Flask app
+           uses it.  In particular, DataManager.search_for_word() and the Category viewer page still run on GraphAccess:
+           the former already fetches all its links with a single follow_links_many() query,
+           while the latter goes through the GraphSchema and Categories classes, which have no async counterparts
+
+    IMPORTANT: only available with version 5 of the Neo4j database and driver
+               (the 4.4 driver has no async API) - see "brainannex/__init__.py"
+    """
+
+    # The following methods don't access the database, and are shared with GraphAccess
+    match = GraphAccess.match
+    sanitize_date_times = GraphAccess.sanitize_date_times
+    flatten_structured_dataset = GraphAccess.flatten_structured_dataset
+    standardize_recordset = GraphAccess.standardize_recordset
+    _group_by_source = GraphAccess._group_by_source
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   RETRIEVE DATA   ~                                          '''
+
+    def ________RETRIEVE_DATA________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    async def get_nodes(self, match :int|str|CypherBuilder,
+                        return_internal_id=False, return_labels=False, order_by=None, limit=None,
+                        single_row=False, single_cell=""):
+        """
+        Async version of GraphAccess.get_nodes() ; see that method
+        """
+        cypher, data_binding = GraphAccess._get_nodes_query(match, order_by=order_by, limit=limit, caller_method="get_nodes")
+
+        fields_to_exclude = GraphAccess._get_nodes_fields_to_exclude(return_internal_id, return_labels)
+        result_list = await self.query_extended(cypher, data_binding, flatten=True, fields_to_exclude=fields_to_exclude)
+
+        # Deal with empty result lists
+        if len(result_list) == 0:   # If no results were produced
+            if single_row or single_cell:
+                return None
+            return []
+
+        if single_row:
+            return result_list[0]
+
+        if single_cell:
+            return result_list[0].get(single_cell)
+
+        return result_list
+
+
+
+    async def get_record_by_primary_key(self, labels: str, primary_key_name: str, primary_key_value,
+                                        return_internal_id=False) -> Union[dict, None]:
+        """
+        Async version of GraphAccess.get_record_by_primary_key() ; see that method
+        """
+        assert primary_key_name, \
+            f"AsyncGraphAccess.get_record_by_primary_key(): the primary key name cannot be absent or empty (value: {primary_key_name})"
+
+        assert primary_key_value is not None, \
+            "AsyncGraphAccess.get_record_by_primary_key(): the primary key value cannot be None" # Note: 0 or "" could be legit
+
+        match = self.match(labels=labels, key_name=primary_key_name, key_value=primary_key_value)
+        result = await self.get_nodes(match=match, return_internal_id=return_internal_id)
+        if len(result) == 0:
+            return None
+        if len(result) > 1:
+            raise Exception(f"AsyncGraphAccess.get_record_by_primary_key(): multiple records ({len(result)}) share the value (`{primary_key_value}`) in the primary key ({primary_key_name})")
+
+        return result[0]
+
+
+
+    async def count_nodes(self, labels=None) -> int:
+        """
+        Async version of GraphAccess.count_nodes() ; see that method
+        """
+        labels_str = CypherUtils.prepare_labels(labels)     # EXAMPLE: ":`my label`:`my other label`"
+
+        q = f"MATCH (n {labels_str}) RETURN COUNT(n) AS number_nodes"
+
+        return await self.query(q, single_cell="number_nodes")
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                  ~   CREATE/DELETE/MODIFY NODES   ~                                  '''
+
+    def ________CREATE_DELETE_MODIFY_NODES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    async def create_node(self, labels :str|list|tuple, properties=None) -> int|str:
+        """
+        Async version of GraphAccess.create_node() ; see that method
+        """
+        q, data_dictionary = GraphAccess._create_node_query(labels, properties)
+
+        result_list = await self.query(q, data_dictionary)
+        if len(result_list) != 1:
+            raise Exception("AsyncGraphAccess.create_node(): failed to create the requested new node")
+
+        return result_list[0]['_internal_id']    # Return the internal database ID of the node just created
+
+
+
+    async def delete_nodes(self, match :int|str|CypherBuilder) -> int:
+        """
+        Async version of GraphAccess.delete_nodes() ; see that method
+        """
+        # Unpack needed values from the match object
+        (node, where, data_binding, _) = CypherUtils.assemble_cypher_blocks(match, caller_method="delete_nodes")
+
+        q = f"MATCH {node} {CypherUtils.prepare_where(where)} DETACH DELETE n"
+
+        stats = await self.update_query(q, data_binding)
+        return stats.get("nodes_deleted", 0)
+
+
+
+    async def set_fields(self, match :int|str|CypherBuilder, set_dict: dict, drop_blanks=True) -> int:
+        """
+        Async version of GraphAccess.set_fields() ; see that method
+        """
+        if set_dict == {}:
+            return 0             # There's nothing to do
+
+        cypher, data_binding = GraphAccess._set_fields_query(match, set_dict, drop_blanks=drop_blanks)
+
+        stats = await self.update_query(cypher, data_binding)
+        return stats.get("properties_set", 0)
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   FOLLOW LINKS   ~                                          '''
+
+    def ________FOLLOW_LINKS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    async def follow_links(self, match :int|str|CypherBuilder, rel_name :str, rel_dir ="OUT",
+                           neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> [dict]:
+        """
+        Async version of GraphAccess.follow_links() ; see that method
+        """
+        q, data_binding = GraphAccess._follow_links_query(match, rel_name=rel_name, rel_dir=rel_dir, neighbor_labels=neighbor_labels,
+                                                          include_id=include_id, include_labels=include_labels, limit=limit)
+
+        result = await self.query(q, data_binding)
+
+        return self.standardize_recordset(recordset=result)
+
+
+
+    async def follow_links_many(self, internal_ids :[int|str], rel_name :str, rel_dir ="OUT",
+                                neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> dict:
+        """
+        Async version of GraphAccess.follow_links_many() ; see that method
+        """
+        q, data_binding = GraphAccess._follow_links_many_query(internal_ids, rel_name=rel_name, rel_dir=rel_dir,
+                                                               neighbor_labels=neighbor_labels, include_id=include_id,
+                                                               include_labels=include_labels, limit=limit)
+
+        result = await self.query(q, data_binding)
+
+        return self._group_by_source(internal_ids, result)
+
+
+
+    async def count_links(self, match :int|CypherBuilder, rel_name: str, rel_dir="OUT", neighbor_labels = None) -> int:
+        """
+        Async version of GraphAccess.count_links() ; see that method
+        """
+        q, data_binding = GraphAccess._count_links_query(match, rel_name=rel_name, rel_dir=rel_dir, neighbor_labels=neighbor_labels)
+
+        return await self.query(q, data_binding, single_cell="link_count")
+
+
+
+    async def get_parents_and_children(self, internal_id :str|int) -> ():
+        """
+        Async version of GraphAccess.get_parents_and_children() ; see that method.
+        The parents and the children are fetched concurrently
+        """
+        (parents_query, children_query) = GraphAccess._parents_and_children_queries(internal_id)
+
+        (parent_list, child_list) = await asyncio.gather(self.query(parents_query), self.query(children_query))
+
+        return (parent_list, child_list)
+
+
+
+    async def get_parents_and_children_many(self, internal_ids :[int|str]) -> dict:
+        """
+        Async version of GraphAccess.get_parents_and_children_many() ; see that method
+        """
+        q, data_binding = GraphAccess._parents_and_children_many_query(internal_ids)
+
+        result = await self.query(q, data_binding)
+
+        return GraphAccess._group_parents_and_children(internal_ids, result)
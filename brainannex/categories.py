@@ -38,7 +38,7 @@ class Categories:
         :return:    None
         """
 
-        assert type(db) == GraphAccess, \
+        assert isinstance(db, GraphAccess), \
             "Categories.set_database(): argument passed isn't a valid GraphAccess object"
 
         cls.db = db     # Save the database object
@@ -1393,61 +1393,63 @@ class Categories:
         assert type(move_after_n) == int, "ERROR: argument 'move_after_n' is not an integer"
         assert move_after_n >= 0, "ERROR: argument 'move_after_n' cannot be negative"
 
-        # Collect a subset of the first sorted "pos" values: enough values to cover across the insertion point
-        number_to_consider = move_after_n + 1
-        q = f'''
-            MATCH (c:Category {{entity_id: $category_id}}) <- [r:BA_in_category] - (:BA)
-            WITH  r.pos AS pos
-            ORDER by pos
-            LIMIT {number_to_consider}
-            WITH collect(pos) AS POS_LIST
-            RETURN POS_LIST
-            '''
-
-        result = cls.db.query(q, {"category_id": category_uri})  # If nothing found, this will be [{'POS_LIST': []}]
-        pos_list = result[0].get("POS_LIST")    # A subset of the first sorted "pos" values
-        #print("pos_list: ", pos_list)
-
-        if pos_list == []:
-            # The Category is empty (or doesn't exist)
-            raise Exception(f"Category (id {category_uri}) not found, or empty")
-
-        if move_after_n == 0:
-            # Move to top
-            #print("Moving to the top")
-            top_pos = pos_list[0]
-            new_pos = top_pos - cls.DELTA_POS
-        elif move_after_n >= len(pos_list):
-            # Move to bottom
-            #print("Moving to the bottom")
-            top_pos = pos_list[-1]      # The last element in the list
-            new_pos = top_pos + cls.DELTA_POS
-        else:
-            pos_above = pos_list[move_after_n - 1]  # The "pos" value of the Item just above the insertion point
-            pos_below = pos_list[move_after_n]      # The "pos" value of the Item just below
-            #print(f"pos_above: {pos_above} | pos_below: {pos_below}")
-            if pos_below == pos_above + 1:
-                # There's no room; shift everything that is past that position, by a count of DELTA_POS
-                #print(f"********* RELOCATING ITEMS (skipping the first {move_after_n}) ***********")
-                cls.relocate_positions(category_uri, n_to_skip=move_after_n, pos_shift=cls.DELTA_POS)
-                new_pos = pos_above + int(cls.DELTA_POS/2)			# This will be now be the empty halfway point
+        # Carry out all the steps below in a single transaction, so that the repositioning is atomic
+        with cls.db.transaction():
+            # Collect a subset of the first sorted "pos" values: enough values to cover across the insertion point
+            number_to_consider = move_after_n + 1
+            q = f'''
+                MATCH (c:Category {{entity_id: $category_id}}) <- [r:BA_in_category] - (:BA)
+                WITH  r.pos AS pos
+                ORDER by pos
+                LIMIT {number_to_consider}
+                WITH collect(pos) AS POS_LIST
+                RETURN POS_LIST
+                '''
+
+            result = cls.db.query(q, {"category_id": category_uri})  # If nothing found, this will be [{'POS_LIST': []}]
+            pos_list = result[0].get("POS_LIST")    # A subset of the first sorted "pos" values
+            #print("pos_list: ", pos_list)
+
+            if pos_list == []:
+                # The Category is empty (or doesn't exist)
+                raise Exception(f"Category (id {category_uri}) not found, or empty")
+
+            if move_after_n == 0:
+                # Move to top
+                #print("Moving to the top")
+                top_pos = pos_list[0]
+                new_pos = top_pos - cls.DELTA_POS
+            elif move_after_n >= len(pos_list):
+                # Move to bottom
+                #print("Moving to the bottom")
+                top_pos = pos_list[-1]      # The last element in the list
+                new_pos = top_pos + cls.DELTA_POS
             else:
-                new_pos = int((pos_above + pos_below) / 2)		# Take the halfway point, rounded down
-
-
-        # Change the "pos" attribute of the relationship to the Content Item being moved
-        q = f'''
-            MATCH (:Category {{entity_id: $category_id}}) <- [r:BA_in_category] - (:BA {{entity_id: $entity_id}})
-            SET r.pos = {new_pos}
-            '''
-
-        #print("q: ", q)
-
-        result = cls.db.update_query(q, {"category_id": category_uri, "entity_id": entity_id})
-        number_props_set = result.get('properties_set')
-        #print("number_props_set: ", number_props_set)
-        if number_props_set != 1:
-            raise Exception(f"Content Item (id {entity_id}) not found in Category (id {category_uri}), or could not be moved")
+                pos_above = pos_list[move_after_n - 1]  # The "pos" value of the Item just above the insertion point
+                pos_below = pos_list[move_after_n]      # The "pos" value of the Item just below
+                #print(f"pos_above: {pos_above} | pos_below: {pos_below}")
+                if pos_below == pos_above + 1:
+                    # There's no room; shift everything that is past that position, by a count of DELTA_POS
+                    #print(f"********* RELOCATING ITEMS (skipping the first {move_after_n}) ***********")
+                    cls.relocate_positions(category_uri, n_to_skip=move_after_n, pos_shift=cls.DELTA_POS)
+                    new_pos = pos_above + int(cls.DELTA_POS/2)			# This will be now be the empty halfway point
+                else:
+                    new_pos = int((pos_above + pos_below) / 2)		# Take the halfway point, rounded down
+
+
+            # Change the "pos" attribute of the relationship to the Content Item being moved
+            q = f'''
+                MATCH (:Category {{entity_id: $category_id}}) <- [r:BA_in_category] - (:BA {{entity_id: $entity_id}})
+                SET r.pos = {new_pos}
+                '''
+
+            #print("q: ", q)
+
+            result = cls.db.update_query(q, {"category_id": category_uri, "entity_id": entity_id})
+            number_props_set = result.get('properties_set')
+            #print("number_props_set: ", number_props_set)
+            if number_props_set != 1:
+                raise Exception(f"Content Item (id {entity_id}) not found in Category (id {category_uri}), or could not be moved")
 
 
 
@@ -0,0 +1,389 @@
+import os
+import re
+import json
+import gzip
+import time
+import threading
+from datetime import datetime, date
+from datetime import time as dt_time
+import neo4j.time
+
+
+'''
+    ----------------------------------------------------------------------------------
+	MIT License
+
+        Copyright (c) 2021-2026 Julian A. West and the BrainAnnex.org project.
+	----------------------------------------------------------------------------------
+'''
+
+
+class ChangeLog:
+    """
+    Append-only, on-disk log of the write queries run on a database, meant for use by GraphAccess
+    - see GraphAccess.enable_change_log() and GraphAccess.apply_changes()
+
+    Each entry is a dict such as
+            {"seq": 18, "time": 1760620000.5, "q": "MATCH (n :Car) WHERE id(n) = $id SET n.color = $color",
+             "params": {"id": 123, "color": "red"}, "counters": {"properties_set": 1}}
+    where "seq" is a sequence number (consecutive, starting at 1), "time" is the UNIX time of the write,
+    and "counters" are the statistics returned by the database for that query (used to verify the replays.)
+    Queries that return internal database ID's (such as "CREATE (n :Car) RETURN id(n) AS _internal_id")
+    also have an "ids" entry, with the returned values of those columns.  EXAMPLE: {"_internal_id": [456]}
+
+    The entries are stored as JSON lines in "segment" files in a directory of their own,
+    named after the sequence number of their first entry (EXAMPLE: "changes-000000000001.jsonl");
+    a new segment is started whenever the current one exceeds the given size.
+    Old segments may be deleted with purge(), for example after a backup.
+
+    Values that JSON can't represent (the temporal types of the neo4j driver, and python dates/times)
+    are stored as tagged dicts, and restored upon reading - see _json_default() and _json_object_hook()
+
+    All methods are thread-safe;  however, only 1 process at a time should write to a given directory.
+
+    EXAMPLE:
+        log = ChangeLog("/backups/change_log")
+        log.append([{"q": "CREATE (n :Car {vin: $vin})", "params": {"vin": 123}, "counters": {"nodes_created": 1}}])
+        for entry in log.read(first_seq=1):
+            print(entry["seq"], entry["q"])
+    """
+
+    SEGMENT_NAME = "changes-{:012d}.jsonl"
+    SEGMENT_PATTERN = re.compile(r"^changes-(\d{12})\.jsonl$")
+
+
+    def __init__(self, directory :str, max_segment_bytes=64_000_000, fsync=False):
+        """
+        Open the change log in the given directory (created if needed),
+        resuming the sequence numbers from its last entry, if any.
+        A partially-written last line (for example, from a crash during a write) gets discarded
+
+        :param directory:           Name of the directory for the segment files
+        :param max_segment_bytes:   [OPTIONAL] Size after which a new segment file is started
+        :param fsync:               [OPTIONAL] If True, force each write to disk (slower, but safer in case of
+                                        operating-system crashes or power failures.)  Default: False
+        """
+        assert type(directory) == str and directory, \
+            "ChangeLog(): argument `directory` must be a non-empty string"
+        assert type(max_segment_bytes) == int and max_segment_bytes > 0, \
+            "ChangeLog(): argument `max_segment_bytes` must be a positive integer"
+
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+
+        self._lock = threading.Lock()   # To protect the file and the sequence number below
+        self._file = None               # The segment file currently open for appending (opened when first needed)
+
+        os.makedirs(directory, exist_ok=True)
+
+        segments = self.segments()
+        if segments:
+            self._segment_path = segments[-1][1]
+            self._seq = self._recover_last_seq(self._segment_path, first_seq=segments[-1][0])
+        else:
+            self._segment_path = None
+            self._seq = 0
+
+
+
+    def append(self, entries :[dict]) -> [int]:
+        """
+        Append the given entries to the log, assigning them consecutive sequence numbers and a timestamp
+        (multiple entries are appended as a block, not interleaved with those of other threads.)
+        Note: the dicts passed as argument get modified
+
+        :param entries: A list of dicts, each with the keys "counters" and (optionally) "ids",
+                            as well as either the keys "q" and "params",
+                            or the key "encoded", with the value returned by encode() for them
+        :return:        The list of the sequence numbers assigned to the entries
+        """
+        if not entries:
+            return []
+
+        # Serialize the entries before taking the lock (the ones passed as encoded strings already were)
+        encoded = []
+        for entry in entries:
+            if "encoded" in entry:
+                encoded.append(entry.pop("encoded"))
+            else:
+                encoded.append(self.encode(entry.pop("q"), entry.pop("params")))
+
+        now = time.time()
+        with self._lock:
+            if (self._segment_path is None) or (os.path.getsize(self._segment_path) >= self.max_segment_bytes):
+                self._start_segment(first_seq=self._seq + 1)
+
+            if self._file is None:
+                self._file = open(self._segment_path, "a", encoding="utf8")
+
+            seq_numbers = []
+            lines = []
+            for entry, encoded_query in zip(entries, encoded):
+                self._seq += 1
+                entry["seq"] = self._seq
+                entry["time"] = now
+                seq_numbers.append(self._seq)
+                # Splice the (already serialized) query and parameters into the JSON object with the other keys
+                head = json.dumps(entry, default=self._json_default, separators=(",", ":"))
+                lines.append(head[:-1] + "," + encoded_query[1:] + "\n")
+
+            self._file.write("".join(lines))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+        return seq_numbers
+
+
+
+    @classmethod
+    def encode(cls, q :str, params) -> str:
+        """
+        Serialize the given query and parameters, for an entry to pass to append().
+        Meant to be done BEFORE running the query, so that writes whose parameters cannot be stored in the log
+        get rejected before they're made, rather than after
+
+        :param q:       A string with a Cypher query
+        :param params:  A Cypher dictionary, or None
+        :return:        A string with a JSON object.  EXAMPLE: '{"q":"CREATE (n :Car {vin: $vin})","params":{"vin":123}}'
+        """
+        return json.dumps({"q": q, "params": params or {}}, default=cls._json_default, separators=(",", ":"))
+
+
+
+    def last_seq(self) -> int:
+        """
+        Return the sequence number of the last entry in the log, or 0 if the log is empty
+
+        :return:    An integer
+        """
+        with self._lock:
+            return self._seq
+
+
+
+    def segments(self) -> [(int, str)]:
+        """
+        Return the segment files of the log, in order
+
+        :return:    A list of pairs (sequence number of the first entry, full name of the file)
+        """
+        result = []
+        for name in os.listdir(self.directory):
+            match = self.SEGMENT_PATTERN.match(name)
+            if match:
+                result.append((int(match.group(1)), os.path.join(self.directory, name)))
+
+        return sorted(result)
+
+
+
+    def read(self, first_seq=None, last_seq=None):
+        """
+        Yield, in order, the entries of the log in the given range of sequence numbers.
+        Entries appended while reading may or may not be included
+
+        :param first_seq:   [OPTIONAL] Sequence number of the first entry to return;
+                                None means: from the oldest one still in the log (see purge)
+        :param last_seq:    [OPTIONAL] Sequence number of the last entry to return;  None means: to the end
+        :return:            A generator of dicts
+        """
+        if last_seq is None:
+            last_seq = self.last_seq()
+
+        segments = self.segments()
+        if first_seq is None:
+            first_seq = segments[0][0] if segments else 1
+        elif segments and first_seq < segments[0][0] and first_seq <= last_seq:
+            raise Exception(f"ChangeLog.read(): the entries before sequence number {segments[0][0]} "
+                            f"are no longer in the log (purged)")
+
+        for i, (segment_first_seq, path) in enumerate(segments):
+            if segment_first_seq > last_seq:
+                break
+            if (i + 1 < len(segments)) and (segments[i + 1][0] <= first_seq):
+                continue    # The whole segment comes before the requested range
+
+            for entry in self.read_file(path):
+                if entry["seq"] > last_seq:
+                    return
+                if entry["seq"] >= first_seq:
+                    yield entry
+
+
+
+    def export_range(self, filename :str, first_seq=None, last_seq=None) -> dict:
+        """
+        Save the entries in the given range of sequence numbers into a file, in the same format as the segments
+        (gzip-compressed if the filename ends in ".gz"), for incremental backups;
+        they may later be replayed with GraphAccess.apply_changes()
+
+        EXAMPLE - an hourly incremental backup, starting from where the previous one left off:
+            stats = log.export_range(f"/backups/changes_{previous_last_seq + 1}.jsonl.gz", first_seq=previous_last_seq + 1)
+            previous_last_seq = stats["last_seq"]
+
+        :param filename:    Name of the file to create
+        :param first_seq:   [OPTIONAL] Sequence number of the first entry to export;
+                                None means: from the oldest one still in the log
+        :param last_seq:    [OPTIONAL] Sequence number of the last entry to export;  None means: to the end
+        :return:            A dict with the keys "entries" (the number exported), and "first_seq" and "last_seq"
+                                (the sequence numbers of the first and last entries exported;  "last_seq" is None
+                                if none was)
+        """
+        if last_seq is None:
+            last_seq = self.last_seq()
+
+        stats = {"entries": 0, "first_seq": first_seq, "last_seq": None}
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(filename, "wt", encoding="utf8") as f:
+            for entry in self.read(first_seq=first_seq, last_seq=last_seq):
+                f.write(json.dumps(entry, default=self._json_default, separators=(",", ":")) + "\n")
+                if stats["entries"] == 0:
+                    stats["first_seq"] = entry["seq"]
+                stats["entries"] += 1
+                stats["last_seq"] = entry["seq"]
+
+        return stats
+
+
+
+    def purge(self, before_seq :int) -> int:
+        """
+        Delete the segment files whose entries all have sequence numbers lower than the given one
+        (for example, once they have been backed up.)  The segment currently being written is always kept
+
+        :param before_seq:  A sequence number
+        :return:            The number of segment files deleted
+        """
+        with self._lock:
+            segments = self.segments()
+            deleted = 0
+            for i, (segment_first_seq, path) in enumerate(segments[:-1]):
+                if segments[i + 1][0] > before_seq:
+                    break
+                os.remove(path)
+                deleted += 1
+
+        return deleted
+
+
+
+    def close(self) -> None:
+        """
+        Close the segment file currently open, if any (it gets re-opened by the next append)
+
+        :return:    None
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+
+    @classmethod
+    def read_file(cls, filename :str):
+        """
+        Yield the entries stored in the given segment file, or file created by export_range()
+        (gzip-compressed if the filename ends in ".gz")
+
+        :param filename:    Name of a file with one JSON entry per line
+        :return:            A generator of dicts
+        """
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(filename, "rt", encoding="utf8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    return      # A partially-written last line
+                yield json.loads(line, object_hook=cls._json_object_hook)
+
+
+
+    def _start_segment(self, first_seq :int) -> None:
+        """
+        Close the current segment file (if any), and make a new one current
+
+        :param first_seq:   The sequence number of the first entry to go into the new segment
+        :return:            None
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        self._segment_path = os.path.join(self.directory, self.SEGMENT_NAME.format(first_seq))
+
+
+
+    @staticmethod
+    def _recover_last_seq(path :str, first_seq :int) -> int:
+        """
+        Return the sequence number of the last complete entry in the given segment file;
+        if the file ends with a partially-written line, truncate it off
+
+        :param path:        Full name of a segment file
+        :param first_seq:   The sequence number of its first entry
+        :return:            An integer
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        end = data.rfind(b"\n") + 1         # Position just past the last complete line (0 if none)
+        if end < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(end)
+
+        if end == 0:
+            return first_seq - 1
+
+        last_line = data[data.rfind(b"\n", 0, end - 1) + 1 : end]
+        return json.loads(last_line)["seq"]
+
+
+
+    TEMPORAL_TYPES = {"DateTime": neo4j.time.DateTime, "Date": neo4j.time.Date,
+                      "Time": neo4j.time.Time, "Duration": neo4j.time.Duration}
+
+    @classmethod
+    def _json_default(cls, value):
+        """
+        Serialize the values that JSON doesn't support natively (used as the `default` argument of json.dumps)
+
+        :param value:   EXAMPLE: neo4j.time.DateTime(2015, 8, 15, 1, 2, 3, 0)
+        :return:        A JSON-serializable value.  EXAMPLE: {"$neo4j": "DateTime", "iso": "2015-08-15T01:02:03.000000000"}
+        """
+        for name, temporal_type in cls.TEMPORAL_TYPES.items():
+            if type(value) == temporal_type:
+                return {"$neo4j": name, "iso": value.iso_format()}
+
+        if isinstance(value, datetime):
+            return {"$python": "datetime", "iso": value.isoformat()}
+        if isinstance(value, date):
+            return {"$python": "date", "iso": value.isoformat()}
+        if isinstance(value, dt_time):
+            return {"$python": "time", "iso": value.isoformat()}
+
+        if isinstance(value, (set, tuple)):
+            return list(value)
+        if hasattr(value, "item"):
+            return value.item()         # Numpy scalars
+
+        raise TypeError(f"ChangeLog: values of type {type(value)} cannot be stored in the log")
+
+
+
+    @classmethod
+    def _json_object_hook(cls, d :dict):
+        """
+        Reverse the serialization done by _json_default() (used as the `object_hook` argument of json.loads)
+
+        :param d:   A dict parsed from JSON
+        :return:    The original value, or the dict itself
+        """
+        if len(d) == 2 and "iso" in d:
+            if "$neo4j" in d:
+                return cls.TEMPORAL_TYPES[d["$neo4j"]].from_iso_format(d["iso"])
+            if "$python" in d:
+                return {"datetime": datetime, "date": date, "time": dt_time}[d["$python"]].fromisoformat(d["iso"])
+
+        return d
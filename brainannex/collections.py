@@ -40,7 +40,7 @@ class Collections:
         :return:    None
         """
 
-        assert type(db) == GraphAccess, \
+        assert isinstance(db, GraphAccess), \
             "Collections.set_database(): argument passed isn't a valid `GraphAccess` object"
 
         cls.db = db
@@ -3,6 +3,10 @@
 #                           and to store Cypher fragments & data-binding dict, to identify one or more nodes (the "PROCESSED match structure")
 #       - CypherUtils       Static class to pre-process node specs, plus misc. Cypher-related utilities
 
+import json
+import base64
+import datetime
+import neo4j.time
 from typing import Union, List, Tuple
 
 
@@ -54,9 +58,9 @@ class CypherBuilder:
                     data_binding: {}
                     dummy_node_name: "p"
             *   node: "(n  )"
-                    where: "id(n) = 123"
+                    where: "id(n) = $n_internal_id"
                     clause_binding: {}
-                    data_binding: {}
+                    data_binding: {"n_internal_id": 123}
                     dummy_node_name: "n"
             *   node: "(n :`car`:`surplus inventory` )"
                     where: ""
@@ -144,7 +148,7 @@ class CypherBuilder:
         self.node = ""                  # It contains filters for labels, for all the passed properties,
                                         #       and for the requested key/value pair, as applicable
                                         # EXAMPLE: "(n :`person` {`gender`: $n_par_1, `age`: $n_par_2})"
-        self.where = ""                 # EXAMPLES: "id(n) = 123"
+        self.where = ""                 # EXAMPLES: "id(n) = $n_internal_id"
                                         #           "n.income > 90000 OR n.state = 'CA'"
         self.data_binding = {}          # For all the passed properties,
                                         #   and for the requested key/value pair, as applicable
@@ -258,9 +262,10 @@ class CypherBuilder:
         """
         if self.internal_id is not None:    # If an internal node ID is specified, it over-rides all the other conditions
                                             # (note: internal_id might be 0)
+            # The ID is passed as a parameter, so that replays of the change log can translate it - see GraphAccess.apply_changes()
             self.node = f"({self.dummy_node_name})"
-            self.where = f"id({self.dummy_node_name}) = {self.internal_id}"
-            self.data_binding = {}
+            self.where = f"id({self.dummy_node_name}) = ${self.dummy_node_name}_internal_id"
+            self.data_binding = {f"{self.dummy_node_name}_internal_id": self.internal_id}
             self.cypher = f"MATCH {self.node} WHERE {self.where}"
             return
 
@@ -423,6 +428,12 @@ class CypherUtils:
     Meant as a PRIVATE class; not indicated for the end user.
     """
 
+    # The temporal types of the order keys that pagination cursors can hold (as ISO strings), indexed by name;
+    # see encode_cursor()
+    _CURSOR_TEMPORAL_TYPES = {cls.__name__: cls for cls in [neo4j.time.DateTime, neo4j.time.Date, neo4j.time.Time,
+                                                            datetime.datetime, datetime.date, datetime.time]}
+
+
     @classmethod
     def process_match_structure(cls, handle :int|str|CypherBuilder,
                                 dummy_node_name=None, caller_method=None) -> CypherBuilder:
@@ -787,3 +798,111 @@ class CypherUtils:
             return f"AND {clause}"
 
         return clause
+
+
+
+    @classmethod
+    def keyset_clause(cls, order_key=None, cursor=None, dummy_node_name="n") -> (str, str, dict):
+        """
+        Assemble the Cypher fragments for a "keyset" (aka "seek") pagination of nodes:
+        rather than skipping over the records of the previous pages (which gets slower and slower with the page depth),
+        pick up right after the last record of the previous page, as identified by the given cursor.
+        The nodes are ordered by the given key (with their internal database ID to break ties),
+        or just by their internal database ID; in either case, the database can seek directly to the
+        starting point, if an index on the key is present.
+
+        Nodes that lack the key property are left out.
+
+        EXAMPLE:    keyset_clause(order_key="name", cursor=<cursor from encode_cursor()>)  returns
+                        ("(n.`name` > $cursor_key OR (n.`name` = $cursor_key AND id(n) > $cursor_id))",
+                         "n.`name`, id(n)",
+                         {"cursor_key": "Julian", "cursor_id": 123})
+
+        :param order_key:       [OPTIONAL] Name of the node property (preferably, indexed) to order by;
+                                    if None, order by internal database ID
+        :param cursor:          [OPTIONAL] A string returned by encode_cursor() for the last record of the previous page;
+                                    if None, start from the first page
+        :param dummy_node_name: [OPTIONAL] String with the dummy name used to refer to the nodes in the Cypher query;
+                                    by default, "n"
+        :return:                A triplet with:  a clause suitable for inclusion in a WHERE statement,
+                                    a string suitable for an ORDER BY statement,
+                                    and the data-binding dictionary for the clause
+        """
+        n = dummy_node_name
+
+        if order_key is None:
+            order_by = f"id({n})"
+            if cursor is None:
+                return ("", order_by, {})
+
+            (_, cursor_id) = cls.decode_cursor(cursor, order_key=None)
+            return (f"id({n}) > $cursor_id", order_by, {"cursor_id": cursor_id})
+
+        order_by = f"{n}.`{order_key}`, id({n})"
+        if cursor is None:
+            return (f"{n}.`{order_key}` IS NOT NULL", order_by, {})
+
+        (cursor_key, cursor_id) = cls.decode_cursor(cursor, order_key=order_key)
+        clause = f"({n}.`{order_key}` > $cursor_key OR ({n}.`{order_key}` = $cursor_key AND id({n}) > $cursor_id))"
+        return (clause, order_by, {"cursor_key": cursor_key, "cursor_id": cursor_id})
+
+
+
+    @classmethod
+    def encode_cursor(cls, order_key, key_value, internal_id :int) -> str:
+        """
+        Create an opaque pagination cursor, to resume a keyset pagination after the given record - see keyset_clause()
+
+        :param order_key:   Name of the node property used for the ordering; None if ordering by internal database ID
+        :param key_value:   The value of the above property in the last record of the current page
+                                (ignored if `order_key` is None).  It must be a string, number or boolean,
+                                or a date/time (which is stored in the cursor as an ISO string, along with its type)
+        :param internal_id: The internal database ID of the last record of the current page
+        :return:            A URL-safe string
+        """
+        state = {"o": order_key, "i": internal_id}
+        if order_key is not None:
+            value_type = type(key_value).__name__
+            if cls._CURSOR_TEMPORAL_TYPES.get(value_type) is type(key_value):
+                state["t"] = value_type
+                key_value = key_value.iso_format() if hasattr(key_value, "iso_format") else key_value.isoformat()
+            else:
+                assert type(key_value) in (str, int, float, bool), \
+                    f"encode_cursor(): cannot paginate by the property `{order_key}`, " \
+                    f"whose values are of type {type(key_value)} (must be string, number, boolean, date or time)"
+            state["k"] = key_value
+
+        return base64.urlsafe_b64encode(json.dumps(state).encode("utf8")).decode("ascii")
+
+
+
+    @classmethod
+    def decode_cursor(cls, cursor :str, order_key=None) -> tuple:
+        """
+        Unpack a pagination cursor created by encode_cursor()
+
+        :param cursor:      A string returned by encode_cursor()
+        :param order_key:   Name of the node property being used for the ordering, or None if ordering by internal database ID;
+                                it must be the same one that the cursor was created for
+        :return:            The pair (key value, internal database ID) of the last record of the previous page;
+                                the key value is None when ordering by internal database ID
+        """
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except Exception:
+            raise Exception(f"decode_cursor(): invalid pagination cursor: `{cursor}`")
+
+        assert state.get("o") == order_key, \
+            f"decode_cursor(): the pagination cursor was created for a different ordering " \
+            f"(`{state.get('o')}` rather than `{order_key}`)"
+
+        key_value = state.get("k")
+        if "t" in state:        # A date/time, stored as an ISO string
+            value_class = cls._CURSOR_TEMPORAL_TYPES.get(state["t"])
+            if value_class is None:
+                raise Exception(f"decode_cursor(): invalid pagination cursor: `{cursor}`")
+            key_value = value_class.from_iso_format(key_value) if hasattr(value_class, "from_iso_format") \
+                            else value_class.fromisoformat(key_value)
+
+        return (key_value, state["i"])
+
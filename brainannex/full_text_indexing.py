@@ -136,7 +136,7 @@ class FullTextIndexing:
         :return:    None
         """
 
-        assert type(db) == GraphAccess, \
+        assert isinstance(db, GraphAccess), \
             "FullTextIndexing.set_database(): argument passed isn't a valid `GraphAccess` object"
 
         cls.db = db
@@ -1,15 +1,28 @@
 from neo4j.time import DateTime                             # To convert datetimes (and dates) between neo4j.time.DateTime and python
                                                             # TODO: all Neo4j-specific parts are being migrated to the InterGraph libraries
 import neo4j.graph                                          # To check returned data types
+import neo4j.time                                           # For the temporal types in snapshots
 from brainannex.cypher_utils import CypherUtils, CypherBuilder  # Helper classes
+from brainannex.query_cache import QueryCache                   # For the optional cache of query results
+from brainannex.change_log import ChangeLog                     # For the optional log of the database writes
 from brainannex import InterGraph                           # One of a family of classes, for different (versions) of graph databases;
                                                             #   make sure to pick the one for your database, in the "brainannex/__init__.py" file!
 import math
-import numpy as np
+import os
 import pandas as pd
 import pandas.core.dtypes.common
 import json
+import gzip
+import zlib
+import sqlite3
 import time
+import copy
+import re
+import threading
+import warnings
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from typing import Union, List, Tuple
 
 
@@ -63,8 +76,24 @@ class GraphAccess(InterGraph):
         such as lookup, creation, deletion, modification, import, etc.
 
     It makes use of separate helper classes (NOT meant for the end user) in the file cypher_utils.py
+
+    If the host is "memory", a MemoryGraphAccess object is created instead:  an in-memory graph store
+    with the same API, and no database server.  EXAMPLE:  GraphAccess(host="memory")
+    (To run, for example, the pytests without a database, set the environment variable NEO4J_HOST to "memory")
     """
 
+    def __new__(cls, host=os.getenv("NEO4J_HOST"), *args, **kwargs):
+        """
+        Create a GraphAccess object - or a MemoryGraphAccess object, if the host is "memory"
+        (the arguments are then passed to the constructor of the class of the new object)
+        """
+        if (cls is GraphAccess) and (host == "memory"):
+            from brainannex.memory_graph import MemoryGraphAccess   # Imported here, to avoid a circular import
+            cls = MemoryGraphAccess
+
+        return super().__new__(cls)
+
+
 
 
     #####################################################################################################
@@ -190,29 +219,13 @@ class GraphAccess(InterGraph):
         """
         # TODO: provide an option to specify the desired fields
 
-        # Unpack needed values from the Cypher builder
-        (node, where, data_binding, dummy_node_name) = CypherUtils.assemble_cypher_blocks(match, caller_method="get_nodes")
-        #print(node, where, data_binding, dummy_node_name)
-        cypher = f"MATCH {node} {CypherUtils.prepare_where(where)} RETURN {dummy_node_name}"
-
-        if order_by:
-            cypher += f" ORDER BY n.{order_by}"
-
-        if limit:
-            cypher += f" LIMIT {limit}"
-
+        cypher, data_binding = self._get_nodes_query(match, order_by=order_by, limit=limit, caller_method="get_nodes")
 
         # Note: the flatten=True takes care of returning just the fields of the matched node "n",
         #       rather than dictionaries indexes by "n"
-        if return_internal_id and return_labels:
-            result_list = self.query_extended(cypher, data_binding, flatten=True)
-            # Note: query_extended() provides both '_internal_id' and '_node_labels'
-        elif return_internal_id:    # but not return_labels
-            result_list = self.query_extended(cypher, data_binding, flatten=True, fields_to_exclude=['_node_labels'])
-        elif return_labels:         # but not return_internal_id
-            result_list = self.query_extended(cypher, data_binding, flatten=True, fields_to_exclude=['_internal_id'])
-        else:
-            result_list = self.query_extended(cypher, data_binding, flatten=True, fields_to_exclude=['_internal_id', '_node_labels'])
+        # Note: query_extended() provides both '_internal_id' and '_node_labels'
+        fields_to_exclude = self._get_nodes_fields_to_exclude(return_internal_id, return_labels)
+        result_list = self.query_extended(cypher, data_binding, flatten=True, fields_to_exclude=fields_to_exclude)
 
         # Deal with empty result lists
         if len(result_list) == 0:   # If no results were produced
@@ -233,9 +246,165 @@ class GraphAccess(InterGraph):
 
 
 
+    def get_nodes_iter(self, match :int|str|CypherBuilder,
+                       return_internal_id=False, return_labels=False, order_by=None, limit=None,
+                       chunk_size=None, fetch_size=None):
+        """
+        Generator variant of get_nodes(), for large sets of nodes:
+        rather than assembling all the records in memory, yield them one by one (or in chunks of a given size),
+        as they get fetched from the database.  See InterGraph.query_iter() for caveats.
+
+        EXAMPLE:
+            for record in db.get_nodes_iter(db.match(labels="Car"), return_internal_id=True):
+                print(record)   # {"make": "Toyota", "_internal_id": 123}
+
+        :param match:               See get_nodes()
+        :param return_internal_id:  See get_nodes()
+        :param return_labels:       See get_nodes()
+        :param order_by:            See get_nodes()
+        :param limit:               See get_nodes()
+        :param chunk_size:          [OPTIONAL] If specified, yield lists of (up to) this many records;
+                                        otherwise, yield individual records
+        :param fetch_size:          [OPTIONAL] Number of records fetched in each batch from the database server
+        :return:                    A generator of dictionaries (or of lists of dictionaries, if chunk_size was specified),
+                                        in the same format as the elements of the list returned by get_nodes()
+        """
+        cypher, data_binding = self._get_nodes_query(match, order_by=order_by, limit=limit, caller_method="get_nodes_iter")
+
+        fields_to_exclude = self._get_nodes_fields_to_exclude(return_internal_id, return_labels)
+
+        yield from self.query_extended_iter(cypher, data_binding, flatten=True, fields_to_exclude=fields_to_exclude,
+                                            chunk_size=chunk_size, fetch_size=fetch_size)
+
+
+
+    def get_nodes_page(self, match :int|str|CypherBuilder, page_size=100, cursor=None, order_key=None,
+                       return_internal_id=False, return_labels=False) -> ([dict], str|None):
+        """
+        Paginated variant of get_nodes(): return one page of the nodes specified by the given match data,
+        plus an opaque cursor to pass back, to get the next page.
+
+        Unlike SKIP/LIMIT pagination, the cost of fetching a page does NOT grow with its depth:
+        each page resumes right after the last node of the previous one - see CypherUtils.keyset_clause()
+        The nodes are ordered by the given (preferably indexed) property, with their internal database ID to break ties;
+        or simply by internal database ID.  Nodes lacking the order-by property are left out.
+
+        For a count of all the nodes with a given label, served by the database's count store
+        (i.e. without scanning the nodes), use count_nodes() with that single label.
+
+        EXAMPLE:
+            cursor = None
+            while True:
+                (records, cursor) = db.get_nodes_page(db.match(labels="Car"), page_size=1000, cursor=cursor, order_key="vin")
+                process(records)
+                if cursor is None:
+                    break
+
+        :param match:               EITHER an integer or string with an internal database node id,
+                                        OR a "CypherBuilder" object, as returned by match(), with data to identify a set of nodes
+        :param page_size:           [OPTIONAL] Max number of nodes to return
+        :param cursor:              [OPTIONAL] The cursor returned by the previous call, to get the next page;
+                                        if None, the first page is returned
+        :param order_key:           [OPTIONAL] Name of the node property to order by; if None, order by internal database ID.
+                                        It must be the same in all the calls for the pages of a given set of nodes
+        :param return_internal_id:  [OPTIONAL] See get_nodes()
+        :param return_labels:       [OPTIONAL] See get_nodes()
+        :return:                    The pair (list of records, cursor for the next page).
+                                        The records are in the format returned by get_nodes();
+                                        the cursor is a string, or None if there are no more pages
+        """
+        assert (type(page_size) == int) and (page_size >= 1), \
+            f"get_nodes_page(): the argument `page_size` must be a positive integer (value passed: {page_size})"
+
+        (node, where, data_binding, dummy_node_name) = \
+                CypherUtils.assemble_cypher_blocks(match, caller_method="get_nodes_page")
+
+        (keyset_clause, order_by, keyset_data_binding) = \
+                CypherUtils.keyset_clause(order_key=order_key, cursor=cursor, dummy_node_name=dummy_node_name)
+
+        # Note: one extra node is requested, to find out whether any nodes are left for further pages
+        q = f'''
+            MATCH {node} {CypherUtils.prepare_where([where, keyset_clause])} 
+            RETURN {dummy_node_name} 
+            ORDER BY {order_by} 
+            LIMIT {page_size + 1}
+            '''
+        data_binding = CypherUtils.prepare_data_binding(data_binding, keyset_data_binding)
+
+        # Note: the internal database ID is always needed, to create the cursor
+        fields_to_exclude = self._get_nodes_fields_to_exclude(return_internal_id=True, return_labels=return_labels)
+        result_list = self.query_extended(q, data_binding, flatten=True, fields_to_exclude=fields_to_exclude)
+
+        if len(result_list) > page_size:
+            result_list = result_list[:page_size]
+            last_record = result_list[-1]
+            next_cursor = CypherUtils.encode_cursor(order_key, key_value=last_record.get(order_key),
+                                                    internal_id=last_record["_internal_id"])
+        else:
+            next_cursor = None      # This is the last page
+
+        if not return_internal_id:
+            for record in result_list:
+                del record["_internal_id"]
+
+        return (result_list, next_cursor)
+
+
+
+    @staticmethod
+    def _get_nodes_query(match :int|str|CypherBuilder, order_by=None, limit=None, caller_method=None) -> (str, dict):
+        """
+        Helper function for get_nodes() and get_nodes_iter().
+        Assemble the Cypher query to retrieve the nodes specified by the given match data
+
+        :param match:           EITHER an integer or string with an internal database node id,
+                                    OR a "CypherBuilder" object, as returned by match()
+        :param order_by:        [OPTIONAL] String with the key (field) name to order by, in ascending order
+        :param limit:           [OPTIONAL] Integer to specify the maximum number of nodes returned
+        :param caller_method:   [OPTIONAL] Name of the calling method, for error messages
+        :return:                The pair (Cypher query string, data-binding dictionary)
+        """
+        # Unpack needed values from the Cypher builder
+        (node, where, data_binding, dummy_node_name) = CypherUtils.assemble_cypher_blocks(match, caller_method=caller_method)
+        #print(node, where, data_binding, dummy_node_name)
+        cypher = f"MATCH {node} {CypherUtils.prepare_where(where)} RETURN {dummy_node_name}"
+
+        if order_by:
+            cypher += f" ORDER BY n.{order_by}"
+
+        if limit:
+            cypher += f" LIMIT {limit}"
+
+        return cypher, data_binding
+
+
+
+    @staticmethod
+    def _get_nodes_fields_to_exclude(return_internal_id :bool, return_labels :bool) -> [str]:
+        """
+        Helper function for get_nodes() and get_nodes_iter().
+        Determine which of the special fields added by query_extended() are to be left out
+
+        :param return_internal_id:  Flag indicating whether to include the internal database node ID
+        :param return_labels:       Flag indicating whether to include the node labels
+        :return:                    A (possibly empty) list of field names
+        """
+        fields_to_exclude = []
+        if not return_internal_id:
+            fields_to_exclude.append('_internal_id')
+        if not return_labels:
+            fields_to_exclude.append('_node_labels')
+
+        return fields_to_exclude
+
+
+
+
     def get_df(self, match :int|str|CypherBuilder, order_by=None, limit=None) -> pd.DataFrame:
         """
-        Similar to get_nodes(), but with fewer arguments - and the result is returned as a Pandas dataframe
+        Similar to get_nodes(), but with fewer arguments - and the result is returned as a Pandas dataframe.
+        Properties with Neo4j DateTime or Date values are returned as Pandas datetime columns
+        (rather than columns of neo4j.time objects) - see InterGraph.columns_to_df()
 
         [See get_nodes() for more information about the arguments]
 
@@ -247,8 +416,14 @@ class GraphAccess(InterGraph):
 
         :return:            A Pandas dataframe
         """
-        result_list = self.get_nodes(match=match, order_by=order_by, limit=limit)
-        return pd.DataFrame(result_list)
+        cypher, data_binding = self._get_nodes_query(match, order_by=order_by, limit=limit, caller_method="get_df")
+
+        # Note: the dataframe is built column by column, without creating a dictionary for each node
+        df = self.query_df(cypher, data_binding)
+        if len(df) == 0:
+            return pd.DataFrame()   # No nodes were found; don't leave behind the (unexpanded) column of the dummy node
+
+        return df
 
 
 
@@ -333,13 +508,19 @@ class GraphAccess(InterGraph):
 
         match = self.match(labels=labels, key_name=primary_key_name, key_value=primary_key_value)
         #print(match)
-        result = self.get_nodes(match=match, return_internal_id=return_internal_id)
+        key = ("get_record_by_primary_key", repr(labels), primary_key_name, repr(primary_key_value), return_internal_id)
+        # Note: the cached record gets tagged with ALL the labels of its node (not just the requested ones),
+        #       so that a change to the node made by way of any of its labels will invalidate it
+        result = self._cached_read(key,
+                                   compute=lambda: self.get_nodes(match=match, return_internal_id=return_internal_id, return_labels=True),
+                                   tags=lambda records: [label for record in records for label in record["_node_labels"]] or self._label_tags(labels))
         #print(result)
         if len(result) == 0:
             return None
         if len(result) > 1:
             raise Exception(f"GraphAccess.get_record_by_primary_key(): multiple records ({len(result)}) share the value (`{primary_key_value}`) in the primary key ({primary_key_name})")
 
+        del result[0]["_node_labels"]
         return result[0]
 
 
@@ -396,7 +577,8 @@ class GraphAccess(InterGraph):
 
         q = f"MATCH (n {labels_str}) RETURN COUNT(n) AS number_nodes"
 
-        return self.query(q, single_cell="number_nodes")
+        return self._cached_read((q, ""), compute=lambda: self.query(q, single_cell="number_nodes"),
+                                 tags=self._label_tags(labels))
 
 
 
@@ -436,7 +618,9 @@ class GraphAccess(InterGraph):
 
         q = "MATCH (n) WHERE id(n)=$internal_id RETURN labels(n) AS all_labels"
 
-        return self.query(q, data_binding={"internal_id": internal_id}, single_cell="all_labels")
+        return self._cached_read((q, repr(internal_id)),
+                                 compute=lambda: self.query(q, data_binding={"internal_id": internal_id}, single_cell="all_labels"),
+                                 tags=lambda all_labels: all_labels)    # If the node doesn't exist, it depends on everything
 
 
 
@@ -563,6 +747,27 @@ class GraphAccess(InterGraph):
         :return:            The internal database ID of the node just created
         """
 
+        q, data_dictionary = self._create_node_query(labels, properties)
+
+        with self._writes_to(labels):
+            result_list = self.query(q, data_dictionary)    # TODO: switch to update_query(), and verify the creation
+        if len(result_list) != 1:
+            raise Exception("GraphAccess.create_node(): failed to create the requested new node")
+
+        return result_list[0]['_internal_id']    # Return the internal database ID of the node just created
+
+
+
+    @staticmethod
+    def _create_node_query(labels :str|list|tuple, properties=None) -> (str, dict):
+        """
+        Helper function for create_node() and AsyncGraphAccess.create_node().
+        Assemble the Cypher query to create a new node with the given labels and properties
+
+        :param labels:      A string, or list/tuple of strings, specifying graph-database labels; it's acceptable to be None
+        :param properties:  [OPTIONAL] (possibly empty or None) dictionary of properties to set for the new node
+        :return:            The pair (Cypher query string, data-binding dictionary)
+        """
         if properties is None:
             properties = {}
 
@@ -576,14 +781,11 @@ class GraphAccess(InterGraph):
         # Turn labels (string or list/tuple of labels) into a string suitable for inclusion into Cypher
         cypher_labels = CypherUtils.prepare_labels(labels)
 
-        # Assemble the complete Cypher query
-        q = f"CREATE (n {cypher_labels} {attributes_str}) RETURN n"
-
-        result_list = self.query_extended(q, data_dictionary, flatten=True)  # TODO: switch to update_query(), and verify the creation
-        if len(result_list) != 1:
-            raise Exception("GraphAccess.create_node(): failed to create the requested new node")
+        # Assemble the complete Cypher query.
+        # Note: the ID is returned in the `_internal_id` column, which is what the change log records - see apply_changes()
+        q = f"CREATE (n {cypher_labels} {attributes_str}) RETURN id(n) AS _internal_id"
 
-        return result_list[0]['_internal_id']    # Return the internal database ID of the node just created
+        return q, data_dictionary
 
 
 
@@ -620,7 +822,8 @@ class GraphAccess(InterGraph):
         q = f"MERGE (n {cypher_labels} {attributes_str}) RETURN id(n) AS _internal_id"
 
 
-        result = self.update_query(q, data_dictionary)
+        with self._writes_to(labels):
+            result = self.update_query(q, data_dictionary)
 
         internal_id = result["returned_data"][0]["_internal_id"]     # The internal database ID of the node found or just created
 
@@ -850,7 +1053,8 @@ class GraphAccess(InterGraph):
         '''
         # EXAMPLE of data_binding : {'par_1': 'Julian', 'par_2': 'Berkeley', 'NODE0_VAL': 'IT', 'NODE1_VAL': 12345, 'NODE1_par_1': 2021}
 
-        result = self.update_query(q, data_binding)
+        with self._writes_to(labels):
+            result = self.update_query(q, data_binding)
         #print("Result of update_query in create_node_with_relationships(): ", result)
         # EXAMPLE: {'labels_added': 1, 'relationships_created': 2, 'nodes_created': 1, 'properties_set': 3, 'returned_data': [{'_internal_id': 604}]}
 
@@ -980,7 +1184,8 @@ class GraphAccess(InterGraph):
         '''
         # EXAMPLE of data_binding : {'par_1': 'Julian', 'par_2': 'Berkeley', 'EDGE1_1': 2021}
 
-        result = self.update_query(q, data_binding)
+        with self._writes_to(labels):
+            result = self.update_query(q, data_binding)
         #self.debug_print(f"Result of update_query in create_node_with_links():\n{result}")
         # EXAMPLE: {'labels_added': 1, 'relationships_created': 2, 'nodes_created': 1, 'properties_set': 3, 'returned_data': [{'_internal_id': 604}]}
 
@@ -1131,18 +1336,33 @@ class GraphAccess(InterGraph):
     #####################################################################################################
 
 
-    def delete_nodes(self, match :int|str|CypherBuilder) -> int:
+    def delete_nodes(self, match :int|str|CypherBuilder, batch_size=None, pause=0, report=False) -> int:
         """
         Delete the node or nodes specified by the match argument.
         Return the number of nodes deleted.
 
-        :param match:   EITHER an integer or string with an internal database node id,
-                            OR a "CypherBuilder" object, as returned by match(), with data to identify a node or set of nodes
-        :return:        The number of nodes deleted (possibly zero)
+        For large numbers of nodes, use the `batch_size` argument, to delete the nodes
+        a batch at a time (each in its own transaction), rather than in a single (possibly huge) transaction
+
+        EXAMPLE:    delete_nodes(match(labels="Car"), batch_size=10000, pause=0.5, report=True)
+
+        :param match:       EITHER an integer or string with an internal database node id,
+                                OR a "CypherBuilder" object, as returned by match(), with data to identify a node or set of nodes
+        :param batch_size:  [OPTIONAL] If specified, max number of nodes to delete in each transaction - see delete_in_batches()
+        :param pause:       [OPTIONAL] Only applicable if `batch_size` is given:
+                                number of seconds to wait between batches, to throttle the load on the database
+        :param report:      [OPTIONAL] Only applicable if `batch_size` is given:
+                                if True, print the progress of the deletion
+        :return:            The number of nodes deleted (possibly zero)
         """
         # Unpack needed values from the match object
         (node, where, data_binding, _) = CypherUtils.assemble_cypher_blocks(match, caller_method="delete_nodes")
 
+        if batch_size is not None:
+            result = self.delete_in_batches(f"MATCH {node} {CypherUtils.prepare_where(where)}", data_binding,
+                                            batch_size=batch_size, pause=pause, report=report)
+            return result["total"]
+
         q = f"MATCH {node} {CypherUtils.prepare_where(where)} DETACH DELETE n"
 
         stats = self.update_query(q, data_binding)
@@ -1195,7 +1415,29 @@ class GraphAccess(InterGraph):
         if set_dict == {}:
             return 0             # There's nothing to do
 
+        cypher, data_binding = self._set_fields_query(match, set_dict, drop_blanks=drop_blanks)
+
+        #self.debug_query_print(cypher, data_binding)
+        with self._writes_to(None):     # The located nodes might have other labels besides the matched ones
+            stats = self.update_query(cypher, data_binding)
+
+        number_properties_set = stats.get("properties_set", 0)
+        return number_properties_set
+
+
 
+    @staticmethod
+    def _set_fields_query(match :int|str|CypherBuilder, set_dict: dict, drop_blanks=True) -> (str, dict):
+        """
+        Helper function for set_fields() and AsyncGraphAccess.set_fields().
+        Assemble the Cypher query to update the properties of the node(s) specified by the match data
+
+        :param match:       EITHER a valid internal database ID (int or string),
+                                OR a "CypherBuilder" object, as returned by match()
+        :param set_dict:    A non-empty dictionary of field name/values - see set_fields()
+        :param drop_blanks: [OPTIONAL] See set_fields()
+        :return:            The pair (Cypher query string, data-binding dictionary)
+        """
         # Unpack the parts needed to put together a Cypher query
         (node, where, data_binding, dummy_node_name) = CypherUtils.assemble_cypher_blocks(match, caller_method="set_fields")
 
@@ -1237,11 +1479,113 @@ class GraphAccess(InterGraph):
         # Example of data binding:
         #       {'n_par_1': 123, 'n_par_2': 7500, 'color': 'white', 'price': 7000}
 
-        #self.debug_query_print(cypher, data_binding)
-        stats = self.update_query(cypher, data_binding)
+        return cypher, data_binding
 
-        number_properties_set = stats.get("properties_set", 0)
-        return number_properties_set
+
+
+    def set_fields_many(self, updates :dict|pd.DataFrame, labels=None, key_name=None, drop_blanks=True,
+                        batch_size=10000, report=False) -> dict:
+        """
+        Bulk version of set_fields(): update, possibly adding and/or dropping fields, the properties of many nodes,
+        each with its own values.  The updates are applied in batches, with one query per batch (rather than per node.)
+
+        The nodes are located EITHER by their internal database ID (if `key_name` is None),
+        OR by the value of the given key property (preferably indexed), among the nodes with the given labels.
+        Nodes that aren't found are skipped.
+
+        EXAMPLES:
+            set_fields_many({123: {"color": "white", "price": 7000}, 456: {"color": "red"}})
+            set_fields_many({"A-1": {"color": "white"}, "A-2": {"notes": ""}}, labels="Car", key_name="vin")
+
+            df = pd.DataFrame({"vin": ["A-1", "A-2"], "price": [7000, 8500]})
+            set_fields_many(df, labels="Car", key_name="vin")
+
+        :param updates:     EITHER a dict whose keys are internal database ID's (or values of the key property),
+                                and whose values are dicts of field name/values for the corresponding node,
+                                with the same conventions as the `set_dict` argument of set_fields();
+                            OR a Pandas dataframe with a column for the key property (or a column named "_internal_id",
+                                if `key_name` is None), and a column for each field to update.
+                                In dataframes, missing values (NaN, None, etc) leave the field untouched.
+                                Note: dataframe columns with datetime values should first be converted
+                                      with pd_datetime_to_neo4j_datetime()
+        :param labels:      [OPTIONAL] String, or list/tuple of strings, with label(s) required on the nodes to update
+        :param key_name:    [OPTIONAL] Name of the property used to locate the nodes; if None, use internal database ID's
+        :param drop_blanks: [OPTIONAL] If True (default), then any blank field is interpreted as a request to drop that property
+                                (as opposed to setting its value to "") - see set_fields()
+        :param batch_size:  [OPTIONAL] Max number of nodes to update with each query.  Default: 10000
+        :param report:      [OPTIONAL] If True, print the progress and throughput of the operation.  Default: False
+
+        :return:            A dict with the following keys:
+                                "rows"              Number of updates submitted (excluding any without fields)
+                                "nodes_updated"     Number of nodes located and updated
+                                "properties_set"    Number of properties set or removed
+        """
+        labels_str = CypherUtils.prepare_labels(labels)     # EXAMPLE: ":`my label`:`my other label`"
+
+        if key_name is None:
+            where = "WHERE id(n) = row.key"
+        else:
+            where = f"WHERE n.`{key_name}` = row.key"
+
+        # Note: in Cypher, SET += with a null value removes the property
+        q = f'''
+            UNWIND $rows AS row
+            MATCH (n {labels_str}) {where}
+            SET n += row.props
+            RETURN count(n) AS nodes_updated
+            '''
+
+        rows = self._set_fields_many_rows(updates, key_name=key_name, drop_blanks=drop_blanks)
+
+        with self._writes_to(None):     # The located nodes might have other labels besides the given ones
+            result = self.run_batched(q, rows, batch_size=batch_size, report=report)
+
+        return {"rows": result["rows"],
+                "nodes_updated": sum(batch["nodes_updated"] for batch in result["returned_data"]),
+                "properties_set": result["counters"].get("properties_set", 0)}
+
+
+
+    @classmethod
+    def _set_fields_many_rows(cls, updates :dict|pd.DataFrame, key_name=None, drop_blanks=True):
+        """
+        Helper function for set_fields_many().
+        Turn the given updates into the rows used by the batched query, skipping the rows without fields
+
+        :param updates:     See set_fields_many()
+        :param key_name:    See set_fields_many()
+        :param drop_blanks: See set_fields_many()
+        :return:            A generator of dicts with keys "key" and "props".
+                                Property values to be dropped are given as None.
+                                EXAMPLE: {"key": 123, "props": {"color": "white", "notes": None}}
+        """
+        def prepare_value(value):
+            if type(value) == str:
+                value = value.strip()               # Zap all leading and trailing blanks
+                if (value == "") and drop_blanks:
+                    return None                     # Request to drop the property
+            return value
+
+
+        if isinstance(updates, pd.DataFrame):
+            key_column = "_internal_id" if key_name is None else key_name
+            assert key_column in updates.columns, \
+                f"set_fields_many(): the dataframe lacks a column named `{key_column}`, to locate the nodes to update"
+
+            for record in cls.df_records(updates):
+                key = record.pop(key_column)
+                props = {field: prepare_value(value) for (field, value) in record.items()
+                         if not cls._is_missing_value(value)}     # Skip missing values
+                if props:
+                    yield {"key": key, "props": props}
+
+        else:
+            assert type(updates) == dict, \
+                f"set_fields_many(): the argument `updates` must be a dict or a Pandas dataframe (type passed: {type(updates)})"
+
+            for (key, set_dict) in updates.items():
+                if set_dict:
+                    yield {"key": key, "props": {field: prepare_value(value) for (field, value) in set_dict.items()}}
 
 
 
@@ -1263,7 +1607,8 @@ class GraphAccess(InterGraph):
 
         :return:    A list of strings
         """
-        results = self.query("call db.relationshipTypes() yield relationshipType return relationshipType")
+        q = "call db.relationshipTypes() yield relationshipType return relationshipType"
+        results = self._cached_read((q, ""), compute=lambda: self.query(q))    # It depends on the entire database
         return [x['relationshipType'] for x in results]
 
 
@@ -1315,7 +1660,8 @@ class GraphAccess(InterGraph):
         # Merge the data-binding dict's
         combined_data_binding = CypherUtils.prepare_data_binding(data_binding_from, data_binding_to)
 
-        result = self.update_query(q, combined_data_binding)
+        with self._writes_to([self._rel_tag(rel_name)]):
+            result = self.update_query(q, combined_data_binding)
 
         number_relationships_added = result.get("relationships_created", 0)   # If field isn't present, return a 0
         if number_relationships_added == 0:       # This could be more than 1: see notes above
@@ -1375,11 +1721,12 @@ class GraphAccess(InterGraph):
 
         q = f'''
             MATCH (from), (to)
-            WHERE id(from) = {match_from} AND id(to) = {match_to}
+            WHERE id(from) = $match_from AND id(to) = $match_to
             MERGE (from) -[:`{rel_name}` {rel_props_cypher}]-> (to)           
             '''
 
-        result = self.update_query(q)
+        with self._writes_to([self._rel_tag(rel_name)]):
+            result = self.update_query(q, {"match_from": match_from, "match_to": match_to})
 
         number_relationships_added = result.get("relationships_created", 0)   # If field isn't present, return a 0
         if number_relationships_added == 0:       # This could be more than 1: see notes above
@@ -1452,7 +1799,8 @@ class GraphAccess(InterGraph):
         combined_data_binding = CypherUtils.prepare_data_binding(data_binding_from, data_binding_to)
 
 
-        result = self.update_query(q, combined_data_binding)
+        with self._writes_to([self._rel_tag(rel_name)]):
+            result = self.update_query(q, combined_data_binding)
 
 
         number_relationships_deleted = result.get("relationships_deleted", 0)   # If field isn't present, return a 0
@@ -1570,7 +1918,8 @@ class GraphAccess(InterGraph):
             '''
 
         data_binding = {"node": node, "old_attachment": old_attachment, "new_attachment": new_attachment}
-        result = self.update_query(q, data_binding=data_binding)
+        with self._writes_to([self._rel_tag(rel_name), self._rel_tag(rel_name_new)]):
+            result = self.update_query(q, data_binding=data_binding)
         #print("result of update_query in reattach_node(): ", result)
 
         assert (result.get("relationships_deleted") == 1), \
@@ -1614,7 +1963,8 @@ class GraphAccess(InterGraph):
         cypher_dict["node_id1"] = node_id1
         cypher_dict["node_id2"] = node_id2
 
-        self.query(q, cypher_dict)
+        with self._writes_to([self._rel_tag(rel)]):
+            self.query(q, cypher_dict)
 
 
 
@@ -1697,6 +2047,25 @@ class GraphAccess(InterGraph):
         # TODO: make `rel_name` optional
         # TODO: add an option to sort by some property of the relationship
 
+        q, data_binding = self._follow_links_query(match, rel_name=rel_name, rel_dir=rel_dir, neighbor_labels=neighbor_labels,
+                                                   include_id=include_id, include_labels=include_labels, limit=limit)
+
+        result = self.query(q, data_binding)        # , single_column='neighbor'
+
+        return self.standardize_recordset(recordset=result)
+
+
+
+    @staticmethod
+    def _follow_links_query(match :int|str|CypherBuilder, rel_name :str, rel_dir ="OUT",
+                            neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> (str, dict):
+        """
+        Helper function for follow_links() and AsyncGraphAccess.follow_links().
+        Assemble the Cypher query to locate the neighbors of the node(s) specified by the match data;
+        for the arguments, see follow_links()
+
+        :return:    The pair (Cypher query string, data-binding dictionary)
+        """
         if limit is not None:
             assert (type(limit) == int) and (limit >= 1), \
                 f"follow_links(): the argument `limit`, if passed, must be an integer >= 1 (value passed: {limit})"
@@ -1725,9 +2094,152 @@ class GraphAccess(InterGraph):
         if limit is not None:
             q += f" LIMIT {limit}"
 
-        result = self.query(q, data_binding)        # , single_column='neighbor'
+        return q, data_binding
+
+
+
+    def follow_links_many(self, internal_ids :[int|str], rel_name :str, rel_dir ="OUT",
+                          neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> dict:
+        """
+        Multi-node version of follow_links():  from EACH of the given starting nodes,
+        follow all the relationships that have the specified name (optionally requiring the neighbor nodes
+        to have the given labels), and return the properties of the located neighbor nodes, grouped by starting node.
+
+        All the work is done with a single database query, regardless of the number of starting nodes -
+        as opposed to calling follow_links() once for each of them.
+
+        EXAMPLE:
+            follow_links_many([318, 3], rel_name="BA_in_category", neighbor_labels="Category")
+            might return:
+                {318: [{'entity_id': '966', 'name': "Deploying VM's on Oracle cloud"}],
+                 3:   []}
+
+        :param internal_ids:    List of the internal database ID's of the starting nodes
+        :param rel_name:        See follow_links()
+        :param rel_dir:         See follow_links()
+        :param neighbor_labels: See follow_links()
+        :param include_id:      See follow_links()
+        :param include_labels:  See follow_links()
+        :param limit:           [OPTIONAL] The max number of neighbors to return for EACH starting node;
+                                    by default 100
+        :return:                A dict whose keys are the given internal database ID's, and whose values are
+                                    (possibly empty) lists of dictionaries, in the format returned by follow_links().
+                                    Starting nodes that don't exist in the database are given an empty list
+        """
+        q, data_binding = self._follow_links_many_query(internal_ids, rel_name=rel_name, rel_dir=rel_dir,
+                                                        neighbor_labels=neighbor_labels, include_id=include_id,
+                                                        include_labels=include_labels, limit=limit)
+
+        result = self.query(q, data_binding)
+
+        return self._group_by_source(internal_ids, result)
+
+
+
+    @staticmethod
+    def _follow_links_many_query(internal_ids :[int|str], rel_name :str, rel_dir ="OUT",
+                                 neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> (str, dict):
+        """
+        Helper function for follow_links_many() and AsyncGraphAccess.follow_links_many().
+        Assemble the Cypher query to locate the neighbors of each of the given nodes;
+        for the arguments, see follow_links_many()
+
+        :return:    The pair (Cypher query string, data-binding dictionary)
+        """
+        assert type(internal_ids) == list, \
+            f"follow_links_many(): the argument `internal_ids` must be a list (type passed: {type(internal_ids)})"
+
+        if limit is not None:
+            assert (type(limit) == int) and (limit >= 1), \
+                f"follow_links_many(): the argument `limit`, if passed, must be an integer >= 1 (value passed: {limit})"
+
+        neighbor_labels_str = CypherUtils.prepare_labels(neighbor_labels)     # EXAMPLE:  ":`CAR`:`INVENTORY`"
+
+        if rel_dir == "OUT":    # Follow outbound links
+            pattern = f"(n) - [:{rel_name}] -> (neighbor {neighbor_labels_str})"
+        elif rel_dir == "IN":   # Follow inbound links
+            pattern = f"(n) <- [:{rel_name}] - (neighbor {neighbor_labels_str})"
+        else:                   # Follow links in BOTH directions
+            pattern = f"(n) - [:{rel_name}] - (neighbor {neighbor_labels_str})"
+
+        projection = "neighbor {.*"       # Map projection with all the properties of the neighbor node
+        if include_id:
+            projection += ", _internal_id: id(neighbor)"
+        if include_labels:
+            projection += ", _node_labels: labels(neighbor)"
+        projection += "}"
+
+        # A pattern comprehension collects the neighbors of each starting node (possibly none)
+        neighbors = f"[{pattern} | {projection}]"
+        if limit is not None:
+            neighbors += f"[..{limit}]"     # List slice
+
+        q = f'''
+            MATCH (n) WHERE id(n) IN $internal_ids
+            RETURN id(n) AS _source_id, {neighbors} AS _records
+            '''
+
+        return q, {"internal_ids": GraphAccess._normalize_internal_ids(internal_ids)}
+
+
+
+    def _group_by_source(self, internal_ids :[int|str], result :[dict]) -> dict:
+        """
+        Helper function for follow_links_many() and AsyncGraphAccess.follow_links_many().
+        Turn the result of the query assembled by _follow_links_many_query() into a dict indexed by starting node
+
+        :param internal_ids:    List of the internal database ID's of the starting nodes
+        :param result:          List of dicts with keys "_source_id" and "_records"
+        :return:                A dict whose keys are the given internal database ID's,
+                                    and whose values are lists of (standardized) records
+        """
+        given_ids = GraphAccess._given_ids_by_normalized_id(internal_ids)    # To map back the ID's in the result
+
+        grouped = {internal_id: [] for internal_id in internal_ids}
+        for row in result:
+            for internal_id in given_ids[row["_source_id"]]:
+                grouped[internal_id] = self.standardize_recordset(recordset=row["_records"], already_flat=True)
+
+        return grouped
+
+
+
+    @staticmethod
+    def _normalize_internal_ids(internal_ids :[int|str]) -> [int|str]:
+        """
+        Helper function for the multi-node methods, such as follow_links_many() and get_parents_and_children_many().
+        Turn any string of digits into the integer that the Cypher function id() returns for that node,
+        so that the database can match it;  all other values are left unchanged
+
+        EXAMPLE:  [318, "3", "4:a1b2:5"]  becomes  [318, 3, "4:a1b2:5"]
+
+        :param internal_ids:    List of the internal database ID's of some nodes
+        :return:                A new list of the same length, with the normalized ID's
+        """
+        return [int(internal_id) if (type(internal_id) == str) and internal_id.isdigit() else internal_id
+                for internal_id in internal_ids]
+
 
-        return self.standardize_recordset(recordset=result)
+
+    @staticmethod
+    def _given_ids_by_normalized_id(internal_ids :[int|str]) -> dict:
+        """
+        Helper function for the multi-node methods, to map the ID's returned by the database back to the given ones.
+        The same node might have been given more than once, in different forms (such as 3 and "3")
+
+        EXAMPLE:  [3, "4", "3"]  gives  {3: [3, "3"], 4: ["4"]}
+
+        :param internal_ids:    List of the internal database ID's of some nodes
+        :return:                A dict whose keys are the normalized ID's (see _normalize_internal_ids),
+                                    and whose values are lists of the given ID's that correspond to them
+        """
+        given_ids = {}
+        for (normalized_id, internal_id) in zip(GraphAccess._normalize_internal_ids(internal_ids), internal_ids):
+            given_ids.setdefault(normalized_id, [])
+            if internal_id not in given_ids[normalized_id]:
+                given_ids[normalized_id].append(internal_id)
+
+        return given_ids
 
 
 
@@ -1806,6 +2318,21 @@ class GraphAccess(InterGraph):
         #TODO: make argument 'rel_name' optional
         #match_structure = CypherUtils.process_match_structure(match, caller_method="count_links")
 
+        q, data_binding = self._count_links_query(match, rel_name=rel_name, rel_dir=rel_dir, neighbor_labels=neighbor_labels)
+
+        return self.query(q, data_binding, single_cell="link_count")
+
+
+
+    @staticmethod
+    def _count_links_query(match :int|CypherBuilder, rel_name: str, rel_dir="OUT", neighbor_labels = None) -> (str, dict):
+        """
+        Helper function for count_links() and AsyncGraphAccess.count_links().
+        Assemble the Cypher query to count the links of the node(s) specified by the match data;
+        for the arguments, see count_links()
+
+        :return:    The pair (Cypher query string, data-binding dictionary)
+        """
         # Unpack needed values from the match dictionary
         (node, where, data_binding, _) = CypherUtils.assemble_cypher_blocks(match, caller_method="count_links")
 
@@ -1822,7 +2349,7 @@ class GraphAccess(InterGraph):
 
         q += CypherUtils.prepare_where(where) + " RETURN count(neighbor) AS link_count"
 
-        return self.query(q, data_binding, single_cell="link_count")
+        return q, data_binding
 
 
 
@@ -1838,21 +2365,17 @@ class GraphAccess(InterGraph):
                                 {'_internal_id': 163, 'labels': ['Car'], 'rel': 'OWNS'}
         """
         # TODO: allow specifying a relationship name to follow
-        # Fetch the parents
-        cypher = f"MATCH (parent)-[inbound]->(n) WHERE id(n) = {internal_id} " \
-                 "RETURN id(parent) AS _internal_id, labels(parent) AS labels, type(inbound) AS rel"
+        (parents_query, children_query) = self._parents_and_children_queries(internal_id)
 
-        parent_list = self.query(cypher)
+        # Fetch the parents
+        parent_list = self.query(parents_query)
         # EXAMPLE of parent_list:
         #       [{'_internal_id': 163, 'labels': ['Subject'], 'rel': 'HAS_TREATMENT'},
         #        {'_internal_id': 150, 'labels': ['Subject'], 'rel': 'HAS_TREATMENT'}]
 
 
         # Fetch the children
-        cypher = f"MATCH (n)-[outbound]->(child) WHERE id(n) = {internal_id} " \
-                 "RETURN id(child) AS _internal_id, labels(child) AS labels, type(outbound) AS rel"
-
-        child_list = self.query(cypher)
+        child_list = self.query(children_query)
         # EXAMPLE of child_list:
         #       [{'_internal_id': 107, 'labels': ['Source Data Row'], 'rel': 'FROM_DATA'},
         #        {'_internal_id': 103, 'labels': ['Source Data Row'], 'rel': 'FROM_DATA'}]
@@ -1862,6 +2385,92 @@ class GraphAccess(InterGraph):
 
 
 
+    @staticmethod
+    def _parents_and_children_queries(internal_id :str|int) -> (str, str):
+        """
+        Helper function for get_parents_and_children() and AsyncGraphAccess.get_parents_and_children().
+        Assemble the Cypher queries to fetch the parents and the children of the given node
+
+        :param internal_id: The internal database ID of the node of interest
+        :return:            The pair (Cypher query for the parents, Cypher query for the children)
+        """
+        parents_query = f"MATCH (parent)-[inbound]->(n) WHERE id(n) = {internal_id} " \
+                        "RETURN id(parent) AS _internal_id, labels(parent) AS labels, type(inbound) AS rel"
+
+        children_query = f"MATCH (n)-[outbound]->(child) WHERE id(n) = {internal_id} " \
+                         "RETURN id(child) AS _internal_id, labels(child) AS labels, type(outbound) AS rel"
+
+        return (parents_query, children_query)
+
+
+
+    def get_parents_and_children_many(self, internal_ids :[int|str]) -> dict:
+        """
+        Multi-node version of get_parents_and_children(): fetch the parents and the children of EACH of the given nodes,
+        with a single database query (regardless of the number of nodes)
+
+        :param internal_ids:    List of the internal database ID's of the nodes of interest
+        :return:                A dict whose keys are the given internal database ID's, and whose values are
+                                    pairs (parent_list, child_list) in the format returned by get_parents_and_children().
+                                    Nodes that don't exist in the database are given a pair of empty lists
+                                    EXAMPLE:  {163: ([{'_internal_id': 150, 'labels': ['Subject'], 'rel': 'HAS_TREATMENT'}],
+                                                     [{'_internal_id': 107, 'labels': ['Source Data Row'], 'rel': 'FROM_DATA'}])
+                                              }
+        """
+        q, data_binding = self._parents_and_children_many_query(internal_ids)
+
+        result = self.query(q, data_binding)
+
+        return self._group_parents_and_children(internal_ids, result)
+
+
+
+    @staticmethod
+    def _parents_and_children_many_query(internal_ids :[int|str]) -> (str, dict):
+        """
+        Helper function for get_parents_and_children_many() and AsyncGraphAccess.get_parents_and_children_many().
+        Assemble the Cypher query to fetch the parents and the children of each of the given nodes
+
+        :param internal_ids:    List of the internal database ID's of the nodes of interest
+        :return:                The pair (Cypher query string, data-binding dictionary)
+        """
+        assert type(internal_ids) == list, \
+            f"get_parents_and_children_many(): the argument `internal_ids` must be a list (type passed: {type(internal_ids)})"
+
+        # Pattern comprehensions collect the parents and the children of each node (possibly none)
+        q = '''
+            MATCH (n) WHERE id(n) IN $internal_ids
+            RETURN id(n) AS _internal_id,
+                   [(parent)-[inbound]->(n) | {_internal_id: id(parent), labels: labels(parent), rel: type(inbound)}] AS parents,
+                   [(n)-[outbound]->(child) | {_internal_id: id(child), labels: labels(child), rel: type(outbound)}] AS children
+            '''
+
+        return q, {"internal_ids": GraphAccess._normalize_internal_ids(internal_ids)}
+
+
+
+    @staticmethod
+    def _group_parents_and_children(internal_ids :[int|str], result :[dict]) -> dict:
+        """
+        Helper function for get_parents_and_children_many() and AsyncGraphAccess.get_parents_and_children_many().
+        Turn the result of the query assembled by _parents_and_children_many_query() into a dict indexed by node
+
+        :param internal_ids:    List of the internal database ID's of the nodes of interest
+        :param result:          List of dicts with keys "_internal_id", "parents" and "children"
+        :return:                A dict whose keys are the given internal database ID's,
+                                    and whose values are pairs (parent_list, child_list)
+        """
+        given_ids = GraphAccess._given_ids_by_normalized_id(internal_ids)    # To map back the ID's in the result
+
+        grouped = {internal_id: ([], []) for internal_id in internal_ids}
+        for row in result:
+            for internal_id in given_ids[row["_internal_id"]]:
+                grouped[internal_id] = (list(row["parents"]), list(row["children"]))
+
+        return grouped
+
+
+
     def get_siblings(self, internal_id :str|int, rel_name: str, rel_dir="OUT", order_by=None) -> [int]:
         """
         Return the data of all the "sibling" nodes of the given one.
@@ -2087,28 +2696,284 @@ class GraphAccess(InterGraph):
 
     #####################################################################################################
 
-    '''                              ~   READ IN from PANDAS   ~                                      '''
+    '''                                      ~   BATCHED WRITES   ~                                      '''
 
-    def ________READ_IN_PANDAS________(DIVIDER):
+    def ________BATCHED_WRITES________(DIVIDER):
         pass        # Used to get a better structure view in IDEs
     #####################################################################################################
 
-    def load_pandas(self,
-            df :Union[pd.DataFrame, pd.Series], labels :Union[str, List[str], Tuple[str]],
-            merge_primary_key=None, merge_overwrite=False,
-            rename=None, ignore_nan=True, max_chunk_size=10000) -> [int]:
-        """
-        Load a Pandas Data Frame (or Series) into Neo4j.
-        Each row is loaded as a separate node.
+    _CONFLICTING_CLAUSES = re.compile(r"\b(MERGE|DELETE|DETACH|REMOVE|FOREACH|CALL|LOAD)\b", re.IGNORECASE)
+                                            # Clauses whose batches may lock (or duplicate) the same nodes if run concurrently
 
-        Columns whose dtype is integer will appear as integer data types in the Neo4j nodes
-            (however, if a NaN is present in a Pandas column, it'll automatically be transformed to float)
 
-        Any Pandas' datetime values get converted to Neo4j's format.
+    @classmethod
+    def is_create_only_query(cls, q :str) -> bool:
+        """
+        Determine whether the given Cypher query only writes by creating new nodes
+        (possibly setting their properties), so that different batches of it can safely be run concurrently,
+        without competing for the locks of the same nodes.
+        Relationships are not regarded as safe, since their creation locks the (existing) nodes at their ends.
 
-        Database indexes are added as needed, if the "merge_primary_key" argument is used.
+        EXAMPLES:   "UNWIND $rows AS record CREATE (n :Car) SET n = record"        -> True
+                    "UNWIND $rows AS record MERGE (n :Car {vin: record.vin})"      -> False
+                    "UNWIND $rows AS r MATCH (a {id: r.a}), (b {id: r.b}) CREATE (a)-[:LINK]->(b)"  -> False
 
-        TODO: maybe save the Panda data frame's row number as an attribute of the Neo4j nodes, to ALWAYS have a primary key
+        :param q:   A string with a Cypher query
+        :return:    True if the query is known to be a CREATE-only one; False otherwise
+        """
+        if not re.search(r"\bCREATE\b", q, re.IGNORECASE):
+            return False
+
+        if cls._CONFLICTING_CLAUSES.search(q):
+            return False
+
+        if re.search(r"\bCREATE\b[^;]*(-\[|\]-)", q, re.IGNORECASE | re.DOTALL):
+            return False    # Relationships get created
+
+        return True
+
+
+
+    def run_batched(self, q :str, rows, batch_size=1000, data_binding=None,
+                    workers=1, parallel=None, start_batch=0, skip_batches=None,
+                    report=True, report_frequency=1, on_batch=None) -> dict:
+        """
+        Run a Cypher query repeatedly, on consecutive batches of rows taken from the given iterable
+        (which is consumed lazily, one batch at a time - so that it can be a generator of arbitrary length.)
+        In the query, the current batch is available as the list $rows ; typically, the query starts with UNWIND $rows
+
+        Batches of CREATE-only queries (see is_create_only_query) can be run concurrently by multiple threads,
+        each with its own database session; all other queries are always run one batch at a time.
+
+        If a batch fails, an Exception is raised, whose message reports the values of the `start_batch`
+        and `skip_batches` arguments to use in a new call with the same rows, to resume the operation:
+        all the batches before `start_batch` were completed, and so were the ones in `skip_batches`
+        (when running batches concurrently, some of the batches after the failed one may have been completed
+        by the time the failure is detected.)
+        The failure, and the values to resume with, are also available as the attributes
+        `failed_batch`, `start_batch` and `skip_batches` of the Exception object
+
+        EXAMPLE:
+            rows = ({"vin": i, "year": 2000 + i % 20} for i in range(20_000_000))
+            run_batched("UNWIND $rows AS record CREATE (n :Car) SET n = record", rows, batch_size=10000, workers=4)
+
+        :param q:               A string with a Cypher query that makes use of the parameter $rows
+        :param rows:            Any iterable (list, generator, etc.), typically of dictionaries
+        :param batch_size:      [OPTIONAL] Max number of rows in each batch.  Default: 1000
+        :param data_binding:    [OPTIONAL] A Cypher dictionary with any parameters needed by the query,
+                                    besides $rows ; it's used for all the batches
+        :param workers:         [OPTIONAL] Max number of batches to run concurrently.  Default: 1 (no concurrency)
+        :param parallel:        [OPTIONAL] If None (default), batches may be run concurrently only if the query
+                                    is a CREATE-only one; use True or False to override that determination.
+                                    Note: no concurrency takes place inside a transaction() block
+        :param start_batch:     [OPTIONAL] Zero-based number of the first batch to run; the rows of the earlier batches
+                                    are skipped.  Used to resume an interrupted operation.  Default: 0
+        :param skip_batches:    [OPTIONAL] Collection of the numbers of other batches (after `start_batch`) to skip,
+                                    because they were already completed.  Used to resume an interrupted operation
+        :param report:          [OPTIONAL] If True (default), print the progress and throughput of the operation
+        :param report_frequency: [OPTIONAL] Only applicable if report is True;
+                                    how often (in terms of number of batches) to print out the progress
+        :param on_batch:        [OPTIONAL] Function invoked (in the calling thread) upon the completion of each batch,
+                                    with 3 arguments: the batch number, the list of its rows, and the dict returned
+                                    by update_query() for it; if it raises an Exception, the operation stops
+                                    (with that batch regarded as completed)
+
+        :return:                A dict with the following keys:
+                                    "batches"       Number of batches run
+                                    "rows"          Number of rows in those batches
+                                    "counters"      Dict with the totals of the stats returned by update_query(),
+                                                        such as 'nodes_created'
+                                    "returned_data" List with the data returned by the query (if any) for all the
+                                                        batches, in the order of the batches
+                                    "next_batch"    Number of the batch following the last one that was run
+                                                        (or skipped)
+                                    "elapsed"       Number of seconds spent
+        """
+        assert (type(batch_size) == int) and (batch_size >= 1), \
+            f"run_batched(): the argument `batch_size` must be an integer >= 1 (value passed: {batch_size})"
+        assert (type(workers) == int) and (workers >= 1), \
+            f"run_batched(): the argument `workers` must be an integer >= 1 (value passed: {workers})"
+        assert (type(start_batch) == int) and (start_batch >= 0), \
+            f"run_batched(): the argument `start_batch` must be an integer >= 0 (value passed: {start_batch})"
+
+        skip_batches = set(skip_batches or [])
+
+        if parallel is None:
+            parallel = self.is_create_only_query(q)
+
+        if workers > 1 and not (parallel and not self.in_transaction()):
+            if report:
+                print("run_batched(): the batches will be run one at a time, "
+                      "since they might conflict with one another if run concurrently")
+            workers = 1
+
+        start_time = time.perf_counter()
+
+        batch_results = {}          # The dicts returned by update_query(), indexed by batch number
+        counters = {}               # Running totals of the numeric stats returned by update_query()
+        number_rows = 0
+        failure = None              # Pair (batch number, Exception) of the first failed batch, if any
+
+        def run_batch(batch :list) -> dict:
+            batch_binding = dict(data_binding) if data_binding else {}
+            batch_binding["rows"] = batch
+            return self.update_query(q, batch_binding)
+
+        def complete_batch(batch_number :int, batch :list, result :dict) -> None:
+            nonlocal number_rows
+            number_rows += len(batch)
+            for k, v in result.items():
+                if type(v) == int:      # Note: this excludes booleans
+                    counters[k] = counters.get(k, 0) + v
+            batch_results[batch_number] = result.get("returned_data", [])
+
+            if report and (len(batch_results) % report_frequency == 0):
+                elapsed = time.perf_counter() - start_time
+                print(f"   Completed batch # {batch_number} : a grand total of {number_rows:,} row(s) "
+                      f"in {elapsed:.1f} sec ({number_rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+            if on_batch is not None:
+                on_batch(batch_number, batch, result)
+
+
+        # Lazily split the rows into numbered batches, skipping the ones before start_batch, and the ones in skip_batches
+        batches = enumerate(self._chunked(rows, batch_size))
+        batches = ((batch_number, batch) for (batch_number, batch) in batches
+                   if (batch_number >= start_batch) and (batch_number not in skip_batches))
+
+        if workers == 1:
+            for (batch_number, batch) in batches:
+                try:
+                    result = run_batch(batch)
+                except Exception as ex:
+                    failure = (batch_number, ex)
+                    break
+                complete_batch(batch_number, batch, result)     # An Exception here ends the whole operation
+
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = {}    # The batches being run, indexed by their Future objects
+                for (batch_number, batch) in batches:
+                    pending[executor.submit(run_batch, batch)] = (batch_number, batch)
+                    if len(pending) < 2 * workers:
+                        continue    # Keep a few batches in the queue, but don't read ahead any further
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        (done_number, done_batch) = pending.pop(future)
+                        if future.exception() is not None:
+                            if (failure is None) or (done_number < failure[0]):
+                                failure = (done_number, future.exception())
+                        else:
+                            complete_batch(done_number, done_batch, future.result())
+                    if failure:
+                        break
+
+                # Let the batches still in progress finish
+                for future in list(pending):
+                    (done_number, done_batch) = pending.pop(future)
+                    if future.exception() is not None:
+                        if (failure is None) or (done_number < failure[0]):
+                            failure = (done_number, future.exception())
+                    else:
+                        complete_batch(done_number, done_batch, future.result())
+
+
+        # Determine where a new run would need to resume from
+        completed = skip_batches.union(batch_results)
+        next_batch = start_batch
+        while next_batch in completed:
+            next_batch += 1
+
+        if failure:
+            (batch_number, ex) = failure
+            completed_later = sorted(n for n in completed if n > next_batch)    # Completed batches after the gap
+            resume_args = f"start_batch={next_batch}"
+            if completed_later:
+                resume_args += f", skip_batches={completed_later}"
+            error = Exception(f"run_batched(): batch # {batch_number} failed.  "
+                              f"To resume the operation, use {resume_args} .  Details: {ex}")
+            error.failed_batch = batch_number
+            error.start_batch = next_batch
+            error.skip_batches = completed_later
+            raise error from ex
+
+        elapsed = time.perf_counter() - start_time
+        if report:
+            print(f"    FINISHED running {len(batch_results)} batch(es), with a total of {number_rows:,} row(s), "
+                  f"in {elapsed:.1f} sec")
+
+        returned_data = []
+        for batch_number in sorted(batch_results):
+            returned_data += batch_results[batch_number]
+
+        return {"batches": len(batch_results),
+                "rows": number_rows,
+                "counters": counters,
+                "returned_data": returned_data,
+                "next_batch": next_batch,
+                "elapsed": elapsed}
+
+
+
+    @staticmethod
+    def df_records(df :pd.DataFrame, chunk_size=10000):
+        """
+        Yield the rows of the given Pandas dataframe as dictionaries,
+        converting just a chunk of rows at a time (rather than all of them at once)
+
+        EXAMPLE:    run_batched("UNWIND $rows AS record CREATE (n :Car) SET n = record", rows=df_records(df))
+
+        :param df:          A Pandas dataframe
+        :param chunk_size:  [OPTIONAL] Number of rows to convert at a time.  Default: 10000
+        :return:            A generator of dictionaries, with the column names as keys.
+                                EXAMPLE: {'col1': 1, 'col2': 0.5}
+        """
+        for row_start in range(0, len(df), chunk_size):
+            yield from df.iloc[row_start : row_start + chunk_size].to_dict(orient="records")
+
+
+
+    @staticmethod
+    def _is_missing_value(value) -> bool:
+        """
+        Determine whether the given value, as obtained from a Pandas dataframe, represents a missing value
+
+        :param value:   Any value
+        :return:        True if the value is None, NaN, NaT or pd.NA;  False otherwise
+        """
+        return (value is None) or (value is pd.NaT) or (value is pd.NA) \
+                or (type(value) == float and math.isnan(value))
+
+
+
+
+
+
+    #####################################################################################################
+
+    '''                              ~   READ IN from PANDAS   ~                                      '''
+
+    def ________READ_IN_PANDAS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def load_pandas(self,
+            df :Union[pd.DataFrame, pd.Series], labels :Union[str, List[str], Tuple[str]],
+            merge_primary_key=None, merge_overwrite=False,
+            rename=None, ignore_nan=True, max_chunk_size=10000, workers=1) -> [int]:
+        """
+        Load a Pandas Data Frame (or Series) into Neo4j.
+        Each row is loaded as a separate node.
+
+        Columns whose dtype is integer will appear as integer data types in the Neo4j nodes
+            (however, if a NaN is present in a Pandas column, it'll automatically be transformed to float)
+
+        Any Pandas' datetime values get converted to Neo4j's format.
+
+        Database indexes are added as needed, if the "merge_primary_key" argument is used.
+
+        TODO: maybe save the Panda data frame's row number as an attribute of the Neo4j nodes, to ALWAYS have a primary key
               maybe allow a bulk auto-increment field
               maybe allow to link all nodes to a given existing one
 
@@ -2135,6 +3000,8 @@ class GraphAccess(InterGraph):
                                     (Note: the moment a NaN is present, columns of integers in a dataframe
                                            will automatically become floats)
         :param max_chunk_size:  To limit the number of Pandas rows loaded into the database at one time
+        :param workers:         [OPTIONAL] Max number of batches to load concurrently;
+                                    only applicable if "merge_primary_key" isn't used - see run_batched()
 
         :return:                A (possibly-empty) list of the internal database ID's of the created nodes
         """
@@ -2160,16 +3027,14 @@ class GraphAccess(InterGraph):
         # Process the primary keys, if any
         primary_key_s = ''
         if merge_primary_key is not None:
-            neo_indexes = self.get_indexes()
-            if f"{labels}.{merge_primary_key}" not in list(neo_indexes['name']):
-                # Create a new database index
-                if type(labels) == str:
-                    index_label = labels
-                else:
-                    index_label = labels[0]     # In case of multiple labels, take the first
+            if type(labels) == str:
+                index_label = labels
+            else:
+                index_label = labels[0]     # In case of multiple labels, take the first
 
-                self.create_index(index_label, merge_primary_key)
-                time.sleep(1)   # Used to give Neo4j time to populate the index
+            # Make sure that the MERGE operations can locate the nodes by means of an index;
+            # if a new index needs to be created, wait for it to be populated
+            self.ensure_index(label=index_label, key=merge_primary_key)
 
             primary_key_s = ' {' + f'`{merge_primary_key}`:record[\'{merge_primary_key}\']' + '}'
             # EXAMPLE of primary_key_s , assuming that the argument `merge_primary_key` is "patient_id":
@@ -2201,46 +3066,211 @@ class GraphAccess(InterGraph):
         cypher_labels = CypherUtils.prepare_labels(labels)
 
 
-        res = []                                                # Running list of the internal database ID's of the created nodes
+        if numeric_columns:
+            q = f'''
+                UNWIND $rows AS record 
+                WITH record, [key in $numeric_columns WHERE toString(record[key]) = 'NaN'] as exclude_keys
+                {op} (n {cypher_labels}{primary_key_s}) 
+                SET n {set_operator}= apoc.map.removeKeys(record, exclude_keys)
+                RETURN id(n) as node_id 
+                '''
+            cypher_dict = {'numeric_columns': numeric_columns}
+        else:
+            q = f'''
+                UNWIND $rows AS record 
+                {op} (n {cypher_labels}{primary_key_s}) 
+                SET n {set_operator}= record 
+                RETURN id(n) as node_id 
+                '''
+            cypher_dict = {}
+
+        # Load the rows in batches; each row is turned into a dict such as {'col1': 1, 'col2': 0.5}
+        result = self.run_batched(q, rows=self.df_records(df, chunk_size=max_chunk_size), batch_size=max_chunk_size,
+                                  data_binding=cypher_dict, workers=workers, report=False)
+
+        return [item["node_id"] for item in result["returned_data"]]    # A (possibly empty) list of internal ID's
+
 
-        # Determine the number of needed batches (always at least 1)
-        number_batches = math.ceil(len(df) / max_chunk_size)    # Note that if the max_chunk_size equals the size of df
-                                                                # then we'll just use 1 batch
 
-        batch_list = np.array_split(df, number_batches)         # List of Pandas Data Frames, each resulting from split of original Data Frame
-                                                                # from groups of rows
+    def load_links(self, df :pd.DataFrame, from_key :str|None, to_key :str|None, rel_name :str,
+                   rel_props_cols=None, key_labels=None, from_column=None, to_column=None,
+                   merge=True, batch_size=10000, workers=1, report=False) -> dict:
+        """
+        Bulk-load relationships among EXISTING nodes, from an edge list in a Pandas dataframe:
+        each row identifies a "from" node and a "to" node, and gives rise to a link between them.
+        The endpoints are located either by their internal database ID's or by a key property (ideally, indexed),
+        and the links are added in batches, with UNWIND queries.
+        Rows whose endpoints cannot be located are skipped, and reported in the returned value.
+
+        If workers > 1, the rows are partitioned into a grid of (workers x workers) buckets,
+        by hashing the values that locate their "from" and "to" nodes;
+        the buckets are then loaded in rounds of `workers` buckets at a time, picked so that no two of them
+        share any "from" value, nor any "to" value - so that concurrent batches never compete for the locks
+        of the same nodes.  (This assumes that different values never locate the same node,
+        and that no node can be located both as a "from" and as a "to" node.)
+        If the same nodes might be at either end of the links - i.e. if they're located by their internal database ID's
+        on both sides, or by the same key on both sides, without two distinct labels - a node could be
+        the "to" node of a bucket and the "from" node of another one in the same round;
+        in that case, the batches are run one at a time
 
-        for df_chunk in batch_list:         # Split the import operation into batches
-            # df_chunk is a Pandas Data Frame, with the same columns, but fewer rows, as the original df
-            record_list = df_chunk.to_dict(orient='records')    # List of dicts; each dict contains the data for 1 row
-                                                                # EXAMPLE: [{'col1': 1, 'col2': 0.5}, {'col1': 2, 'col2': 0.75}]
+        EXAMPLE:
+            df = pd.DataFrame({"person_id": [1, 1, 2], "vin": ["A-1", "B-7", "C-3"], "since": [2020, 2021, 2022]})
+            load_links(df, from_key="person_id", to_key="vin", rel_name="OWNS", rel_props_cols="since",
+                       key_labels=("Person", "Car"))
+
+        :param df:              A Pandas dataframe with one row for each link to add
+        :param from_key:        Name of the node property used to locate the nodes from which the links originate;
+                                    if None, internal database ID's are used
+        :param to_key:          Name of the node property used to locate the nodes into which the links terminate;
+                                    if None, internal database ID's are used
+        :param rel_name:        The name to give to the new relationships.  Blanks allowed
+        :param rel_props_cols:  [OPTIONAL] Name, or list of names, of the dataframe columns whose values are to be stored
+                                    as properties of the new relationships.  Missing values are skipped
+        :param key_labels:      [OPTIONAL] A label to use for the nodes at both ends, or a pair (from_label, to_label),
+                                    either of which may be None.  Used to restrict the matches, and to make use of indexes:
+                                    an index is created as needed on any key property used along with a label
+        :param from_column:     [OPTIONAL] Name of the dataframe column with the values that locate the "from" nodes;
+                                    by default, the same as `from_key` (it's required if `from_key` is None)
+        :param to_column:       [OPTIONAL] Name of the dataframe column with the values that locate the "to" nodes;
+                                    by default, the same as `to_key` (it's required if `to_key` is None)
+        :param merge:           [OPTIONAL] If True (default), links already present aren't duplicated (MERGE);
+                                    if False, new links are always created (CREATE), which is faster
+        :param batch_size:      [OPTIONAL] Max number of rows to process with each query.  Default: 10000
+        :param workers:         [OPTIONAL] Max number of batches to run concurrently.  Default: 1 (no concurrency)
+                                    Note: no concurrency takes place inside a transaction() block,
+                                          nor when the same nodes might be at either end of the links (see above)
+        :param report:          [OPTIONAL] If True, print the progress and throughput of the operation.  Default: False
+
+        :return:                A dict with the following keys:
+                                    "rows"              Number of rows in the dataframe
+                                    "links_created"     Number of new relationships
+                                    "properties_set"    Number of relationship properties that were set
+                                    "unmatched"         List of the (zero-based) positions, in the dataframe,
+                                                            of the rows whose "from" or "to" node couldn't be located
+                                    "elapsed"           Number of seconds spent
+        """
+        from_column = from_key if from_column is None else from_column
+        to_column = to_key if to_column is None else to_column
+        assert (from_column is not None) and (to_column is not None), \
+            "load_links(): when locating nodes by their internal database ID's, " \
+            "the arguments `from_column` and/or `to_column` must be given"
+
+        if rel_props_cols is None:
+            rel_props_cols = []
+        elif type(rel_props_cols) == str:
+            rel_props_cols = [rel_props_cols]
+
+        for column in [from_column, to_column] + rel_props_cols:
+            assert column in df.columns, f"load_links(): the dataframe lacks a column named `{column}`"
+
+        if (key_labels is None) or (type(key_labels) == str):
+            (from_label, to_label) = (key_labels, key_labels)
+        else:
+            assert len(key_labels) == 2, \
+                "load_links(): the argument `key_labels`, if a list or tuple, must be a pair (from_label, to_label)"
+            (from_label, to_label) = key_labels
+
+        assert (type(workers) == int) and (workers >= 1), \
+            f"load_links(): the argument `workers` must be an integer >= 1 (value passed: {workers})"
+
+        # Determine whether the same nodes might be located both as "from" and as "to" nodes,
+        # in which case the partitioning cannot keep concurrent batches from locking the same nodes
+        self_referencing = (from_key == to_key) and \
+                           ((from_key is None) or (from_label is None) or (to_label is None) or (from_label == to_label))
+        if (workers > 1) and self_referencing:
+            if report:
+                print("load_links(): the batches will be run one at a time, since the same nodes "
+                      "might be at either end of the links")
+            workers = 1
+
+        # Make sure that the nodes located by key property can be found by means of an index
+        for (label, key) in [(from_label, from_key), (to_label, to_key)]:
+            if label and (key is not None):
+                self.ensure_index(label=label, key=key)
+
+
+        def endpoint_clause(node_name :str, label, key, row_field :str) -> str:
+            # EXAMPLES:  "MATCH (from :`Person`) WHERE from.`person_id` = row.a"
+            #            "MATCH (to) WHERE id(to) = row.b"
+            lookup = f"id({node_name})" if key is None else f"{node_name}.`{key}`"
+            return f"MATCH ({node_name} {CypherUtils.prepare_labels(label)}) WHERE {lookup} = row.{row_field}"
+
+        op = "MERGE" if merge else "CREATE"
+        q = f'''
+            UNWIND $rows AS row
+            {endpoint_clause("from", from_label, from_key, "a")}
+            {endpoint_clause("to", to_label, to_key, "b")}
+            {op} (from) -[r:`{rel_name}`]-> (to)
+            SET r += row.props
+            RETURN DISTINCT row.i AS i
+            '''
 
-            if numeric_columns:
-                q = f'''
-                    WITH $data AS data 
-                    UNWIND data AS record 
-                    WITH record, [key in $numeric_columns WHERE toString(record[key]) = 'NaN'] as exclude_keys
-                    {op} (n {cypher_labels}{primary_key_s}) 
-                    SET n {set_operator}= apoc.map.removeKeys(record, exclude_keys)
-                    RETURN id(n) as node_id 
-                    '''
-                cypher_dict = {'data': record_list, 'numeric_columns': numeric_columns}
+        # Turn the dataframe into rows such as {"i": 0, "a": 1, "b": "A-1", "props": {"since": 2020}} ,
+        # skipping any row with a missing endpoint value
+        df = self.pd_datetime_to_neo4j_datetime(df[[from_column, to_column] + rel_props_cols])
+        rows = []
+        for (i, record) in enumerate(self.df_records(df)):
+            (a, b) = (record[from_column], record[to_column])
+            if self._is_missing_value(a) or self._is_missing_value(b):
+                continue
+            props = {name: record[name] for name in rel_props_cols if not self._is_missing_value(record[name])}
+            rows.append({"i": i, "a": a, "b": b, "props": props})
+
+        start_time = time.perf_counter()
+
+        with self._writes_to([self._rel_tag(rel_name)]):
+            if (workers == 1) or self.in_transaction():
+                results = [self.run_batched(q, rows, batch_size=batch_size, parallel=False, report=report)]
             else:
-                q = f'''
-                    WITH $data AS data 
-                    UNWIND data AS record 
-                    {op} (n {cypher_labels}{primary_key_s}) 
-                    SET n {set_operator}= record 
-                    RETURN id(n) as node_id 
-                    '''
-                cypher_dict = {'data':record_list}
+                results = self._load_links_partitioned(q, rows, batch_size=batch_size, workers=workers, report=report)
 
+        matched = {item["i"] for result in results for item in result["returned_data"]}
+        elapsed = time.perf_counter() - start_time
 
-            res_chunk = self.query(q, cypher_dict, single_column="node_id")     # A (possibly empty) list of internal ID's
-            res += res_chunk
-        # END for loop
+        return {"rows": len(df),
+                "links_created": sum(result["counters"].get("relationships_created", 0) for result in results),
+                "properties_set": sum(result["counters"].get("properties_set", 0) for result in results),
+                "unmatched": [i for i in range(len(df)) if i not in matched],
+                "elapsed": elapsed}
 
-        return res
+
+
+    def _load_links_partitioned(self, q :str, rows :[dict], batch_size :int, workers :int, report :bool) -> [dict]:
+        """
+        Helper function for load_links().
+        Partition the given rows into a grid of (workers x workers) buckets, by hashing the values
+        that locate their endpoints, and run the given query on the buckets,
+        in rounds of `workers` buckets that share no row (i.e. no "from" value) nor column (i.e. no "to" value) of the grid.
+        Note: that keeps the "from" nodes of concurrent buckets apart, and so their "to" nodes, but not a "from" node
+              from a "to" node;  load_links() only uses this when no node can be located at both ends of the links
+
+        :param q:           The Cypher query from load_links()
+        :param rows:        List of dicts with keys "i", "a", "b" and "props" - see load_links()
+        :param batch_size:  Max number of rows to process with each query
+        :param workers:     Number of buckets to run concurrently, each of them in its own thread
+        :param report:      If True, print the progress of the operation
+        :return:            List of the dicts returned by run_batched() for the non-empty buckets
+        """
+        buckets = {}        # Lists of rows, indexed by (from partition, to partition)
+        for row in rows:
+            cell = (hash(row["a"]) % workers, hash(row["b"]) % workers)
+            buckets.setdefault(cell, []).append(row)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for round_number in range(workers):
+                # The buckets along a "diagonal" of the grid, which have no endpoints in common
+                cells = [(i, (i + round_number) % workers) for i in range(workers)]
+                futures = [executor.submit(self.run_batched, q, buckets[cell], batch_size=batch_size,
+                                           parallel=False, report=False)
+                           for cell in cells if cell in buckets]
+                results += [future.result() for future in futures]      # Any Exception gets re-raised here
+
+                if report:
+                    print(f"   Completed round {round_number + 1} of {workers} : "
+                          f"{sum(result['rows'] for result in results):,} row(s) so far")
+
+        return results
 
 
 
@@ -2282,6 +3312,56 @@ class GraphAccess(InterGraph):
 
 
 
+    @staticmethod
+    def parse_iso_datetimes(column :pd.Series, errors="raise") -> pd.Series:
+        """
+        Parse a Pandas Series of ISO 8601 datetime strings, which may come in any mix of shapes
+        (such as '2015-08-15 01:02:03' , '2016-01-02' , '2017-03-04T05:06:07' or '2018-01-01T10:00:00+02:00')
+
+        If all the values are timezone-naive, or all have the same UTC offset, a Series of dtype datetime64 is returned.
+        If the values have different UTC offsets (or are a mix of timezone-aware and naive ones),
+        they're parsed one by one, each keeping its own offset, and a Series of python "datetime" objects is returned
+
+        :param column:  A Pandas Series of strings (with NaN's or None's for missing values)
+        :param errors:  [OPTIONAL] Either "raise" (default), to raise an Exception upon a value that cannot be parsed,
+                            or "coerce", to turn such values into missing values
+        :return:        A Pandas Series of the same length, with NaT's or None's for the missing values
+        """
+        assert errors in ["raise", "coerce"], \
+            f"parse_iso_datetimes(): the argument `errors` must be either 'raise' or 'coerce' (value passed: {errors})"
+
+        # Versions of pandas prior to 2 accept any shape of ISO strings by default, and don't know the "ISO8601" format
+        options = {"format": "ISO8601"} if int(pd.__version__.split(".")[0]) >= 2 else {}
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)      # Issued by pandas 2 about mixed time zones
+                parsed = pd.to_datetime(column, errors=errors, **options)
+            if pd.api.types.is_datetime64_any_dtype(parsed.dtype):
+                return parsed
+            # Otherwise, the values have different time zones
+        except ValueError as ex:
+            if "timezone" not in str(ex).lower():
+                raise       # A value that isn't a datetime, rather than a mix of time zones
+
+        def parse_value(value):
+            if (value is None) or (not isinstance(value, str) and pd.isna(value)):
+                return None
+            if isinstance(value, pd.Timestamp):
+                return value.to_pydatetime()
+            if isinstance(value, datetime):
+                return value
+            try:
+                return datetime.fromisoformat(str(value).strip())
+            except ValueError:
+                if errors == "raise":
+                    raise
+                return None
+
+        return column.map(parse_value).astype(object)
+
+
+
 
 
     #####################################################################################################
@@ -2292,77 +3372,482 @@ class GraphAccess(InterGraph):
         pass        # Used to get a better structure view in IDEs
     #####################################################################################################
 
-    def import_csv_nodes_IN_PROGRESS(self, filename :str, labels :Union[str, List[str], Tuple[str]], os="linux",
-                               headers=True, rename_fields=None, field_types=None,
-                               import_line_number=False, start_line_number=1, line_number_name="line number",
-                               link_to_node=None) -> dict:
+    CSV_FIELD_TYPES = ["str", "int", "float", "bool", "datetime"]     # The types of CSV columns understood by import_csv_nodes()
+
+    _CSV_BOOLEANS = {"true": True, "false": False, "yes": True, "no": False, "1": True, "0": False}
+
+
+    def import_csv_nodes(self, filename :str, labels :Union[str, List[str], Tuple[str]],
+                         merge_primary_key=None, merge_overwrite=False, rename=None,
+                         field_types=None, datetime_cols=None, sample_size=1000, strict_types=True,
+                         chunk_size=100000, batch_size=10000, start_row=0, skip_rows=None, workers=1,
+                         report=True, csv_options=None) -> dict:
         """
-        TODO: In-progress.  DO NOT USE.   Use load_pandas() instead
+        Import the records of a CSV file (with a header row) as new nodes, streaming the file
+        a chunk at a time - so that files of any size can be imported, without ever holding them in memory.
 
-        Import data from a CSV file located on the same file system as the Neo4j database,
-        and the records represent nodes to be created in the database.
+        The type of each column is determined just once, from a sample of the first rows of the file
+        (unless specified by the `field_types` argument); the values of all the chunks are then converted
+        to those types, column by column.  Blank values are dropped, and never make it into the database;
+        leading and trailing blanks in strings are zapped.
 
-        IMPORTANT:  the file to import MUST be located in the special folder NEO4J_HOME/import,
-                    unless the Neo4j configuration file is first modified - and the database restarted!
-                    A typical default location, when Neo4j is installed on Linux, is:  /var/lib/neo4j/import
+        If the import fails midway, the Exception message reports the values of `start_row` and `skip_rows`
+        to use in a new call with the same arguments, to resume the import from where it left off:
+        all the rows before `start_row` were imported, and so were the ones in the ranges of `skip_rows`
+        (when importing batches concurrently, some of the batches after the failed one may have been completed
+        by the time the failure is detected.)
+        Those values are also available as the attributes `start_row` and `skip_rows` of the Exception object
 
-        :param filename:    EXAMPLE in Linux:   "test.csv"
-                            EXAMPLE in Windows: "C:/test.csv"
-        :param labels:      A string, or list/tuple of strings, representing one or multiple Neo4j labels;
-                                it's acceptable to be None
-        :param os:          Either "linux" or "win"
-        :param headers:     TODO: implement
-        :param rename:      TODO: implement
-                                Example: {"name": "Product Name", "n_parts": "Number of Parts"}
-        :param field_types: (OPTIONAL) if not specified, all values get imported as STRINGS
-                                TODO: implement
-                                    Example: {"product_id": "int", "cost": "float"}
-        :param import_line_number:
-        :param start_line_number:
-        :param line_number_name:
-        :param link_to_node:    (OPTIONAL) If provided, all the newly-created nodes
-                                    get linked to the specified existing node.
-                                    Example: {"_internal_id": 123, "name": "employed_by", "dir": "out"}
-
-        :return:        A dictionary of statistics about the import
-        """
-        if os == "linux":
-            full_filename = f"/{filename}"
+        EXAMPLE:
+            import_csv_nodes("/data/cars.csv", labels="Car", merge_primary_key="vin",
+                             field_types={"zip": "str"}, datetime_cols="sold_on", csv_options={"sep": ";"})
+
+        :param filename:        Name of a CSV file, whose first line contains the field names
+        :param labels:          A string, or list/tuple of strings, with the label(s) to give to the nodes
+        :param merge_primary_key: [OPTIONAL] Name of a field that serves as a primary key;
+                                    if provided, records are merged into the existing nodes with the same value
+                                    of that key (if any), rather than always creating new nodes.
+                                    Rows lacking a value for the key are skipped.
+                                    An index is created on that key, if not already present
+        :param merge_overwrite: [OPTIONAL] Only applicable if "merge_primary_key" is set.
+                                    If True then on merge the existing nodes will be completely overwritten with the new data,
+                                    otherwise they will be updated with new information - see load_pandas()
+        :param rename:          [OPTIONAL] Dict to rename the CSV fields.  EXAMPLE: {"current_name": "name_we_want"}
+                                    Note: all the other arguments refer to fields by their new names
+        :param field_types:     [OPTIONAL] Dict whose keys are field names, and whose values are any of the types
+                                    in CSV_FIELD_TYPES; it overrides the types inferred from the sample.
+                                    EXAMPLE: {"zip": "str", "price": "float"}
+        :param datetime_cols:   [OPTIONAL] Name, or list of names, of fields with datetime strings
+                                    in ISO 8601 format, such as '2015-08-15 01:02:03' or '2016-01-02'
+                                    (same as listing them in `field_types` as "datetime")
+        :param sample_size:     [OPTIONAL] Number of rows, from the start of the file, used to infer the column types.
+                                    Default: 1000
+        :param strict_types:    [OPTIONAL] If True (default), an Exception is raised upon encountering a value
+                                    that cannot be converted to the type of its column;
+                                    if False, such values are dropped
+        :param chunk_size:      [OPTIONAL] Number of rows to read from the file at a time.  Default: 100000
+        :param batch_size:      [OPTIONAL] Number of rows to import with each query.  Default: 10000
+        :param start_row:       [OPTIONAL] Number of data rows (after the header) to skip.
+                                    Used to resume an interrupted import.  Default: 0
+                                    Note: it assumes that each record occupies a single line of the file
+        :param skip_rows:       [OPTIONAL] List of pairs [first, end] with ranges of (zero-based) numbers
+                                    of data rows to skip, from `first` up to, but not including, `end` -
+                                    because they were already imported.  Used to resume an interrupted import
+        :param workers:         [OPTIONAL] Max number of batches to import concurrently;
+                                    only applicable if "merge_primary_key" isn't used - see run_batched()
+        :param report:          [OPTIONAL] If True (default), print the progress and throughput of the import
+        :param csv_options:     [OPTIONAL] Dict with any additional arguments for pd.read_csv(),
+                                    such as "sep" or "encoding"
+
+        :return:                A dict with the following keys:
+                                    "rows_read"         Number of data rows read from the file
+                                    "rows_skipped"      Number of rows that didn't get imported
+                                                            (no values, or no value for the primary key)
+                                    "nodes_created"     Number of new nodes
+                                    "properties_set"    Number of properties set on new or existing nodes
+                                    "field_types"       Dict with the type used for each field
+                                    "next_row"          Value of `start_row` that would continue past this import
+                                    "elapsed"           Number of seconds spent
+        """
+        assert (type(start_row) == int) and (start_row >= 0), \
+            f"import_csv_nodes(): the argument `start_row` must be an integer >= 0 (value passed: {start_row})"
+
+        skip_rows = [(first, end) for (first, end) in (skip_rows or [])]
+
+        csv_options = {} if csv_options is None else dict(csv_options)
+        for option in ["chunksize", "dtype", "nrows", "skiprows"]:
+            assert option not in csv_options, \
+                f"import_csv_nodes(): the option `{option}` for pd.read_csv() is managed by this function, and cannot be passed"
+
+        # Determine the type of each column, once and for all, from a sample of the file
+        sample = pd.read_csv(filename, nrows=sample_size, **csv_options)
+        if rename:
+            sample = sample.rename(rename, axis=1)
+
+        types = self._infer_csv_field_types(sample)
+
+        if type(datetime_cols) == str:
+            datetime_cols = [datetime_cols]
+        for name in (datetime_cols or []):
+            types[name] = "datetime"
+        types.update(field_types or {})
+
+        for (name, field_type) in types.items():
+            assert name in sample.columns, f"import_csv_nodes(): the file lacks a field named `{name}`"
+            assert field_type in self.CSV_FIELD_TYPES, \
+                f"import_csv_nodes(): unknown type `{field_type}` for field `{name}`; allowed types are: {self.CSV_FIELD_TYPES}"
+
+        # Prepare the query
+        cypher_labels = CypherUtils.prepare_labels(labels)
+        if merge_primary_key is None:
+            q = f"UNWIND $rows AS row CREATE (n {cypher_labels}) SET n = row.props"
         else:
-            full_filename = f"///{filename}"
+            assert merge_primary_key in sample.columns, \
+                f"import_csv_nodes(): the file lacks a field named `{merge_primary_key}`, to use as primary key"
+            index_label = labels if type(labels) == str else labels[0]     # In case of multiple labels, take the first
+            self.ensure_index(label=index_label, key=merge_primary_key)
+            set_operator = "" if merge_overwrite else "+"
+            q = f'''
+                UNWIND $rows AS row 
+                MERGE (n {cypher_labels} {{`{merge_primary_key}`: row.props.`{merge_primary_key}`}}) 
+                SET n {set_operator}= row.props
+                '''
 
-        labels = CypherUtils.prepare_labels(labels)
+        rows_read = 0
+        rows_skipped = 0
 
-        q = f'''
-            LOAD CSV WITH HEADERS FROM "file:{full_filename}" AS row
-            UNWIND row as properties
-            CREATE (n {labels}) SET n = properties
-            '''
+        def csv_rows():
+            # Generator of dicts such as {"row": 123, "props": {"vin": "A-1", "year": 2020}} ,
+            # where "row" is the (zero-based) number of the data row in the file
+            nonlocal rows_read, rows_skipped
+            skip_lines = range(1, start_row + 1) if start_row else None      # Line 0 is the header
+            with pd.read_csv(filename, chunksize=chunk_size, dtype=str, skiprows=skip_lines, **csv_options) as reader:
+                for chunk in reader:
+                    if rename:
+                        chunk = chunk.rename(rename, axis=1)
+
+                    for (name, field_type) in types.items():
+                        chunk[name] = self._coerce_csv_column(chunk[name], field_type, strict=strict_types)
 
-        if import_line_number:
-            offset = start_line_number - 2      # Subtracting 2 because the first line of the file contains the field headers
-                                                # (i.e. the count would start with 2, in absence of offset)
-            q += f", n.{line_number_name} = linenumber() + {offset}"
+                    chunk = self.pd_datetime_to_neo4j_datetime(chunk)
 
+                    for record in self.df_records(chunk, chunk_size=batch_size):
+                        row_number = start_row + rows_read
+                        rows_read += 1
+                        if any(first <= row_number < end for (first, end) in skip_rows):
+                            continue        # Already imported by an earlier run
+                        props = {}
+                        for (name, value) in record.items():
+                            if type(value) == str:
+                                value = value.strip()
+                                if value == "":
+                                    continue
+                            if not self._is_missing_value(value):
+                                props[name] = value
 
-        if link_to_node:
-            # All the newly-created nodes will get linked to an existing node specified by its internal database ID
-            if link_to_node["dir"] == "out":
-                link = f"MERGE (n)-[:{link_to_node['name']}]->(l)"
+                        if (not props) or ((merge_primary_key is not None) and (merge_primary_key not in props)):
+                            rows_skipped += 1
+                            continue
+
+                        yield {"row": row_number, "props": props}
+
+
+        batch_rows = {}         # Pairs (first, end) with the number of the first row of each completed batch,
+                                #   and the number of the row following its last row, indexed by batch number
+
+        def note_batch(batch_number :int, batch :list, result :dict) -> None:
+            batch_rows[batch_number] = (batch[0]["row"], batch[-1]["row"] + 1)
+
+        try:
+            result = self.run_batched(q, csv_rows(), batch_size=batch_size, workers=workers,
+                                      report=report, on_batch=note_batch)
+        except Exception as ex:
+            # Resume after the last row of the uninterrupted sequence of completed batches,
+            # skipping the rows of the batches completed after it (and the ranges skipped by this run)
+            next_batch = 0
+            while next_batch in batch_rows:
+                next_batch += 1
+            next_row = batch_rows[next_batch - 1][1] if next_batch else start_row
+            completed_later = [batch_rows[n] for n in getattr(ex, "skip_batches", [])]
+            completed_later += [(first, end) for (first, end) in skip_rows if end > next_row]
+            merged_ranges = []
+            for (first, end) in sorted(completed_later):
+                if merged_ranges and (first <= merged_ranges[-1][1]):
+                    merged_ranges[-1][1] = max(end, merged_ranges[-1][1])   # Coalesce adjacent ranges
+                else:
+                    merged_ranges.append([first, end])
+            completed_later = merged_ranges
+
+            resume_args = f"start_row={next_row}"
+            if completed_later:
+                resume_args += f", skip_rows={completed_later}"
+            error = Exception(f"import_csv_nodes(): the import was interrupted.  "
+                              f"To resume it, use {resume_args} .  Details: {ex}")
+            error.start_row = next_row
+            error.skip_rows = completed_later
+            raise error from ex
+
+        return {"rows_read": rows_read,
+                "rows_skipped": rows_skipped,
+                "nodes_created": result["counters"].get("nodes_created", 0),
+                "properties_set": result["counters"].get("properties_set", 0),
+                "field_types": types,
+                "next_row": start_row + rows_read,
+                "elapsed": result["elapsed"]}
+
+
+
+    @staticmethod
+    def _infer_csv_field_types(sample :pd.DataFrame) -> dict:
+        """
+        Helper function for import_csv_nodes().
+        Infer the type of each column from the given sample, as parsed by pd.read_csv()
+
+        :param sample:  A Pandas dataframe with the first rows of a CSV file
+        :return:        A dict whose keys are the column names, and whose values are in CSV_FIELD_TYPES.
+                            EXAMPLE: {"vin": "str", "year": "int", "price": "float"}
+        """
+        types = {}
+        for (name, dtype) in sample.dtypes.items():
+            if sample[name].isna().all():
+                types[name] = "str"         # Nothing to go by; strings are the safest choice
+            elif pd.api.types.is_bool_dtype(dtype):
+                types[name] = "bool"
+            elif pd.api.types.is_integer_dtype(dtype):
+                types[name] = "int"
+            elif pd.api.types.is_float_dtype(dtype):
+                types[name] = "float"       # Note: that includes integer columns with missing values;
+                                            #       use the `field_types` argument of import_csv_nodes() to override
             else:
-                link = f"MERGE (n)<-[:{link_to_node['name']}]-(l)"
+                types[name] = "str"
+
+        return types
+
+
+
+    @classmethod
+    def _coerce_csv_column(cls, column :pd.Series, field_type :str, strict=True) -> pd.Series:
+        """
+        Helper function for import_csv_nodes().
+        Convert (all at once) the given column of strings, as read from a CSV file, to the given type.
+        Missing values stay missing
+
+        :param column:      A Pandas Series of strings (with NaN's for missing values)
+        :param field_type:  One of the values in CSV_FIELD_TYPES
+        :param strict:      If True, raise an Exception if any value cannot be converted;
+                                if False, such values are turned into missing values
+        :return:            A Pandas Series with the converted values
+        """
+        if field_type == "str":
+            return column
+
+        if field_type == "datetime":
+            converted = cls.parse_iso_datetimes(column, errors="coerce")
+        elif field_type == "bool":
+            converted = column.str.strip().str.lower().map(cls._CSV_BOOLEANS)
+        else:
+            converted = pd.to_numeric(column, errors="coerce")
+
+        # Locate the values that are present, but couldn't be converted
+        bad = column.notna() & (column.str.strip() != "") & converted.isna()
+        if field_type == "int":
+            bad |= converted.notna() & (converted % 1 != 0)
+
+        if bad.any():
+            if strict:
+                raise Exception(f"import_csv_nodes(): the value `{column[bad].iloc[0]}` in field `{column.name}` "
+                                f"cannot be converted to type `{field_type}`")
+            converted = converted.mask(bad)
+
+        if field_type == "int":
+            converted = converted.astype("Int64")       # Integers, with possibly missing values
+        elif field_type == "bool":
+            converted = converted.astype("boolean")
+
+        return converted
+
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                ~   PARQUET / ARROW IMPORT   ~                                  '''
+
+    def ________PARQUET_ARROW_IMPORT________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    @staticmethod
+    def _import_pyarrow():
+        """
+        Import the optional library `pyarrow`, only used for Parquet files and Arrow data
+
+        :return:    The triplet of modules (pyarrow, pyarrow.compute, pyarrow.parquet)
+        """
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("The optional library `pyarrow` is required to import Parquet files or Arrow data.  "
+                            "Install it with:  pip install pyarrow")
+
+        return (pyarrow, pyarrow.compute, pyarrow.parquet)
+
+
+
+    def arrow_batches(self, source, columns=None, batch_size=10000):
+        """
+        Yield the data of the given Parquet file or Arrow table, a batch of rows at a time.
+        Parquet files are memory-mapped, and their row groups are only read as needed
+
+        :param source:      EITHER the name of a Parquet file, OR a pyarrow.Table object
+        :param columns:     [OPTIONAL] List of the names of the columns to read; by default, all of them
+        :param batch_size:  [OPTIONAL] Max number of rows in each batch.  Default: 10000
+        :return:            A generator of pyarrow.RecordBatch objects
+        """
+        (pa, _, pq) = self._import_pyarrow()
+
+        if isinstance(source, pa.Table):
+            if columns is not None:
+                source = source.select(columns)
+            yield from source.to_batches(max_chunksize=batch_size)
+        else:
+            parquet_file = pq.ParquetFile(source, memory_map=True)
+            yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+
+
+    def arrow_column_names(self, source) -> [str]:
+        """
+        Return the names of the columns of the given Parquet file or Arrow table
+        (for Parquet files, only the schema gets read)
+
+        :param source:  EITHER the name of a Parquet file, OR a pyarrow.Table object
+        :return:        A list of strings
+        """
+        (pa, _, pq) = self._import_pyarrow()
+
+        if isinstance(source, pa.Table):
+            return source.column_names
+
+        return pq.read_schema(source, memory_map=True).names
+
+
+
+    def arrow_records(self, batch, rename=None, datetime_cols=None, int_cols=None) -> [dict]:
+        """
+        Turn the rows of the given Arrow record batch into dicts suitable as query parameters,
+        scrubbing the data one column at a time (with vectorized Arrow operations) rather than one value at a time:
+            - leading and trailing blanks are zapped from strings
+            - nulls, NaN's and blank strings are dropped;  rows left without any values are skipped
+            - the given datetime columns (with strings such as '2015-08-15 01:02:03'
+              or '2018-01-01T10:00:00+02:00') are parsed - see parse_iso_datetimes()
+            - the given integer columns (possibly floats, because of missing values) are cast to integers
+            - timestamps are turned into python datetime's, and dictionary-encoded columns are decoded
+
+        EXAMPLE:    a batch with the columns  vin: ["A-1", " A-2 ", ""]  and  year: [2020.0, NaN, 2022.0],
+                    with int_cols="year", becomes:
+                        [{"vin": "A-1", "year": 2020}, {"vin": "A-2"}, {"year": 2022}]
+
+        :param batch:           A pyarrow.RecordBatch object (or a pyarrow.Table)
+        :param rename:          [OPTIONAL] Dict to rename the columns.  EXAMPLE: {"current_name": "name_we_want"}
+        :param datetime_cols:   [OPTIONAL] Name, or list of names, of columns with datetime strings (original names)
+        :param int_cols:        [OPTIONAL] Name, or list of names, of columns to cast to integers (original names)
+        :return:                A list of dicts, one per non-empty row, with only the non-blank values
+        """
+        (pa, pc, _) = self._import_pyarrow()
+
+        datetime_cols = [datetime_cols] if type(datetime_cols) == str else (datetime_cols or [])
+        int_cols = [int_cols] if type(int_cols) == str else (int_cols or [])
+
+        names = []
+        columns = []            # Lists of python values, one per column
+        for (name, column) in zip(batch.column_names, batch.columns):
+            names.append(rename.get(name, name) if rename else name)
+
+            if pa.types.is_dictionary(column.type):
+                column = column.cast(column.type.value_type)
+
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                column = pc.utf8_trim_whitespace(column)
+                column = pc.if_else(pc.equal(column, ""), None, column)     # Blank strings become nulls
+                if name in datetime_cols:
+                    try:
+                        column = pc.cast(column, pa.timestamp("us"))
+                    except pa.ArrowInvalid:
+                        # Strings with UTC offsets: parse them like import_csv_nodes() does, each keeping its own offset
+                        parsed = self.parse_iso_datetimes(column.to_pandas())
+                        columns.append([None if pd.isna(value) else pd.Timestamp(value).to_pydatetime()
+                                        for value in parsed])
+                        continue
+            elif pa.types.is_floating(column.type):
+                column = pc.if_else(pc.is_nan(column), None, column)         # NaN's become nulls
+
+            if name in int_cols:
+                column = pc.cast(column, pa.int64(), safe=False)            # Any fractional part is dropped
+
+            if pa.types.is_timestamp(column.type) and (column.type.unit == "ns"):
+                column = pc.cast(column, pa.timestamp("us", column.type.tz), safe=False)   # To get python datetime's
+
+            columns.append(column.to_pylist())
+
+        # Assemble the rows, omitting the nulls;  rows left without any values are skipped
+        records = ({name: value for (name, value) in zip(names, row) if value is not None}
+                   for row in zip(*columns))
+        return [record for record in records if record]
+
+
+
+    def load_parquet(self, source, labels :Union[str, List[str], Tuple[str]],
+                     merge_primary_key=None, merge_overwrite=False, columns=None, rename=None,
+                     datetime_cols=None, int_cols=None, batch_size=10000, workers=1, report=False) -> dict:
+        """
+        Counterpart of load_pandas(), for Parquet files (or Arrow tables):
+        load each row as a separate node, reading and converting the data a batch of rows at a time,
+        with vectorized operations - see arrow_batches() and arrow_records()
+
+        Nulls, NaN's and blank strings are dropped; leading and trailing blanks in strings are zapped.
+        Rows without any values are skipped, as in import_csv_nodes().
+
+        Requires the optional library `pyarrow`
+
+        EXAMPLE:    load_parquet("/data/cars.parquet", labels="Car", merge_primary_key="vin", int_cols="year")
+
+        :param source:          EITHER the name of a Parquet file, OR a pyarrow.Table object
+        :param labels:          A string, or list/tuple of strings, with the label(s) to give to the nodes
+        :param merge_primary_key: [OPTIONAL] Name of a field (after any renaming) that serves as a primary key;
+                                    if provided, records are merged into the existing nodes with the same value of that key
+                                    (if any), rather than always creating new nodes.  Rows lacking a value for the key
+                                    are skipped.  An index is created on that key, if not already present
+        :param merge_overwrite: [OPTIONAL] Only applicable if "merge_primary_key" is set.
+                                    If True then on merge the existing nodes will be completely overwritten with the new data,
+                                    otherwise they will be updated with new information - see load_pandas()
+        :param columns:         [OPTIONAL] List of the names of the columns to import; by default, all of them
+        :param rename:          [OPTIONAL] Dict to rename the columns.  EXAMPLE: {"current_name": "name_we_want"}
+        :param datetime_cols:   [OPTIONAL] Name, or list of names, of columns with datetime strings
+                                    such as '2015-08-15 01:02:03' (original names)
+        :param int_cols:        [OPTIONAL] Name, or list of names, of columns to cast to integers (original names)
+        :param batch_size:      [OPTIONAL] Max number of rows to read and import at a time.  Default: 10000
+        :param workers:         [OPTIONAL] Max number of batches to load concurrently;
+                                    only applicable if "merge_primary_key" isn't used - see run_batched()
+        :param report:          [OPTIONAL] If True, print the progress and throughput of the operation.  Default: False
+
+        :return:                A dict with the following keys:
+                                    "rows"              Number of rows imported
+                                    "nodes_created"     Number of new nodes
+                                    "properties_set"    Number of properties set on new or existing nodes
+                                    "elapsed"           Number of seconds spent
+        """
+        cypher_labels = CypherUtils.prepare_labels(labels)
 
-            q = f'''MATCH (l:CLASS)
-                    WHERE id(l) = {link_to_node["_internal_id"]}
-                    WITH l
-                    {q}
-                    {link}
+        if merge_primary_key is None:
+            q = f"UNWIND $rows AS record CREATE (n {cypher_labels}) SET n = record"
+        else:
+            index_label = labels if type(labels) == str else labels[0]     # In case of multiple labels, take the first
+            self.ensure_index(label=index_label, key=merge_primary_key)
+            set_operator = "" if merge_overwrite else "+"
+            q = f'''
+                UNWIND $rows AS record 
+                MERGE (n {cypher_labels} {{`{merge_primary_key}`: record.`{merge_primary_key}`}}) 
+                SET n {set_operator}= record
                 '''
 
+        def rows():
+            for batch in self.arrow_batches(source, columns=columns, batch_size=batch_size):
+                for record in self.arrow_records(batch, rename=rename, datetime_cols=datetime_cols, int_cols=int_cols):
+                    if (merge_primary_key is None) or (merge_primary_key in record):
+                        yield record
+
+        result = self.run_batched(q, rows(), batch_size=batch_size, workers=workers, report=report)
+
+        return {"rows": result["rows"],
+                "nodes_created": result["counters"].get("nodes_created", 0),
+                "properties_set": result["counters"].get("properties_set", 0),
+                "elapsed": result["elapsed"]}
 
-        status = self.update_query(q)
-        #print(status)
-        return status
 
 
 
@@ -2380,6 +3865,7 @@ class GraphAccess(InterGraph):
     def export_dbase_json(self) -> dict:
         """
         Export the entire Neo4j database as a JSON string.
+        For large databases, use export_dbase_json_iter() or export_dbase_json_file() instead
 
         IMPORTANT: APOC must be activated in the database, to use this function.
                    Otherwise it'll raise an Exception.
@@ -2521,6 +4007,197 @@ class GraphAccess(InterGraph):
 
 
 
+    def export_dbase_json_iter(self, page_size=10000, as_array=False, compress=False, chunk_size=65536):
+        """
+        Export the entire database in JSON, without using APOC and without assembling the export in memory:
+        yield the export as a sequence of byte chunks, suitable to be written to a file,
+        or to be sent as a streamed (chunked) HTTP response.
+
+        The nodes, and then the relationships, are read a page at a time, by ranges of their internal database id's,
+        and each of them is serialized (as a line of JSON) as soon as it arrives - so the memory use is bounded
+        by the page size, regardless of the size of the database.
+        The format of the individual records is the same as the one of export_dbase_json():
+            {"type":"node","id":"3","labels":["User"],"properties":{"name":"Adam","age":32,"male":true}}
+            {"type":"relationship","id":"1","label":"KNOWS","properties":{"since":2003},"start":{"id":"3","labels":["User"]},"end":{"id":"4","labels":["User"]}}
+        Datetimes and other temporal values are exported as ISO-format strings.
+
+        Note: the export is not a snapshot; changes made to the database while it's in progress may or may not be included.
+
+        EXAMPLE:
+            for chunk in db.export_dbase_json_iter(compress=True):
+                f.write(chunk)
+
+        :param page_size:   [OPTIONAL] Max number of nodes (or relationships) to read from the database at a time.  Default: 10000
+        :param as_array:    [OPTIONAL] If True, the export is a JSON array (with one record per line),
+                                as produced by export_dbase_json() and expected by import_json_dump();
+                                otherwise (default), it's in the "JSON Lines" format, with one JSON record per line
+        :param compress:    [OPTIONAL] If True, the chunks are gzip-compressed (i.e., their concatenation is a .gz file)
+        :param chunk_size:  [OPTIONAL] Approximate number of (uncompressed) bytes in each chunk.  Default: 65536
+        :return:            A generator of bytes objects
+        """
+        lines = self._export_lines(page_size=page_size, as_array=as_array)
+
+        compressor = zlib.compressobj(wbits=31) if compress else None    # wbits=31 means: use the gzip format
+
+        buffer = []
+        buffer_size = 0
+        for line in lines:
+            buffer.append(line)
+            buffer_size += len(line)
+            if buffer_size >= chunk_size:
+                data = "".join(buffer).encode("utf-8")
+                buffer = []
+                buffer_size = 0
+                if compressor:
+                    data = compressor.compress(data)
+                if data:
+                    yield data
+
+        data = "".join(buffer).encode("utf-8")
+        if compressor:
+            data = compressor.compress(data) + compressor.flush()
+        if data:
+            yield data
+
+
+
+    def export_dbase_json_file(self, filename :str, page_size=10000, as_array=False, compress=None) -> dict:
+        """
+        Export the entire database in JSON to the given file, without using APOC and with bounded memory use.
+        For details, see export_dbase_json_iter()
+
+        EXAMPLE:    export_dbase_json_file("/backups/dbase.jsonl.gz")
+                        might return {"nodes": 2, "relationships": 1, "properties": 6, "elapsed": 0.041}
+
+        :param filename:    Full name of the file to create (or overwrite)
+        :param page_size:   [OPTIONAL] Max number of nodes (or relationships) to read from the database at a time.  Default: 10000
+        :param as_array:    [OPTIONAL] If True, the export is a JSON array; otherwise (default), it's in the "JSON Lines" format
+        :param compress:    [OPTIONAL] If True, the file is gzip-compressed;
+                                if None (default), it's compressed if the filename ends with ".gz"
+        :return:            A dict with the number of nodes, relationships and properties exported,
+                                and the elapsed time in seconds
+        """
+        if compress is None:
+            compress = filename.endswith(".gz")
+
+        start_time = time.perf_counter()
+        stats = {"nodes": 0, "relationships": 0, "properties": 0}
+
+        with (gzip.open(filename, "wt", encoding="utf-8") if compress else open(filename, "w", encoding="utf-8")) as f:
+            for line in self._export_lines(page_size=page_size, as_array=as_array, stats=stats):
+                f.write(line)
+
+        stats["elapsed"] = time.perf_counter() - start_time
+        return stats
+
+
+
+    def _export_lines(self, page_size :int, as_array :bool, stats=None):
+        """
+        Helper generator for export_dbase_json_iter() and export_dbase_json_file().
+        Yield the lines of the JSON export of the entire database (each line ending with a newline)
+
+        :param page_size:   Max number of nodes (or relationships) to read from the database at a time
+        :param as_array:    If True, the export is a JSON array; otherwise, it's in the "JSON Lines" format
+        :param stats:       [OPTIONAL] A dict with the keys "nodes", "relationships" and "properties",
+                                whose counts get updated as the export proceeds
+        :return:            A generator of strings
+        """
+        assert type(page_size) == int and page_size >= 1, \
+            "export_dbase_json_iter(): argument `page_size` must be an integer >= 1"
+
+        if stats is None:
+            stats = {"nodes": 0, "relationships": 0, "properties": 0}
+
+        separator = ""      # What goes in front of each record (only used for JSON arrays)
+        if as_array:
+            yield "["
+
+        for (kind, row) in self._dbase_records(page_size):
+            if kind == "node":
+                record = {"type": "node", "id": str(row["id"]), "labels": row["labels"]}
+                if row["properties"]:
+                    record["properties"] = row["properties"]    # As done by APOC, empty properties are omitted
+                stats["nodes"] += 1
+            else:
+                record = {"type": "relationship", "id": str(row["id"]), "label": row["label"]}
+                if row["properties"]:
+                    record["properties"] = row["properties"]
+                record["start"] = {"id": str(row["from_id"]), "labels": row["from_labels"]}
+                record["end"] = {"id": str(row["to_id"]), "labels": row["to_labels"]}
+                stats["relationships"] += 1
+
+            stats["properties"] += len(row["properties"])
+            yield separator + json.dumps(record, default=self._json_export_default) + "\n"
+            if as_array:
+                separator = ", "
+
+        if as_array:
+            yield "]\n"
+
+
+
+    def _dbase_records(self, page_size :int):
+        """
+        Helper generator for the exports of the entire database.
+        Read all the nodes, and then all the relationships, a page at a time, in the order of their internal database id's,
+        and yield them as they arrive.
+        Each page starts right after the last id of the previous one ("keyset paging"), so that the gaps
+        left in the id's by deleted nodes or relationships cost nothing
+
+        :param page_size:   Max number of nodes or relationships to read from the database at a time
+        :return:            A generator of pairs (kind, data), where kind is either "node" or "relationship", and data is a dict.
+                                EXAMPLES:   ("node", {"id": 3, "labels": ["User"], "properties": {"name": "Adam"}})
+                                            ("relationship", {"id": 1, "label": "KNOWS", "properties": {"since": 2003},
+                                                              "from_id": 3, "from_labels": ["User"],
+                                                              "to_id": 4, "to_labels": ["User"]})
+        """
+        nodes_q = """
+            MATCH (n) WHERE id(n) > $last_id
+            RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties
+            ORDER BY id(n)
+            LIMIT $page_size
+            """
+        rels_q = """
+            MATCH (from)-[r]->(to) WHERE id(r) > $last_id
+            RETURN id(r) AS id, type(r) AS label, properties(r) AS properties,
+                   id(from) AS from_id, labels(from) AS from_labels, id(to) AS to_id, labels(to) AS to_labels
+            ORDER BY id(r)
+            LIMIT $page_size
+            """
+
+        for (kind, q) in [("node", nodes_q), ("relationship", rels_q)]:
+            last_id = -1
+            while True:
+                page = self.query(q, {"last_id": last_id, "page_size": page_size})
+                for row in page:
+                    yield (kind, row)
+                if len(page) < page_size:
+                    break       # That was the last page
+                last_id = page[-1]["id"]
+
+
+
+    @staticmethod
+    def _json_export_default(value):
+        """
+        Used by json.dumps() to serialize the values that it doesn't natively handle,
+        such as the temporal types of the database
+
+        :param value:   A value from a database property.  EXAMPLE: neo4j.time.DateTime(2015, 8, 15, 1, 2, 3, 0)
+        :return:        A JSON-serializable value.  EXAMPLE: "2015-08-15T01:02:03.000000000"
+        """
+        if hasattr(value, "iso_format"):
+            return value.iso_format()       # The temporal types of the neo4j driver
+        if hasattr(value, "isoformat"):
+            return value.isoformat()        # python dates and times
+        if isinstance(value, (bytes, bytearray)):
+            return list(value)
+
+        return str(value)                   # For example, spatial points
+
+
+
 
     def is_literal(self, value) -> bool:
         """
@@ -2536,19 +4213,23 @@ class GraphAccess(InterGraph):
 
 
 
-    def import_json(self, json_str: str, root_labels="import_root_label", parse_only=False, provenance=None) -> List[int]:
+    def import_json(self, json_str: str, root_labels="import_root_label", parse_only=False, provenance=None,
+                    bulk=False) -> List[int]:
         """
         Import the data specified by a JSON string into the database.
 
         CAUTION: A "postorder" approach is followed: create subtrees first (with recursive calls), then create root last;
         as a consequence, in case of failure mid-import, there's no top root, and there could be several fragments.
         A partial import might need to be manually deleted.
+        (Not the case with the `bulk` option, which creates everything in a single transaction)
 
         :param json_str:    A JSON string representing the data to import
         :param root_labels: String, or list of strings, to be used as Neo4j labels for the root node(s)
         :param parse_only:  If True, the parsed data will NOT be added to the database
         :param provenance:  Optional string to store in a "source" attribute in the root node
                                 (only used if the top-level JSON structure is an object, i.e. if there's a single root node)
+        :param bulk:        [OPTIONAL] If True, create the nodes and links in batches - much faster for large,
+                                deeply-nested data.  See create_nodes_from_python_data()
 
         :return:            List of integer ID's (possibly empty), of the root node(s) created
         """
@@ -2567,7 +4248,7 @@ class GraphAccess(InterGraph):
             return []      # Nothing else to do
 
         # Import the structure into Neo4j
-        result = self.create_nodes_from_python_data(json_data, root_labels)
+        result = self.create_nodes_from_python_data(json_data, root_labels, bulk=bulk)
 
         # TODO: implement a mechanism whereby, if the above call results in error, the partial database structure created gets erased
 
@@ -2581,7 +4262,8 @@ class GraphAccess(InterGraph):
 
 
 
-    def create_nodes_from_python_data(self, python_data, root_labels: Union[str, List[str]], level=1) -> List[int|str]:
+    def create_nodes_from_python_data(self, python_data, root_labels: Union[str, List[str]], level=1,
+                                      bulk=False, batch_size=5000) -> List[int|str]:
         """
         Recursive function to add data from a JSON structure to the database, to create a tree:
         either a single node, or a root node with children.
@@ -2591,13 +4273,24 @@ class GraphAccess(InterGraph):
 
         Return the internal database ID's of the root node(s)
 
+        With the `bulk` option, the same nodes and links get created - but, rather than running 1 query per node,
+        the data is first flattened into lists of nodes and links (see _flatten_python_data),
+        and then all the nodes, and all the links, are created in batches, in a single transaction
+
         :param python_data: Python data to import.
                                 The data can be a literal, or list, or dictionary
                                 - and lists/dictionaries may be nested
         :param root_labels: String, or list of strings, to be used as Neo4j labels for the root node(s)
         :param level:       Recursion level (also used for debugging, to make the indentation more readable)
+        :param bulk:        [OPTIONAL] If True, create the nodes and links in batches, as described above.  Default: False
+        :param batch_size:  [OPTIONAL] Only used with the `bulk` option: max number of nodes, or links,
+                                to create in one query
         :return:            List (possibly empty) of internal database ID's of the root node(s) created
         """
+        if bulk:
+            assert level == 1, "create_nodes_from_python_data(): the `bulk` option is only available at the top level"
+            return self._bulk_create_from_python_data(python_data, root_labels=root_labels, batch_size=batch_size)
+
         indent_str = self.indent_chooser(level)
         self.debug_print(f"{indent_str}{level}. ~~~~~:")
 
@@ -2727,31 +4420,163 @@ class GraphAccess(InterGraph):
 
 
 
-    def import_json_dump(self, json_str: str, extended_validation = True) -> str:
+    def _bulk_create_from_python_data(self, python_data, root_labels: Union[str, List[str]], batch_size :int) -> List[int|str]:
         """
-        Used to import data from a database dump that was done with export_dbase_json() or export_nodes_rels_json().
+        Helper for the `bulk` option of create_nodes_from_python_data().
+        Flatten the given data into lists of nodes and links, and then create all the nodes (grouped by labels),
+        and all the links (grouped by name), in batches - all in a single transaction
 
-        Import nodes and relationships into the database, as specified in the JSON code
-        that was created by the earlier data dump.
+        :param python_data: Python data to import (a literal, or list, or dictionary - possibly nested)
+        :param root_labels: String, or list of strings, to be used as labels for the root node(s)
+        :param batch_size:  Max number of nodes, or links, to create in one query
+        :return:            List (possibly empty) of internal database ID's of the root node(s) created
+        """
+        assert type(batch_size) == int and batch_size >= 1, \
+            "create_nodes_from_python_data(): argument `batch_size` must be an integer >= 1"
 
-        IMPORTANT: the internal id's of the nodes need to be shifted,
-              because one cannot force the Neo4j internal id's to be any particular value...
-              and, besides (if one is importing into an existing database), particular id's may already be taken.
+        nodes = []      # List of pairs (labels, properties); the positions in the list are used as temporary ID's
+        links = []      # List of triplets (temporary ID of parent node, temporary ID of child node, link name)
+        root_tmp_ids = self._flatten_python_data(python_data, root_labels=root_labels, nodes=nodes, links=links)
+        self.debug_print(f"create_nodes_from_python_data(): flattened the data into {len(nodes)} node(s) "
+                         f"and {len(links)} link(s)")
 
-        :param json_str:            A JSON string with the format specified under export_dbase_json()
-        :param extended_validation: If True, an attempt is made to try to avoid partial imports,
-                                        by running extended validations prior to importing
-                                        (it will make a first pass thru the data, and hence take longer)
+        # Group the rows for the node creation by labels, and those for the link creation by link name
+        node_groups = {}    # Lists of dicts with the keys "old_id" and "props", indexed by tuples of labels
+        for tmp_id, (labels, props) in enumerate(nodes):
+            labels = (labels, ) if type(labels) == str else tuple(labels)
+            node_groups.setdefault(labels, []).append({"old_id": tmp_id, "props": props})
 
-        :return:                    A status message with import details if successful;
-                                        or raise an Exception if not.
-                                        If an error does occur during import then the import is aborted -
-                                        and the number of imported nodes & relationships is returned in the Exception raised.
-        """
+        link_groups = {}    # Lists of pairs of temporary ID's, indexed by link name
+        for (parent, child, rel_name) in links:
+            link_groups.setdefault(rel_name, []).append((parent, child))
 
-        try:
-            json_list = json.loads(json_str)    # Turn the string (which represents a JSON list) into a list
-        except Exception as ex:
+        new_ids = {}        # Internal database ID's of the new nodes, indexed by their temporary ID's
+        with self.transaction():
+            for labels, rows in node_groups.items():
+                for i in range(0, len(rows), batch_size):
+                    new_ids.update(self._create_nodes_with_old_ids(labels, rows[i : i + batch_size]))
+
+            for rel_name, pairs in link_groups.items():
+                rows = [{"from": new_ids[parent], "to": new_ids[child], "props": {}} for (parent, child) in pairs]
+                for i in range(0, len(rows), batch_size):
+                    batch = rows[i : i + batch_size]
+                    created = self._create_relationships_by_ids(rel_name, batch)
+                    if created != len(batch):
+                        raise Exception(f"create_nodes_from_python_data(): only {created} of {len(batch)} links "
+                                        f"named `{rel_name}` could be created.  Nothing was imported")
+
+        return [new_ids[tmp_id] for tmp_id in root_tmp_ids]
+
+
+
+    def _flatten_python_data(self, python_data, root_labels: Union[str, List[str]], nodes :list, links :list, level=1) -> [int]:
+        """
+        Recursive helper for _bulk_create_from_python_data().
+        Walk the given data, in the same way as create_nodes_from_python_data() does, but, rather than
+        creating the nodes and links in the database, append them to the given lists,
+        identifying the nodes by their (temporary) positions in the `nodes` list
+
+        EXAMPLE:    python_data = {"name": "Julian", "cars": [{"vin": 1}, {"vin": 2}]}, root_labels = "person"
+                    will append to `nodes`:   ("cars", {"vin": 1}), ("cars", {"vin": 2}), ("person", {"name": "Julian"})
+                    and to `links`:           (2, 0, "cars"), (2, 1, "cars")
+                    and return [2]
+
+        :param python_data: Python data to import (a literal, or list, or dictionary - possibly nested)
+        :param root_labels: String, or list of strings, to be used as labels for the root node(s)
+        :param nodes:       List of pairs (labels, properties), to which to append the new nodes
+        :param links:       List of triplets (temporary ID of parent node, temporary ID of child node, link name),
+                                to which to append the new links
+        :param level:       Recursion level
+        :return:            List (possibly empty) of the temporary ID's of the root node(s)
+        """
+        if python_data is None:
+            return []
+
+        if self.is_literal(python_data):
+            python_data = {"value": python_data}    # Turn the literal data into a dictionary
+
+        if type(python_data) == dict:
+            properties = {}
+            children = []       # List of pairs (temporary ID, link name)
+            for k, v in python_data.items():
+                if self.is_literal(v):
+                    properties[k] = v
+                elif type(v) == dict:
+                    children += [(child, k) for child in
+                                 self._flatten_python_data(v, root_labels=k, nodes=nodes, links=links, level=level + 1)]
+                elif type(v) == list:
+                    for item in v:
+                        children += [(child, k) for child in
+                                     self._flatten_python_data(item, root_labels=k, nodes=nodes, links=links, level=level + 1)]
+                # Note: dictionary entries with values of None are disregarded
+
+            return [self._append_flat_node(root_labels, properties, children, nodes=nodes, links=links)]
+
+        elif type(python_data) == list:
+            children = []
+            for item in python_data:
+                children += self._flatten_python_data(item, root_labels=root_labels, nodes=nodes, links=links, level=level + 1)
+
+            if level == 1:
+                return children     # Top-level lists require a special treatment (no grouping)
+
+            # Lists that aren't top-level result in element nodes (or subtree roots)
+            # that are all attached to a special parent node that has no attributes
+            return [self._append_flat_node(root_labels, {}, [(child, root_labels) for child in children],
+                                           nodes=nodes, links=links)]
+
+        else:
+            raise Exception(f"Unexpected data type: {type(python_data)}")
+
+
+
+    @staticmethod
+    def _append_flat_node(labels, properties :dict, children :[(int, str)], nodes :list, links :list) -> int:
+        """
+        Helper for _flatten_python_data().  Append a node, and the links to its children, to the given lists
+
+        :param labels:      String, or list of strings, with the labels of the node
+        :param properties:  Dict with the properties of the node
+        :param children:    List of pairs (temporary ID of child node, link name)
+        :param nodes:       List of pairs (labels, properties)
+        :param links:       List of triplets (temporary ID of parent node, temporary ID of child node, link name)
+        :return:            The temporary ID of the new node
+        """
+        tmp_id = len(nodes)
+        nodes.append((labels, properties))
+        links.extend((tmp_id, child, rel_name) for (child, rel_name) in children)
+        return tmp_id
+
+
+
+    def import_json_dump(self, json_str: str, extended_validation = True, batch_size=10000) -> str:
+        """
+        Used to import data from a database dump that was done with export_dbase_json() or export_nodes_rels_json().
+
+        Import nodes and relationships into the database, as specified in the JSON code
+        that was created by the earlier data dump.
+        The nodes, and then the relationships, are created in batches (see import_json_dump_file() )
+
+        IMPORTANT: the internal id's of the nodes need to be shifted,
+              because one cannot force the Neo4j internal id's to be any particular value...
+              and, besides (if one is importing into an existing database), particular id's may already be taken.
+
+        :param json_str:            A JSON string with the format specified under export_dbase_json()
+        :param extended_validation: If True, an attempt is made to try to avoid partial imports,
+                                        by running extended validations prior to importing
+                                        (it will make a first pass thru the data, and hence take longer)
+        :param batch_size:          [OPTIONAL] Max number of nodes, or relationships, to create in one database transaction.
+                                        Default: 10000
+
+        :return:                    A status message with import details if successful;
+                                        or raise an Exception if not.
+                                        If an error does occur during import then the import is aborted -
+                                        and the number of imported nodes & relationships is returned in the Exception raised.
+        """
+
+        try:
+            json_list = json.loads(json_str)    # Turn the string (which represents a JSON list) into a list
+        except Exception as ex:
             raise Exception(f"import_json_dump(): incorrectly-formatted JSON string. {ex}")
 
         if self.debug:
@@ -2760,95 +4585,773 @@ class GraphAccess(InterGraph):
         assert type(json_list) == list, \
             "import_json_dump(): the JSON string does not represent a list"
 
-
-        id_shifting = {}    # To map the Neo4j internal ID's specified in the JSON data dump
-        #       into the ID's of newly-created nodes
-
         if extended_validation:
             # Do an initial pass for correctness, to help avoid partial imports.
             # TODO: maybe also check the validity of the start and end nodes of relationships
             for i, item in enumerate(json_list):
-                assert type(item) == dict, \
-                    f"import_json_dump(): Item in list index {i} should be a dict, but instead it's of type {type(item)}.  Nothing imported.  Item: {item}"
-                # We use item.get(key_name) to handle without error situation where the key is missing
-                if (item.get("type") != "node") and (item.get("type") != "relationship"):
-                    raise Exception(f"import_json_dump(): Item in list index {i} must be a dict with a 'type' key, "
-                                    f"whose value is either 'node' or 'relationship'.  Nothing imported.  Item: {item}")
-
-                if item["type"] == "node":
-                    if "id" not in item:
-                        raise Exception(f"import_json_dump(): Item in list index {i} is marked as 'node' but it lacks an 'id'.  Nothing imported.  Item: {item}")
-                    try:
-                        int(item["id"])
-                    except ValueError:
-                        raise Exception(f"import_json_dump(): Item in list index {i} has an 'id' key whose value ({item['id']}) doesn't correspond to an integer.  "
-                                        f"Nothing imported.  Item: {item}")
-
-                elif item["type"] == "relationship":
-                    if "label" not in item:
-                        raise Exception(f"import_json_dump(): Item in list index {i} is marked as 'relationship' but lacks a 'label'.  Nothing imported.  Item: {item}")
-                    if "start" not in item:
-                        raise Exception(f"import_json_dump(): Item in list index {i} is marked as 'relationship' but lacks a 'start' value.  Nothing imported.  Item: {item}")
-                    if "end" not in item:
-                        raise Exception(f"import_json_dump(): Item in list index {i} is marked as 'relationship' but lacks a 'end' value.  Nothing imported.  Item: {item}")
-                    if "id" not in item["start"]:
-                        raise Exception(f"import_json_dump(): Item in list index {i} is marked as 'relationship' but its 'start' value lacks an 'id'.  Nothing imported.  Item: {item}")
-                    if "id" not in item["end"]:
-                        raise Exception(f"import_json_dump(): Item in list index {i} is marked as 'relationship' but its 'end' value lacks an 'id'.  Nothing imported.  Item: {item}")
-
-
-        # First, process all the node data, and create the nodes; while doing that, generate the id_shifting map
-        num_nodes_imported = 0
+                try:
+                    self._check_dump_item(i, item)
+                except Exception as ex:
+                    raise Exception(f"import_json_dump(): {ex}  Nothing imported.")
+
+        id_map = sqlite3.connect(":memory:")    # For the map of the node id's
         try:
-            for item in json_list:
-                if item["type"] == "node":
-                    #print("ADDING NODE: ", item)
-                    #print(f'     Creating node with labels `{item["labels"]}` and properties {item["properties"]}')
-                    old_id = int(item["id"])
-                    new_id = self.create_node(labels=item.get("labels"), properties=item.get("properties")) # Note: any number of labels can be imported
-                                                                                                            #       if item has no labels/properties, None will be passed
-                    id_shifting[old_id] = new_id
-                    num_nodes_imported += 1
-        except Exception as ex:
-            raise Exception(f"import_json_dump(): the import process was INTERRUPTED "
-                            f"after importing {num_nodes_imported} node(s) and 0 relationship(s). Reason: " + str(ex))
+            result = self._import_dump_items(items=lambda: iter(json_list), id_map=id_map, source="",
+                                             batch_size=batch_size, caller="import_json_dump")
+        finally:
+            id_map.close()
+
+        return f"Successful import of {result['nodes']} node(s) and {result['relationships']} relationship(s)"
+
+
+
+    def import_json_dump_file(self, filename :str, id_map_file=None, extended_validation=True,
+                              batch_size=10000, report=False) -> dict:
+        """
+        Import nodes and relationships into the database from a file with a database dump, such as the ones
+        created by export_dbase_json_file(), export_dbase_json_iter() or export_dbase_json().
+        Meant for large dumps: the file is parsed incrementally, rather than being read into memory.
+
+        The file may contain either a JSON array of records, or one JSON record per line ("JSON Lines");
+        in either case, it may be gzip-compressed (which gets automatically detected)
+        The format of the records is specified under export_dbase_json()
+
+        The nodes are created first, in batches of nodes with the same labels,
+        and the mapping from their id's in the dump to their new internal database id's is kept in a SQLite table.
+        Then the file is read again, and the relationships are created, in batches of relationships of the same type.
+
+        If `id_map_file` is specified, that SQLite table is stored in that file (rather than in memory),
+        which allows the import of dumps with more nodes than can be accommodated in RAM;
+        that file also holds a checkpoint of the import, after each batch: if the import gets interrupted,
+        running this function again with the same arguments resumes it where it left off.
+        After a successful import, that file gets left in place (and can be used to look up the new id's of the nodes.)
+        Note: if the import gets interrupted between the database commit of a batch and its checkpoint,
+              the nodes (or relationships) of that batch will get created again when the import is resumed.
+
+        EXAMPLE:    import_json_dump_file("/backups/dbase.jsonl.gz", id_map_file="/tmp/dbase_restore.sqlite")
+                        might return {"nodes": 2, "relationships": 1, "elapsed": 0.085}
+
+        :param filename:            Full name of a file with a database dump
+        :param id_map_file:         [OPTIONAL] Full name of a SQLite file for the map of the node id's and the checkpoints;
+                                        if not specified, the map is kept in memory, and the import cannot be resumed
+        :param extended_validation: [OPTIONAL] If True (default), an attempt is made to try to avoid partial imports,
+                                        by validating all the records in the file prior to importing
+                                        (it will make an extra pass thru the file, and hence take longer)
+        :param batch_size:          [OPTIONAL] Max number of nodes, or relationships, to create in one database transaction.
+                                        Default: 10000
+        :param report:              [OPTIONAL] If True, print the progress after each batch
+        :return:                    A dict with the total number of nodes and relationships imported
+                                        (including any ones imported prior to a resumption) and the elapsed time in seconds.
+                                        If an error occurs, an Exception is raised, with the number of imported nodes & relationships
+        """
+        assert type(batch_size) == int and batch_size >= 1, \
+            "import_json_dump_file(): argument `batch_size` must be an integer >= 1"
+
+        start_time = time.perf_counter()
 
+        with open(filename, "rb") as f:
+            compressed = (f.read(2) == b"\x1f\x8b")   # The "magic number" at the start of gzip files
 
-        #print("id_shifting map:", id_shifting)
+        def items():
+            # Generator of the records in the dump file
+            opener = gzip.open if compressed else open
+            with opener(filename, "rt", encoding="utf-8") as f:
+                yield from self._iter_json_items(f)
 
-        # Then process all the relationships, linking to the correct (newly-created) nodes by using the id_shifting map
-        # (node: item types that aren't either "node" nor "relationship" are currently being ignored during the import)
-        num_rels_imported = 0
+        id_map = sqlite3.connect(id_map_file or ":memory:")     # For the map of the node id's, and the checkpoints
         try:
-            for item in json_list:
-                if item["type"] == "relationship":
-                    #print("ADDING RELATIONSHIP: ", item)
-                    rel_name = item["label"]
-                    #rel_props = item["properties"]
-                    rel_props = item.get("properties")      # Also works if no "properties" is present (relationships may lack it)
+            resuming = self._dump_import_progress(id_map) is not None
+            if extended_validation and not resuming:
+                try:
+                    for i, item in enumerate(items()):
+                        self._check_dump_item(i, item)
+                except Exception as ex:
+                    raise Exception(f"import_json_dump_file(): {ex}  Nothing imported.")
+
+            result = self._import_dump_items(items=items, id_map=id_map, source=filename, batch_size=batch_size,
+                                             caller="import_json_dump_file", report=report)
+        finally:
+            id_map.close()
+
+        result["elapsed"] = time.perf_counter() - start_time
+        return result
+
+
+
+    @staticmethod
+    def _check_dump_item(i :int, item) -> None:
+        """
+        Validate a record from a database dump, and raise an Exception if not valid
+
+        :param i:       The (zero-based) position of the record in the dump
+        :param item:    The record, as parsed from JSON.
+                            EXAMPLE: {"type":"node","id":"3","labels":["User"],"properties":{"name":"Adam","age":32}}
+        :return:        None
+        """
+        assert type(item) == dict, \
+            f"Item in list index {i} should be a dict, but instead it's of type {type(item)}.  Item: {item}"
+        # We use item.get(key_name) to handle without error situation where the key is missing
+        if (item.get("type") != "node") and (item.get("type") != "relationship"):
+            raise Exception(f"Item in list index {i} must be a dict with a 'type' key, "
+                            f"whose value is either 'node' or 'relationship'.  Item: {item}")
+
+        if item["type"] == "node":
+            if "id" not in item:
+                raise Exception(f"Item in list index {i} is marked as 'node' but it lacks an 'id'.  Item: {item}")
+            try:
+                int(item["id"])
+            except ValueError:
+                raise Exception(f"Item in list index {i} has an 'id' key whose value ({item['id']}) doesn't correspond to an integer.  "
+                                f"Item: {item}")
+
+        elif item["type"] == "relationship":
+            if "label" not in item:
+                raise Exception(f"Item in list index {i} is marked as 'relationship' but lacks a 'label'.  Item: {item}")
+            if "start" not in item:
+                raise Exception(f"Item in list index {i} is marked as 'relationship' but lacks a 'start' value.  Item: {item}")
+            if "end" not in item:
+                raise Exception(f"Item in list index {i} is marked as 'relationship' but lacks a 'end' value.  Item: {item}")
+            if "id" not in item["start"]:
+                raise Exception(f"Item in list index {i} is marked as 'relationship' but its 'start' value lacks an 'id'.  Item: {item}")
+            if "id" not in item["end"]:
+                raise Exception(f"Item in list index {i} is marked as 'relationship' but its 'end' value lacks an 'id'.  Item: {item}")
+
+
+
+    @staticmethod
+    def _iter_json_items(f, read_size=1048576):
+        """
+        Incrementally parse the given text file, containing either a JSON array or a sequence of JSON values
+        (for example, one per line, as in the "JSON Lines" format), and yield its elements one by one
+
+        EXAMPLE:  a file with the text  '[{"a": 1},\n {"b": 2}\n]'  yields {"a": 1} and then {"b": 2}
 
-                    start_id_original = int(item["start"]["id"])
-                    end_id_original = int(item["end"]["id"])
+        :param f:           A file object, opened in text mode
+        :param read_size:   [OPTIONAL] Number of characters to read from the file at a time
+        :return:            A generator of parsed JSON values
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0             # Position in the buffer where the next value starts
+        at_end = False      # True once the whole file has been read
+
+        def read_more():
+            # Discard the consumed part of the buffer, and append some more text from the file
+            nonlocal buffer, pos, at_end
+            more = f.read(read_size)
+            at_end = (more == "")
+            buffer = buffer[pos:] + more
+            pos = 0
+
+        while True:
+            # Skip the whitespace and the punctuation of the JSON array, if present, between values
+            while (pos < len(buffer)) and (buffer[pos] in " \t\r\n,[]"):
+                pos += 1
+
+            if (not at_end) and (len(buffer) - pos < read_size):
+                read_more()         # Keep a good amount of text ahead of the next value
+                continue
+
+            if pos == len(buffer):
+                return              # All done
+
+            try:
+                (value, end) = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as ex:
+                if at_end:
+                    raise Exception(f"incorrectly-formatted JSON. {ex}")
+                end = None          # Presumably, a value longer than the text read so far
+
+            if (not at_end) and ((end is None) or (end == len(buffer))):
+                read_more()         # The value might be incomplete (for example, a truncated number)
+                continue
+
+            yield value
+            pos = end
+
+
+
+    def _import_dump_items(self, items, id_map, source :str, batch_size :int, caller :str, report=False) -> dict:
+        """
+        Helper for import_json_dump() and import_json_dump_file().
+        Create the nodes in the given records of a database dump, and then the relationships, in batches;
+        after each batch, save a checkpoint in the `progress` table of the given SQLite database,
+        and resume from the last checkpoint, if one is present
+
+        :param items:       Function with no arguments, returning a (new) iterator over the records of the dump.
+                                It gets called twice: once for the nodes, and once for the relationships
+        :param id_map:      A sqlite3.Connection object, used for the map of the node id's (`id_map` table)
+                                and for the checkpoints (`progress` table);  the tables get created if not present
+        :param source:      Name of the dump file, or "";  recorded with the checkpoints,
+                                to catch attempts to resume the import of a different file
+        :param batch_size:  Max number of nodes, or relationships, to create in one database transaction
+        :param caller:      Name of the calling function, for the error messages
+        :param report:      [OPTIONAL] If True, print the progress after each batch
+        :return:            A dict with the total number of "nodes" and "relationships" imported
+        """
+        id_map.execute("CREATE TABLE IF NOT EXISTS id_map (old_id INTEGER PRIMARY KEY, new_id INTEGER NOT NULL)")
+        id_map.execute("CREATE TABLE IF NOT EXISTS progress "
+                       "(source TEXT, phase TEXT, position INTEGER, nodes INTEGER, relationships INTEGER)")
+
+        progress = self._dump_import_progress(id_map)
+        if progress is None:
+            progress = {"source": source, "phase": "nodes", "position": 0, "nodes": 0, "relationships": 0}
+            id_map.execute("INSERT INTO progress VALUES (:source, :phase, :position, :nodes, :relationships)", progress)
+            id_map.commit()
+        else:
+            if progress["source"] != source:
+                raise Exception(f"{caller}(): the id map file belongs to the import of a different dump (`{progress['source']}`)")
+            if progress["phase"] == "done":
+                raise Exception(f"{caller}(): according to the id map file, this import was already completed")
+            if report:
+                print(f"{caller}(): resuming the import of the {progress['phase']}, "
+                      f"after {progress['nodes']} node(s) and {progress['relationships']} relationship(s)")
+
+        def save_progress(phase :str, position :int) -> None:
+            # Commit the id's of the latest batch of nodes (if applicable), together with the checkpoint
+            progress["phase"] = phase
+            progress["position"] = position     # Number of records of the dump taken care of, in the current phase
+            id_map.execute("UPDATE progress SET phase = :phase, position = :position, "
+                           "nodes = :nodes, relationships = :relationships", progress)
+            id_map.commit()
+            if report:
+                print(f"    {progress['nodes']} node(s) and {progress['relationships']} relationship(s) imported")
 
-                    if start_id_original not in id_shifting:
-                        raise Exception(f"cannot add a relationship `{rel_name}` starting at node with id {start_id_original}, because no node with that id was imported")
-                    if end_id_original not in id_shifting:
-                        raise Exception(f"cannot add a relationship `{rel_name}` ending at node with id {start_id_original}, because no node with that id was imported")
+        try:
+            # First, process all the node data, and create the nodes; while doing that, fill the map of node id's
+            if progress["phase"] == "nodes":
+                pending = []
+                position = progress["position"]
+                for i, item in enumerate(items()):
+                    if i < progress["position"]:
+                        continue        # Already imported, prior to a resumption
+                    self._check_dump_item(i, item)
+                    if item["type"] == "node":
+                        pending.append(item)
+                    position = i + 1
+                    if len(pending) == batch_size:
+                        progress["nodes"] += self._create_dump_nodes(pending, id_map)
+                        pending = []
+                        save_progress("nodes", position)
+
+                progress["nodes"] += self._create_dump_nodes(pending, id_map)
+                save_progress("relationships", 0)
+
+            # Then process all the relationships, linking to the correct (newly-created) nodes by using the id map
+            # (note: item types that aren't either "node" nor "relationship" are currently being ignored during the import)
+            pending = []
+            position = progress["position"]
+            for i, item in enumerate(items()):
+                if i < progress["position"]:
+                    continue
+                if item["type"] == "relationship":
+                    pending.append(item)
+                position = i + 1
+                if len(pending) == batch_size:
+                    progress["relationships"] += self._create_dump_relationships(pending, id_map)
+                    pending = []
+                    save_progress("relationships", position)
 
-                    start_id_shifted = id_shifting[start_id_original]
-                    end_id_shifted = id_shifting[end_id_original]
+            progress["relationships"] += self._create_dump_relationships(pending, id_map)
+            save_progress("done", position)
 
-                    #print(f'     Creating relationship named `{rel_name}` from node {start_id_shifted} to node {end_id_shifted},  with properties {rel_props}')
-                    self.link_nodes_by_ids(start_id_shifted, end_id_shifted, rel_name, rel_props)
-                    num_rels_imported += 1
         except Exception as ex:
-            raise Exception(f"import_json_dump(): the import process was INTERRUPTED "
-                            f"after importing {num_nodes_imported} node(s) and {num_rels_imported} relationship(s). Reason: " + str(ex))
+            raise Exception(f"{caller}(): the import process was INTERRUPTED "
+                            f"after importing {progress['nodes']} node(s) and {progress['relationships']} relationship(s). "
+                            f"Reason: {ex}")
+
+        return {"nodes": progress["nodes"], "relationships": progress["relationships"]}
+
+
+
+    @staticmethod
+    def _dump_import_progress(id_map) -> dict|None:
+        """
+        Return the latest checkpoint saved by _import_dump_items() in the given SQLite database, if any
+
+        :param id_map:  A sqlite3.Connection object
+        :return:        A dict with the keys "source", "phase", "position", "nodes" and "relationships";
+                            or None if no checkpoint is present
+        """
+        try:
+            row = id_map.execute("SELECT source, phase, position, nodes, relationships FROM progress").fetchone()
+        except sqlite3.OperationalError:
+            return None         # No "progress" table
+
+        if row is None:
+            return None
 
+        return dict(zip(["source", "phase", "position", "nodes", "relationships"], row))
 
-        return f"Successful import of {num_nodes_imported} node(s) and {num_rels_imported} relationship(s)"
 
 
+    def _create_dump_nodes(self, items :[dict], id_map) -> int:
+        """
+        Create the nodes for the given records of a database dump, in a single transaction,
+        with one query for each combination of labels;
+        add the mapping of their id's in the dump to their new internal database id's to the `id_map` table
+        (without committing it)
+
+        :param items:   List of records of type "node".
+                            EXAMPLE: [{"type":"node","id":"3","labels":["User"],"properties":{"name":"Adam"}}]
+        :param id_map:  A sqlite3.Connection object
+        :return:        The number of nodes created
+        """
+        if not items:
+            return 0
+
+        rows_by_labels = {}     # Lists of {"old_id": int, "props": dict}, indexed by the tuple of the node labels
+        for item in items:
+            labels = tuple(item.get("labels") or [])
+            rows_by_labels.setdefault(labels, []).append({"old_id": int(item["id"]),
+                                                          "props": item.get("properties") or {}})
+
+        id_pairs = []           # List of (old id, new id) pairs
+        with self.transaction():
+            for labels, rows in rows_by_labels.items():
+                id_pairs += self._create_nodes_with_old_ids(labels, rows)
+
+        id_map.executemany("INSERT OR REPLACE INTO id_map VALUES (?, ?)", id_pairs)
+
+        return len(id_pairs)
+
+
+
+    def _create_dump_relationships(self, items :[dict], id_map) -> int:
+        """
+        Create the relationships for the given records of a database dump, in a single transaction,
+        with one query for each relationship type.
+        Their end nodes are located by looking up their id's in the dump, in the `id_map` table
+
+        :param items:   List of records of type "relationship".
+                            EXAMPLE: [{"type":"relationship","id":"1","label":"KNOWS","properties":{"since":2003},
+                                       "start":{"id":"3","labels":["User"]},"end":{"id":"4","labels":["User"]}}]
+        :param id_map:  A sqlite3.Connection object
+        :return:        The number of relationships created
+        """
+        if not items:
+            return 0
+
+        old_ids = list({int(item["start"]["id"]) for item in items} | {int(item["end"]["id"]) for item in items})
+        new_ids = {}            # Indexed by the id's in the dump
+        for i in range(0, len(old_ids), 500):   # Look them up in chunks, to stay within the SQLite limit on parameters
+            chunk = old_ids[i : i + 500]
+            placeholders = ", ".join(["?"] * len(chunk))
+            new_ids.update(id_map.execute(f"SELECT old_id, new_id FROM id_map WHERE old_id IN ({placeholders})", chunk))
+
+        rows_by_name = {}       # Lists of {"from": int, "to": int, "props": dict}, indexed by relationship name
+        for item in items:
+            rel_name = item["label"]
+            start_id_original = int(item["start"]["id"])
+            end_id_original = int(item["end"]["id"])
+
+            if start_id_original not in new_ids:
+                raise Exception(f"cannot add a relationship `{rel_name}` starting at node with id {start_id_original}, because no node with that id was imported")
+            if end_id_original not in new_ids:
+                raise Exception(f"cannot add a relationship `{rel_name}` ending at node with id {end_id_original}, because no node with that id was imported")
+
+            rows_by_name.setdefault(rel_name, []).append({"from": new_ids[start_id_original], "to": new_ids[end_id_original],
+                                                          "props": item.get("properties") or {}})
+
+        number_created = 0
+        with self.transaction():
+            for rel_name, rows in rows_by_name.items():
+                number_created += self._create_relationships_by_ids(rel_name, rows)
+
+        return number_created
+
+
+
+    def _create_nodes_with_old_ids(self, labels, rows :[dict]) -> [(int, int)]:
+        """
+        Create a batch of nodes with the given labels, and the properties specified in the given rows,
+        and return the pairs of (old id, new internal database id), where the old id's are also given in the rows
+
+        :param labels:  List or tuple of node labels (possibly empty)
+        :param rows:    List of dicts with the keys "old_id" and "props".  EXAMPLE: [{"old_id": 3, "props": {"name": "Adam"}}]
+        :return:        List of pairs (old id, new id)
+        """
+        q = f'''
+            UNWIND $rows AS row
+            CREATE (n {CypherUtils.prepare_labels(list(labels))})
+            SET n = row.props
+            RETURN row.old_id AS old_id, id(n) AS new_id
+            '''
+        with self._writes_to(list(labels)):
+            result = self.update_query(q, {"rows": rows})
+
+        return [(r["old_id"], r["new_id"]) for r in result["returned_data"]]
+
+
+
+    def _create_relationships_by_ids(self, rel_name :str, rows :[dict]) -> int:
+        """
+        Create a batch of relationships of the given type, between nodes specified by their internal database id's
+
+        :param rel_name:    The name of the relationship type
+        :param rows:        List of dicts with the keys "from", "to" (internal database id's) and "props".
+                                EXAMPLE: [{"from": 123, "to": 456, "props": {"since": 2003}}]
+        :return:            The number of relationships created
+        """
+        q = f'''
+            UNWIND $rows AS row
+            MATCH (from) WHERE id(from) = row.from
+            MATCH (to) WHERE id(to) = row.to
+            CREATE (from)-[r:`{rel_name}`]->(to)
+            SET r = row.props
+            '''
+        with self._writes_to(self._rel_tag(rel_name)):
+            result = self.update_query(q, {"rows": rows})
+
+        return result.get("relationships_created", 0)
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                ~   BINARY SNAPSHOTS   ~                                       '''
+
+    def ________BINARY_SNAPSHOTS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    SNAPSHOT_MAGIC = b"BrainAnnex snapshot 1\n"     # Start of all snapshot files (the digit is the format version)
+
+    # Codes for the msgpack extension types used to store the temporal types of the database in snapshots
+    SNAPSHOT_TEMPORAL_CODES = {neo4j.time.DateTime: 1, neo4j.time.Date: 2, neo4j.time.Time: 3, neo4j.time.Duration: 4}
+
+
+    @staticmethod
+    def _import_msgpack():
+        """
+        Import the optional library `msgpack`, only used for binary snapshots
+
+        :return:    The msgpack module
+        """
+        try:
+            import msgpack
+        except ImportError:
+            raise Exception("The optional library `msgpack` is required for database snapshots.  "
+                            "Install it with:  pip install msgpack")
+
+        return msgpack
+
+
+
+    def export_snapshot(self, filename :str, segment_size=10000, page_size=10000, compression_level=6) -> dict:
+        """
+        Save the entire database to a compact, compressed binary file, for later restore with import_snapshot().
+        Several times smaller than the JSON exports, and much faster to restore.
+        Like export_dbase_json_iter(), it doesn't need APOC, and its memory use is bounded regardless of the size of the database.
+        Requires the optional library `msgpack`
+
+        The file starts with SNAPSHOT_MAGIC, followed by "frames", each consisting of the length of its data
+        (4 bytes, big-endian) followed by its data: a zlib-compressed msgpack map.
+        The first frame is a header with the lists of the node labels, relationship types and property keys;
+        in the rest of the file, those names are only referred to by their (zero-based) position in those lists.
+        Then come the segments of (up to `segment_size`) nodes, then the ones of relationships, and finally
+        an "end" frame with the total counts.  Segments may extend the lists of names (for example, with labels
+        that got added to the database while the snapshot was being taken.)
+
+            header:         {"kind": "header", "labels": [str], "rel_types": [str], "keys": [str]}
+            node segment:   {"kind": "nodes", "new_labels": [str], "new_keys": [str],
+                             "rows": [[node id, [label positions], {key position: value}]]}
+            rel. segment:   {"kind": "relationships", "new_types": [str], "new_keys": [str],
+                             "rows": [[from node id, to node id, type position, {key position: value}]]}
+            end:            {"kind": "end", "nodes": int, "relationships": int}
+
+        The temporal types of the database are stored as msgpack extension types (see SNAPSHOT_TEMPORAL_CODES),
+        with the ISO format of their values; spatial values are not supported.
+
+        Note: the snapshot is not transactional; changes made to the database while it's in progress may or may not be included.
+
+        EXAMPLE:    export_snapshot("/backups/dbase.snapshot")
+                        might return {"nodes": 2, "relationships": 1, "bytes": 291, "elapsed": 0.052}
+
+        :param filename:            Full name of the file to create (or overwrite)
+        :param segment_size:        [OPTIONAL] Max number of nodes, or relationships, in each segment.  Default: 10000
+        :param page_size:           [OPTIONAL] Max number of nodes (or relationships) to read from the database at a time.  Default: 10000
+        :param compression_level:   [OPTIONAL] zlib compression level, from 0 (none) to 9 (max).  Default: 6
+        :return:                    A dict with the number of nodes and relationships saved,
+                                        the size of the file in bytes, and the elapsed time in seconds
+        """
+        assert type(segment_size) == int and segment_size >= 1, \
+            "export_snapshot(): argument `segment_size` must be an integer >= 1"
+        assert type(page_size) == int and page_size >= 1, \
+            "export_snapshot(): argument `page_size` must be an integer >= 1"
+
+        msgpack = self._import_msgpack()
+        start_time = time.perf_counter()
+
+        # The dictionaries of names, as lists, and the reverse lookups of their positions
+        labels = self.get_labels()
+        rel_types = self.get_relationship_types()
+        keys = self.query("CALL db.propertyKeys() YIELD propertyKey RETURN propertyKey", single_column="propertyKey")
+        positions = {"labels": {name: i for i, name in enumerate(labels)},
+                     "rel_types": {name: i for i, name in enumerate(rel_types)},
+                     "keys": {name: i for i, name in enumerate(keys)}}
+        additions = {"labels": [], "rel_types": [], "keys": []}     # Names not in the dictionaries yet, for the current segment
+
+        def position(dictionary :str, name :str) -> int:
+            # Look up the position of the given name in the given dictionary, adding the name if not already present
+            lookup = positions[dictionary]
+            if name not in lookup:
+                lookup[name] = len(lookup)
+                additions[dictionary].append(name)
+            return lookup[name]
+
+        def pack_props(props :dict) -> dict:
+            return {position("keys", k): v for k, v in props.items()}
+
+        stats = {"nodes": 0, "relationships": 0}
+
+        with open(filename, "wb") as f:
+            f.write(self.SNAPSHOT_MAGIC)
+
+            def write_frame(payload :dict) -> None:
+                data = zlib.compress(msgpack.packb(payload, default=self._snapshot_default, use_bin_type=True),
+                                     compression_level)
+                f.write(len(data).to_bytes(4, "big"))
+                f.write(data)
+
+            def write_segment(kind :str, rows :list) -> None:
+                payload = {"kind": kind, "rows": rows, "new_keys": additions["keys"]}
+                if kind == "nodes":
+                    payload["new_labels"] = additions["labels"]
+                else:
+                    payload["new_types"] = additions["rel_types"]
+                write_frame(payload)
+                for name_list in additions.values():
+                    name_list.clear()
+
+            write_frame({"kind": "header", "labels": labels, "rel_types": rel_types, "keys": keys})
+
+            rows = []
+            current_kind = "nodes"
+            for (kind, record) in self._dbase_records(page_size):
+                if (kind == "relationship") and (current_kind == "nodes"):
+                    if rows:
+                        write_segment("nodes", rows)    # The last segment of nodes
+                        rows = []
+                    current_kind = "relationships"
+
+                if kind == "node":
+                    rows.append([record["id"], [position("labels", label) for label in record["labels"]],
+                                 pack_props(record["properties"])])
+                    stats["nodes"] += 1
+                else:
+                    rows.append([record["from_id"], record["to_id"], position("rel_types", record["label"]),
+                                 pack_props(record["properties"])])
+                    stats["relationships"] += 1
+
+                if len(rows) == segment_size:
+                    write_segment(current_kind, rows)
+                    rows = []
+
+            if rows:
+                write_segment(current_kind, rows)
+
+            write_frame({"kind": "end", "nodes": stats["nodes"], "relationships": stats["relationships"]})
+            stats["bytes"] = f.tell()
+
+        stats["elapsed"] = time.perf_counter() - start_time
+        return stats
+
+
+
+    def import_snapshot(self, filename :str, workers=4, report=False) -> dict:
+        """
+        Restore into the database a snapshot saved by export_snapshot() (the existing data isn't affected.)
+        Requires the optional library `msgpack`
+
+        The segments of nodes are imported in parallel, by the given number of threads, while the file is being read;
+        once all the nodes are in, the segments of relationships are imported in parallel as well,
+        using the mapping of the node id's in the snapshot to the id's of the newly-created nodes (kept in memory.)
+        Within each segment, the nodes are created in batches with the same labels, and the relationships
+        in batches of the same type.
+        If the import is interrupted by an error, an Exception is raised, and the data imported up to that point remains.
+
+        EXAMPLE:    import_snapshot("/backups/dbase.snapshot", workers=8)
+                        might return {"nodes": 2, "relationships": 1, "elapsed": 0.071}
+
+        :param filename:    Full name of a file created by export_snapshot()
+        :param workers:     [OPTIONAL] Max number of segments to import concurrently.  Default: 4
+        :param report:      [OPTIONAL] If True, print the progress after each segment
+        :return:            A dict with the number of nodes and relationships imported, and the elapsed time in seconds
+        """
+        assert type(workers) == int and workers >= 1, \
+            "import_snapshot(): argument `workers` must be an integer >= 1"
+
+        msgpack = self._import_msgpack()
+        start_time = time.perf_counter()
+
+        id_map = {}             # To map the node id's in the snapshot into the id's of newly-created nodes
+        stats = {"nodes": 0, "relationships": 0}
+
+        def collect(done_futures) -> None:
+            # Gather the outcome of the completed segment imports (raising their Exception, if any)
+            for future in done_futures:
+                result = future.result()
+                if type(result) == list:        # A list of (old id, new id) pairs, from a segment of nodes
+                    id_map.update(result)
+                    stats["nodes"] += len(result)
+                else:                           # The number of relationships created in a segment
+                    stats["relationships"] += result
+                if report:
+                    print(f"    {stats['nodes']} node(s) and {stats['relationships']} relationship(s) imported")
+
+        with open(filename, "rb") as f:
+            if f.read(len(self.SNAPSHOT_MAGIC)) != self.SNAPSHOT_MAGIC:
+                raise Exception(f"import_snapshot(): `{filename}` is not a snapshot file (or it's from an unsupported version)")
+
+            frames = self._snapshot_frames(f, msgpack)
+            header = next(frames, None)
+            assert header and header.get("kind") == "header", \
+                f"import_snapshot(): the snapshot file `{filename}` lacks a header"
+            (labels, rel_types, keys) = (header["labels"], header["rel_types"], header["keys"])
+
+            end = None          # The final frame of the snapshot
+            pending = set()     # Futures of the segment imports in progress
+            nodes_done = False  # Becomes True once all the segments of nodes have been imported
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                try:
+                    for payload in frames:
+                        kind = payload["kind"]
+                        if kind == "end":
+                            end = payload
+                            break
+
+                        labels += payload.get("new_labels", [])
+                        rel_types += payload.get("new_types", [])
+                        keys += payload.get("new_keys", [])
+
+                        if kind == "nodes":
+                            rows_by_labels = {}     # Lists of {"old_id": int, "props": dict}, indexed by the tuple of labels
+                            for (old_id, label_positions, props) in payload["rows"]:
+                                rows_by_labels.setdefault(tuple(labels[i] for i in label_positions), []) \
+                                              .append({"old_id": old_id, "props": {keys[k]: v for k, v in props.items()}})
+                            pending.add(executor.submit(self._import_snapshot_nodes, rows_by_labels))
+
+                        elif kind == "relationships":
+                            if not nodes_done:
+                                collect(wait(pending).done)     # All the nodes must be in place first
+                                pending = set()
+                                nodes_done = True
+                            rows_by_name = {}       # Lists of {"from": int, "to": int, "props": dict}, indexed by rel name
+                            for (from_id, to_id, type_position, props) in payload["rows"]:
+                                if (from_id not in id_map) or (to_id not in id_map):
+                                    raise Exception(f"a relationship `{rel_types[type_position]}` links nodes with id's "
+                                                    f"{from_id} and {to_id}, but not both of them are in the snapshot")
+                                rows_by_name.setdefault(rel_types[type_position], []) \
+                                            .append({"from": id_map[from_id], "to": id_map[to_id],
+                                                     "props": {keys[k]: v for k, v in props.items()}})
+                            pending.add(executor.submit(self._import_snapshot_relationships, rows_by_name))
+
+                        if len(pending) >= 2 * workers:     # Limit the number of segments held in memory
+                            (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+
+                    collect(wait(pending).done)
+
+                except Exception as ex:
+                    for future in pending:
+                        future.cancel()
+                    raise Exception(f"import_snapshot(): the import was INTERRUPTED after importing "
+                                    f"{stats['nodes']} node(s) and {stats['relationships']} relationship(s). Reason: {ex}")
+
+        if end is None:
+            raise Exception(f"import_snapshot(): the snapshot file `{filename}` is truncated.  "
+                            f"Imported {stats['nodes']} node(s) and {stats['relationships']} relationship(s)")
+
+        stats["elapsed"] = time.perf_counter() - start_time
+        return stats
+
+
+
+    def _import_snapshot_nodes(self, rows_by_labels :dict) -> [(int, int)]:
+        """
+        Helper for import_snapshot(), to import a segment of nodes
+
+        :param rows_by_labels:  Lists of {"old_id": int, "props": dict}, indexed by tuples of node labels
+        :return:                List of pairs (id in the snapshot, new internal database id)
+        """
+        id_pairs = []
+        for labels, rows in rows_by_labels.items():
+            id_pairs += self._create_nodes_with_old_ids(labels, rows)
+
+        return id_pairs
+
+
+
+    def _import_snapshot_relationships(self, rows_by_name :dict) -> int:
+        """
+        Helper for import_snapshot(), to import a segment of relationships
+
+        :param rows_by_name:    Lists of {"from": int, "to": int, "props": dict}, indexed by relationship name;
+                                    "from" and "to" are internal database id's
+        :return:                The number of relationships created
+        """
+        return sum(self._create_relationships_by_ids(rel_name, rows) for rel_name, rows in rows_by_name.items())
+
+
+
+    def _snapshot_frames(self, f, msgpack):
+        """
+        Helper generator for import_snapshot().  Read the frames of a snapshot file, and yield their decoded data
+
+        :param f:       A file object, opened in binary mode, positioned at the start of a frame
+        :param msgpack: The msgpack module
+        :return:        A generator of dicts
+        """
+        while True:
+            prefix = f.read(4)
+            if len(prefix) < 4:
+                return          # End of file (a truncated file gets caught by the lack of an "end" frame)
+
+            length = int.from_bytes(prefix, "big")
+            data = f.read(length)
+            if len(data) < length:
+                return          # Truncated frame
+
+            yield msgpack.unpackb(zlib.decompress(data), ext_hook=self._snapshot_ext_hook,
+                                  raw=False, strict_map_key=False)
+
+
+
+    @classmethod
+    def _snapshot_default(cls, value):
+        """
+        Used by msgpack to serialize the values that it doesn't natively handle, namely the temporal types of the database
+
+        :param value:   A value from a database property.  EXAMPLE: neo4j.time.DateTime(2015, 8, 15, 1, 2, 3, 0)
+        :return:        A msgpack.ExtType object
+        """
+        code = cls.SNAPSHOT_TEMPORAL_CODES.get(type(value))
+        if code is None:
+            raise Exception(f"export_snapshot(): values of type {type(value)} cannot be saved in snapshots")
+
+        msgpack = cls._import_msgpack()
+        return msgpack.ExtType(code, value.iso_format().encode("utf-8"))
+
+
+
+    @classmethod
+    def _snapshot_ext_hook(cls, code :int, data :bytes):
+        """
+        Used by msgpack to de-serialize the extension types created by _snapshot_default()
+
+        :param code:    The code of the extension type (see SNAPSHOT_TEMPORAL_CODES)
+        :param data:    The ISO format of the value, as bytes
+        :return:        A value of one of the temporal types of the database
+        """
+        for temporal_type, temporal_code in cls.SNAPSHOT_TEMPORAL_CODES.items():
+            if temporal_code == code:
+                return temporal_type.from_iso_format(data.decode("utf-8"))
+
+        raise Exception(f"import_snapshot(): unknown extension type ({code}) in the snapshot")
+
 
 
 
@@ -3117,6 +5620,761 @@ class GraphAccess(InterGraph):
 
 
 
+    #####################################################################################################
+
+    '''                                      ~   QUERY CACHE   ~                                         '''
+
+    def ________QUERY_CACHE________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    query_cache = None      # A QueryCache object, while the cache is enabled;  see enable_cache()
+
+
+    def enable_cache(self, max_entries=1000, max_bytes=50_000_000, ttl=60) -> None:
+        """
+        Start caching (in memory) the results of some frequently-repeated reads:
+        get_labels(), get_relationship_types(), count_nodes(), get_record_by_primary_key() and get_node_labels()
+
+        Each cached result is tagged with the node labels (or relationship types) that it depends on,
+        and it gets automatically discarded whenever a write method of this object
+        (create_node(), merge_node(), set_fields(), delete_nodes(), add_links(), etc.) touches any of them.
+        Writes whose scope isn't known - for example, from update_query(), or on nodes located by internal ID -
+        discard the entire cache.
+        Reads inside a transaction() block bypass the cache; and, if the block writes to the database,
+        the affected entries are discarded again when it ends.
+
+        IMPORTANT: changes made to the database by OTHER objects or processes won't be detected;
+                   the `ttl` argument limits for how long stale results may be returned
+
+        EXAMPLE:
+            db.enable_cache(max_entries=500, ttl=30)
+            db.count_nodes("Car")       # Runs a query
+            db.count_nodes("Car")       # From the cache
+            db.create_node("Car", {"vin": 123})
+            db.count_nodes("Car")       # Runs a query again
+            db.cache_stats()            # {"hits": 1, "misses": 2, "evictions": 0, "expirations": 0, "invalidations": 1, ...}
+
+        :param max_entries: [OPTIONAL] Max number of cached results; the least-recently used ones get evicted
+        :param max_bytes:   [OPTIONAL] Approximate bound on the memory used by the cached results;  None means no bound
+        :param ttl:         [OPTIONAL] Number of seconds after which cached results expire;  None means never
+        :return:            None
+        """
+        self.query_cache = QueryCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+
+
+    def disable_cache(self) -> None:
+        """
+        Stop caching query results, and discard any cached ones
+
+        :return:    None
+        """
+        self.query_cache = None
+
+
+
+    def cache_stats(self) -> dict|None:
+        """
+        Return the usage statistics of the query cache - see QueryCache.stats()
+
+        :return:    A dict;  or None if the cache isn't enabled
+        """
+        if self.query_cache is None:
+            return None
+
+        return self.query_cache.stats()
+
+
+
+    def get_labels(self) -> [str]:
+        """
+        Extract and return a list of ALL the labels present in the database, in no particular order.
+        Same as the method in the base class, but making use of the query cache, if enabled
+
+        :return:    A list of strings
+        """
+        return self._cached_read(("get_labels", ""), compute=super().get_labels)     # It depends on the entire database
+
+
+
+    def _cached_read(self, key :tuple, compute, tags=None):
+        """
+        Return the result of the given read operation, from the query cache if available there;
+        otherwise, compute it, and (if the cache is enabled) store it in the cache.
+        Values get copied in and out of the cache, so that callers may freely modify them
+
+        :param key:     A tuple that uniquely identifies the read operation.  EXAMPLE: (Cypher query, repr of its data binding)
+        :param compute: Function with no arguments, that carries out the read operation
+        :param tags:    [OPTIONAL] List or set of the node labels (or relationship tags, see _rel_tag())
+                            that the result depends on;  alternatively, a function that takes the result
+                            and returns such a list.  If None or empty, the result depends on the entire database
+        :return:        The result of the read operation
+        """
+        cache = self.query_cache
+        if (cache is None) or self.in_transaction():
+            return compute()        # Don't let uncommitted data into the cache
+
+        (found, value) = cache.get(key)
+        if found:
+            return copy.deepcopy(value)
+
+        value = compute()
+        if callable(tags):
+            tags = tags(value)
+
+        cache.put(key, copy.deepcopy(value), tags=tags)
+        return value
+
+
+
+    @contextmanager
+    def _writes_to(self, tags):
+        """
+        Context manager to declare the node labels (or relationship tags, see _rel_tag() )
+        touched by the database writes in its block (by this thread), so that only the cached results
+        depending on them will get discarded.  Writes outside any such block discard the entire cache.
+        Note: ALL the labels of the nodes being changed must be declared, not just the ones used to locate them;
+              if they aren't known (for example, for writes to nodes located by a match), pass None
+
+        EXAMPLE:
+            with self._writes_to(["Car"]):
+                self.update_query("CREATE (:Car {vin: 123})")
+
+        :param tags:    A string, or list/tuple/set of strings;  None means: unknown (i.e. everything)
+        :return:        None
+        """
+        previous = getattr(self._scope, "cache_write_tags", None)
+        self._scope.cache_write_tags = self._label_tags(tags)
+        try:
+            yield
+        finally:
+            self._scope.cache_write_tags = previous
+
+
+
+    def _invalidate_cache(self) -> None:
+        """
+        Discard the cached results affected by a database write (by this thread) - see _writes_to().
+        If inside a transaction() block, also remember which ones, to discard them again when the block ends
+
+        :return:    None
+        """
+        if self.query_cache is None:
+            return
+
+        tags = getattr(self._scope, "cache_write_tags", None)
+        self.query_cache.invalidate(tags)
+
+        pending = getattr(self._scope, "cache_pending_tags", None)
+        if pending is not None:
+            pending.append(tags)
+
+
+
+    def _note_write(self) -> None:
+        """
+        Same as the method in the base class, but also invalidating the query cache, if enabled
+
+        :return:    None
+        """
+        super()._note_write()
+        self._invalidate_cache()
+
+
+
+    def _execute(self, q :str, data_binding, fetch, count_rows=len):
+        """
+        Same as the method in the base class, but, after write queries, invalidating the query cache again
+        (in case another thread cached results from the database while the write was in progress),
+        and recording them in the change log, if enabled - serialized before they're run,
+        and logged in the order of their commits
+        """
+        if ((self.query_cache is None) and (self.change_log is None)) or self.is_read_only_query(q):
+            return super()._execute(q, data_binding, fetch, count_rows=count_rows)
+
+        log = self.change_log
+        summary = {}        # To receive the counters and returned ID's of the query, if the change log is enabled
+        if log is not None:
+            # Serialize the query before running it, so that a write that cannot be logged doesn't get made
+            summary["encoded"] = ChangeLog.encode(q, data_binding)
+            # Unless in a transaction() block, keep the order lock from just before the commit
+            # until the write is logged, so that the log follows the order of the commits
+            order_lock = None if self.in_transaction() else self._change_log_order_lock
+            fetch = self._counting_fetch(fetch, summary, id_columns=self._returned_id_columns(q), order_lock=order_lock)
+
+        try:
+            fetched = super()._execute(q, data_binding, fetch, count_rows=count_rows)
+            if log is not None:
+                self._log_change(summary["encoded"], counters=summary.get("counters"), ids=summary.get("ids"))
+        finally:
+            if summary.get("locked"):
+                summary["locked"] = False
+                self._change_log_order_lock.release()
+            self._invalidate_cache()
+
+        return fetched
+
+
+
+    def _stream_records(self, q :str, data_binding=None, fetch_size=None):
+        """
+        Same as the method in the base class, but, once all the records of a write query have been consumed,
+        recording it in the change log, if enabled
+        """
+        if (self.change_log is None) or self.is_read_only_query(q):
+            yield from super()._stream_records(q, data_binding, fetch_size=fetch_size)
+            return
+
+        encoded = ChangeLog.encode(q, data_binding)     # Before the write, in case it cannot be logged
+        yield from super()._stream_records(q, data_binding, fetch_size=fetch_size)
+
+        if self.change_log is not None:
+            self._log_change(encoded, counters=None, ids=None)  # The counters and ID's aren't available here
+
+
+
+    # The methods above that merely pass queries along, and that shouldn't show up as the callers in the query stats
+    _QUERY_PLUMBING = (_execute.__code__, _stream_records.__code__, _cached_read.__code__)
+
+
+
+    @contextmanager
+    def transaction(self):
+        """
+        Same as the method in the base class, but, when the outermost block ends,
+        invalidating once more all the cached results affected by the writes in it
+        (in case other threads cached results from the database before the commit);
+        also, if the change log is enabled, recording the writes in the block only if it gets committed
+
+        :return:    A neo4j.Transaction object  (typically not needed by the caller)
+        """
+        if self.in_transaction():
+            with super().transaction() as tx:
+                yield tx        # Join the already-active transaction
+            return
+
+        self._scope.cache_pending_tags = []     # List of the tags of all the writes in the block (None for unknown)
+        self._scope.change_log_pending = []     # List of the change-log entries of all the writes in the block
+        locked = False
+        try:
+            with super().transaction() as tx:
+                yield tx
+                if self._scope.change_log_pending and (self.change_log is not None):
+                    # Keep the order lock from just before the commit until the writes are logged
+                    self._change_log_order_lock.acquire()
+                    locked = True
+            # If we get here, the transaction was committed
+            if self._scope.change_log_pending and (self.change_log is not None):
+                self.change_log.append(self._scope.change_log_pending)
+        finally:
+            if locked:
+                self._change_log_order_lock.release()
+            self._scope.change_log_pending = None
+            pending = self._scope.cache_pending_tags
+            self._scope.cache_pending_tags = None
+            if pending and (self.query_cache is not None):
+                if None in pending:
+                    self.query_cache.invalidate()
+                else:
+                    self.query_cache.invalidate(set().union(*pending))
+
+
+
+    @staticmethod
+    def _label_tags(labels) -> frozenset|None:
+        """
+        Turn the given label(s) into a set of cache tags
+
+        :param labels:  A string, or list/tuple/set of strings, or None
+        :return:        A frozenset of strings;  or None if no labels were given
+        """
+        if not labels:
+            return None
+        if type(labels) == str:
+            return frozenset([labels])
+
+        return frozenset(labels)
+
+
+
+    @staticmethod
+    def _rel_tag(rel_name :str) -> str:
+        """
+        Return the cache tag for writes to relationships of the given type.
+        (No cached result depends on a specific relationship type, so this merely
+        ensures that only the results that depend on the entire database get discarded)
+
+        :param rel_name:    The name of a relationship type
+        :return:            A string.  EXAMPLE: "rel:OWNS"
+        """
+        return f"rel:{rel_name}"
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   CHANGE LOG   ~                                          '''
+
+    def ________CHANGE_LOG________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    change_log = None       # A ChangeLog object, while the change log is enabled;  see enable_change_log()
+    _change_log_order_lock = None   # Held from just before the commit of a logged write, until it gets logged
+
+
+    def enable_change_log(self, directory :str, max_segment_bytes=64_000_000, fsync=False) -> ChangeLog:
+        """
+        Start recording, in an append-only log on disk, all the write queries run by this object:
+        from the methods of this class (node creation/update/deletion, links, indexes and constraints, imports, etc.),
+        from the schema-layer classes (such as GraphSchema) that use it, and from update_query()/query().
+        Each write gets a sequence number, so that later the changes in any range
+        can be exported with ChangeLog.export_range() (for incremental backups),
+        or replayed onto another database with apply_changes() (for example, to keep a replica in sync.)
+
+        The changes are logged as the Cypher queries that made them, with their parameters,
+        after they succeed;  writes inside a transaction() block get logged only when the block commits.
+        The parameters are serialized before the query is run:  a write whose parameters cannot be stored
+        in the log raises an Exception, without being made.
+        The writes of this object are logged in the order of their commits (at the cost of the commits of
+        concurrent threads taking place one at a time, while the log is enabled.)
+        The internal database ID's returned by the queries (as in "RETURN id(n) AS _internal_id")
+        are logged as well, so that the replays can translate them - see apply_changes()
+
+        IMPORTANT: - many queries locate nodes by their internal database ID's, so the replays are only meaningful
+                        on a database that started out as a physical copy of this one
+                        (restored from a backup or a store dump), with the same internal ID's
+                        - see apply_changes() for how the ID's of the nodes created afterward are handled
+                   - queries whose results depend on the time or on randomness (e.g. timestamp() or randomUUID())
+                        won't give identical results when replayed
+                   - changes made to the database by OTHER objects or processes aren't logged
+
+        EXAMPLE:
+            log = db.enable_change_log("/backups/change_log")
+            db.create_node("Car", {"vin": 123})
+            log.last_seq()                  # 1
+            log.export_range("/backups/changes_1.jsonl.gz", first_seq=1)
+
+        :param directory:           Name of the directory for the log files (created if needed.)  If it already
+                                        contains a log, the new entries are appended to it
+        :param max_segment_bytes:   [OPTIONAL] Size after which a new log file is started - see ChangeLog
+        :param fsync:               [OPTIONAL] If True, force each log write to disk - see ChangeLog
+        :return:                    The ChangeLog object (also available as the `change_log` attribute)
+        """
+        self._change_log_order_lock = threading.Lock()
+        self.change_log = ChangeLog(directory, max_segment_bytes=max_segment_bytes, fsync=fsync)
+        return self.change_log
+
+
+
+    def disable_change_log(self) -> None:
+        """
+        Stop recording the write queries, and close the log files
+
+        :return:    None
+        """
+        if self.change_log is not None:
+            self.change_log.close()
+        self.change_log = None
+
+
+
+    def apply_changes(self, source, first_seq=None, last_seq=None, verify=True, batch_size=500, id_map=None) -> dict:
+        """
+        Replay onto this database the changes recorded in a change log (see enable_change_log()), in order.
+        Each batch of changes is run in a single transaction.
+
+        The nodes created by the replays generally get different internal database ID's than in the original database;
+        the ID's returned by the logged queries are used to build a map from the original ID's to the new ones,
+        which then gets used to translate the ID's in the parameters of the later queries
+        (including the lists of rows passed to UNWIND.)  The text of the queries is never altered:
+        a query with the ID of a replayed node written as a literal value in its text stops the replay with an Exception.
+        The ID's that aren't in the map are taken to be those of nodes that existed in both databases from the start.
+        If a logged query created nodes without returning their ID's (for example, a bulk import), then those
+        nodes can't be located by ID anymore: the first later query that uses an ID not in the map
+        stops the replay with an Exception - at which point, a new full copy of the database is needed.
+
+        If `verify` is True, the statistics of each replayed query (number of nodes created, properties set, etc.),
+        as well as the number of ID's returned, get compared with the logged ones;  any difference means that
+        this database has diverged from the original one (for example, because it wasn't a copy of it,
+        or because a change got skipped), and the replay stops, with an Exception, after rolling back the current batch.
+
+        EXAMPLE - keeping a replica in sync (`last_applied` and `id_map` must be persisted by the caller between runs):
+            replica = GraphAccess(host=..., credentials=...)
+            stats = replica.apply_changes(primary.change_log, first_seq=last_applied + 1, id_map=id_map)
+            last_applied = stats["last_seq"]
+
+        EXAMPLE - restoring incremental backups, after restoring the full backup that preceded them:
+            id_map = {}
+            db.apply_changes("/backups/changes_1.jsonl.gz", id_map=id_map)
+            db.apply_changes("/backups/changes_5001.jsonl.gz", id_map=id_map)
+
+        :param source:      EITHER a ChangeLog object, OR the name of a file created by ChangeLog.export_range()
+                                (or of a segment file of a log)
+        :param first_seq:   [OPTIONAL] Sequence number of the first change to apply;
+                                by default, the first one in the source
+        :param last_seq:    [OPTIONAL] Sequence number of the last change to apply;  by default, the last one in the source
+        :param verify:      [OPTIONAL] If True (default), stop at the first change whose replay gives different statistics
+        :param batch_size:  [OPTIONAL] Number of changes to replay in each transaction
+        :param id_map:      [OPTIONAL] Dict that maps internal database ID's of the original database (as integers)
+                                to the ones of this database, as built by earlier calls (it's updated in place);
+                                it must be passed to the calls that replay the later changes.
+                                It also records, under the key "untracked_since", the sequence number of the first
+                                replayed change that created nodes without returning their ID's, if any
+        :return:            A dict with the keys "applied" (the number of changes replayed),
+                                "last_seq" (the sequence number of the last one; None if none was)
+                                and "id_map" (the map of the ID's, same as the argument, if passed)
+        """
+        assert type(batch_size) == int and batch_size >= 1, \
+            "apply_changes(): argument `batch_size` must be an integer >= 1"
+
+        if id_map is None:
+            id_map = {}
+
+        if isinstance(source, ChangeLog):
+            entries = source.read(first_seq=first_seq, last_seq=last_seq)
+        elif type(source) == str:
+            entries = (entry for entry in ChangeLog.read_file(source)
+                       if (first_seq is None or entry["seq"] >= first_seq) and (last_seq is None or entry["seq"] <= last_seq))
+        else:
+            raise Exception(f"apply_changes(): argument `source` must be a ChangeLog object or a file name; "
+                            f"value passed was of type {type(source)}")
+
+        stats = {"applied": 0, "last_seq": None, "id_map": id_map}
+        batch = []
+        expected_seq = first_seq        # None means: any (for the first change)
+        for entry in entries:
+            if (expected_seq is not None) and (entry["seq"] != expected_seq):
+                raise Exception(f"apply_changes(): change {expected_seq} is missing from the source "
+                                f"(found change {entry['seq']} instead).  "
+                                f"Changes applied so far: up to {stats['last_seq']}")
+            expected_seq = entry["seq"] + 1
+            batch.append(entry)
+            if len(batch) == batch_size:
+                self._apply_change_batch(batch, verify=verify, id_map=id_map, last_applied=stats["last_seq"])
+                stats["applied"] += len(batch)
+                stats["last_seq"] = batch[-1]["seq"]
+                batch = []
+
+        if batch:
+            self._apply_change_batch(batch, verify=verify, id_map=id_map, last_applied=stats["last_seq"])
+            stats["applied"] += len(batch)
+            stats["last_seq"] = batch[-1]["seq"]
+
+        return stats
+
+
+
+    def _apply_change_batch(self, batch :[dict], verify :bool, id_map :dict, last_applied) -> None:
+        """
+        Helper for apply_changes().  Replay the given change-log entries in a single transaction,
+        translating the internal database ID's that they use - see _translate_ids().
+        The given map of ID's gets updated only if the transaction commits
+
+        :param batch:           A list of change-log entries
+        :param verify:          If True, raise an Exception (rolling back the transaction)
+                                    if the statistics of any replayed query differ from the logged ones
+        :param id_map:          Dict that maps the internal database ID's of the original database to those of this one
+        :param last_applied:    Sequence number of the last change already applied (only used in error messages)
+        :return:                None
+        """
+        new_ids = {}            # The additions to id_map from this batch
+        untracked_since = id_map.get("untracked_since")
+
+        def error_context(entry):
+            return f"Changes applied so far: up to {last_applied}.  Query: {entry['q'][:200]}"
+
+        with self.transaction():
+            for entry in batch:
+                q = entry["q"]
+                params, unmapped = self._translate_ids(q, entry["params"], lambda i: new_ids.get(i, id_map.get(i)))
+                if unmapped and (untracked_since is not None):
+                    raise Exception(f"apply_changes(): change {entry['seq']} uses internal database ID's "
+                                    f"{sorted(unmapped)[:10]} that might belong to nodes created by change "
+                                    f"{untracked_since} or later, whose ID's weren't logged; "
+                                    f"this database can no longer be kept in sync by replaying changes, "
+                                    f"and needs to be restored from a new full copy.  {error_context(entry)}")
+
+                result = self.update_query(q, params)
+
+                logged_ids = entry.get("ids") or {}
+                for (column, logged_values) in logged_ids.items():
+                    replayed_values = [row.get(column) for row in result.get("returned_data", [])]
+                    if verify and (len(replayed_values) != len(logged_values)):
+                        raise Exception(f"apply_changes(): the replay of change {entry['seq']} returned "
+                                        f"{len(replayed_values)} ID's in the column `{column}`, rather than "
+                                        f"{len(logged_values)}; the database has diverged from the logged one.  "
+                                        f"{error_context(entry)}")
+                    for (logged_id, replayed_id) in zip(logged_values, replayed_values):
+                        if (logged_id is not None) and (replayed_id is not None):
+                            new_ids[logged_id] = replayed_id
+
+                if (untracked_since is None) and self._creates_untracked_nodes(entry):
+                    untracked_since = entry["seq"]
+
+                logged_counters = entry.get("counters")
+                if not verify or logged_counters is None:
+                    continue
+
+                replayed_counters = self._nonzero_counters(result)
+                if replayed_counters != logged_counters:
+                    raise Exception(f"apply_changes(): the replay of change {entry['seq']} gave different results "
+                                    f"({replayed_counters}) than the original ({logged_counters}); "
+                                    f"the database has diverged from the logged one.  {error_context(entry)}")
+
+        # The transaction was committed
+        id_map.update(new_ids)
+        if untracked_since is not None:
+            id_map["untracked_since"] = untracked_since
+
+
+
+    def _log_change(self, encoded :str, counters, ids) -> None:
+        """
+        Record in the change log a write query that has just succeeded
+        (or, inside a transaction() block, save it for when the block commits.)
+        Queries that, according to their statistics, didn't change anything, aren't recorded
+
+        :param encoded:     A string with the query and its parameters, as returned by ChangeLog.encode()
+        :param counters:    A dict with the non-zero statistics of the query (see _nonzero_counters);
+                                None if not known
+        :param ids:         A dict with the values of the columns of internal database ID's returned by the query
+                                (see _returned_id_columns), or None
+        :return:            None
+        """
+        if counters == {}:
+            return          # Nothing was changed
+
+        entry = {"counters": counters, "encoded": encoded}
+        if ids:
+            entry["ids"] = ids
+
+        pending = getattr(self._scope, "change_log_pending", None)
+        if pending is not None:
+            pending.append(entry)
+        else:
+            self.change_log.append([entry])
+
+
+
+    @classmethod
+    def _counting_fetch(cls, fetch, summary :dict, id_columns=None, order_lock=None):
+        """
+        Wrap the given `fetch` function (see InterGraph._execute), so that it also saves
+        the statistics of the query into the given dict, under the key "counters",
+        and the values of the given columns of internal database ID's, under the key "ids".
+        If a lock is given, also acquire it (just once, even if the transaction gets retried)
+        before the transaction gets committed, and set the key "locked" of the dict to True
+
+        :param fetch:       Function that takes a neo4j.Result object, and returns whatever data is needed from it
+        :param summary:     A dict that will receive the counters (see _nonzero_counters;  None if not available),
+                                and the ID's (a dict of lists, indexed by column name;  None if not available)
+        :param id_columns:  [OPTIONAL] A dict whose keys are the names of columns of internal database ID's
+                                returned by the query - see _returned_id_columns()
+        :param order_lock:  [OPTIONAL] A threading.Lock object
+        :return:            A function
+        """
+        def counting_fetch(result):
+            fetched = fetch(result)
+            try:
+                summary["counters"] = cls._nonzero_counters(result.consume().counters.__dict__)
+            except Exception:
+                summary["counters"] = None
+            if id_columns:
+                summary["ids"] = cls._fetched_ids(fetched, list(id_columns))
+            if (order_lock is not None) and not summary.get("locked"):
+                order_lock.acquire()
+                summary["locked"] = True
+            return fetched
+
+        return counting_fetch
+
+
+
+    @staticmethod
+    def _fetched_ids(fetched, columns :[str]) -> dict|None:
+        """
+        Extract the values of the given columns from the data fetched by a query,
+        in any of the forms used by the query methods (see InterGraph._execute):
+        a list of dicts or of neo4j.Record objects, a pair (list of dicts, summary),
+        or a pair (column names, list of lists of values)
+
+        :param fetched: The data returned by the `fetch` function of a query
+        :param columns: List of column names
+        :return:        A dict of lists, indexed by column name;  or None if the data isn't in any of the above forms
+        """
+        if isinstance(fetched, tuple) and len(fetched) == 2:
+            (first, second) = fetched
+            if isinstance(first, (list, tuple)) and isinstance(second, list) and all(type(k) == str for k in first):
+                first = list(first)
+                return {col: [row[first.index(col)] for row in second] for col in columns if col in first}
+            fetched = first
+
+        if not isinstance(fetched, list):
+            return None
+
+        try:
+            return {col: [row[col] for row in fetched] for col in columns}
+        except (KeyError, TypeError, IndexError):
+            return None
+
+
+
+    # Regular expressions for the analysis of how queries use internal database ID's - see _translate_ids()
+    _ID_OPERAND = r"(\$\w+|\[[^\]]*\]|-?\d+\b|\w+(?:\.\w+)?)"      # EXAMPLES: $id , [1, 2] , 123 , row.id
+    _ID_COMPARISON = re.compile(r"(?<![\w.])id\(\s*(\w+)\s*\)\s*(?:=|<>|IN\b)\s*" + _ID_OPERAND, re.IGNORECASE)
+    _ID_COMPARISON_REVERSED = re.compile(r"(\$\w+|-?\d+\b)\s*(?:=|<>)\s*id\(\s*(\w+)\s*\)", re.IGNORECASE)
+    _ID_RETURNED = re.compile(r"(?<![\w.])id\(\s*(\w+)\s*\)\s+AS\s+(\w+)", re.IGNORECASE)
+    _PARAM_ALIAS = re.compile(r"\b(?:UNWIND|WITH)\s+\$(\w+)\s+AS\s+(\w+)", re.IGNORECASE)
+    _RELATIONSHIP_VARIABLE = re.compile(r"\[\s*(\w+)")
+    _CREATE_CLAUSE = re.compile(r"\b(?:CREATE|MERGE)\b(?!\s+(?:SET|INDEX|CONSTRAINT|OR)\b)(.*?)"
+                                r"(?=\b(?:MATCH|OPTIONAL|WITH|RETURN|SET|ON|UNWIND|WHERE|CREATE|MERGE|DELETE|DETACH|"
+                                r"REMOVE|FOREACH|CALL)\b|$)", re.IGNORECASE | re.DOTALL)
+    _NODE_PATTERN = re.compile(r"(?<![\w`])\(\s*(\w*)\s*(?=[:{)])")
+
+
+    @classmethod
+    def _returned_id_columns(cls, q :str) -> dict:
+        """
+        Locate the columns of internal database ID's of nodes returned by the given query
+
+        EXAMPLE:  "MATCH (r)-[e]->(n) RETURN id(n) AS _internal_id, id(e) AS rel_id"  gives  {"_internal_id": "n"}
+
+        :param q:   A string with a Cypher query
+        :return:    A dict whose keys are column names, and whose values are the names of the node variables
+        """
+        relationship_variables = set(cls._RELATIONSHIP_VARIABLE.findall(q))
+        return {column: variable for (variable, column) in cls._ID_RETURNED.findall(q)
+                if variable not in relationship_variables}
+
+
+
+    @classmethod
+    def _creates_untracked_nodes(cls, entry :dict) -> bool:
+        """
+        Determine whether the query of the given change-log entry created nodes
+        whose internal database ID's weren't returned (and thus logged)
+
+        :param entry:   A change-log entry
+        :return:        True if some nodes might have been created without logging their ID's
+        """
+        q = entry["q"]
+        counters = entry.get("counters")
+        if counters is not None:
+            if not counters.get("nodes_created"):
+                return False
+        elif not re.search(r"\b(CREATE|MERGE)\b", q, re.IGNORECASE):
+            return False        # Unknown counters, but no way to create nodes (short of procedures)
+
+        if (counters is None) or ("ids" not in entry):
+            return True
+
+        returned_variables = set(cls._returned_id_columns(q).values())
+        created_variables = []
+        for clause in cls._CREATE_CLAUSE.finditer(q):
+            earlier_text = q[:clause.start()]
+            for variable in cls._NODE_PATTERN.findall(clause.group(1)):
+                if (variable == "") or not re.search(rf"\b{variable}\b", earlier_text):
+                    created_variables.append(variable)      # Possibly a new node (not bound by earlier clauses)
+
+        if not created_variables:
+            return True         # Nodes got created in a way that isn't recognized (for example, by a procedure)
+
+        return not all(variable in returned_variables for variable in created_variables)
+
+
+
+    @classmethod
+    def _translate_ids(cls, q :str, params :dict, lookup) -> (dict, set):
+        """
+        Translate the internal database ID's of nodes that are used by the given query,
+        by means of the given function.  Only the parameters get translated: the text of the query is left as it is.
+        Recognized usages are comparisons such as:
+            id(n) = $id     id(n) IN $ids       $id = id(n)
+            id(n) = row.id  (with UNWIND $rows AS row)          id(n) = i   (with UNWIND $ids AS i)
+        Comparisons with values computed by the query itself (such as id(n) = id(m)) need no translation.
+        ID's written as literal values in the text (such as id(n) = 123) can't be translated:
+        an Exception is raised if any of them belongs to a node that got a different ID in this database
+
+        :param q:       A string with a Cypher query
+        :param params:  A Cypher dictionary
+        :param lookup:  Function that takes an ID of the original database, and returns the corresponding one
+                            in this database, or None if it's not known
+        :return:        The pair (translated parameters, set of the integer ID's
+                            that were left unchanged because `lookup` didn't know them)
+        """
+        unmapped = set()
+        params = copy.deepcopy(params) if params else {}
+        relationship_variables = set(cls._RELATIONSHIP_VARIABLE.findall(q))
+        aliases = {alias: param for (param, alias) in cls._PARAM_ALIAS.findall(q)}
+
+        def translate(value):
+            if (type(value) == int) or ((type(value) == str) and value.isdigit()):
+                translated = lookup(int(value))
+                if translated is None:
+                    unmapped.add(int(value))
+                    return value
+                return translated if type(value) == int else str(translated)
+            if isinstance(value, list):
+                return [translate(v) for v in value]
+            return value
+
+        params_to_translate = set()     # Pairs (parameter name, key in its row dicts, or None for the values themselves)
+
+        def note_operand(variable :str, operand :str) -> None:
+            if variable in relationship_variables:
+                return      # Relationships have ID's of their own, which aren't tracked
+            if operand.startswith("$"):
+                params_to_translate.add((operand[1:], None))
+            elif operand.startswith("[") or operand.lstrip("-").isdigit():
+                for literal in re.findall(r"-?\d+", operand):
+                    if translate(int(literal)) != int(literal):
+                        raise Exception(f"apply_changes(): the internal database ID {literal} is written as a literal "
+                                        f"value in the text of the query, and can't be translated; "
+                                        f"pass it as a query parameter instead.  Query: {q[:200]}")
+            else:
+                (alias, _, key) = operand.partition(".")
+                if alias in aliases:
+                    params_to_translate.add((aliases[alias], key or None))
+
+        for (variable, operand) in cls._ID_COMPARISON.findall(q):
+            note_operand(variable, operand)
+        for (operand, variable) in cls._ID_COMPARISON_REVERSED.findall(q):
+            note_operand(variable, operand)
+
+        for (name, key) in params_to_translate:
+            if name not in params:
+                continue
+            if key is None:
+                params[name] = translate(params[name])
+            else:
+                rows = params[name] if isinstance(params[name], list) else [params[name]]
+                for row in rows:
+                    if isinstance(row, dict) and (key in row):
+                        row[key] = translate(row[key])
+
+        return (params, unmapped)
+
+
+
+    @staticmethod
+    def _nonzero_counters(stats :dict) -> dict:
+        """
+        Extract the non-zero statistics from the given dictionary of query statistics
+
+        EXAMPLE:  {"nodes_created": 1, "properties_set": 2, "labels_added": 0, "_contains_updates": True, "returned_data": []}
+                        becomes {"nodes_created": 1, "properties_set": 2}
+
+        :param stats:   A dict, such as the one returned by update_query(),
+                            or the attributes of a neo4j.SummaryCounters object
+        :return:        A (possibly empty) dict
+        """
+        return {k: v for k, v in stats.items()
+                if (type(v) == int) and v and (not k.startswith("_")) and (k != "returned_data")}
+
+
+
     #####################################################################################################
 
     '''                                   ~   DEBUGGING SUPPORT   ~                                   '''
@@ -153,7 +153,7 @@ class GraphSchema:
         :return:    None
         """
 
-        assert type(db) == GraphAccess, \
+        assert isinstance(db, GraphAccess), \
             "GraphSchema.set_database(): argument passed isn't a valid `GraphAccess` object"
 
         cls.db = db
@@ -280,8 +280,8 @@ class GraphSchema:
 
 
         if create_index:
-            # Create an index and constraint for the pair (label=name, properties="entity_id")
-            cls.db.create_constraint(label=name, key="entity_id")
+            # Create an index and constraint for the pair (label=name, properties="entity_id"), unless already present
+            cls.db.ensure_index(label=name, key="entity_id", kind="unique", wait=False)
 
         return internal_id
 
@@ -526,19 +526,34 @@ class GraphSchema:
 
 
     @classmethod
-    def delete_class(cls, name :str, safe_delete=True) -> None:
+    def delete_class(cls, name :str, safe_delete=True, delete_data_nodes=False,
+                     batch_size=10000, pause=0, report=False) -> None:
         """
         Delete the given Class AND all its attached Properties.
         If safe_delete is True (highly recommended), then delete ONLY if there are no data nodes of that Class
         (i.e., linked to it by way of "_CLASS" relationships)
 
+        Optionally, first delete all the Data Nodes of the Class, a batch at a time
+        (each batch in its own transaction, so that even very large Classes can be deleted)
+
         :param name:        Name of the Class to delete
         :param safe_delete: Flag indicating whether the deletion is to be done
                                 only when no data node would be left "orphaned".
                                 CAUTION: if `safe_delete` is False,
                                          then Data Nodes may be left without a Schema
+        :param delete_data_nodes: [OPTIONAL] If True, all the Data Nodes of this Class get deleted first.  Default: False
+        :param batch_size:  [OPTIONAL] Only applicable if `delete_data_nodes` is True:
+                                max number of Data Nodes to delete in each transaction.  Default: 10000
+        :param pause:       [OPTIONAL] Only applicable if `delete_data_nodes` is True:
+                                number of seconds to wait between batches, to throttle the load on the database
+        :param report:      [OPTIONAL] Only applicable if `delete_data_nodes` is True:
+                                if True, print the progress of the deletion
         :return:            None.  In case of no node deletion, an Exception is raised
         """
+        if delete_data_nodes:
+            data_nodes = cls.db.match(labels=name, properties={"_CLASS": name})
+            cls.db.delete_nodes(data_nodes, batch_size=batch_size, pause=pause, report=report)
+
         # TODO: maybe eliminate the dangerous safe_delete=False option!
         # TODO: in case of failure, investigate further the problem
         #       (e.g. no class by that name vs. class has data points still attached to it)
@@ -2508,58 +2523,9 @@ class GraphSchema:
         #TODO: add argument `hide_schema`
         #TODO: provide a way to only return specific fields; maybe add argument `single_field` and/or `fields`
 
-        allowed_patters = ["CONTAINS", "STARTS WITH", "ENDS WITH"]
-        if string_match:
-            assert string_match in allowed_patters, \
-                "get_data_nodes_by_filter(): argument `string_match`, if specified, must be one of {allowed_patters}"
-
-
-        # Start preparing a Cypher query to extract the requested data
-
-        labels_str = CypherUtils.prepare_labels(labels)     # EXAMPLE: ":`my label`:`my other label`"
-
-        clause_list = []        # List of clauses that all must be satisfied (i.e. "AND" will go between them)
-                                # Each entry is a string that contains outer round parentheses
-                                # EXAMPLE:  "(n.`age` = 22)"
-        data_binding = {}
-
-        if key_names == []:
-            key_names = None
-
-        if (key_value is not None) and (key_value != ""):
-            assert key_names is not None, \
-                f"get_data_nodes_by_filter(): since argument `key_value` is present ({key_value}), then so must be `key_names`"
-
-        if (key_names is not None) and (key_names != ""):
-            assert key_value is not None, \
-                f"get_data_nodes_by_filter(): since argument `key_names` is present ({key_names}), then so must be `key_value`"
-
-            data_binding["key_value"] = key_value
-
-            if type(key_names) == list:
-                # Process each individual key name in turn, and put an OR between the Cypher fragments of them
-                or_list = [cls._process_key_name_value(key_name=name, key_value=key_value, string_match=string_match, case_sensitive=case_sensitive)
-                            for name in key_names]
-                clause = "(" + " OR ".join(or_list) + ")"
-                # EXAMPLE:  "((n.`color` = $key_value) OR (n.`trim` = $key_value))"
-                clause_list.append(clause)
-            else:
-                clause_list.append(cls._process_key_name_value(key_name=key_names, key_value=key_value,
-                                                               string_match=string_match, case_sensitive=case_sensitive))
-
-
-        if class_name is not None:
-            # The following validation is to remedy a Cypher/Neo4j bug
-            # about unexpected results when using "SKIP" and "LIMIT" together with a "ORDER BY" by an unknown field
-            if order_by is not None:
-                if "," not in order_by:    # "ORDER BY" is present and doesn't contain multiple parts
-                                           # (i.e. we're sorting by just one field)
-                    assert order_by in GraphSchema.get_class_properties(class_name=class_name, include_ancestors=True), \
-                        f"cannot sort recordset (of Class `{class_name}`) by the unknown Class Property `{order_by}`"
-
-            data_binding["class_name"] = class_name
-            clause_list.append("(n.`_CLASS` = $class_name)")
-
+        (labels_str, clause_list, data_binding) = \
+                cls._filter_clauses(class_name=class_name, labels=labels, key_names=key_names, key_value=key_value,
+                                    string_match=string_match, case_sensitive=case_sensitive, order_by=order_by)
 
         if clause_list == []:
             clause = ""
@@ -2637,6 +2603,100 @@ class GraphSchema:
 
 
 
+    @classmethod
+    def get_nodes_by_filter_page(cls, class_name=None, labels=None,
+                                 key_names=None, key_value=None,
+                                 string_match=None, case_sensitive=True,
+                                 include_id=False, include_labels=False,
+                                 order_key=None, cursor=None, limit=100,
+                                 approx_count=True) -> ([dict], str|None, int|None):
+        """
+        Paginated variant of get_nodes_by_filter(), whose cost does NOT grow with the depth of the page:
+        rather than using SKIP, each page resumes right after the last node of the previous one,
+        as identified by the opaque cursor returned along with it - see CypherUtils.keyset_clause()
+
+        The nodes are ordered by the given (preferably indexed) property, with their internal database ID to break ties;
+        or simply by internal database ID.  Nodes lacking the order-by property are left out.
+
+        EXAMPLE:
+            (page_1, cursor, total) = GraphSchema.get_nodes_by_filter_page(labels="Restaurants", order_key="name", limit=50)
+            (page_2, cursor, _) = GraphSchema.get_nodes_by_filter_page(labels="Restaurants", order_key="name", limit=50,
+                                                                       cursor=cursor, approx_count=False)
+
+        :param class_name:      [OPTIONAL] See get_nodes_by_filter()
+        :param labels:          [OPTIONAL] See get_nodes_by_filter()
+        :param key_names:       [OPTIONAL] See get_nodes_by_filter()
+        :param key_value:       [OPTIONAL] See get_nodes_by_filter()
+        :param string_match:    [OPTIONAL] See get_nodes_by_filter()
+        :param case_sensitive:  [OPTIONAL] See get_nodes_by_filter()
+        :param include_id:      [OPTIONAL] See get_nodes_by_filter()
+        :param include_labels:  [OPTIONAL] See get_nodes_by_filter()
+        :param order_key:       [OPTIONAL] Name of the node property to order by (in ascending order);
+                                    if None, order by internal database ID.
+                                    It must be the same in all the calls for the pages of a given search
+        :param cursor:          [OPTIONAL] The cursor returned by the previous call, to get the next page;
+                                    if None, the first page is returned
+        :param limit:           [OPTIONAL] An integer specifying the max number of items to return
+        :param approx_count:    [OPTIONAL] If True (default), also return the total number of nodes with the (first) given label,
+                                    NOT considering the remainder of the filter - which is instantly available
+                                    from the database's count store
+
+        :return:                A triplet with:
+                                    1. A (possibly-empty) list of dictionaries, as returned by get_nodes_by_filter()
+                                    2. The cursor for the next page, or None if there are no more pages
+                                    3. The approximate count (see the `approx_count` argument),
+                                        or None if not requested, or if no labels were given
+        """
+        assert (type(limit) == int) and (limit >= 1), \
+            f"get_nodes_by_filter_page(): the argument `limit` must be a positive integer (value passed: {limit})"
+
+        (labels_str, clause_list, data_binding) = \
+                cls._filter_clauses(class_name=class_name, labels=labels, key_names=key_names, key_value=key_value,
+                                    string_match=string_match, case_sensitive=case_sensitive)
+
+        (keyset_clause, order_by, keyset_data_binding) = CypherUtils.keyset_clause(order_key=order_key, cursor=cursor)
+        data_binding.update(keyset_data_binding)
+
+        # Note: the internal database ID is always needed, to create the cursor;
+        #       one extra node is requested, to find out whether any nodes are left for further pages
+        q = f'''
+            MATCH (n {labels_str})
+            {CypherUtils.prepare_where(clause_list + [keyset_clause])}
+            RETURN n, id(n) AS _internal_id
+            '''
+
+        if include_labels:
+            q += ''' , labels(n) AS _node_labels
+                 '''
+
+        q += f"ORDER BY {order_by} \n"
+        q += f"LIMIT {limit + 1}"
+
+        #cls.db.debug_query_print(q, data_binding)
+        result = cls.db.query(q, data_binding=data_binding)
+
+        recordset = cls.db.standardize_recordset(recordset=result[:limit])
+
+        if len(result) > limit:
+            last_record = recordset[-1]
+            next_cursor = CypherUtils.encode_cursor(order_key, key_value=result[limit - 1]["n"].get(order_key),
+                                                    internal_id=last_record["_internal_id"])
+        else:
+            next_cursor = None      # This is the last page
+
+        if not include_id:
+            for record in recordset:
+                del record["_internal_id"]
+
+        number_records = None
+        if approx_count and labels:
+            first_label = labels if type(labels) == str else labels[0]
+            number_records = cls.db.count_nodes(first_label)    # A single label, with no conditions, uses the count store
+
+        return (recordset, next_cursor, number_records)
+
+
+
     @classmethod
     def all_properties(cls, label :str, primary_key_name :str, primary_key_value) -> [str]:
         """
@@ -2879,6 +2939,81 @@ class GraphSchema:
 
 
 
+    @classmethod
+    def _filter_clauses(cls, class_name=None, labels=None, key_names=None, key_value=None,
+                        string_match=None, case_sensitive=True, order_by=None) -> (str, [str], dict):
+        """
+        Helper method for get_nodes_by_filter() and get_nodes_by_filter_page():
+        assemble the Cypher fragments to locate the nodes that match the given parameters
+
+        :param class_name:      See get_nodes_by_filter()
+        :param labels:          See get_nodes_by_filter()
+        :param key_names:       See get_nodes_by_filter()
+        :param key_value:       See get_nodes_by_filter()
+        :param string_match:    See get_nodes_by_filter()
+        :param case_sensitive:  See get_nodes_by_filter()
+        :param order_by:        [OPTIONAL] See get_nodes_by_filter(); only used for validation
+        :return:                A triplet with:  a string with the node labels (EXAMPLE: ":`my label`:`my other label`"),
+                                    a (possibly empty) list of the clauses that must all be satisfied,
+                                    and the data-binding dictionary for the clauses
+        """
+        allowed_patters = ["CONTAINS", "STARTS WITH", "ENDS WITH"]
+        if string_match:
+            assert string_match in allowed_patters, \
+                "get_data_nodes_by_filter(): argument `string_match`, if specified, must be one of {allowed_patters}"
+
+
+        # Start preparing a Cypher query to extract the requested data
+
+        labels_str = CypherUtils.prepare_labels(labels)     # EXAMPLE: ":`my label`:`my other label`"
+
+        clause_list = []        # List of clauses that all must be satisfied (i.e. "AND" will go between them)
+                                # Each entry is a string that contains outer round parentheses
+                                # EXAMPLE:  "(n.`age` = 22)"
+        data_binding = {}
+
+        if key_names == []:
+            key_names = None
+
+        if (key_value is not None) and (key_value != ""):
+            assert key_names is not None, \
+                f"get_data_nodes_by_filter(): since argument `key_value` is present ({key_value}), then so must be `key_names`"
+
+        if (key_names is not None) and (key_names != ""):
+            assert key_value is not None, \
+                f"get_data_nodes_by_filter(): since argument `key_names` is present ({key_names}), then so must be `key_value`"
+
+            data_binding["key_value"] = key_value
+
+            if type(key_names) == list:
+                # Process each individual key name in turn, and put an OR between the Cypher fragments of them
+                or_list = [cls._process_key_name_value(key_name=name, key_value=key_value, string_match=string_match, case_sensitive=case_sensitive)
+                            for name in key_names]
+                clause = "(" + " OR ".join(or_list) + ")"
+                # EXAMPLE:  "((n.`color` = $key_value) OR (n.`trim` = $key_value))"
+                clause_list.append(clause)
+            else:
+                clause_list.append(cls._process_key_name_value(key_name=key_names, key_value=key_value,
+                                                               string_match=string_match, case_sensitive=case_sensitive))
+
+
+        if class_name is not None:
+            # The following validation is to remedy a Cypher/Neo4j bug
+            # about unexpected results when using "SKIP" and "LIMIT" together with a "ORDER BY" by an unknown field
+            if order_by is not None:
+                if "," not in order_by:    # "ORDER BY" is present and doesn't contain multiple parts
+                                           # (i.e. we're sorting by just one field)
+                    assert order_by in GraphSchema.get_class_properties(class_name=class_name, include_ancestors=True), \
+                        f"cannot sort recordset (of Class `{class_name}`) by the unknown Class Property `{order_by}`"
+
+            data_binding["class_name"] = class_name
+            clause_list.append("(n.`_CLASS` = $class_name)")
+
+
+        return (labels_str, clause_list, data_binding)
+
+
+
     @classmethod
     def _process_key_name_value(cls, key_name :str, key_value, string_match=None, case_sensitive=True) -> str:
         """
@@ -3429,63 +3564,65 @@ class GraphSchema:
             f"NeoAccess.create_data_node(): The argument `links` must be a list or None; instead, it's of type {type(links)}"
 
 
-        # Obtain both the Class name and its the internal database ID of the Class schema node
-        class_internal_id = cls.get_class_internal_id(class_name)
+        # All the database operations below share a single session (or join an active one)
+        with cls.db.session_scope():
+            # Obtain both the Class name and its the internal database ID of the Class schema node
+            class_internal_id = cls.get_class_internal_id(class_name)
 
 
-        # Make sure that the specified Class accepts Data Nodes
-        assert cls.allows_data_nodes(internal_id=class_internal_id),\
-            f"GraphSchema.create_data_node(): addition of data nodes to Class `{class_name}` is not allowed by the Schema"
+            # Make sure that the specified Class accepts Data Nodes
+            assert cls.allows_data_nodes(internal_id=class_internal_id),\
+                f"GraphSchema.create_data_node(): addition of data nodes to Class `{class_name}` is not allowed by the Schema"
 
 
-        # Verify whether all the requested properties are allowed, and possibly trim them down
-        properties_to_set = cls.allowable_props(class_internal_id=class_internal_id, requested_props=properties,
-                                                silently_drop=silently_drop)
+            # Verify whether all the requested properties are allowed, and possibly trim them down
+            properties_to_set = cls.allowable_props(class_internal_id=class_internal_id, requested_props=properties,
+                                                    silently_drop=silently_drop)
 
 
-        # Prepare the list of labels to use on the new Data Node
-        labels = cls._prepare_data_node_labels(class_name=class_name, extra_labels=extra_labels)
+            # Prepare the list of labels to use on the new Data Node
+            labels = cls._prepare_data_node_labels(class_name=class_name, extra_labels=extra_labels)
 
 
-        # In addition to the passed properties for the new node, data nodes may contain a special attribute: "entity_id";
-        # if a value for `new_entity_id` was provided, expand `properties_to_set` accordingly
-        if new_entity_id is not None:
-            assert type(new_entity_id) == str, \
-                "create_data_node(): argument `new_entity_id`, if provided, must be a string"
+            # In addition to the passed properties for the new node, data nodes may contain a special attribute: "entity_id";
+            # if a value for `new_entity_id` was provided, expand `properties_to_set` accordingly
+            if new_entity_id is not None:
+                assert type(new_entity_id) == str, \
+                    "create_data_node(): argument `new_entity_id`, if provided, must be a string"
 
-            #print("URI assigned to new data node: ", new_entity_id)
-            properties_to_set["entity_id"] = new_entity_id                   # Expand the dictionary
+                #print("URI assigned to new data node: ", new_entity_id)
+                properties_to_set["entity_id"] = new_entity_id                   # Expand the dictionary
 
-            # EXAMPLE of properties_to_set at this stage:
-            #       {"make": "Toyota", "color": "white", "entity_id": "car-123"}
-            #       where "car-123" is the passed URI
+                # EXAMPLE of properties_to_set at this stage:
+                #       {"make": "Toyota", "color": "white", "entity_id": "car-123"}
+                #       where "car-123" is the passed URI
 
 
-        # TODO: perhaps merge the two approaches, node creation with and without links
-        if links is not None:
-            allowed_keys = {'internal_id', 'rel_name', 'rel_dir', 'rel_attrs'}
-            for d in links:
-                assert "internal_id" in d, \
-                    f"GraphSchema.create_data_node(): the `links` argument must be a list of dicts that contain the key '_internal_id'; the dict in question: {d}"
+            # TODO: perhaps merge the two approaches, node creation with and without links
+            if links is not None:
+                allowed_keys = {'internal_id', 'rel_name', 'rel_dir', 'rel_attrs'}
+                for d in links:
+                    assert "internal_id" in d, \
+                        f"GraphSchema.create_data_node(): the `links` argument must be a list of dicts that contain the key '_internal_id'; the dict in question: {d}"
 
-                assert "rel_name" in d, \
-                    f"GraphSchema.create_data_node(): the `links` argument must be a list of dicts that contain the key 'rel_name'; the dict in question: {d}"
+                    assert "rel_name" in d, \
+                        f"GraphSchema.create_data_node(): the `links` argument must be a list of dicts that contain the key 'rel_name'; the dict in question: {d}"
 
-                unexpected_keys = set(d) - allowed_keys     # Set difference.  It should be the empty set
+                    unexpected_keys = set(d) - allowed_keys     # Set difference.  It should be the empty set
 
-                assert unexpected_keys == set(), \
-                    f"GraphSchema.create_data_node(): the `links` argument must be a list of dicts whose keys are one of {allowed_keys}; the dict in question: {d}"
+                    assert unexpected_keys == set(), \
+                        f"GraphSchema.create_data_node(): the `links` argument must be a list of dicts whose keys are one of {allowed_keys}; the dict in question: {d}"
 
-            properties_to_set["_CLASS"] = class_name       # Expand the dictionary, to also include the Schema data
-            new_internal_id = cls.db.create_node_with_links(labels=labels,
-                                                            properties=properties_to_set,
-                                                            links=links, merge=False)
-        else:
-            new_internal_id = cls._create_data_node_helper(class_name=class_name,
-                                                           labels=labels,
-                                                           properties_to_set=properties_to_set)
+                properties_to_set["_CLASS"] = class_name       # Expand the dictionary, to also include the Schema data
+                new_internal_id = cls.db.create_node_with_links(labels=labels,
+                                                                properties=properties_to_set,
+                                                                links=links, merge=False)
+            else:
+                new_internal_id = cls._create_data_node_helper(class_name=class_name,
+                                                               labels=labels,
+                                                               properties_to_set=properties_to_set)
 
-        return new_internal_id
+            return new_internal_id
 
 
 
@@ -3728,14 +3865,14 @@ class GraphSchema:
             return 0            # Nothing to do!
 
         if type(data_node) == int:
-            where_clause =  f'WHERE id(n) = {data_node}'
+            where_clause =  'WHERE id(n) = $_internal_id'
         elif type(data_node) == str:
             where_clause =  f'WHERE n.entity_id = "{data_node}"'
         else:
             raise Exception("update_data_node(): the argument `data_node` must be an integer or a string")
 
 
-        data_binding = {}
+        data_binding = {"_internal_id": data_node} if type(data_node) == int else {}
         set_list = []
         remove_list = []
         for field_name, field_value in set_dict.items():            # field_name, field_value are key/values in set_dict
@@ -3790,6 +3927,68 @@ class GraphSchema:
 
 
 
+    @classmethod
+    def update_data_nodes_many(cls, class_name :str, updates :dict|pd.DataFrame, key_name="entity_id",
+                               drop_blanks=True, silently_drop=False, batch_size=10000, report=False) -> dict:
+        """
+        Bulk version of update_data_node(): update, possibly adding and/or dropping fields,
+        the properties of many existing Data Nodes of the given Class, each with its own values.
+        The fields are validated against the Schema just once, and the updates are applied in batches
+        - see GraphAccess.set_fields_many()
+
+        EXAMPLE:
+            update_data_nodes_many("Car", {"car-1": {"color": "white"}, "car-2": {"color": "red", "notes": ""}})
+
+        :param class_name:  The name of the Class that the Data Nodes are part of
+        :param updates:     EITHER a dict whose keys are values of the key property (or internal database ID's,
+                                if `key_name` is None), and whose values are dicts of field name/values;
+                            OR a Pandas dataframe with a column for the key property (or a column named "_internal_id",
+                                if `key_name` is None), and a column for each field to update.
+                            See GraphAccess.set_fields_many()
+        :param key_name:    [OPTIONAL] Name of the property used to locate the Data Nodes (by default, "entity_id");
+                                if None, use internal database ID's
+        :param drop_blanks: [OPTIONAL] If True (default), then any blank field is interpreted as a request to drop that property
+                                (as opposed to setting its value to "")
+        :param silently_drop:[OPTIONAL] If True, any fields not allowed by the Schema are simply dropped;
+                                otherwise, an Exception is raised if any field isn't allowed.
+                                Note: only applicable for "Strict" schema - otherwise, anything goes!
+        :param batch_size:  [OPTIONAL] Max number of Data Nodes to update with each query.  Default: 10000
+        :param report:      [OPTIONAL] If True, print the progress and throughput of the operation.  Default: False
+
+        :return:            A dict with the keys "rows", "nodes_updated" and "properties_set" -
+                                see GraphAccess.set_fields_many()
+        """
+        class_internal_id = cls.get_class_internal_id(class_name)
+
+        # Determine the names of all the fields being updated
+        if isinstance(updates, pd.DataFrame):
+            key_column = "_internal_id" if key_name is None else key_name
+            field_names = [name for name in updates.columns if name != key_column]
+        else:
+            assert type(updates) == dict, \
+                f"update_data_nodes_many(): the argument `updates` must be a dict or a Pandas dataframe (type passed: {type(updates)})"
+            field_names = list({name for set_dict in updates.values() for name in set_dict})
+
+        assert "_CLASS" not in field_names, \
+            "update_data_nodes_many(): the special field `_CLASS` cannot be updated"
+
+        # Validate all the fields against the Schema, just once
+        allowed_names = cls.allowable_props(class_internal_id=class_internal_id,
+                                            requested_props={name: None for name in field_names},
+                                            silently_drop=silently_drop)
+
+        if len(allowed_names) < len(field_names):   # Some fields need to be dropped
+            if isinstance(updates, pd.DataFrame):
+                updates = updates[[key_column] + list(allowed_names)]
+            else:
+                updates = {key: {name: value for (name, value) in set_dict.items() if name in allowed_names}
+                           for (key, set_dict) in updates.items()}
+
+        return cls.db.set_fields_many(updates, labels=class_name, key_name=key_name, drop_blanks=drop_blanks,
+                                      batch_size=batch_size, report=report)
+
+
+
     @classmethod
     def delete_data_nodes(cls, node_id=None, id_key=None, class_name=None) -> int:
         """
@@ -4117,7 +4316,7 @@ class GraphSchema:
         if type(node_id) == int:
             q = f'''
             {match} WHERE labels(n) <> ["CLASS", "PROPERTY" ]
-            AND id(n) = {node_id}
+            AND id(n) = $node_id
             DELETE r
             '''
         else:
@@ -4128,7 +4327,7 @@ class GraphSchema:
             '''
 
         #print(q)
-        cls.db.update_query(q)
+        cls.db.update_query(q, {"node_id": node_id})
 
 
 
@@ -4352,7 +4551,7 @@ class GraphSchema:
                             datetime_cols=None, int_cols=None,
                             extra_labels=None,
                             report=True, report_frequency=1,
-                            max_batch_size=1000) -> dict:
+                            max_batch_size=1000, workers=1) -> dict:
         """
         Import a group of entities (records), from the rows of a Pandas dataframe,
         as Data Nodes in the database.
@@ -4416,6 +4615,8 @@ class GraphSchema:
                                     to print out the status of the import-in-progress
 
         :param max_batch_size:  To limit the number of Pandas rows loaded into the database at one time
+        :param workers:         [OPTIONAL] Max number of batches to import concurrently;
+                                    only applicable if no primary_key is specified - see GraphAccess.run_batched()
 
         :return:                A dict with 2 keys:
                                     'number_nodes_created': the number of newly-created nodes
@@ -4508,112 +4709,214 @@ class GraphSchema:
         #df = cls.db.pd_datetime_to_neo4j_datetime(df)
 
 
-        internal_id_list = []       # Running list of the internal database ID's of the created or updated nodes
-                                    # (noted: "updated" doesn't necessarily entail changed)
-
-        created_node_count = 0      # Running list of the number of new nodes created
-
         # Determine the number of needed batches (always at least 1)
         number_batches = math.ceil(len(df) / max_batch_size)    # Note that if the max_chunk_size equals the size of df
                                                                 # then we'll just use 1 batch
         print(f"import_pandas_nodes(): importing {len(df)} records in {number_batches} batch(es) of size up to {max_batch_size}...")
 
-         # TODO: np.array_split is being phased out in favor of the approach used in import_pandas_links()
-        batch_list = np.array_split(df, number_batches)     # List of Pandas data frames,
-                                                            # each resulting from splitting the original data frame
-                                                            # into groups of rows
+        # Zap NaN's, blank strings, leading/trailing spaces, and convert the datetime and int columns:
+        # the work is done a column at a time, over chunks of rows, rather than cell by cell
+        scrubbed_records = cls._scrubbed_records(df, datetime_cols=datetime_cols, int_cols=int_cols,
+                                                 chunk_size=max_batch_size)
 
-        labels_str = CypherUtils.prepare_labels(labels)    # EXAMPLE:  ":`CAR`:`INVENTORY`"
 
-        # Process the primary keys, if any
-        primary_key_s = ''
+        # PERFORM THE ACTUAL IMPORT, in batches
+        return cls._import_data_node_rows(rows=scrubbed_records, class_name=class_name,
+                                          class_internal_id=class_internal_id, labels=labels,
+                                          primary_key=primary_key, duplicate_option=duplicate_option,
+                                          max_batch_size=max_batch_size, workers=workers,
+                                          report=report, report_frequency=report_frequency)
+
+
+
+    @classmethod
+    def import_parquet_nodes(cls, source, class_name: str,
+                             select=None, drop=None, rename=None,
+                             primary_key=None, duplicate_option="merge",
+                             datetime_cols=None, int_cols=None,
+                             extra_labels=None,
+                             report=True, report_frequency=1,
+                             max_batch_size=1000, workers=1) -> dict:
+        """
+        Counterpart of import_pandas_nodes(), for Parquet files (or Arrow tables):
+        import the rows as Data Nodes of the given Class, reading and converting the data
+        a batch of rows at a time, with vectorized operations - see GraphAccess.arrow_records()
+
+        Nulls, NaN's and blank strings are dropped - and never make it into the database;
+        leading and trailing blanks in strings are zapped.
+
+        Requires the optional library `pyarrow`
+
+        EXAMPLE:    import_parquet_nodes("/data/patients.parquet", class_name="patient",
+                                         primary_key="patient_id", datetime_cols="admitted")
+
+        :param source:      EITHER the name of a Parquet file, OR a pyarrow.Table object
+        :param class_name:  The name of a Class node already present in the Schema
+
+        :param select:      [OPTIONAL] Name of the column, or list of names, to import; all others will be ignored
+                                (Note: use the original column name prior to any rename done by this function, if applicable)
+        :param drop:        [OPTIONAL] Name of a column, or list of names, to ignore during import
+                                (Note: use the original column name prior to any rename, if applicable)
+                                If both arguments "select" and "drop" are passed, an Exception gets raised
+        :param rename:      [OPTIONAL] dictionary to rename the columns
+                                EXAMPLE {"current_name": "name_we_want"}
+        :param primary_key: [OPTIONAL] Name of a column that is to be regarded as a primary key
+                                (Note: use the original column name prior to any rename, if applicable).
+                                See import_pandas_nodes()
+        :param duplicate_option: Only applicable if primary_key is specified;
+                                if provided, must be "merge" (default) or "replace".  See import_pandas_nodes()
+        :param datetime_cols:   [OPTIONAL] String, or list/tuple of strings, of column name(s)
+                                    that contain datetime strings such as '2015-08-15 01:02:03'
+        :param int_cols:        [OPTIONAL] String, or list/tuple of strings, of column name(s)
+                                    that contain integers, or that are to be converted to integers
+        :param extra_labels:    [OPTIONAL] String, or list/tuple of strings, with label(s) to assign to the new Data nodes,
+                                    *IN ADDITION TO* the Class name (which is always used as label)
+        :param report:          [OPTIONAL] If True (default), print the status of the import-in-progress
+        :param report_frequency: [OPTIONAL] Only applicable if report is True;
+                                    how often (in terms of number of batches) to print out the status of the import-in-progress
+        :param max_batch_size:  [OPTIONAL] Number of rows read from the source, and imported, at a time
+        :param workers:         [OPTIONAL] Max number of batches to import concurrently;
+                                    only applicable if no primary_key is specified - see GraphAccess.run_batched()
+
+        :return:                A dict with 2 keys, 'number_nodes_created' and 'affected_nodes_ids' -
+                                    see import_pandas_nodes()
+        """
+        # Validations
+        cls.assert_valid_class_name(class_name)
+
+        assert (select is None) or (drop is None), \
+            "GraphSchema.import_parquet_nodes(): cannot specify both arguments `select` and `drop`"
+
+        if duplicate_option:
+            assert duplicate_option in ["merge", "replace"], \
+                "GraphSchema.import_parquet_nodes(): argument `duplicate_option`, " \
+                "if passed, must be either 'merge' or 'replace'"
+
+        # Determine the columns to import
+        columns = cls.db.arrow_column_names(source)
+        if select is not None:
+            columns = [select] if type(select) == str else list(select)
+        elif drop is not None:
+            drop = [drop] if type(drop) == str else drop
+            columns = [name for name in columns if name not in drop]
+
         if primary_key is not None:
-            primary_key_s = ' {' + f'`{primary_key}`:record[\'{primary_key}\']' + '}'
-            # EXAMPLE of primary_key_s , assuming that the argument `primary_key` is "patient_id":
-            #                           "{patient_id:record['patient_id']}"
-            # Note that "record" is a dummy name used in the Cypher query, further down
+            assert primary_key in columns, \
+                f"GraphSchema.import_parquet_nodes(): the requested primary_key (`{primary_key}`) " \
+                f"is not among the columns to import"
 
+        rename = rename or {}
+        if primary_key is not None:
+            primary_key = rename.get(primary_key, primary_key)     # Switch to the new name of the primary key, if applicable
 
-        # Import each batch of records (Pandas dataframe rows) in turn
-        if report:
-            print()
+        # Obtain the internal database ID of the Class node
+        class_internal_id = cls.get_class_internal_id(class_name)
 
-        for batch_count, df_chunk in enumerate(batch_list):         # Split the import operation into batches
-            # df_chunk is a Pandas data frame, with the same columns, but fewer rows, as the original data frame df
-            if report and ((batch_count+1) % report_frequency == 0):
-                print(f"   Importing batch # {batch_count+1} : {len(df_chunk)} row(s)")
+        # Make sure that the Class accepts Data Nodes
+        if not cls.allows_data_nodes(internal_id=class_internal_id):
+            raise Exception(f"GraphSchema.import_parquet_nodes(): "
+                            f"addition of data nodes to Class `{class_name}` is not allowed by the Schema")
 
-            record_list = df_chunk.to_dict(orient='records')    # Turn the Pandas dataframe into a list of dicts;
-                                                                # each dict contains the data for 1 row, with the properties to import
-                                                                # EXAMPLE: [{'col1': 1, 'col2': 0.5}, {'col1': 2, 'col2': 0.75}]
+        # Prepare the list of labels to use on the new Data Nodes
+        labels = cls._prepare_data_node_labels(class_name=class_name, extra_labels=extra_labels)
 
-            scrubbed_record_list = []
+        # Verify whether all properties are allowed
+        new_names = [rename.get(name, name) for name in columns]
+        class_properties = cls.get_class_properties(class_name=class_name, include_ancestors=True)
+        assert set(new_names) <= set(class_properties), \
+            f"import_parquet_nodes(): attempting to import columns " \
+            f"not declared in the Schema:  {set(new_names) - set(class_properties)}"
 
-            for d in record_list:               # d is a dictionary.  EXAMPLE: {'col1': 1, 'col2': 0.5}
-                d_scrubbed = cls.scrub_dict(d)          # Zap NaN's, blank strings, leading/trailing spaces
 
-                for dt_col in datetime_cols:
-                    if dt_col in d_scrubbed:
-                        dt_str = d_scrubbed[dt_col]     # EXAMPLE: '2015-08-15 01:02:03'
-                        dt_python = datetime.fromisoformat(dt_str)  # As a python "datetime" object
-                        # EXAMPLE: datetime.datetime(2015, 8, 15, 1, 2, 3)
-                        # TODO: maybe do a dataframe-wide op such as df = db.pd_datetime_to_neo4j_datetime(df) done in NeoAccess
-                        dt_neo = neo4j.time.DateTime.from_native(dt_python)    # In Neo4j format; TODO: let InterGraph handle this
-                        # EXAMPLE: neo4j.time.DateTime(2015, 8, 15, 1, 2, 3, 0)
-                        d_scrubbed[dt_col] = dt_neo     # Replace the original string value
+        def scrubbed_records():
+            # Read and scrub the data a batch of rows at a time, one column at a time
+            for batch in cls.db.arrow_batches(source, columns=columns, batch_size=max_batch_size):
+                for record in cls.db.arrow_records(batch, rename=rename, datetime_cols=datetime_cols, int_cols=int_cols):
+                    if (primary_key is None) or (primary_key in record):
+                        yield record        # Records lacking a value for the primary key are skipped
 
-                for col in int_cols:
-                    if col in d_scrubbed:
-                        val = d_scrubbed[col]           # This might be a float
-                        val_int = int(val)
-                        d_scrubbed[col] = val_int       # Replace the original value
 
-                scrubbed_record_list.append(d_scrubbed)
+        # PERFORM THE ACTUAL IMPORT, in batches
+        return cls._import_data_node_rows(rows=scrubbed_records(), class_name=class_name,
+                                          class_internal_id=class_internal_id, labels=labels,
+                                          primary_key=primary_key, duplicate_option=duplicate_option,
+                                          max_batch_size=max_batch_size, workers=workers,
+                                          report=report, report_frequency=report_frequency)
 
 
-            # PERFORM THE ACTUAL BATCH IMPORT
 
-            if not primary_key:     # Simpler scenario; just creation of new nodes
-                q = f'''
-                    MATCH (cl :CLASS)
-                    WHERE id(cl) = {class_internal_id} 
-                    WITH cl, $data AS data 
-                    UNWIND data AS record 
-                    CREATE (dn {labels_str}) 
-                    SET dn = record , dn.`_CLASS` = $class_name
-                    RETURN id(dn) AS _internal_id 
-                    '''
+    @classmethod
+    def _import_data_node_rows(cls, rows, class_name :str, class_internal_id :int|str, labels :[str],
+                               primary_key=None, duplicate_option="merge",
+                               max_batch_size=1000, workers=1, report=True, report_frequency=1) -> dict:
+        """
+        Helper function for import_pandas_nodes() and import_parquet_nodes():
+        create (or merge) Data Nodes of the given Class, from the given (already-scrubbed) records, in batches
+
+        :param rows:            An iterable of dicts, one per Data Node, with the properties to import
+        :param class_name:      The name of the Class of the Data Nodes
+        :param class_internal_id: The internal database ID of the Class node
+        :param labels:          List of the labels to use on the Data Nodes
+        :param primary_key:     [OPTIONAL] See import_pandas_nodes()
+        :param duplicate_option:[OPTIONAL] See import_pandas_nodes()
+        :param max_batch_size:  [OPTIONAL] Max number of records imported with each query
+        :param workers:         [OPTIONAL] See import_pandas_nodes()
+        :param report:          [OPTIONAL] See import_pandas_nodes()
+        :param report_frequency:[OPTIONAL] See import_pandas_nodes()
+
+        :return:                A dict with 2 keys, 'number_nodes_created' and 'affected_nodes_ids' -
+                                    see import_pandas_nodes()
+        """
+        labels_str = CypherUtils.prepare_labels(labels)    # EXAMPLE:  ":`CAR`:`INVENTORY`"
 
-            else:                   # More complex scenario possibly involving existing nodes
-                set_operator = "" if duplicate_option == "replace" else "+"
-
-                q = f'''
-                    MATCH (cl :CLASS)
-                    WHERE id(cl) = {class_internal_id} 
-                    WITH cl, $data AS data 
-                    UNWIND data AS record 
-                    MERGE (dn {labels_str} {primary_key_s}) 
-                    SET dn {set_operator}= record , dn.`_CLASS` = $class_name
-                    RETURN id(dn) AS _internal_id 
-                    '''
+        # Process the primary keys, if any
+        primary_key_s = ''
+        if primary_key is not None:
+            primary_key_s = ' {' + f'`{primary_key}`:record[\'{primary_key}\']' + '}'
+            # EXAMPLE of primary_key_s , assuming that the argument `primary_key` is "patient_id":
+            #                           "{patient_id:record['patient_id']}"
+            # Note that "record" is a dummy name used in the Cypher query, further down
 
+            # Without an index, each MERGE on the primary key would have to scan all the existing Data Nodes;
+            # if a new index needs to be created, wait for it to be populated
+            cls.db.ensure_index(label=class_name, key=primary_key)
 
-            result = cls.db.update_query(q, data_binding={"data": scrubbed_record_list, "class_name": class_name})
-            #cls.db.debug_query_print(q, data_binding={"data": scrubbed_record_list})
-            #print("    result of running batch =", result)
 
-            if result.get('nodes_created'):
-                created_node_count += result.get('nodes_created')
+        # Perform the actual import, in batches
+        if not primary_key:     # Simpler scenario; just creation of new nodes
+            q = f'''
+                MATCH (cl :CLASS)
+                WHERE id(cl) = $class_internal_id 
+                WITH cl 
+                UNWIND $rows AS record 
+                CREATE (dn {labels_str}) 
+                SET dn = record , dn.`_CLASS` = $class_name
+                RETURN id(dn) AS _internal_id 
+                '''
 
-            import_data = result['returned_data']
-            for import_item in import_data:
-                internal_id_list.append(import_item['_internal_id'])  # The internal database ID of the created or updated nodes
+        else:                   # More complex scenario possibly involving existing nodes
+            set_operator = "" if duplicate_option == "replace" else "+"
 
-            if report and ((batch_count+1) % report_frequency == 0):
-                print(f"     Interim status: at the end of this batch, imported a grand total of {len(internal_id_list)} record(s), and created a grand total of {created_node_count} new node(s)")
+            q = f'''
+                MATCH (cl :CLASS)
+                WHERE id(cl) = $class_internal_id 
+                WITH cl 
+                UNWIND $rows AS record 
+                MERGE (dn {labels_str} {primary_key_s}) 
+                SET dn {set_operator}= record , dn.`_CLASS` = $class_name
+                RETURN id(dn) AS _internal_id 
+                '''
 
-        # END for
+        result = cls.db.run_batched(q, rows=rows, batch_size=max_batch_size,
+                                    data_binding={"class_name": class_name, "class_internal_id": class_internal_id},
+                                    workers=workers,
+                                    report=report, report_frequency=report_frequency)
 
+        created_node_count = result["counters"].get("nodes_created", 0)     # The number of new nodes created
+
+        # The internal database ID's of the created or updated nodes
+        # (noted: "updated" doesn't necessarily entail changed)
+        internal_id_list = [import_item['_internal_id'] for import_item in result["returned_data"]]
 
         print(f"    FINISHED importing {len(internal_id_list)} record(s), and created {created_node_count} new node(s) in the process")
 
@@ -5010,120 +5313,75 @@ class GraphSchema:
                                                                 # then we'll just use 1 batch
         print(f"import_pandas_links(): importing {len(df)} links in {number_batches} batch(es) of max size {max_batch_size}...")
 
-        #batch_list = np.array_split(df, number_batches)    # List of Pandas data frames,
-                                                            # each resulting from splitting the original data frame
-                                                            # into groups of rows.  BAD APPROACH!  It turns int's into numpy.int64 :O
-
-        # EXAMPLE of *ONE* ELEMENT in the batch_list (batch_list is a list of them):
-        #       a Pandas data frame, with the same columns, but fewer rows, as the original data frame df
-        #print("\nbatch_list[0]:\n", batch_list[0])
-        #print("Data types of above batch:\n", batch_list[0].dtypes, "\n")
-        '''
-            city_id  state_id  rank region
-        0        1         1    53  north
-        1        3         1     4  north
-        '''
-
-        # Import each batch of records (Pandas dataframe rows) in turn
-        if report:
-            print()
-
         link_id_list = []
 
         number_of_recs = len(df)
 
-        batch_count = 1             # 1-based count for batches (just used in reporting)
-        chunk_size = math.ceil(number_of_recs / number_batches)  # EXAMPLES: 10 recs, 2 batches -> 5 ; 11 recs, 2 batches -> 6
-        row_start = 0               # 0-based indexing
-        row_end = chunk_size-1
-
-        #for batch_count, df_chunk in enumerate(batch_list):         # Split the import operation into batches
-        while(row_start < number_of_recs):      # 0-based indexing
-            if report and (batch_count % report_frequency == 0):
-                print(f"   Importing batch # {batch_count} : {chunk_size} row(s)")
-
-            #print(f"From row {row_start} to row {row_end} (both inclusive):\n")
-            #print(f"key_from: `{key_from}`, key_to: `{key_to}`, link_props: {link_props}")
-
-            link_list = cls._convert_df_chunk(df=df, row_start=row_start, row_end=row_end,
-                                              col_from=key_from, col_to=key_to, cols_other=link_props)
-            #link_list = cls._restructure_df(df=df_chunk, col_from=key_from, col_to=key_to, cols_other=link_props)
-                                # Turn the Pandas dataframe into a list of dicts;
-                                # each dict (originating from a row of the dataframe)
-                                # contains the data for 1 link.  The value for 'OTHER_FIELDS' is a (possibly-empty) dict
-                                # EXAMPLE: [{'FROM': 1, 'TO': 1, 'OTHER_FIELDS': {'rank': 53, 'region': 'north'}},
-                                #           {'FROM': 3, 'TO': 1, 'OTHER_FIELDS': {'rank': 4, 'region': 'north'}}]
-            #print("link_list:\n", link_list)
-
-
-            # *** PERFORM THE ACTUAL BATCH IMPORT ***
-
-            # For each element in the list prepare a Cypher query to link up a pairs of nodes
-            q = f'''
-                UNWIND $link_list AS link_dict
-                WITH link_dict
-                MATCH (from_node :`{class_from}` {{`{key_from}`: link_dict["FROM"]}}), 
-                      (to_node   :`{class_to}`   {{`{key_to}`  : link_dict["TO"]}})             
-                MERGE (from_node)-[r:`{link_name}`]->(to_node)
-                WITH r, link_dict["OTHER_FIELDS"] AS link_props
-                SET r += link_props
-                RETURN id(r) AS link_id
-                '''
-            # Note:  "SET r += link_props" works also when link_props in an empty dict
-            data_binding={"link_list": link_list}
-
-            # EXAMPLE of query:
-            '''
-                UNWIND $link_list AS link_dict
-                WITH link_dict
-                MATCH (from_node :`City`  {`city_id` : link_dict["FROM"]}), 
-                      (to_node   :`State` {`state_id`: link_dict["TO"]})             
-                MERGE (from_node)-[r:`IS_IN`]->(to_node)
-                WITH r, link_dict["OTHER_FIELDS"] AS link_props
-                SET r += link_props
-                RETURN id(r) AS link_id
-            '''
-            # EXAMPLE of data_binding:
-            '''
-                {'link_list': [
-                                {'FROM': 1, 'TO': 1, 'OTHER_FIELDS': {'rank': 53, 'region': 'north'}}, 
-                                {'FROM': 3, 'TO': 1, 'OTHER_FIELDS': {'rank': 4,  'region': 'north'}}
-                              ]
-                }
-            '''
-            #cls.db.debug_query_print(q, data_binding)
-
-            result = cls.db.update_query(q, data_binding=data_binding)
-            #print("    Result of running batch : ", result)
-            # EXAMPLE :  {'_contains_updates': True,
-            #             'relationships_created': 2, 'properties_set': 4,
-            #             'returned_data': [{'link_id': 11}, {'link_id': 12}]}
-
+        def link_rows():
+            # Turn the rows of the Pandas dataframe into dicts, a chunk of rows at a time;
+            # each dict (originating from a row of the dataframe)
+            # contains the data for 1 link.  The value for 'OTHER_FIELDS' is a (possibly-empty) dict
+            # EXAMPLE: {'FROM': 1, 'TO': 1, 'OTHER_FIELDS': {'rank': 53, 'region': 'north'}}
+            for row_start in range(0, number_of_recs, max_batch_size):      # 0-based indexing
+                row_end = min(row_start + max_batch_size, number_of_recs) - 1   # INCLUSIVE
+                yield from cls._convert_df_chunk(df=df, row_start=row_start, row_end=row_end,
+                                                 col_from=key_from, col_to=key_to, cols_other=link_props)
+
+
+        def check_batch(batch_number :int, link_list :[dict], result :dict) -> None:
+            # Invoked at the end of each batch
+            # EXAMPLE of result:  {'_contains_updates': True,
+            #                      'relationships_created': 2, 'properties_set': 4,
+            #                      'returned_data': [{'link_id': 11}, {'link_id': 12}]}
             if result.get('relationships_created') == len(link_list):   # If the expected number of links was created
-                import_data = result.get('returned_data')
-                # EXAMPLE of import_data:   [{'link_id': 11}, {'link_id': 12}]}
-                for import_item in import_data:
+                for import_item in result.get('returned_data'):
                     link_id_list.append(import_item['link_id'])  # The internal database ID of the created links
 
             else:                                                       # If fewer links than expected were created
-                error_msg = f"import_pandas_links(): in this batch import, " \
+                error_msg = f"import_pandas_links(): in the import of batch # {batch_number}, " \
                             f"only created {result.get('relationships_created', 0)} links, instead of the expected {len(link_list)}"
                 if skip_errors:
                     print(error_msg)
                 else:
                     raise Exception(error_msg)
 
-            if report and (batch_count % report_frequency == 0):
-                print(f"     Interim status: at the end of this batch, imported a grand total of {len(link_id_list)} link(s)")
 
-            batch_count += 1
+        # *** PERFORM THE ACTUAL IMPORT, in batches ***
 
-            row_start = row_end + 1
+        # For each element in the batch, link up a pairs of nodes
+        q = f'''
+            UNWIND $rows AS link_dict
+            WITH link_dict
+            MATCH (from_node :`{class_from}` {{`{key_from}`: link_dict["FROM"]}}), 
+                  (to_node   :`{class_to}`   {{`{key_to}`  : link_dict["TO"]}})             
+            MERGE (from_node)-[r:`{link_name}`]->(to_node)
+            WITH r, link_dict["OTHER_FIELDS"] AS link_props
+            SET r += link_props
+            RETURN id(r) AS link_id
+            '''
+        # Note:  "SET r += link_props" works also when link_props in an empty dict
 
-            row_end = row_start + chunk_size-1  # This will create a chuck of the desired size
-            if row_end >= number_of_recs:
-                row_end = number_of_recs-1      # The max value that row_end can take
-        # END for
+        # EXAMPLE of query:
+        '''
+            UNWIND $rows AS link_dict
+            WITH link_dict
+            MATCH (from_node :`City`  {`city_id` : link_dict["FROM"]}), 
+                  (to_node   :`State` {`state_id`: link_dict["TO"]})             
+            MERGE (from_node)-[r:`IS_IN`]->(to_node)
+            WITH r, link_dict["OTHER_FIELDS"] AS link_props
+            SET r += link_props
+            RETURN id(r) AS link_id
+        '''
+        # EXAMPLE of a batch of rows:
+        '''
+            [
+                {'FROM': 1, 'TO': 1, 'OTHER_FIELDS': {'rank': 53, 'region': 'north'}}, 
+                {'FROM': 3, 'TO': 1, 'OTHER_FIELDS': {'rank': 4,  'region': 'north'}}
+            ]
+        '''
+
+        cls.db.run_batched(q, rows=link_rows(), batch_size=max_batch_size,
+                           report=report, report_frequency=report_frequency, on_batch=check_batch)
 
 
         if report_frequency:
@@ -5256,6 +5514,98 @@ class GraphSchema:
 
 
 
+    @classmethod
+    def _scrubbed_records(cls, df :pd.DataFrame, datetime_cols=None, int_cols=None, chunk_size=10000):
+        """
+        Vectorized counterpart of running scrub_dict() on each row of a Pandas dataframe:
+        yield the rows of the dataframe as dicts, with string values trimmed of leading and trailing blanks,
+        and without the entries whose values are blank, NaN, None, NaT or pd.NA.
+        Optionally, also convert some of the columns to datetimes, or to integers.
+
+        The clean-up is carried out one column at a time, over chunks of rows,
+        so that the only per-row work left is assembling the (sparse) dicts.
+
+        EXAMPLE:    a dataframe with the columns "name", "born", "rank", and the row
+                        {"name": "  Julian ", "born": "2015-08-15 01:02:03", "rank": 4.0}
+                    with datetime_cols="born" and int_cols="rank", yields
+                        {"name": "Julian", "born": datetime(2015, 8, 15, 1, 2, 3), "rank": 4}
+                    while the row {"name": "   ", "born": NaN, "rank": 7.0} yields  {"rank": 7}
+
+        :param df:              A Pandas dataframe
+        :param datetime_cols:   [OPTIONAL] String, or list/tuple of strings, with the name(s) of the columns
+                                    to convert from strings (in ISO format) to python datetimes,
+                                    which the database driver stores as datetimes
+        :param int_cols:        [OPTIONAL] String, or list/tuple of strings, with the name(s) of the columns
+                                    to convert to integers (values with a fractional part get truncated)
+        :param chunk_size:      [OPTIONAL] Number of rows to process at a time.  Default: 10000
+        :return:                A generator of dictionaries, with (some of) the column names as keys
+        """
+        if type(datetime_cols) == str:
+            datetime_cols = [datetime_cols]
+        datetime_cols = set(datetime_cols or [])
+
+        if type(int_cols) == str:
+            int_cols = [int_cols]
+        int_cols = set(int_cols or [])
+
+        col_names = list(df.columns)
+
+        for row_start in range(0, len(df), chunk_size):
+            chunk = df.iloc[row_start : row_start + chunk_size]
+
+            # List of the cleaned-up values of each column in this chunk, with None for the values to omit
+            col_values = [cls._scrubbed_column(chunk.iloc[:, i],
+                                               as_datetime=(name in datetime_cols), as_int=(name in int_cols))
+                          for i, name in enumerate(col_names)]
+
+            for row_values in zip(*col_values):
+                yield {k: v for k, v in zip(col_names, row_values) if v is not None}
+
+
+
+    @classmethod
+    def _scrubbed_column(cls, column :pd.Series, as_datetime=False, as_int=False) -> list:
+        """
+        Clean up a column of a Pandas dataframe, as needed by _scrubbed_records()
+
+        EXAMPLE:    pd.Series(["  a ", "", float("nan"), 3])  gets turned into  ["a", None, None, 3]
+
+        :param column:      A Pandas Series
+        :param as_datetime: [OPTIONAL] If True, parse the values as ISO 8601 datetimes (in any mix of shapes and UTC offsets),
+                                and convert them to python "datetime" objects
+        :param as_int:      [OPTIONAL] If True, convert the values to integers (truncating any fractional part)
+        :return:            A list of python values, of the same length as the column;
+                                None is used for blank strings and missing values
+        """
+        missing = column.isna()     # Boolean mask of NaN, None, NaT and pd.NA
+
+        if (column.dtype == object) or pd.api.types.is_string_dtype(column.dtype):
+            try:
+                stripped = column.str.strip()   # Non-string values become NaN...
+            except AttributeError:
+                stripped = None                 # No string values at all
+            if stripped is not None:
+                column = stripped.where(stripped.notna(), column)   # ...and get their original values back
+                missing = missing | (column == "")                  # Blank strings are regarded as missing
+
+        if as_datetime:
+            # Python "datetime" objects (or NaT, masked below), which the database driver converts to its own format;
+            # timezone-aware values keep their UTC offsets, even if they differ from one another
+            parsed = GraphAccess.parse_iso_datetimes(column.where(~missing))
+            if pd.api.types.is_datetime64_any_dtype(parsed.dtype):
+                values = parsed.dt.to_pydatetime()
+            else:
+                values = parsed.tolist()        # Already python "datetime" objects, with different time zones
+        elif as_int:
+            numbers = pd.to_numeric(column.where(~missing))
+            values = np.trunc(numbers.fillna(0)).astype("int64").tolist()   # Missing values get masked below
+        else:
+            values = column.tolist()    # Python native types
+
+        return [None if m else v for v, m in zip(values, missing.tolist())]
+
+
+
     @classmethod
     def import_triplestore(cls, df :pd.DataFrame, class_node : int | str,
                            col_names = None, entity_id_prefix = None,
@@ -5406,10 +5756,10 @@ class GraphSchema:
         # Store the import date in the node with the metadata
         # Note: this is done as a separate step, so that the attribute will be a DATE ("LocalDate") field, not a text one
         q = f'''
-            MATCH (n :`Import Data`) WHERE id(n) = {metadata_neo_id}
+            MATCH (n :`Import Data`) WHERE id(n) = $metadata_neo_id
             SET n.date = date()
             '''
-        cls.db.update_query(q)
+        cls.db.update_query(q, {"metadata_neo_id": metadata_neo_id})
 
         # TODO: catch Exceptions, and store the status and error message on the `Import Data` node;
         #       in particular, add "Import Data" to the Schema if not already present
@@ -1,11 +1,20 @@
 from neo4j import GraphDatabase                         # The Neo4j python connectivity library "Neo4j Python Driver"
 from neo4j import __version__ as neo4j_driver_version   # The version of the Neo4j driver being used
-from neo4j.exceptions import ServiceUnavailable         # To catch inactivity timeout errors (new to v. 5 of Neo4j)
-from neo4j.time import DateTime                         # To convert datetimes (and dates) between neo4j.time.DateTime and python
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError  # Errors that may go away upon retrying
+from neo4j.time import DateTime, Date                   # To convert datetimes (and dates) between neo4j.time.DateTime and python
 import neo4j.graph                                      # To check returned data types
 import pandas as pd
 import os
 import sys
+import re
+import time
+import random
+import math
+import itertools
+import threading
+import warnings
+from collections import deque
+from contextlib import contextmanager
 
 
 '''
@@ -43,7 +52,20 @@ class InterGraph:
                  credentials=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")),
                  apoc=False,
                  debug=False,
-                 autoconnect=True):
+                 autoconnect=True,
+                 retry_max_attempts=5,
+                 retry_initial_delay=0.1,
+                 retry_max_delay=3.0,
+                 max_connection_pool_size=None,
+                 connection_acquisition_timeout=None,
+                 max_connection_lifetime=None,
+                 keep_alive=None,
+                 fetch_size=None,
+                 read_replicas=None,
+                 read_your_writes_window=5.0,
+                 read_your_writes_scope="global",
+                 slow_query_threshold=1.0,
+                 query_stats_window=1000):
         """
         If unable to create a Neo4j driver object, raise an Exception
         reminding the user to check whether the Neo4j database is running
@@ -59,6 +81,45 @@ class InterGraph:
         :param debug:       Flag indicating whether a debug mode is to be used :
                                 if True, all the Cypher queries, and some additional info, will get printed
         :param autoconnect  Flag indicating whether the class should establish connection to database at initialization
+        :param retry_max_attempts:  [OPTIONAL] Max number of times that a query is attempted, in case of transient errors
+                                        (such as deadlocks, cluster leader switches, or lost connections.)  Default: 5
+        :param retry_initial_delay: [OPTIONAL] Number of seconds to wait before the first retry; the wait
+                                        then grows exponentially, with some random jitter.  Default: 0.1
+        :param retry_max_delay:     [OPTIONAL] Max number of seconds to wait between any 2 attempts.  Default: 3
+
+        The following optional arguments tune the driver's pool of connections to the database;
+        if not specified (or None), the driver's default values are used.
+        See https://neo4j.com/docs/api/python-driver/4.4/api.html#driver-configuration
+        :param max_connection_pool_size:        [OPTIONAL] Max number of connections in the pool.  Driver default: 100
+        :param connection_acquisition_timeout:  [OPTIONAL] Max number of seconds to wait for a connection
+                                                    from the pool, when all are in use.  Driver default: 60
+        :param max_connection_lifetime:         [OPTIONAL] Number of seconds after which a pooled connection
+                                                    gets closed and replaced.  Driver default: 3600
+        :param keep_alive:                      [OPTIONAL] Flag indicating whether to use TCP keep-alive.  Driver default: True
+        :param fetch_size:                      [OPTIONAL] Number of records fetched in each batch
+                                                    from the database server.  Driver default: 1000
+
+        :param read_replicas:           [OPTIONAL] List of pairs (host, credentials), in the same format as the
+                                            `host` and `credentials` arguments, for databases that are read-only
+                                            replicas of the one at `host` (the "primary").
+                                            If provided, queries that only read data get sent, in rotation, to the replicas,
+                                            while everything else goes to the primary.
+                                            Queries inside session_scope() blocks also get routed that way,
+                                            but ALL queries inside transaction() blocks go to the primary.
+                                            EXAMPLE: [("bolt://10.0.0.2:7687", ("neo4j", "my_pass"))]
+        :param read_your_writes_window: [OPTIONAL] Number of seconds after a write during which reads
+                                            are sent to the primary, in lieu of replicas that might not have caught up yet.
+                                            Use 0 to always read from the replicas.  Default: 5
+        :param read_your_writes_scope:  [OPTIONAL] Either "global" (default), to apply the above window
+                                            after a write by any thread (bounded staleness for all readers),
+                                            or "thread", to apply it only to the thread that did the write
+                                            (read-your-own-writes)
+
+        :param slow_query_threshold:    [OPTIONAL] Number of seconds above which a query gets recorded
+                                            in the slow-query log (see slow_queries.)  Use None to disable the log.
+                                            Default: 1
+        :param query_stats_window:      [OPTIONAL] Number of the most recent timings kept, for each calling method,
+                                            to compute the percentiles and histograms of query_stats().  Default: 1000
         """
 
         self.debug = debug                  # If True, all the Cypher queries, and some additional info,
@@ -79,6 +140,55 @@ class InterGraph:
         self.driver = None          # Object to connect to Neo4j's Bolt driver for Python
                                     # https://neo4j.com/docs/api/python-driver/4.4/api.html#driver
 
+        self._scope = threading.local()     # Per-thread state of any active session_scope() or transaction() ;
+                                            # the same object may be shared by many threads (e.g. in a Flask app)
+
+        assert type(retry_max_attempts) == int and retry_max_attempts >= 1, \
+                        "`retry_max_attempts` argument must be an integer >= 1"
+
+        self.retry_max_attempts = retry_max_attempts    # Settings for the retries of queries upon transient errors
+        self.retry_initial_delay = retry_initial_delay  #   (in seconds)
+        self.retry_max_delay = retry_max_delay          #   (in seconds)
+        self.retry_delay_multiplier = 2.0               # Growth factor of the wait between consecutive attempts
+        self.retry_jitter = 0.2                         # Fraction of random variation of each wait
+
+        self._retry_lock = threading.Lock()             # To protect the counters below
+        self._retry_counts = {"retries": 0, "retried_queries": 0, "recovered_queries": 0, "failed_queries": 0}
+
+        self.driver_config = {k: v for (k, v) in [("max_connection_pool_size", max_connection_pool_size),
+                                                  ("connection_acquisition_timeout", connection_acquisition_timeout),
+                                                  ("max_connection_lifetime", max_connection_lifetime),
+                                                  ("keep_alive", keep_alive)]
+                                if v is not None}   # Only the options that override the driver's defaults
+        self.fetch_size = fetch_size
+
+        assert read_your_writes_scope in ["global", "thread"], \
+                        "`read_your_writes_scope` argument must be either 'global' or 'thread'"
+
+        self.read_replicas = read_replicas or []    # List of pairs (host, credentials)
+        self.replica_drivers = []                   # One driver object for each of the above replicas
+        self._replica_rotation = itertools.count()  # To pick replicas in rotation
+        self.read_your_writes_window = read_your_writes_window
+        self.read_your_writes_scope = read_your_writes_scope
+        self._last_write_time = None                # Time (from time.monotonic) of the latest write by any thread
+
+        self._pool_lock = threading.Lock()  # To protect the counters below
+        self._active_queries = 0            # Number of queries currently being run, across all threads
+        self._peak_active_queries = 0       # Max value ever reached by the above counter
+
+        assert type(query_stats_window) == int and query_stats_window >= 1, \
+                        "`query_stats_window` argument must be an integer >= 1"
+
+        self.query_stats_enabled = True                 # If False, the queries don't get timed (see query_stats)
+        self.slow_query_threshold = slow_query_threshold
+        self.query_stats_window = query_stats_window
+        self._stats_lock = threading.Lock()             # To protect the data structures below
+        self._query_stats = {}                          # Stats of the queries, indexed by the name of the calling method
+        self._slow_queries = deque(maxlen=100)          # The most recent entries of the slow-query log
+
+        self._index_cache = None    # Set of triplets (label, key, kind) for the known node indexes;
+                                    #   None if not yet loaded (see ensure_indexes)
+
         assert host, "Cannot instantiate the GraphAccess object with an undefined argument`host`; " \
                      "unable to obtain a default value from getenv('NEO4J_HOST') . You need to pass a value, " \
                      "or to set that environment variable"
@@ -87,8 +197,8 @@ class InterGraph:
                             "unable to obtain a default value from getenv('NEO4J_USER') and getenv('NEO4J_PASSWORD') . You need to pass a value, " \
                             "or to set those environment variables"
 
-        assert ("bolt" in host) or ("neo4j" in host), \
-                        "`host` argument must start with `bolt` or `neo4j`"
+        assert ("bolt" in host) or ("neo4j" in host) or (host == "memory"), \
+                        "`host` argument must start with `bolt` or `neo4j` (or be `memory`, for the in-memory graph store)"
                         # TODO: check that substrings actual occur at start, after trimming blanks.
                         # TODO: maybe accept a host name without port number, and default port to 7687
 
@@ -117,8 +227,12 @@ class InterGraph:
             if self.debug:
                 print(f"Attempting to connect to Neo4j host '{self.host}', with username '{user}'...")
 
+            # Note: the retries of managed transactions are handled by _run_with_retries() ;
+            #       the driver's own retry loop is disabled, by giving it zero time
             self.driver = GraphDatabase.driver(self.host,
-                                               auth=(user, password))   # Object to connect to Neo4j's Bolt driver for Python
+                                               auth=(user, password),
+                                               max_transaction_retry_time=0,
+                                               **self.driver_config)   # Object to connect to Neo4j's Bolt driver for Python
             # https://neo4j.com/docs/api/python-driver/4.4/api.html#driver
         except Exception as ex:
             error_msg = f"CHECK WHETHER NEO4J IS RUNNING! While instantiating the Intergraph object, it failed to create the driver: {ex}"
@@ -141,6 +255,8 @@ class InterGraph:
             raise Exception(error_msg)
 
 
+        self.connect_replicas()
+
         if self.debug:
             print(f"Connection to host '{self.host}' established.  *** IN DEBUG MODE ***")
         else:
@@ -151,6 +267,35 @@ class InterGraph:
 
 
 
+    def connect_replicas(self) -> None:
+        """
+        Create and save a driver object for each of the read-only replicas (if any)
+        that were specified at instantiation.
+        Unlike for the primary database, no connection attempt is made at this stage:
+        if a replica turns out to be unreachable, its reads will fall back to the primary
+
+        :return:    None
+        """
+        self.replica_drivers = []
+        for (replica_host, replica_credentials) in self.read_replicas:
+            assert ("bolt" in replica_host) or ("neo4j" in replica_host), \
+                        f"The host of a read replica (`{replica_host}`) must start with `bolt` or `neo4j`"
+            try:
+                user, password = replica_credentials
+                replica_driver = GraphDatabase.driver(replica_host,
+                                                      auth=(user, password),
+                                                      max_transaction_retry_time=0,
+                                                      **self.driver_config)
+            except Exception as ex:
+                raise Exception(f"Failed to create the driver for the read replica at `{replica_host}`: {ex}")
+
+            self.replica_drivers.append(replica_driver)
+
+        if self.replica_drivers:
+            print(f"Reads will be routed to {len(self.replica_drivers)} read replica(s)")
+
+
+
     def test_dbase_connection(self) -> None:
         """
         Attempt to perform a trivial Neo4j query, for the purpose of validating
@@ -160,7 +305,7 @@ class InterGraph:
         :return:    None
         """
         q = "MATCH (n) RETURN n LIMIT 1"
-        with self.driver.session() as new_session:
+        with self.get_session(self.driver) as new_session:
             new_session.run(q)
 
 
@@ -190,7 +335,7 @@ class InterGraph:
 
         :return:    A string with the Neo4j server version number
         """
-        with self.driver.session() as new_session:
+        with self.get_session(self.driver) as new_session:
             q = """
             CALL dbms.components()
             YIELD name, versions
@@ -213,9 +358,13 @@ class InterGraph:
         if self.driver is not None:
             self.driver.close()
 
+        for replica_driver in self.replica_drivers:
+            replica_driver.close()
+
 
 
-    def empty_dbase(self, keep_labels=None, drop_indexes=False, drop_constraints=False) -> None:
+    def empty_dbase(self, keep_labels=None, drop_indexes=False, drop_constraints=False,
+                    batch_size=None, pause=0, report=False) -> None:
         """
         Use this to get rid of everything in the database,
         including all the indexes and constraints (unless otherwise specified.)
@@ -224,10 +373,17 @@ class InterGraph:
         :param keep_labels:     An optional list of strings, indicating specific labels to KEEP
         :param drop_indexes:    Flag indicating whether to also ditch all indexes (by default, True)
         :param drop_constraints:Flag indicating whether to also ditch all constraints (by default, True)
+        :param batch_size:      [OPTIONAL] If specified, delete the nodes in batches of this size,
+                                    each in its own transaction - recommended for large databases.
+                                    See delete_in_batches()
+        :param pause:           [OPTIONAL] Only applicable if `batch_size` is given:
+                                    number of seconds to wait between batches
+        :param report:          [OPTIONAL] Only applicable if `batch_size` is given:
+                                    if True, print the progress of the deletion
 
         :return:                None
         """
-        self.delete_nodes_by_label(keep_labels=keep_labels)
+        self.delete_nodes_by_label(keep_labels=keep_labels, batch_size=batch_size, pause=pause, report=report)
 
         if drop_indexes:
             self.drop_all_indexes(including_constraints=drop_constraints)
@@ -236,6 +392,351 @@ class InterGraph:
 
 
 
+    #####################################################################################################
+
+    '''                          ~   SESSION AND TRANSACTION SCOPES   ~                               '''
+
+    def ________SESSION_AND_TRANSACTION_SCOPES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    @contextmanager
+    def session_scope(self):
+        """
+        Context manager to make ALL the queries run in its block (by this thread)
+        share a single database session, rather than each opening and closing its own.
+        Each query is still individually auto-committed.
+
+        Nested scopes (including ones opened by transaction() ) simply join the outermost one.
+
+        EXAMPLE:
+            with db.session_scope():
+                db.query("MATCH (n :Car) RETURN n")
+                db.update_query("CREATE (:Car {make: 'Toyota'})")
+
+        :return:    A neo4j.Session object  (typically not needed by the caller)
+        """
+        active_session = getattr(self._scope, "session", None)
+        if active_session is not None:
+            yield active_session        # Join the already-active scope
+            return
+
+        with self.get_session(self.driver) as new_session:
+            self._scope.session = new_session
+            self._scope.replica_session = None      # Lazily started, if any read gets routed to a replica
+            try:
+                yield new_session
+            finally:
+                self._scope.session = None
+                if self._scope.replica_session is not None:
+                    self._scope.replica_session.close()
+                    self._scope.replica_session = None
+
+
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager to run ALL the queries in its block (by this thread)
+        in a single explicit database transaction, within a single session.
+        If the block completes normally, the transaction is committed;
+        if an Exception is raised, the transaction is rolled back, and the Exception is re-raised.
+
+        Nested transaction() blocks simply join the outermost one
+        (i.e. only the outermost block commits or rolls back.)
+
+        EXAMPLE:
+            with db.transaction():
+                db.update_query("MATCH (n :Account {id: 1}) SET n.balance = n.balance - 100")
+                db.update_query("MATCH (n :Account {id: 2}) SET n.balance = n.balance + 100")
+
+        :return:    A neo4j.Transaction object  (typically not needed by the caller)
+        """
+        active_tx = getattr(self._scope, "tx", None)
+        if active_tx is not None:
+            yield active_tx             # Join the already-active transaction
+            return
+
+        with self.session_scope() as session:
+            tx = session.begin_transaction()
+            self._scope.tx = tx
+            try:
+                yield tx
+                tx.commit()
+            finally:
+                self._scope.tx = None
+                tx.close()      # Roll back, unless already committed
+
+
+
+    def in_transaction(self) -> bool:
+        """
+        Return True if the current thread is inside a transaction() block, or False otherwise
+
+        :return:    True or False
+        """
+        return getattr(self._scope, "tx", None) is not None
+
+
+
+    #####################################################################################################
+
+    '''                                ~   CONNECTION POOL   ~                                         '''
+
+    def ________CONNECTION_POOL________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def _count_active_query(self, change :int) -> None:
+        """
+        Update, in a thread-safe way, the count of the queries currently being run,
+        and the peak value of that count
+
+        :param change:  +1 when a query starts, or -1 when it ends
+        :return:        None
+        """
+        with self._pool_lock:
+            self._active_queries += change
+            if self._active_queries > self._peak_active_queries:
+                self._peak_active_queries = self._active_queries
+
+
+
+    def pool_stats(self) -> dict:
+        """
+        Return a snapshot of the utilization of the pool of connections to the database.
+
+        The counts of connections are read from the internals of the Neo4j driver, on a best-effort basis;
+        if not available (for example, with an untested version of the driver), they are returned as None.
+        The counts of queries are kept by this class.
+
+        :return:    A dict with the following keys:
+                        "max_size"              Max number of connections in the pool (per server)
+                        "in_use"                Number of pooled connections currently in use
+                        "idle"                  Number of pooled connections currently idle
+                        "waiting"               Estimated number of queries waiting to acquire a connection:
+                                                    those being run, in excess of the connections in use
+                        "active_queries"        Number of queries currently being run, across all threads
+                        "peak_active_queries"   Max number of queries ever run at the same time
+                        "acquisition_timeout"   Max number of seconds to wait for a connection (None if driver default)
+                    EXAMPLE: {'max_size': 100, 'in_use': 3, 'idle': 5, 'waiting': 0,
+                              'active_queries': 3, 'peak_active_queries': 12, 'acquisition_timeout': None}
+        """
+        with self._pool_lock:
+            active_queries = self._active_queries
+            peak_active_queries = self._peak_active_queries
+
+        max_size = self.driver_config.get("max_connection_pool_size")
+        in_use = None
+        idle = None
+        try:
+            pool = self.driver._pool                                # Not part of the driver's public API
+            max_size = pool.pool_config.max_connection_pool_size
+            all_connections = [conn for connections in list(pool.connections.values())
+                                    for conn in list(connections)]
+            in_use = sum(1 for conn in all_connections if conn.in_use)
+            idle = len(all_connections) - in_use
+        except Exception:
+            pass    # Connection counts not available
+
+        return {"max_size": max_size,
+                "in_use": in_use,
+                "idle": idle,
+                "waiting": None if in_use is None else max(0, active_queries - in_use),
+                "active_queries": active_queries,
+                "peak_active_queries": peak_active_queries,
+                "acquisition_timeout": self.driver_config.get("connection_acquisition_timeout")
+                }
+
+
+
+
+
+
+    #####################################################################################################
+
+    '''                          ~   QUERY STATISTICS   ~                                          '''
+
+    def ________QUERY_STATISTICS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    _QUERY_TIME_BUCKETS = [(0.001, "<1ms"), (0.01, "<10ms"), (0.1, "<100ms"), (1., "<1s"), (10., "<10s")]
+                                                # Upper bounds (in seconds) and names of the bins of the histograms
+                                                # of query times; slower queries go into a final ">=10s" bin
+
+    _QUERY_PLUMBING = ()    # Code objects of the methods of subclasses that merely pass queries along
+                            #   (such as overrides of _execute), to be skipped by _query_caller()
+
+
+    @classmethod
+    def _query_caller(cls, max_depth=6) -> [str]:
+        """
+        Identify the code that requested the query being run, by walking up the call stack
+        past all the methods of this class, the methods listed in _QUERY_PLUMBING, and any lambda functions
+
+        EXAMPLE:  ["GraphAccess.get_nodes", "GraphSchema.get_nodes_by_filter", "DataManager.get_filtered", "get_filtered"]
+
+        :param max_depth:   [OPTIONAL] Max number of callers to return
+        :return:            A (possibly empty) list of the qualified names of the calling functions,
+                                from the innermost one outward
+        """
+        frame = sys._getframe(1)
+        while frame is not None and (frame.f_code.co_filename == __file__
+                                     or frame.f_code in cls._QUERY_PLUMBING
+                                     or frame.f_code.co_name == "<lambda>"):
+            frame = frame.f_back    # Skip the frames in this file, and the ones that merely pass queries along
+
+        call_chain = []
+        while frame is not None and len(call_chain) < max_depth:
+            code = frame.f_code
+            call_chain.append(getattr(code, "co_qualname", code.co_name))   # co_qualname is only in Python 3.11+
+            frame = frame.f_back
+
+        return call_chain
+
+
+
+    def _record_query(self, q :str, data_binding, call_chain :[str], elapsed :float, result, rows) -> None:
+        """
+        Add the timings of an executed query to the stats of its calling method,
+        and to the slow-query log if it took longer than self.slow_query_threshold
+
+        :param q:           A string with the Cypher query that was run
+        :param data_binding:The Cypher dictionary (if any) that was used with the query
+        :param call_chain:  List of the calling functions, as returned by _query_caller()
+        :param elapsed:     Number of seconds that it took to run the query and fetch its results
+        :param result:      The neo4j.Result object from the query, already fully fetched
+        :param rows:        Number of records returned by the query (None if not known)
+        :return:            None
+        """
+        available_after = None
+        consumed_after = None
+        db_hits = None
+        try:
+            summary = result.consume()      # Only the summary is left at this point
+            available_after = summary.result_available_after    # Server-side times, in milliseconds
+            consumed_after = summary.result_consumed_after
+            if summary.profile:             # Only present if the query was run with PROFILE
+                db_hits = self._total_db_hits(summary.profile)
+        except Exception:
+            pass    # Server-side info not available
+
+        caller = call_chain[0] if call_chain else "(unknown)"
+
+        with self._stats_lock:
+            stats = self._query_stats.get(caller)
+            if stats is None:
+                stats = {"count": 0, "total_time": 0., "server_time": 0., "rows": 0, "db_hits": 0,
+                         "timings": deque(maxlen=self.query_stats_window)}
+                self._query_stats[caller] = stats
+
+            stats["count"] += 1
+            stats["total_time"] += elapsed
+            stats["server_time"] += ((available_after or 0) + (consumed_after or 0)) / 1000.
+            stats["rows"] += rows or 0
+            stats["db_hits"] += db_hits or 0
+            stats["timings"].append(elapsed)
+
+            if self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold:
+                self._slow_queries.append({"time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                           "caller": caller,
+                                           "call_chain": call_chain,
+                                           "query": q if len(q) <= 1000 else q[:1000] + " ...",
+                                           "parameters": sorted(data_binding) if data_binding else [],
+                                           "elapsed": round(elapsed, 4),
+                                           "result_available_after": available_after,
+                                           "result_consumed_after": consumed_after,
+                                           "rows": rows,
+                                           "db_hits": db_hits})
+
+
+
+    @classmethod
+    def _total_db_hits(cls, profile :dict) -> int:
+        """
+        Add up the database hits in all the steps of a profiled query plan
+
+        :param profile: A dict with a query plan, as found in the "profile" attribute of a neo4j.ResultSummary object
+        :return:        The total number of database hits
+        """
+        return profile.get("dbHits", 0) + sum(cls._total_db_hits(child) for child in profile.get("children", []))
+
+
+
+    def query_stats(self) -> dict:
+        """
+        Return the stats of the executed queries, broken down by the calling method,
+        since the creation of this object (or the last call to reset_query_stats)
+
+        :return:    A dict indexed by the names of the calling methods, whose values are dicts with the following keys:
+                        "count"         Number of queries run
+                        "total_time"    Total number of seconds spent running the queries and fetching their results
+                        "server_time"   Total number of seconds reported by the database server
+                                            (until the results were available, plus until they were consumed)
+                        "rows"          Total number of records returned
+                        "db_hits"       Total number of database hits (only from the queries run with PROFILE)
+                        "mean", "p50", "p95", "max"     Stats of the most recent query times, in seconds
+                        "histogram"     Dict with the number of the most recent queries in each range of times
+                    EXAMPLE: {'GraphAccess.get_nodes': {'count': 12, 'total_time': 0.84, 'server_time': 0.31,
+                                                        'rows': 40, 'db_hits': 0,
+                                                        'mean': 0.07, 'p50': 0.05, 'p95': 0.2, 'max': 0.2,
+                                                        'histogram': {'<1ms': 0, '<10ms': 2, '<100ms': 9, '<1s': 1,
+                                                                      '<10s': 0, '>=10s': 0}}}
+        """
+        with self._stats_lock:
+            snapshot = {caller: dict(stats, timings=sorted(stats["timings"]))
+                            for (caller, stats) in self._query_stats.items()}
+
+        for stats in snapshot.values():
+            timings = stats.pop("timings")
+            n = len(timings)
+            stats["mean"] = sum(timings) / n
+            stats["p50"] = timings[math.ceil(0.50 * n) - 1]     # Nearest-rank percentiles
+            stats["p95"] = timings[math.ceil(0.95 * n) - 1]
+            stats["max"] = timings[-1]
+
+            histogram = {name: 0 for (_, name) in self._QUERY_TIME_BUCKETS}
+            histogram[">=10s"] = 0
+            for t in timings:
+                name = next((name for (upper_bound, name) in self._QUERY_TIME_BUCKETS if t < upper_bound), ">=10s")
+                histogram[name] += 1
+            stats["histogram"] = histogram
+
+        return snapshot
+
+
+
+    def slow_queries(self) -> [dict]:
+        """
+        Return the slow-query log: the most recent queries that took at least self.slow_query_threshold seconds,
+        from the oldest to the newest
+
+        :return:    A (possibly empty) list of dicts with the following keys:
+                        "time", "caller", "call_chain", "query", "parameters" (just their names), "elapsed" (in seconds),
+                        "result_available_after", "result_consumed_after" (both in milliseconds, as reported by the server),
+                        "rows", "db_hits" (None unless the query was run with PROFILE)
+        """
+        with self._stats_lock:
+            return list(self._slow_queries)
+
+
+
+    def reset_query_stats(self) -> None:
+        """
+        Clear all the data returned by query_stats() and slow_queries()
+
+        :return:    None
+        """
+        with self._stats_lock:
+            self._query_stats = {}
+            self._slow_queries.clear()
+
+
+
+
+
+
     #####################################################################################################
 
     '''                          ~   RUN GENERIC CYPHER QUERIES   ~                                   '''
@@ -251,7 +752,7 @@ class InterGraph:
 
         :param q:           A string with a Cypher query
         :param data_binding:An optional Cypher dictionary
-        :param session:
+        :param session:     A neo4j.Session object, or a neo4j.Transaction object
         :return:            A neo4j.Result object (type "neo4j.work.result.Result")
                             See https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.Result
         """
@@ -260,19 +761,290 @@ class InterGraph:
             if self.block_query_execution:
                 return
 
-        try:
-            result = session.run(q, data_binding)
-        except ServiceUnavailable:
-            print("*** NOTICE - ServiceUnavailable condition: attempting to reconnect to the database...")
-            self.connect()
-            #  Details: {ex}
-            raise Exception(f"ServiceUnavailable signal received, probably from a timeout.\n"
-                            f"Automatically re-connected.  Please RE-RUN your last command")
+        result = session.run(q, data_binding)   # Transient errors are dealt with by the caller - see _run_with_retries()
 
         return result
 
 
 
+    def _execute(self, q :str, data_binding, fetch, count_rows=len):
+        """
+        Run the given Cypher query, and fully consume its result by means of the given `fetch` function.
+
+        If the current thread is inside a transaction() block, the query is simply run in that transaction.
+        Otherwise, it's run in its own managed transaction (a read or a write one,
+        depending on the query), on the active session (if inside a session_scope() block)
+        or on a brand-new one; in case of transient errors, the managed transaction is retried
+        - see _run_with_retries()
+
+        :param q:           A string with a Cypher query
+        :param data_binding:An optional Cypher dictionary
+        :param fetch:       Function that takes a neo4j.Result object, and returns whatever data is needed from it;
+                                it must consume the result, since the transaction is closed afterward.
+                                EXAMPLE:  lambda result: result.data()
+        :param count_rows:  [OPTIONAL] Function that takes the value returned by `fetch`, and returns the number
+                                of records in it (for the query stats.)  Default: len
+        :return:            Whatever the `fetch` function returns
+        """
+        call_chain = self._query_caller() if self.query_stats_enabled else None
+
+        def work(tx):
+            start_time = time.perf_counter()
+            result = self.run_cypher_query(q=q, data_binding=data_binding, session=tx)
+            if result is None:
+                return None
+            fetched = fetch(result)
+            if call_chain is not None:
+                self._record_query(q, data_binding, call_chain=call_chain, elapsed=time.perf_counter() - start_time,
+                                   result=result, rows=count_rows(fetched))
+            return fetched
+
+
+        is_read_only = self.is_read_only_query(q)
+        if not is_read_only:
+            self._note_write()
+
+        self._count_active_query(+1)
+        try:
+            active_tx = getattr(self._scope, "tx", None)
+            if active_tx is not None:
+                # No retries here: if the explicit transaction fails, it's the whole block that needs re-running
+                return work(active_tx)
+
+            replica_driver = self._pick_replica() if is_read_only else None     # None means: use the primary
+
+            if replica_driver is not None:
+                try:
+                    return self._run_on_replica(replica_driver, work=work, q=q)
+                except (ServiceUnavailable, SessionExpired) as ex:
+                    print(f"*** NOTICE - read replica unavailable; falling back to the primary database.  Details: {ex}")
+
+            active_session = getattr(self._scope, "session", None)
+            if active_session is not None:
+                return self._run_with_retries(session=active_session, work=work, q=q)
+
+            # Start a new session, use it, and then immediately close it
+            with self.get_session(self.driver) as new_session:
+                return self._run_with_retries(session=new_session, work=work, q=q)
+        finally:
+            self._count_active_query(-1)
+
+
+
+    def _run_on_replica(self, replica_driver, work, q :str):
+        """
+        Run the given unit of work on a read replica:
+        on the replica session of the active session_scope(), if any (starting it on the given replica if needed;
+        once started, it's used for all the remaining reads in that scope),
+        or else on a new session, which then gets closed
+
+        :param replica_driver:  The driver object of one of the read replicas
+        :param work:            See _run_with_retries()
+        :param q:               The Cypher query being run
+        :return:                Whatever the `work` function returns
+        """
+        if getattr(self._scope, "session", None) is not None:
+            if self._scope.replica_session is None:
+                self._scope.replica_session = self.get_session(replica_driver)
+            return self._run_with_retries(session=self._scope.replica_session, work=work, q=q)
+
+        with self.get_session(replica_driver) as new_session:
+            return self._run_with_retries(session=new_session, work=work, q=q)
+
+
+
+    def _note_write(self) -> None:
+        """
+        Record the time of a write to the database (by the current thread), for the purpose
+        of sending subsequent reads to the primary database, rather than to a possibly-lagging replica
+
+        :return:    None
+        """
+        now = time.monotonic()
+        self._last_write_time = now
+        self._scope.last_write_time = now
+
+
+
+    def _pick_replica(self):
+        """
+        Pick, in rotation, the read replica to send a read-only query to;
+        if there are no replicas, or if a write was made too recently
+        (see the `read_your_writes_window` argument of the constructor), pick none
+
+        :return:    The driver object of one of the read replicas, or None if the primary is to be used
+        """
+        if not self.replica_drivers:
+            return None
+
+        if self.read_your_writes_window:
+            if self.read_your_writes_scope == "thread":
+                last_write_time = getattr(self._scope, "last_write_time", None)
+            else:
+                last_write_time = self._last_write_time
+
+            if (last_write_time is not None) and (time.monotonic() - last_write_time < self.read_your_writes_window):
+                return None
+
+        return self.replica_drivers[next(self._replica_rotation) % len(self.replica_drivers)]
+
+
+
+    def _run_with_retries(self, session, work, q :str):
+        """
+        Execute the given unit of work in a managed transaction on the given session,
+        re-attempting it - after an exponentially-growing wait - in case of transient errors
+        (such as deadlocks, cluster leader switches, timeouts or lost connections),
+        up to a max of self.retry_max_attempts attempts.
+
+        Queries that only read data are run as read transactions; all others as write transactions.
+        Queries that manage their own transactions (such as "CALL { } IN TRANSACTIONS")
+        are run as auto-commit queries.
+
+        :param session: A neo4j.Session object
+        :param work:    A function that takes a neo4j.Transaction (or neo4j.Session) object,
+                            runs the query on it, and fully consumes its result
+        :param q:       The Cypher query being run (used to decide how to run it)
+        :return:        Whatever the `work` function returns
+        """
+        if self.is_autocommit_only_query(q):
+            attempt_work = lambda: work(session)
+        elif self.is_read_only_query(q):
+            attempt_work = lambda: session.read_transaction(work)
+        else:
+            attempt_work = lambda: session.write_transaction(work)
+
+        delay = self.retry_initial_delay
+        attempt = 1
+        while True:
+            try:
+                result = attempt_work()
+                if attempt > 1:
+                    self._count_retry_event("recovered_queries")
+                return result
+            except (TransientError, ServiceUnavailable, SessionExpired) as ex:
+                # Lost connections are always worth retrying;  a few transient errors
+                # (such as transactions terminated by an administrator) aren't
+                not_retriable = isinstance(ex, TransientError) and not ex.is_retriable()
+                if not_retriable or (attempt >= self.retry_max_attempts):
+                    self._count_retry_event("failed_queries")
+                    raise
+
+                if attempt == 1:
+                    self._count_retry_event("retried_queries")
+                self._count_retry_event("retries")
+
+                wait = min(delay, self.retry_max_delay) * (1 + random.uniform(-self.retry_jitter, self.retry_jitter))
+                if self.debug:
+                    print(f"*** NOTICE - {type(ex).__name__} on attempt {attempt} of {self.retry_max_attempts}: "
+                          f"retrying in {wait:.3f} sec.  Details: {ex}")
+                time.sleep(wait)
+
+                delay *= self.retry_delay_multiplier
+                attempt += 1
+
+
+
+    def _count_retry_event(self, name :str) -> None:
+        """
+        Increment the counter with the given name, in a thread-safe way
+
+        :param name:    One of the keys of self._retry_counts
+        :return:        None
+        """
+        with self._retry_lock:
+            self._retry_counts[name] += 1
+
+
+
+    def retry_stats(self) -> dict:
+        """
+        Return the counters about the re-attempts of queries upon transient errors,
+        since the creation of this object (or the last call to reset_retry_stats)
+
+        :return:    A dict with the following keys:
+                        "retries"           Total number of re-attempts
+                        "retried_queries"   Number of queries that needed at least one re-attempt
+                        "recovered_queries" Number of queries that eventually succeeded after re-attempts
+                        "failed_queries"    Number of queries that failed with a transient error,
+                                                and were given up on
+                    EXAMPLE: {'retries': 3, 'retried_queries': 2, 'recovered_queries': 2, 'failed_queries': 0}
+        """
+        with self._retry_lock:
+            return dict(self._retry_counts)
+
+
+
+    def reset_retry_stats(self) -> None:
+        """
+        Zero out all the counters returned by retry_stats()
+
+        :return:    None
+        """
+        with self._retry_lock:
+            for k in self._retry_counts:
+                self._retry_counts[k] = 0
+
+
+
+    _WRITE_CLAUSES = re.compile(r"\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD|CALL|ALTER|GRANT|DENY|REVOKE|START|STOP|TERMINATE)\b",
+                                re.IGNORECASE)
+    _READ_PROCEDURES = re.compile(r"\bCALL\s+(db\.labels|db\.relationshipTypes|db\.propertyKeys|db\.indexes|db\.constraints|db\.schema\.\w+|dbms\.components)\s*\(",
+                                  re.IGNORECASE)
+    _AUTOCOMMIT_CLAUSES = re.compile(r"\bIN\s+TRANSACTIONS\b|\bPERIODIC\s+COMMIT\b", re.IGNORECASE)
+
+    @classmethod
+    def is_read_only_query(cls, q :str) -> bool:
+        """
+        Conservatively decide whether the given Cypher query only reads data;
+        any query with a clause (or even just a word) that might alter the database is deemed a write query,
+        and so are calls to procedures, except for a few well-known read-only ones
+
+        EXAMPLES:   is_read_only_query("MATCH (n :Car) RETURN n")                -> True
+                    is_read_only_query("MATCH (n :Car) SET n.color = 'red'")     -> False
+                    is_read_only_query("CALL db.labels() YIELD label RETURN label") -> True
+
+        :param q:   A string with a Cypher query
+        :return:    True if the query is certain to only read data, or False otherwise
+        """
+        q_without_read_procedures = cls._READ_PROCEDURES.sub(" ", q)
+        return cls._WRITE_CLAUSES.search(q_without_read_procedures) is None
+
+
+
+    @classmethod
+    def is_autocommit_only_query(cls, q :str) -> bool:
+        """
+        Return True if the given Cypher query manages its own transactions
+        (such as "CALL { ... } IN TRANSACTIONS"), and thus can only be run as an auto-commit query
+
+        :param q:   A string with a Cypher query
+        :return:    True or False
+        """
+        return cls._AUTOCOMMIT_CLAUSES.search(q) is not None
+
+
+
+    def get_session(self, driver, fetch_size=None):
+        """
+        Generate a new database Session object.
+        If a fetch size was specified at instantiation, it's applied to the new session.
+
+        :param driver:      Object of type neo4j.BoltDriver or neo4j.Neo4jDriver
+        :param fetch_size:  [OPTIONAL] Number of records fetched in each batch from the database server;
+                                if not specified, the value given at instantiation (if any) is used
+        :return:            Object of type neo4j.Session
+        """
+        if fetch_size is None:
+            fetch_size = self.fetch_size
+
+        if fetch_size is not None:
+            return driver.session(fetch_size=fetch_size)
+        else:
+            return driver.session()
+
+
+
     def query(self, q :str, data_binding=None, single_row=False, single_cell="", single_column=""):
         """
         Run a Cypher query.  Best suited for Cypher queries that return individual values
@@ -281,7 +1053,8 @@ class InterGraph:
 
         Execute the query and fetch the returned values as a list of dictionaries.
         In cases of no results, return an empty list.
-        A new session to the database driver is started, and then immediately terminated after running the query.
+        A new session to the database driver is started, and then immediately terminated after running the query -
+        unless the call is made inside a session_scope() or transaction() block.
 
         ALTERNATIVES:
             * if the Cypher query returns nodes, and one wants to extract the internal database ID or node labels
@@ -342,19 +1115,30 @@ class InterGraph:
             if self.block_query_execution:
                 return
 
-        # Start a new session, use it, and then immediately close it
-        with self.driver.session() as new_session:
-            result = self.run_cypher_query(q=q, data_binding=data_binding, session=new_session)
-            # Note: A neo4j.Result object (printing it, shows an object of type "neo4j.work.result.Result")
-            #       See https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.Result
-            if result is None:
-                return []
+        # Run the query, and fetch its result as a list of dictionaries
+        # (in the active transaction or session, if any; otherwise, in a new session that then gets closed)
+        data_as_list = self._execute(q, data_binding, fetch=lambda result: result.data())
+        if data_as_list is None:
+            return []
+
+        return self._select_query_results(data_as_list, single_row=single_row,
+                                          single_cell=single_cell, single_column=single_column)
+
 
-            data_as_list = result.data()    # Return the result as a list of dictionaries.
-                                            #       This must be done inside the "with" block,
-                                            #       while the session is still open
-            #print(f"data_as_list: {data_as_list}")
 
+    @staticmethod
+    def _select_query_results(data_as_list :[dict], single_row=False, single_cell="", single_column=""):
+        """
+        Helper function for query().
+        Extract from the data returned by a query the part requested by the arguments
+        single_row, single_cell or single_column - see query()
+
+        :param data_as_list:    A (possibly empty) list of dictionaries, one for each record returned by a query
+        :param single_row:      See query()
+        :param single_cell:     See query()
+        :param single_column:   See query()
+        :return:                See query()
+        """
         # Deal with empty result lists
         if len(data_as_list) == 0:  # If no results were produced
             if single_row:
@@ -404,106 +1188,104 @@ class InterGraph:
                                  '_start': INTERNAL_ID_OF_START_NODE, '_end': INTERNAL_ID_OF_END_NODE
                                  }
         """
-        # Start a new session, use it, and then immediately close it
-        with self.driver.session() as new_session:
-            all_paths = self.run_cypher_query(q=q, data_binding=data_binding, session=new_session)
-            #print(type(result))        # <class 'neo4j.work.result.Result'>
-            # https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.Result
-            #data_as_list = all_paths.data()
-            #print(data_as_list)
-            #return
-
-            result = []     # A list of paths
-
-            for record in all_paths:
-                #print("--- PROCESSING path")
-                #print(type(record))    # <class 'neo4j.data.Record'>
-                                        # Immutable, ordered collection of key-value pairs
-                                        # https://neo4j.com/docs/api/python-driver/4.4/api.html#record
-
-                #print(record)
-                # EXAMPLE (abridged):    <Record p=<
-                #                                   Path start=<...> end=<...> size=1>
-                #                                  >
-
-                path = record.get(dummy_name)   # This will return None if the given dummy name isn't found
-                assert path is not None, \
-                    f"Unable to find any path named '{dummy_name}'; if you used a " \
-                    f"different dummy name in your Cypher query, pass it as argument to `dummy_name`\n" \
-                    f"EXAMPLE of Cypher query:  MATCH p=(your path definition here) RETURN p"
-
-                #print(type(path))      # <class 'neo4j.graph.Path'>
-                                        # https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.graph.Path
-                                        # https://neo4j.com/docs/api/python-driver/5.28/api.html#neo4j.graph.Path
-                assert type(path) == neo4j.graph.Path, \
-                    f"The Cypher query that you provided does NOT return a path; " \
-                    f"it's returning an object of type {type(path)}\nYour Cypher query:\n{q}"
-
-                #print(path)
-                # EXAMPLE:
-                # <Path   start=<Node id=22 labels=frozenset({'Person'}) properties={'name': 'Val'}>
-                #         end=  <Node id=18 labels=frozenset({'Person'}) properties={'name': 'Julian'}>
-                #         size=1>
-
-                '''
-                for element in path:
-                    # This only iterates over the relationships
-                    print("    Processing link in the path:")
-                    print("       ", element)                       # EXAMPLE (abridged):
-                                                                    #   <Relationship id=5 nodes=(...) type='FRIENDS OF' properties={}>
-                    print("       ", element.__class__.__name__)    # EXAMPLE: "FRIENDS OF"
-                    print("       ", type(element))                 # EXAMPLE: <class 'abc.FRIENDS OF'>
-                '''
-
-                # Extract the nodes and the relationships (links)
-                nodes = path.nodes
-                #print("    Nodes: ", nodes)
-                # This will be a tuple of nodes. EXAMPLE:
-                # (<Node id=22 labels=frozenset({'Person'}) properties={'name': 'Val'}>,
-                #  <Node id=18 labels=frozenset({'Person'}) properties={'name': 'Julian'}>
-                #  )
-
-                rels = path.relationships
-                #print("    Links: ", rels)
-                # This will be a tuple of links.  EXAMPLE:
-                #( <Relationship id=5
-                #        nodes=(<Node id=22 labels=frozenset({'Person'}) properties={'name': 'Val'}>,
-                #               <Node id=18 labels=frozenset({'Person'}) properties={'name': 'Julian'}>)
-                #        type='FRIENDS OF' properties={}
-                #  >
-                #  ,)
-
-                path_list = []
-
-                for i, node in enumerate(nodes):
-                    n=dict(node)
-                    #n["_kind"] = "NODE"
-                    n["_internal_id"] = node.id
-                    n["_node_labels"] = list(node.labels)
-                    #print(n)   # EXAMPLE: {'name': 'Val', '_internal_id': 22, '_node_labels': ['Person']}
-
-                    path_list.append(n)
-
-                    if i < len(rels):
-                        rel = rels[i]
-                        r = {
-                            "_kind": "LINK",
-                            "_internal_id": rel.id,
-                            "name": rel.type,
-                            "_start": rel.start_node.id,
-                            "_end": rel.end_node.id,
-                            "_properties": dict(rel)
-                        }
-                        #print(r)
-                        # EXAMPLE: {'_kind': 'LINK', '_internal_id': 7, 'name': 'FRIENDS OF', '_start': 22, '_end': 18, '_properties': {}}
-                        path_list.append(r)
-
-                '''
-                print("PATH:")
-                for item in path_list:
-                    print(item)
-                '''
-                result.append(path_list)
+        # Run the query, and fetch all its records
+        # (in the active transaction or session, if any; otherwise, in a new session that then gets closed)
+        all_paths = self._execute(q, data_binding, fetch=list)     # A list of neo4j.Record objects
+        #data_as_list = all_paths.data()
+        #print(data_as_list)
+        #return
+
+        result = []     # A list of paths
+
+        for record in all_paths:
+            #print("--- PROCESSING path")
+            #print(type(record))    # <class 'neo4j.data.Record'>
+                                    # Immutable, ordered collection of key-value pairs
+                                    # https://neo4j.com/docs/api/python-driver/4.4/api.html#record
+
+            #print(record)
+            # EXAMPLE (abridged):    <Record p=<
+            #                                   Path start=<...> end=<...> size=1>
+            #                                  >
+
+            path = record.get(dummy_name)   # This will return None if the given dummy name isn't found
+            assert path is not None, \
+                f"Unable to find any path named '{dummy_name}'; if you used a " \
+                f"different dummy name in your Cypher query, pass it as argument to `dummy_name`\n" \
+                f"EXAMPLE of Cypher query:  MATCH p=(your path definition here) RETURN p"
+
+            #print(type(path))      # <class 'neo4j.graph.Path'>
+                                    # https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.graph.Path
+                                    # https://neo4j.com/docs/api/python-driver/5.28/api.html#neo4j.graph.Path
+            assert type(path) == neo4j.graph.Path, \
+                f"The Cypher query that you provided does NOT return a path; " \
+                f"it's returning an object of type {type(path)}\nYour Cypher query:\n{q}"
+
+            #print(path)
+            # EXAMPLE:
+            # <Path   start=<Node id=22 labels=frozenset({'Person'}) properties={'name': 'Val'}>
+            #         end=  <Node id=18 labels=frozenset({'Person'}) properties={'name': 'Julian'}>
+            #         size=1>
+
+            '''
+            for element in path:
+                # This only iterates over the relationships
+                print("    Processing link in the path:")
+                print("       ", element)                       # EXAMPLE (abridged):
+                                                                #   <Relationship id=5 nodes=(...) type='FRIENDS OF' properties={}>
+                print("       ", element.__class__.__name__)    # EXAMPLE: "FRIENDS OF"
+                print("       ", type(element))                 # EXAMPLE: <class 'abc.FRIENDS OF'>
+            '''
+
+            # Extract the nodes and the relationships (links)
+            nodes = path.nodes
+            #print("    Nodes: ", nodes)
+            # This will be a tuple of nodes. EXAMPLE:
+            # (<Node id=22 labels=frozenset({'Person'}) properties={'name': 'Val'}>,
+            #  <Node id=18 labels=frozenset({'Person'}) properties={'name': 'Julian'}>
+            #  )
+
+            rels = path.relationships
+            #print("    Links: ", rels)
+            # This will be a tuple of links.  EXAMPLE:
+            #( <Relationship id=5
+            #        nodes=(<Node id=22 labels=frozenset({'Person'}) properties={'name': 'Val'}>,
+            #               <Node id=18 labels=frozenset({'Person'}) properties={'name': 'Julian'}>)
+            #        type='FRIENDS OF' properties={}
+            #  >
+            #  ,)
+
+            path_list = []
+
+            for i, node in enumerate(nodes):
+                n=dict(node)
+                #n["_kind"] = "NODE"
+                n["_internal_id"] = node.id
+                n["_node_labels"] = list(node.labels)
+                #print(n)   # EXAMPLE: {'name': 'Val', '_internal_id': 22, '_node_labels': ['Person']}
+
+                path_list.append(n)
+
+                if i < len(rels):
+                    rel = rels[i]
+                    r = {
+                        "_kind": "LINK",
+                        "_internal_id": rel.id,
+                        "name": rel.type,
+                        "_start": rel.start_node.id,
+                        "_end": rel.end_node.id,
+                        "_properties": dict(rel)
+                    }
+                    #print(r)
+                    # EXAMPLE: {'_kind': 'LINK', '_internal_id': 7, 'name': 'FRIENDS OF', '_start': 22, '_end': 18, '_properties': {}}
+                    path_list.append(r)
+
+            '''
+            print("PATH:")
+            for item in path_list:
+                print(item)
+            '''
+            result.append(path_list)
 
 
         return result
@@ -585,76 +1367,88 @@ class InterGraph:
         if (type(fields_to_exclude) == str) and (fields_to_exclude != ""):
             fields_to_exclude = [fields_to_exclude]
 
-        # Start a new session, use it, and then immediately close it
-        with self.driver.session() as new_session:
-            result = self.run_cypher_query(q=q, data_binding=data_binding, session=new_session)
-            # Note: A neo4j.Result object (printing it, shows an object of type "neo4j.work.result.Result")
-            #       See https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.Result
+        # Run the query, and fetch all its records
+        # (in the active transaction or session, if any; otherwise, in a new session that then gets closed)
+        records = self._execute(q, data_binding, fetch=list)     # A list of neo4j.Record objects
+        if records is None:
+            return []
 
-            if result is None:
-                return []
+        data_as_list = []
 
-            data_as_list = []
-
-            # The following must be done inside the "with" block, while the session is still open
-            for record in result:
-                # Note: record is a neo4j.Record object - an immutable ordered collection of key-value pairs.
-                #       (the keys are the dummy names used for the nodes, such as "n")
-                #       See https://neo4j.com/docs/api/python-driver/current/api.html#record
-
-                # EXAMPLE of record (if node n was returned):
-                #       <Record n=<Node id=227 labels=frozenset({'person', 'client'}) properties={'gender': 'M', 'age': 99}>>
-                #       (it has one key, "n")
-                # EXAMPLE of record (if node n and node c were returned):
-                #       <Record n=<Node id=227 labels=frozenset({'person', 'client'}) properties={'gender': 'M', 'age': 99}>
-                #               c=<Node id=66 labels=frozenset({'car'}) properties={'color': 'blue'}>>
-                #       (it has 2 keys, "n" and "c")
-
-                data = []
-                for item in record:
-                    # Note: item is EITHER a neo4j.graph.Node object
-                    #       OR a neo4j.graph.Relationship object
-                    #       OR a neo4j.graph.Path object
-                    #       See https://neo4j.com/docs/api/python-driver/current/api.html#node
-                    #           https://neo4j.com/docs/api/python-driver/current/api.html#relationship
-                    #           https://neo4j.com/docs/api/python-driver/current/api.html#path
-                    # EXAMPLES of item:
-                    #       <Node id=95 labels=frozenset({'car'}) properties={'color': 'white', 'make': 'Toyota'}>
-                    #       <Relationship id=12 nodes=(<Node id=147 labels=frozenset() properties={}>, <Node id=150 labels=frozenset() properties={}>) type='bought_by' properties={'price': 7500}>
-
-                    neo4j_properties = dict(item.items())   # EXAMPLE: {'gender': 'M', 'age': 99}
-
-                    # Add extra, special fields depending on whether the returned item represents
-                    # a database node, relationship or path
-                    if isinstance(item, neo4j.graph.Node):
-                        neo4j_properties["_internal_id"] = item.id              # Example: 227
-                        neo4j_properties["_node_labels"] = list(item.labels)    # Example: ['person', 'client']
-
-                    elif isinstance(item, neo4j.graph.Relationship):
-                        neo4j_properties["_internal_id"] = item.id              # Example: 227
-                        neo4j_properties["neo4j_start_node"] = item.start_node  # A neo4j.graph.Node object with "id", "labels" and "properties"
-                        neo4j_properties["neo4j_end_node"] = item.end_node      # A neo4j.graph.Node object with "id", "labels" and "properties"
-                        #   Example: <Node id=118 labels=frozenset({'car'}) properties={'color': 'white'}>
-                        neo4j_properties["neo4j_type"] = item.type              # The name of the relationship
-
-                    elif isinstance(item, neo4j.graph.Path):
-                        neo4j_properties["neo4j_nodes"] = item.nodes            # The sequence of Node objects in this path
-
-                    # Exclude any unwanted (ordinary or special) field
-                    if fields_to_exclude:
-                        for field in fields_to_exclude:
-                            if field in neo4j_properties:
-                                del neo4j_properties[field]
-
-                    if flatten:
-                        data_as_list.append(neo4j_properties)
-                    else:
-                        data.append(neo4j_properties)
-
-                if not flatten:
-                    data_as_list.append(data)
+        for record in records:
+            data = self._extended_record_data(record, fields_to_exclude)    # One dict for each item in the record
+            if flatten:
+                data_as_list += data
+            else:
+                data_as_list.append(data)
 
-            return data_as_list
+        return data_as_list
+
+
+
+    @staticmethod
+    def _extended_record_data(record, fields_to_exclude=None) -> [dict]:
+        """
+        Helper function for query_extended() and query_extended_iter().
+        Turn the given record into a list of dictionaries, one for each of its items;
+        for items that are Graph Data Types (nodes, relationships or paths),
+        extra special fields are added - see query_extended()
+
+        :param record:              A neo4j.Record object
+        :param fields_to_exclude:   [OPTIONAL] List of names of fields to leave out
+        :return:                    A list of dictionaries
+        """
+        # Note: record is a neo4j.Record object - an immutable ordered collection of key-value pairs.
+        #       (the keys are the dummy names used for the nodes, such as "n")
+        #       See https://neo4j.com/docs/api/python-driver/current/api.html#record
+
+        # EXAMPLE of record (if node n was returned):
+        #       <Record n=<Node id=227 labels=frozenset({'person', 'client'}) properties={'gender': 'M', 'age': 99}>>
+        #       (it has one key, "n")
+        # EXAMPLE of record (if node n and node c were returned):
+        #       <Record n=<Node id=227 labels=frozenset({'person', 'client'}) properties={'gender': 'M', 'age': 99}>
+        #               c=<Node id=66 labels=frozenset({'car'}) properties={'color': 'blue'}>>
+        #       (it has 2 keys, "n" and "c")
+
+        data = []
+        for item in record:
+            # Note: item is EITHER a neo4j.graph.Node object
+            #       OR a neo4j.graph.Relationship object
+            #       OR a neo4j.graph.Path object
+            #       See https://neo4j.com/docs/api/python-driver/current/api.html#node
+            #           https://neo4j.com/docs/api/python-driver/current/api.html#relationship
+            #           https://neo4j.com/docs/api/python-driver/current/api.html#path
+            # EXAMPLES of item:
+            #       <Node id=95 labels=frozenset({'car'}) properties={'color': 'white', 'make': 'Toyota'}>
+            #       <Relationship id=12 nodes=(<Node id=147 labels=frozenset() properties={}>, <Node id=150 labels=frozenset() properties={}>) type='bought_by' properties={'price': 7500}>
+
+            neo4j_properties = dict(item.items())   # EXAMPLE: {'gender': 'M', 'age': 99}
+
+            # Add extra, special fields depending on whether the returned item represents
+            # a database node, relationship or path
+            if isinstance(item, neo4j.graph.Node):
+                neo4j_properties["_internal_id"] = item.id              # Example: 227
+                neo4j_properties["_node_labels"] = list(item.labels)    # Example: ['person', 'client']
+
+            elif isinstance(item, neo4j.graph.Relationship):
+                neo4j_properties["_internal_id"] = item.id              # Example: 227
+                neo4j_properties["neo4j_start_node"] = item.start_node  # A neo4j.graph.Node object with "id", "labels" and "properties"
+                neo4j_properties["neo4j_end_node"] = item.end_node      # A neo4j.graph.Node object with "id", "labels" and "properties"
+                #   Example: <Node id=118 labels=frozenset({'car'}) properties={'color': 'white'}>
+                neo4j_properties["neo4j_type"] = item.type              # The name of the relationship
+
+            elif isinstance(item, neo4j.graph.Path):
+                neo4j_properties["neo4j_nodes"] = item.nodes            # The sequence of Node objects in this path
+
+            # Exclude any unwanted (ordinary or special) field
+            if fields_to_exclude:
+                for field in fields_to_exclude:
+                    if field in neo4j_properties:
+                        del neo4j_properties[field]
+
+            data.append(neo4j_properties)
+
+        return data
 
 
 
@@ -697,52 +1491,378 @@ class InterGraph:
             if self.block_query_execution:
                  return {}
 
-        # Start a new session, use it, and then immediately close it
-        with self.driver.session() as new_session:
-            result = self.run_cypher_query(q=q, data_binding=data_binding, session=new_session)
-            # Note: A neo4j.Result object (printing it, shows an object of type "neo4j.work.result.Result")
-            #       See https://neo4j.com/docs/api/python-driver/4.4/api.html#neo4j.Result
+        # Run the query, and fetch any data it returns, as a (possibly-empty) list of dictionaries,
+        # as well as the stats of its execution, as a neo4j.ResultSummary object
+        # (in the active transaction or session, if any; otherwise, in a new session that then gets closed)
+        # See https://neo4j.com/docs/api/python-driver/current/api.html#neo4j.ResultSummary
+        data_as_list, info = self._execute(q, data_binding,
+                                           fetch=lambda result: (result.data(), result.consume()),
+                                           count_rows=lambda fetched: len(fetched[0]))
 
-            data_as_list = result.data()    # Fetch any data returned by the query, as a (possibly-empty) list of dictionaries
+        if self.debug:
+            print("    In update_query(). Attributes of ResultSummary object:")
+            # Show as dictionary, which is available in info.__dict__
+            for k, v in info.__dict__.items():
+                print(f"    {k} -> {v}")
+            '''
+            EXAMPLE of info.__dict__: 
+            {   'metadata': { 
+                                'query': 'MATCH (n :`A` {`name`: $par_1}) DETACH DELETE n', 
+                                'parameters': {'par_1': 'Jill'}, 
+                                'server': <neo4j.api.ServerInfo object at 0x0000013AFFAF36A0>, 
+                                't_first': 0, 'fields': [], 'bookmark': 'FB:kcwQ7BUXt6dES3GUrMEnTGTC5ck+BZA=', 
+                                'stats': {'nodes-deleted': 1}, 'type': 'w', 't_last': 0, 'db': 'neo4j'
+                            }, 
+                'server': <neo4j.api.ServerInfo object at 0x0000013AFFAF36A0>, 
+                'database': 'neo4j', 
+                'query': 'MATCH (n :`A` {`name`: $par_1}) DETACH DELETE n', 
+                'parameters': {'par_1': 'Jill'}, 
+                'query_type': 'w', 
+                'plan': None, 'profile': None, 
+                'notifications': None, 
+                'counters': {'nodes_deleted': 1}, 
+                'result_available_after': 0, 
+                'result_consumed_after': 0
+            }
+            '''
+
+        stats = info.counters   # A neo4j.SummaryCounters object
+        # See https://neo4j.com/docs/api/python-driver/current/api.html#neo4j.SummaryCounters
+        stats_dict = stats.__dict__   # Convert object to dictionary
+
+        stats_dict['returned_data'] = data_as_list  # Add an extra entry to the dictionary, with the data returned by the query
+
+        return stats_dict
+
+
+
+
+
+    def query_iter(self, q :str, data_binding=None, chunk_size=None, fetch_size=None):
+        """
+        Generator variant of query(), for queries with large results:
+        rather than assembling all the results in memory, yield them one by one (or in chunks of a given size),
+        as they get fetched from the database server.
 
-            info = result.consume()     # Get the stats of the query just executed
-            # This is a neo4j.ResultSummary object
-            # See https://neo4j.com/docs/api/python-driver/current/api.html#neo4j.ResultSummary
+        A dedicated database session is kept open until the generator is exhausted (or closed),
+        even inside a session_scope() block (so that the shared session remains usable by other queries);
+        inside a transaction() block, however, the query is run in that transaction,
+        and no other queries should be run in it until the generator is exhausted.
 
-            if self.debug:
-                print("    In update_query(). Attributes of ResultSummary object:")
-                # Show as dictionary, which is available in info.__dict__
-                for k, v in info.__dict__.items():
-                    print(f"    {k} -> {v}")
-                '''
-                EXAMPLE of info.__dict__: 
-                {   'metadata': { 
-                                    'query': 'MATCH (n :`A` {`name`: $par_1}) DETACH DELETE n', 
-                                    'parameters': {'par_1': 'Jill'}, 
-                                    'server': <neo4j.api.ServerInfo object at 0x0000013AFFAF36A0>, 
-                                    't_first': 0, 'fields': [], 'bookmark': 'FB:kcwQ7BUXt6dES3GUrMEnTGTC5ck+BZA=', 
-                                    'stats': {'nodes-deleted': 1}, 'type': 'w', 't_last': 0, 'db': 'neo4j'
-                                }, 
-                    'server': <neo4j.api.ServerInfo object at 0x0000013AFFAF36A0>, 
-                    'database': 'neo4j', 
-                    'query': 'MATCH (n :`A` {`name`: $par_1}) DETACH DELETE n', 
-                    'parameters': {'par_1': 'Jill'}, 
-                    'query_type': 'w', 
-                    'plan': None, 'profile': None, 
-                    'notifications': None, 
-                    'counters': {'nodes_deleted': 1}, 
-                    'result_available_after': 0, 
-                    'result_consumed_after': 0
-                }
-                '''
+        Note: unlike query(), there are no automatic retries in case of transient errors.
 
-            stats = info.counters   # A neo4j.SummaryCounters object
-            # See https://neo4j.com/docs/api/python-driver/current/api.html#neo4j.SummaryCounters
-            stats_dict = stats.__dict__   # Convert object to dictionary
+        EXAMPLE:
+            for row in db.query_iter("MATCH (n :Car) RETURN n.make AS make, n.year AS year"):
+                print(row)      # {'make': 'Toyota', 'year': 2013}
+
+            for chunk in db.query_iter("MATCH (n :Car) RETURN n.make AS make", chunk_size=1000):
+                print(len(chunk))   # 1000 (except possibly for the last chunk)
+
+        :param q:           A string with a Cypher query
+        :param data_binding:[OPTIONAL] A Cypher dictionary
+        :param chunk_size:  [OPTIONAL] If specified, yield lists of (up to) this many records;
+                                otherwise, yield individual records
+        :param fetch_size:  [OPTIONAL] Number of records fetched in each batch from the database server;
+                                if not specified, the value given at instantiation (if any), or else the driver's default
+        :return:            A generator of dictionaries, or of lists of dictionaries (if chunk_size was specified),
+                                in the same format as the elements of the list returned by query()
+        """
+        rows = (record.data() for record in self._stream_records(q, data_binding, fetch_size=fetch_size))
+
+        if chunk_size is None:
+            yield from rows
+        else:
+            yield from self._chunked(rows, chunk_size)
 
-            stats_dict['returned_data'] = data_as_list  # Add an extra entry to the dictionary, with the data returned by the query
 
-            return stats_dict
+
+    def query_extended_iter(self, q :str, data_binding=None, flatten=False, fields_to_exclude=None,
+                            chunk_size=None, fetch_size=None):
+        """
+        Generator variant of query_extended(), for queries with large results:
+        rather than assembling all the results in memory, yield them one by one (or in chunks of a given size),
+        as they get fetched from the database server.
+        Same caveats as for query_iter()
+
+        EXAMPLE:
+            for node in db.query_extended_iter("MATCH (n :Car) RETURN n", flatten=True):
+                print(node)     # {'make': 'Toyota', '_internal_id': 123, '_node_labels': ['Car']}
+
+        :param q:                   A Cypher query ; typically, one returning nodes, relationships or paths
+        :param data_binding:        [OPTIONAL] A Cypher dictionary
+        :param flatten:             If True, yield the individual items (dictionaries) of each record;
+                                        if False, yield a list of dictionaries for each record
+        :param fields_to_exclude:   [OPTIONAL] String, or list of strings, with name(s) of fields to leave out
+        :param chunk_size:          [OPTIONAL] If specified, yield lists of (up to) this many of the elements described above
+        :param fetch_size:          [OPTIONAL] Number of records fetched in each batch from the database server
+        :return:                    A generator of the elements that make up the list returned by query_extended() ;
+                                        or of lists of them, if chunk_size was specified
+        """
+        if (type(fields_to_exclude) == str) and (fields_to_exclude != ""):
+            fields_to_exclude = [fields_to_exclude]
+
+        def elements():
+            for record in self._stream_records(q, data_binding, fetch_size=fetch_size):
+                data = self._extended_record_data(record, fields_to_exclude)
+                if flatten:
+                    yield from data
+                else:
+                    yield data
+
+        if chunk_size is None:
+            yield from elements()
+        else:
+            yield from self._chunked(elements(), chunk_size)
+
+
+
+    def query_columns(self, q :str, data_binding=None,
+                      expand_nodes=True, include_internal_id=False, include_labels=False) -> dict:
+        """
+        Column-oriented variant of query(), meant for large results that are destined to tabular processing
+        (for example with Pandas or NumPy):
+        build lists of values for each column directly from the record stream,
+        without creating a dictionary for each record.
+
+        EXAMPLES:
+            query_columns("MATCH (n :Car) RETURN n.make AS make, n.year AS year")
+                    -> {"make": ["Toyota", "Ford"], "year": [2013, 2023]}
+            query_columns("MATCH (n :Car) RETURN n", include_internal_id=True)
+                    -> {"make": ["Toyota", "Ford"], "year": [2013, None], "_internal_id": [12, 34]}
+
+        :param q:                   A string with a Cypher query
+        :param data_binding:        [OPTIONAL] A Cypher dictionary
+        :param expand_nodes:        [OPTIONAL] If True (default), columns that contain nodes get replaced by one column
+                                        for each of the properties present in any of those nodes (with None where missing);
+                                        if the query returns more than one node column, the names of the new columns
+                                        are prefixed by the name of the node column, as in "n.make".
+                                        If False, nodes are left as neo4j.graph.Node objects
+        :param include_internal_id: [OPTIONAL] If True, and if expanding nodes, include the column "_internal_id"
+        :param include_labels:      [OPTIONAL] If True, and if expanding nodes, include the column "_node_labels"
+        :return:                    A dictionary whose keys are the column names, and whose values are lists
+                                        (all of the same length, i.e. the number of records)
+        """
+        if self.debug or self.block_query_execution:
+            self.debug_query_print(q, data_binding, method="query_columns")
+            if self.block_query_execution:
+                return {}
+
+        # Fetch the names of the columns, and the values of all the records (as a list of lists)
+        fetched = self._execute(q, data_binding, fetch=lambda result: (result.keys(), result.values()),
+                                count_rows=lambda fetched: len(fetched[1]))
+        if fetched is None:
+            return {}
+
+        keys, rows = fetched
+        raw_columns = list(zip(*rows)) if rows else [() for _ in keys]    # Transpose the records into columns
+
+        node_keys = [key for (key, values) in zip(keys, raw_columns)
+                        if expand_nodes and isinstance(self._first_not_none(values), neo4j.graph.Node)]
+
+        columns = {}
+        for key, values in zip(keys, raw_columns):
+            if key not in node_keys:
+                columns[key] = list(values)
+                continue
+
+            # Expand a column of nodes into one column for each of their properties
+            prefix = "" if len(node_keys) == 1 else f"{key}."
+            property_names = {}     # Used as an ordered set
+            for node in values:
+                if node is not None:
+                    property_names.update(dict.fromkeys(node.keys()))
+
+            for name in property_names:
+                columns[prefix + name] = [None if node is None else node.get(name) for node in values]
+
+            if include_labels:
+                columns[prefix + "_node_labels"] = [None if node is None else list(node.labels) for node in values]
+            if include_internal_id:
+                columns[prefix + "_internal_id"] = [None if node is None else node.id for node in values]
+
+        return columns
+
+
+
+    def query_df(self, q :str, data_binding=None,
+                 expand_nodes=True, include_internal_id=False, include_labels=False, convert_datetimes=True) -> pd.DataFrame:
+        """
+        Run a Cypher query, and return its result as a Pandas dataframe,
+        built column by column (see query_columns), rather than from a dictionary for each record.
+
+        EXAMPLE:
+            query_df("MATCH (n :Car) RETURN n")   ->   a dataframe with columns such as "make" and "year"
+
+        :param q:                   A string with a Cypher query
+        :param data_binding:        [OPTIONAL] A Cypher dictionary
+        :param expand_nodes:        [OPTIONAL] See query_columns()
+        :param include_internal_id: [OPTIONAL] See query_columns()
+        :param include_labels:      [OPTIONAL] See query_columns()
+        :param convert_datetimes:   [OPTIONAL] If True (default), columns of Neo4j DateTime or Date values
+                                        get converted into Pandas datetime columns - see columns_to_df()
+        :return:                    A Pandas dataframe
+        """
+        columns = self.query_columns(q, data_binding, expand_nodes=expand_nodes,
+                                     include_internal_id=include_internal_id, include_labels=include_labels)
+
+        return self.columns_to_df(columns, convert_datetimes=convert_datetimes)
+
+
+
+    @classmethod
+    def columns_to_df(cls, columns :dict, convert_datetimes=True) -> pd.DataFrame:
+        """
+        Turn a dictionary of lists of values, as returned by query_columns(), into a Pandas dataframe,
+        building each typed column in a single step.
+
+        Columns of Neo4j DateTime or Date values (and None's) are turned into Pandas datetime columns
+        by parsing the ISO strings of all their values with one vectorized call (which, unlike the conversion
+        into python datetime's, also keeps the nanoseconds.)  Such columns are left as they are
+        if Pandas cannot accommodate them, for example in case of a mixture of different UTC offsets.
+        All other columns are typed by Pandas, as usual: for example, integers with missing values become floats
+
+        :param columns:             A dictionary whose keys are the column names, and whose values are lists
+                                        (all of the same length)
+        :param convert_datetimes:   [OPTIONAL] If True (default), convert the columns of Neo4j DateTime or Date values
+        :return:                    A Pandas dataframe
+        """
+        df_columns = {}
+        for name, values in columns.items():
+            if convert_datetimes and isinstance(cls._first_not_none(values), (DateTime, Date)):
+                df_columns[name] = cls._datetime_column(values)
+            else:
+                df_columns[name] = pd.Series(values, dtype=None if values else object)
+
+        return pd.DataFrame(df_columns)
+
+
+
+    @staticmethod
+    def _datetime_column(values :list) -> pd.Series:
+        """
+        Helper for columns_to_df().  Turn a list of Neo4j DateTime or Date values (possibly with None's)
+        into a Pandas Series of dtype datetime64, if possible;  otherwise, into a Series of the unchanged values
+
+        :param values:  A list of neo4j.time.DateTime or neo4j.time.Date objects, or None's
+        :return:        A Pandas Series
+        """
+        iso_strings = pd.Series([None if v is None else v.iso_format() for v in values], dtype=object)
+
+        # Versions of pandas prior to 2 accept any shape of ISO strings by default, and don't know the "ISO8601" format
+        options = {"format": "ISO8601"} if int(pd.__version__.split(".")[0]) >= 2 else {}
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)      # Issued by pandas 2 about mixed time zones
+                parsed = pd.to_datetime(iso_strings, **options)
+            if pd.api.types.is_datetime64_any_dtype(parsed.dtype):
+                return parsed
+        except (ValueError, TypeError):
+            pass
+
+        return pd.Series(values, dtype=object)      # Leave the values as they are
+
+
+
+    @staticmethod
+    def _first_not_none(values):
+        """
+        Return the first element of the given sequence that isn't None, or None if there isn't any
+
+        :param values:  A list or tuple
+        :return:        The first element that isn't None (or None)
+        """
+        return next((v for v in values if v is not None), None)
+
+
+
+    def _stream_records(self, q :str, data_binding=None, fetch_size=None):
+        """
+        Helper generator for query_iter() and query_extended_iter().
+        Run the given Cypher query, and yield its records as they get fetched from the database server
+
+        :param q:           A string with a Cypher query
+        :param data_binding:[OPTIONAL] A Cypher dictionary
+        :param fetch_size:  [OPTIONAL] Number of records fetched in each batch from the database server
+        :return:            A generator of neo4j.Record objects
+        """
+        if self.debug or self.block_query_execution:
+            self.debug_query_print(q, data_binding, method="query_iter")
+            if self.block_query_execution:
+                return
+
+        is_read_only = self.is_read_only_query(q)
+        if not is_read_only:
+            self._note_write()
+
+        call_chain = self._query_caller() if self.query_stats_enabled else None
+
+        self._count_active_query(+1)
+        try:
+            active_tx = getattr(self._scope, "tx", None)
+            if active_tx is not None:
+                yield from self._stream_and_record(q, data_binding, session=active_tx, call_chain=call_chain)
+                return
+
+            replica_driver = self._pick_replica() if is_read_only else None     # None means: use the primary
+
+            # Use a dedicated session, kept open while the records are being consumed
+            with self.get_session(replica_driver or self.driver, fetch_size=fetch_size) as new_session:
+                yield from self._stream_and_record(q, data_binding, session=new_session, call_chain=call_chain)
+        finally:
+            self._count_active_query(-1)
+
+
+
+    def _stream_and_record(self, q :str, data_binding, session, call_chain):
+        """
+        Helper generator for _stream_records().
+        Run the given Cypher query on the given session (or transaction), and yield its records;
+        once they have all been consumed, record the query stats (unless `call_chain` is None)
+
+        :param q:           A string with a Cypher query
+        :param data_binding:A Cypher dictionary, or None
+        :param session:     A neo4j.Session object, or a neo4j.Transaction object
+        :param call_chain:  List of the calling functions, as returned by _query_caller(); None to skip the query stats
+        :return:            A generator of neo4j.Record objects
+        """
+        start_time = time.perf_counter()
+        result = self.run_cypher_query(q=q, data_binding=data_binding, session=session)
+        if result is None:
+            return
+
+        rows = 0
+        for record in result:
+            rows += 1
+            yield record
+
+        if call_chain is not None:
+            # Note: the elapsed time includes the time spent by the caller to process the records
+            self._record_query(q, data_binding, call_chain=call_chain, elapsed=time.perf_counter() - start_time,
+                               result=result, rows=rows)
+
+
+
+    @staticmethod
+    def _chunked(iterable, chunk_size :int):
+        """
+        Yield lists of (up to) the given number of consecutive elements from the given iterable
+
+        EXAMPLE:  list(_chunked(range(5), 2))  will be  [[0, 1], [2, 3], [4]]
+
+        :param iterable:    Any iterable
+        :param chunk_size:  A positive integer
+        :return:            A generator of non-empty lists
+        """
+        assert type(chunk_size) == int and chunk_size > 0, \
+            f"The `chunk_size` argument must be a positive integer; instead, it's {chunk_size}"
+
+        iterator = iter(iterable)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
 
 
 
@@ -771,7 +1891,7 @@ class InterGraph:
 
 
 
-    def delete_nodes_by_label(self, delete_labels=None, keep_labels=None) -> None:
+    def delete_nodes_by_label(self, delete_labels=None, keep_labels=None, batch_size=None, pause=0, report=False) -> None:
         """
         Empty out (by default completely) the Neo4j database.
         Optionally, only delete nodes with the specified labels, or only keep nodes with the given labels.
@@ -782,10 +1902,20 @@ class InterGraph:
         :param delete_labels:   An optional string, or list of strings, indicating specific labels to DELETE
         :param keep_labels:     An optional string or list of strings, indicating specific labels to KEEP
                                     (keep_labels has higher priority over delete_labels)
+        :param batch_size:      [OPTIONAL] If specified, delete the nodes in batches of this size,
+                                    each in its own transaction - recommended for large databases.
+                                    See delete_in_batches()
+        :param pause:           [OPTIONAL] Only applicable if `batch_size` is given:
+                                    number of seconds to wait between batches
+        :param report:          [OPTIONAL] Only applicable if `batch_size` is given:
+                                    if True, print the progress of the deletion
         :return:                None
         """
         if (delete_labels is None) and (keep_labels is None):
             # Delete ALL nodes AND ALL relationship from the database; for efficiency, do it all at once
+            if batch_size is not None:
+                self.delete_in_batches("MATCH (n)", batch_size=batch_size, pause=pause, report=report)
+                return
 
             q = "MATCH (n) DETACH DELETE(n)"
             self.query(q)       # TODO: switch to update_query() and return the number of nodes deleted
@@ -808,15 +1938,17 @@ class InterGraph:
         #   EXCEPT for any label in the keep_labels list
         for label in delete_labels:
             if not (label in keep_labels):
+                if batch_size is not None:
+                    self.delete_in_batches(f"MATCH (n :`{label}`)", batch_size=batch_size, pause=pause, report=report)
+                    continue
+
                 q = f"MATCH (x:`{label}`) DETACH DELETE x"
                 self.query(q)       # TODO: switch to update_query() and return the number of nodes deleted
 
 
 
-    def bulk_delete_by_label(self, label: str):
+    def bulk_delete_by_label(self, label: str, batch_size=10000) -> dict:
         """
-        IMPORTANT: APOC required (starting from v 4.4 of Neo4j, will be able to do this without APOC; TODO: not yet tested)
-
         Meant for large databases, where the straightforward deletion operations may result
         in very large number of nodes, and take a long time (or possibly fail)
 
@@ -825,21 +1957,79 @@ class InterGraph:
         such that a Java OUT OF HEAP Error will be encountered."
         See:  https://neo4j.com/developer/kb/large-delete-transaction-best-practices-in-neo4j/
 
-        TODO: generalize to bulk-deletion not just by label
-        TODO: test.  CAUTION: only tested interactively
+        Note: it no longer requires APOC - see delete_in_batches()
 
-        :param label:   A string with the label of the nodes to delete (blank spaces in name are ok)
-        :return:        A dict with the keys "batches" and "total"
+        :param label:       A string with the label of the nodes to delete (blank spaces in name are ok)
+        :param batch_size:  [OPTIONAL] Max number of nodes to delete in each transaction.  Default: 10000
+        :return:            A dict with the keys "batches" and "total"
         """
-        batch_size = 10000
+        return self.delete_in_batches(f"MATCH (n :`{label}`)", batch_size=batch_size)
+
+
+
+    def delete_in_batches(self, q_match :str, data_binding=None, node_name="n",
+                          batch_size=10000, pause=0, report=False) -> dict:
+        """
+        Delete (along with their relationships) all the nodes located by the given MATCH clause,
+        a batch at a time, each batch in its own transaction - so that the memory needed by the database
+        for each transaction stays bounded, no matter how many nodes get deleted.
+        Optionally, pause between batches, to throttle the load on the database
+        (for example, when running in the background while the database is in use.)
+
+        The batching is done by the client, rather than with CALL { ... } IN TRANSACTIONS (not available
+        in older versions of Neo4j), so that it can be throttled and report its progress.
+        Note: a node with a very large number of relationships still gets deleted, along with all of them,
+              in a single transaction
+
+        EXAMPLE:
+            delete_in_batches("MATCH (n :`Car`) WHERE n.year < $year", data_binding={"year": 2000}, pause=0.5)
+
+        :param q_match:         A string with a Cypher MATCH clause (possibly with a WHERE clause)
+                                    that locates the nodes to delete
+        :param data_binding:    [OPTIONAL] A dict with the parameters used in `q_match`, if any
+        :param node_name:       [OPTIONAL] The dummy name used in `q_match` for the nodes to delete.  Default: "n"
+        :param batch_size:      [OPTIONAL] Max number of nodes to delete in each transaction.  Default: 10000
+        :param pause:           [OPTIONAL] Number of seconds to wait between batches.  Default: 0
+        :param report:          [OPTIONAL] If True, print the progress of the deletion.  Default: False
+
+        :return:                A dict with the keys "batches" (the number of non-empty batches)
+                                    and "total" (the number of nodes deleted)
+        """
+        assert (type(batch_size) == int) and (batch_size >= 1), \
+            f"delete_in_batches(): the argument `batch_size` must be an integer >= 1 (value passed: {batch_size})"
+        assert not self.in_transaction(), \
+            "delete_in_batches(): cannot be used inside a transaction() block, since each batch must be committed separately"
+
         q = f'''
-            CALL apoc.periodic.iterate("MATCH (n :`{label}`) RETURN id(n) as id", 
-                                       "MATCH (n) WHERE id(n) = id DETACH DELETE n", {{batchSize:{batch_size}}})
-            YIELD batches, total 
-            RETURN batches, total
-        '''
-        result = self.query(q)
-        return result[0]
+            {q_match}
+            WITH {node_name} LIMIT $delete_batch_size
+            DETACH DELETE {node_name}
+            '''
+        batch_binding = dict(data_binding) if data_binding else {}
+        batch_binding["delete_batch_size"] = batch_size
+
+        start_time = time.perf_counter()
+        batches = 0
+        total = 0
+        while True:
+            number_deleted = self.update_query(q, batch_binding).get("nodes_deleted", 0)
+            if number_deleted == 0:
+                break
+
+            batches += 1
+            total += number_deleted
+            if report:
+                elapsed = time.perf_counter() - start_time
+                print(f"   Completed deletion batch # {batches} : a grand total of {total:,} node(s) "
+                      f"in {elapsed:.1f} sec ({total / max(elapsed, 1e-9):,.0f} nodes/sec)")
+
+            if number_deleted < batch_size:
+                break           # No more nodes left
+
+            if pause:
+                time.sleep(pause)
+
+        return {"batches": batches, "total": total}
 
 
 
@@ -946,6 +2136,7 @@ class InterGraph:
         if (label, key) not in existing_standard_name_pairs:
             q = f'CREATE INDEX `{label}.{key}` FOR (s:`{label}`) ON (s.`{key}`)'
             self.query(q)
+            self._index_cache = None    # The cache of known indexes will need to be refreshed
             return True
         else:
             return False
@@ -959,6 +2150,7 @@ class InterGraph:
         :param name:    Name of the index to jettison
         :return:        True if successful or False otherwise (for example, if the index doesn't exist)
         """
+        self._index_cache = None    # The cache of known indexes will need to be refreshed
         try:
             self.query(f"DROP INDEX `{name}`")      # Note: this crashes if the index doesn't exist
             return True
@@ -983,6 +2175,174 @@ class InterGraph:
         for name in indexes['name']:
             self.drop_index(name)
 
+        self._index_cache = None    # The cache of known indexes will need to be refreshed
+
+
+
+    def ensure_index(self, label :str, key :str, kind="range", wait=True, timeout=300) -> bool:
+        """
+        Make sure that an index of the given kind exists for the pairing of the specified label and key (property);
+        if not, create it and (by default) wait for it to be fully populated.
+        See ensure_indexes()
+
+        EXAMPLE:    ensure_index(label="patient", key="patient_id")
+                    ensure_index(label="patient", key="notes", kind="text", wait=False)
+
+        :param label:   A string with the node label to which the index is to be applied
+        :param key:     A string with the key (property) name to which the index is to be applied
+        :param kind:    [OPTIONAL] Either "range" (the default), "text" or "unique"
+        :param wait:    [OPTIONAL] If True (default), a newly-created index is waited upon till it's ONLINE
+        :param timeout: [OPTIONAL] Max number of seconds to wait; default 300
+        :return:        True if a new index (or uniqueness constraint) was created, or False otherwise
+        """
+        return self.ensure_indexes([(label, key, kind)], wait=wait, timeout=timeout) == 1
+
+
+
+    def ensure_indexes(self, specs :[tuple], wait=True, timeout=300) -> int:
+        """
+        Make sure that all the requested node indexes exist, creating the missing ones;
+        if any got created, optionally wait for ALL the indexes to come ONLINE
+        (i.e. to be fully populated) before returning.
+        This is meant to be called prior to bulk imports that MATCH or MERGE on a key,
+        which - in the absence of an index - would take time quadratic in the number of nodes.
+
+        The set of existing indexes is read from the database only the first time, and then cached;
+        the cache is kept up-to-date by all the methods of this class that create or drop indexes or constraints.
+        If indexes are altered by other means (for example, by direct Cypher queries, or by other clients),
+        use reset_index_cache()
+
+        Supported kinds of indexes:
+            "range"     A general-purpose index, for equality and range lookups
+                            (also satisfied by an existing uniqueness constraint on the same label and key)
+                            Standard name: `{label}.{key}`
+            "text"      An index for string-matching lookups (CONTAINS, ENDS WITH)
+                            Standard name: `{label}.{key}.TEXT`
+            "unique"    A uniqueness constraint, which comes with its own index - see create_constraint()
+                            Standard name: `{label}.{key}.UNIQUE`
+                            Note: it cannot be created if the nodes already contain duplicate values,
+                                  or if a non-unique index already exists on the same label and key;
+                                  in those cases, no constraint is created (as with create_constraint)
+
+        EXAMPLE:    ensure_indexes([("patient", "patient_id"), ("patient", "name", "text"), ("doctor", "npi", "unique")])
+
+        :param specs:   A list of pairs (label, key), or triplets (label, key, kind)
+                            where kind is "range" (the default), "text" or "unique"
+        :param wait:    [OPTIONAL] If True (default), and if any index was created,
+                            wait till all indexes are ONLINE - see await_indexes()
+        :param timeout: [OPTIONAL] Max number of seconds to wait; default 300
+        :return:        The number of indexes (or uniqueness constraints) that were created
+        """
+        known = self._known_indexes()
+
+        created = 0
+        for spec in specs:
+            assert type(spec) in (tuple, list) and len(spec) in (2, 3), \
+                f"ensure_indexes(): each index specification must be a pair (label, key) " \
+                f"or a triplet (label, key, kind); `{spec}` is not valid"
+            (label, key) = spec[:2]
+            kind = spec[2] if len(spec) == 3 else "range"
+            assert kind in ("range", "text", "unique"), \
+                f"ensure_indexes(): the kind of index must be one of 'range', 'text', 'unique'; not `{kind}`"
+
+            if (label, key, kind) in known:
+                continue                # This index is already present
+            if kind == "range" and (label, key, "unique") in known:
+                continue                # The index of a uniqueness constraint will do just fine
+
+            if kind == "range":
+                self.query(f'CREATE INDEX `{label}.{key}` IF NOT EXISTS FOR (n:`{label}`) ON (n.`{key}`)')
+            elif kind == "text":
+                self.query(f'CREATE TEXT INDEX `{label}.{key}.TEXT` IF NOT EXISTS FOR (n:`{label}`) ON (n.`{key}`)')
+            else:
+                if not self.create_constraint(label=label, key=key):
+                    continue            # No constraint could be created (see docstring)
+                known = self._known_indexes()   # create_constraint() invalidated the cache
+
+            known.add((label, key, kind))
+            created += 1
+
+        if created and wait:
+            self.await_indexes(timeout=timeout)
+
+        return created
+
+
+
+    def _known_indexes(self) -> set:
+        """
+        Return the cached set of existing single-property node indexes (loaded from the database if needed),
+        as triplets (label, key, kind) with kind being "range", "text" or "unique"
+
+        :return:    A (possibly empty) set of triplets of strings
+        """
+        if self._index_cache is None:
+            q = """
+            CALL db.indexes() 
+            YIELD type, entityType, labelsOrTypes, properties, uniqueness
+            WHERE entityType = "NODE" AND size(properties) = 1
+            RETURN type, labelsOrTypes[0] AS label, properties[0] AS key, 
+                   (uniqueness = "UNIQUE") AS unique
+            """
+            known = set()
+            for index in self.query(q):
+                if index["unique"]:
+                    known.add((index["label"], index["key"], "unique"))
+                elif index["type"] in ["BTREE", "RANGE"]:     # BTREE is the 4.x name of general-purpose indexes
+                    known.add((index["label"], index["key"], "range"))
+                elif index["type"] == "TEXT":
+                    known.add((index["label"], index["key"], "text"))
+            self._index_cache = known
+
+        return self._index_cache
+
+
+
+    def reset_index_cache(self) -> None:
+        """
+        Forget the cached set of known indexes (used by ensure_indexes);
+        it will get re-read from the database when next needed.
+        Only needed if indexes or constraints were altered other than by the methods of this class
+
+        :return:    None
+        """
+        self._index_cache = None
+
+
+
+    def await_indexes(self, timeout=300) -> None:
+        """
+        Wait till all the database indexes are ONLINE, i.e. fully populated and ready to be used.
+        Newly-created indexes get populated in the background, and - till then - aren't used by queries
+
+        :param timeout: [OPTIONAL] Max number of seconds to wait; default 300.
+                            If exceeded, an Exception is raised by the database
+        :return:        None
+        """
+        self.query("CALL db.awaitIndexes($timeout)", {"timeout": timeout})
+
+
+
+    def index_population_progress(self) -> [dict]:
+        """
+        Report the status of all the database indexes, including their population progress
+        (which is only relevant while the "state" is "POPULATING")
+
+        EXAMPLE of a returned list:
+            [{"name": "car.color", "state": "ONLINE", "populationPercent": 100.0},
+             {"name": "car.vin.UNIQUE", "state": "POPULATING", "populationPercent": 37.5}]
+
+        :return:    A (possibly empty) list of dicts, with keys "name", "state" and "populationPercent"
+        """
+        q = """
+            CALL db.indexes() 
+            YIELD name, state, populationPercent
+            RETURN name, state, populationPercent
+            ORDER BY name
+            """
+
+        return self.query(q)
+
 
 
 
@@ -1045,6 +2405,7 @@ class InterGraph:
         try:
             q = f'CREATE CONSTRAINT `{cname}` ON (s:`{label}`) ASSERT s.`{key}` IS UNIQUE'
             self.query(q)
+            self._index_cache = None    # The cache of known indexes will need to be refreshed
             # Note: creation of a constraint will crash if another constraint, or index, already exists
             #           for the specified label and key
             return True
@@ -1060,6 +2421,7 @@ class InterGraph:
         :param name:    Name of the constraint to eliminate
         :return:        True if successful or False otherwise (for example, if the constraint doesn't exist)
         """
+        self._index_cache = None    # The cache of known indexes will need to be refreshed (the constraint's index goes away)
         try:
             q = f"DROP CONSTRAINT `{name}`"
             self.query(q)     # Note: it crashes if the constraint doesn't exist
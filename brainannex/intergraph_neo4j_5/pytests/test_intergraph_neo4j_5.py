@@ -16,7 +16,9 @@ from brainannex.intergraph_neo4j_5.intergraph_neo4j_5 import InterGraph
 from utilities.comparisons import compare_unordered_lists, compare_recordsets
 from datetime import datetime, date
 import os
+import pandas as pd
 import neo4j.time
+from neo4j.exceptions import ServiceUnavailable, TransientError
 
 
 
@@ -312,6 +314,245 @@ def test_update_query(db):
     pass    # TODO
 
 
+def test_session_scope(db):
+    db.empty_dbase()
+
+    with db.session_scope() as session:
+        db.update_query("CREATE (:car {color: 'white'})")
+        with db.session_scope() as inner_session:
+            assert inner_session is session     # Nested scopes join the outer one
+            db.query("CREATE (:car {color: 'blue'})")
+
+        result = db.query("MATCH (c:car) RETURN c.color AS color ORDER BY color")
+        assert result == [{'color': 'blue'}, {'color': 'white'}]
+
+    assert db._scope.session is None
+    assert db.query("MATCH (c:car) RETURN count(c) AS n", single_cell="n") == 2
+
+
+
+def test_transaction(db):
+    db.empty_dbase()
+
+    # Successful completion: everything is committed
+    with db.transaction():
+        assert db.in_transaction()
+        db.update_query("CREATE (:car {color: 'white'})")
+        with db.transaction():      # Nested transactions join the outer one
+            db.update_query("CREATE (:car {color: 'blue'})")
+        # Inside the transaction, the uncommitted changes are visible
+        assert db.query("MATCH (c:car) RETURN count(c) AS n", single_cell="n") == 2
+
+    assert not db.in_transaction()
+    assert db.query("MATCH (c:car) RETURN count(c) AS n", single_cell="n") == 2
+
+    # An Exception inside the block: everything is rolled back
+    with pytest.raises(Exception):
+        with db.transaction():
+            db.update_query("CREATE (:car {color: 'red'})")
+            db.update_query("MATCH (c:car {color: 'white'}) DETACH DELETE c")
+            raise Exception("Simulated failure")
+
+    assert not db.in_transaction()
+    result = db.query("MATCH (c:car) RETURN c.color AS color ORDER BY color")
+    assert result == [{'color': 'blue'}, {'color': 'white'}]
+
+
+def test_is_read_only_query():
+    assert InterGraph.is_read_only_query("MATCH (n :Car) RETURN n")
+    assert InterGraph.is_read_only_query("MATCH (n :Car) WHERE n.year > $year RETURN n.color AS color LIMIT 10")
+    assert InterGraph.is_read_only_query("CALL db.labels() YIELD label RETURN label")
+    assert InterGraph.is_read_only_query("SHOW INDEXES YIELD name RETURN name")
+
+    assert not InterGraph.is_read_only_query("CREATE (:Car {color: 'white'})")
+    assert not InterGraph.is_read_only_query("MATCH (n :Car) SET n.color = 'red'")
+    assert not InterGraph.is_read_only_query("match (n :Car) detach delete n")
+    assert not InterGraph.is_read_only_query("MERGE (n :Car {vin: 123}) RETURN id(n)")
+    assert not InterGraph.is_read_only_query("CALL apoc.export.json.all(null, {stream: true})")
+    assert not InterGraph.is_read_only_query("DROP INDEX `Car.vin`")
+
+
+
+def test_is_autocommit_only_query():
+    assert InterGraph.is_autocommit_only_query("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS")
+    assert not InterGraph.is_autocommit_only_query("MATCH (n) DETACH DELETE n")
+
+
+
+def test_retry_stats(db):
+    db.reset_retry_stats()
+    db.query("MATCH (n) RETURN count(n)")
+    assert db.retry_stats() == {'retries': 0, 'retried_queries': 0, 'recovered_queries': 0, 'failed_queries': 0}
+
+
+
+def test_run_with_retries():
+    # No database needed: a fake session fails on the first attempt, and succeeds on the second one
+    class FlakySession:
+        def __init__(self, error):
+            self.error = error
+            self.attempts = 0
+
+        def execute_write(self, work):
+            self.attempts += 1
+            if self.attempts == 1:
+                raise self.error
+            return work("fake transaction")
+
+    graph = InterGraph(host="bolt://localhost:7687", credentials=("neo4j", "unused"), autoconnect=False,
+                       retry_initial_delay=0.001)
+
+    for error in [TransientError("Simulated deadlock"), ServiceUnavailable("Simulated lost connection")]:
+        session = FlakySession(error)
+        result = graph._run_with_retries(session=session, work=lambda tx: f"done in {tx}", q="MATCH (n) SET n.x = 1")
+        assert result == "done in fake transaction"
+        assert session.attempts == 2
+
+    assert graph.retry_stats() == {'retries': 2, 'retried_queries': 2, 'recovered_queries': 2, 'failed_queries': 0}
+
+    graph = InterGraph(host="bolt://localhost:7687", credentials=("neo4j", "unused"), autoconnect=False,
+                       retry_max_attempts=1)
+    with pytest.raises(ServiceUnavailable):
+        graph._run_with_retries(session=FlakySession(ServiceUnavailable("Lost connection")),
+                                work=lambda tx: None, q="MATCH (n) SET n.x = 1")
+    assert graph.retry_stats()["failed_queries"] == 1
+
+
+def test_pool_stats(db):
+    db.query("MATCH (n) RETURN count(n)")
+    stats = db.pool_stats()
+    assert set(stats) == {"max_size", "in_use", "idle", "waiting",
+                          "active_queries", "peak_active_queries", "acquisition_timeout"}
+    assert stats["active_queries"] == 0     # No query is being run at this moment
+    assert stats["peak_active_queries"] >= 1
+
+
+def test_query_stats(db):
+    db.reset_query_stats()
+    assert db.query_stats() == {}
+    assert db.slow_queries() == []
+
+    db.query("UNWIND range(1, 3) AS i RETURN i")
+    db.query("UNWIND range(1, 2) AS i RETURN i")
+
+    stats = db.query_stats()
+    assert list(stats) == ["test_query_stats"]      # Tagged with the calling function
+    assert stats["test_query_stats"]["count"] == 2
+    assert stats["test_query_stats"]["rows"] == 5
+    assert sum(stats["test_query_stats"]["histogram"].values()) == 2
+    assert db.slow_queries() == []
+
+    saved_threshold = db.slow_query_threshold
+    try:
+        db.slow_query_threshold = 0     # Every query is now "slow"
+        db.query("PROFILE MATCH (n) RETURN count(n) AS n")
+        (entry,) = db.slow_queries()
+        assert entry["caller"] == "test_query_stats"
+        assert entry["query"] == "PROFILE MATCH (n) RETURN count(n) AS n"
+        assert entry["rows"] == 1
+        assert entry["db_hits"] >= 0
+    finally:
+        db.slow_query_threshold = saved_threshold
+
+    db.reset_query_stats()
+    assert db.query_stats() == {}
+    assert db.slow_queries() == []
+
+
+def test_pick_replica(db):
+    assert db._pick_replica() is None       # No replicas were specified
+
+    # Simulate the presence of 2 read replicas
+    saved_drivers, saved_window = db.replica_drivers, db.read_your_writes_window
+    try:
+        db.replica_drivers = ["replica_A", "replica_B"]
+        db.read_your_writes_window = 5
+        db._last_write_time = None
+        picked = [db._pick_replica() for _ in range(4)]
+        assert sorted(picked) == ["replica_A", "replica_A", "replica_B", "replica_B"]   # In rotation
+
+        db._note_write()
+        assert db._pick_replica() is None   # Just after a write, reads go to the primary
+
+        db.read_your_writes_window = 0
+        assert db._pick_replica() in ["replica_A", "replica_B"]
+    finally:
+        db.replica_drivers, db.read_your_writes_window = saved_drivers, saved_window
+
+
+def test_query_iter(db):
+    db.empty_dbase()
+    db.query("UNWIND range(1, 5) AS i CREATE (:car {vin: i})")
+
+    q = "MATCH (c:car) RETURN c.vin AS vin ORDER BY vin"
+    result = list(db.query_iter(q))
+    assert result == [{'vin': 1}, {'vin': 2}, {'vin': 3}, {'vin': 4}, {'vin': 5}]
+    assert result == db.query(q)
+
+    result = list(db.query_iter(q, chunk_size=2, fetch_size=1))
+    assert result == [[{'vin': 1}, {'vin': 2}], [{'vin': 3}, {'vin': 4}], [{'vin': 5}]]
+
+    # Inside a session scope, other queries may be run while the generator is being consumed
+    with db.session_scope():
+        for row in db.query_iter(q, fetch_size=1):
+            assert db.query("MATCH (c:car {vin: $vin}) RETURN count(c) AS n", {"vin": row["vin"]}, single_cell="n") == 1
+
+    assert list(db.query_iter("MATCH (c:non_existing_label) RETURN c")) == []
+
+
+
+def test_query_extended_iter(db):
+    db.empty_dbase()
+    db.query("UNWIND range(1, 3) AS i CREATE (:car {vin: i})")
+
+    q = "MATCH (c:car) RETURN c ORDER BY c.vin"
+    assert list(db.query_extended_iter(q, flatten=True)) == db.query_extended(q, flatten=True)
+    assert list(db.query_extended_iter(q, flatten=False)) == db.query_extended(q, flatten=False)
+
+    result = list(db.query_extended_iter(q, flatten=True, fields_to_exclude=["_internal_id", "_node_labels"], chunk_size=2))
+    assert result == [[{'vin': 1}, {'vin': 2}], [{'vin': 3}]]
+
+
+
+def test_query_columns(db):
+    db.empty_dbase()
+    assert db.query_columns("MATCH (c:car) RETURN c.vin AS vin") == {"vin": []}
+
+    db.query("CREATE (:car {vin: 1, make: 'Toyota'}), (:car {vin: 2})")
+
+    result = db.query_columns("MATCH (c:car) RETURN c.vin AS vin, c.make AS make ORDER BY vin")
+    assert result == {"vin": [1, 2], "make": ["Toyota", None]}
+
+    result = db.query_columns("MATCH (c:car) RETURN c ORDER BY c.vin", include_labels=True)
+    assert result == {"vin": [1, 2], "make": ["Toyota", None], "_node_labels": [["car"], ["car"]]}
+
+    result = db.query_columns("MATCH (c:car) RETURN c ORDER BY c.vin", include_internal_id=True)
+    assert result["_internal_id"] == [r["_internal_id"] for r in db.query_extended("MATCH (c:car) RETURN c ORDER BY c.vin")]
+
+    result = db.query_columns("MATCH (c:car {vin: 1}), (d:car {vin: 2}) RETURN c, d")
+    assert result == {"c.vin": [1], "c.make": ["Toyota"], "d.vin": [2]}
+
+
+
+def test_query_df(db):
+    db.empty_dbase()
+    db.query("CREATE (:car {vin: 1, make: 'Toyota', sold: date('2023-05-01')}), (:car {vin: 2, make: 'Ford'})")
+
+    df = db.query_df("MATCH (c:car) RETURN c ORDER BY c.vin")
+    assert sorted(df.columns) == ["make", "sold", "vin"]
+    assert df["vin"].tolist() == [1, 2]
+    assert df["make"].tolist() == ["Toyota", "Ford"]
+    assert df["sold"].iloc[0] == pd.Timestamp("2023-05-01")
+    assert pd.isna(df["sold"].iloc[1])
+
+    # Datetimes keep their nanoseconds;  a mixture of different UTC offsets is left unconverted
+    columns = {"seen": [neo4j.time.DateTime(2023, 5, 1, 10, 20, 30, 123456789), None]}
+    assert InterGraph.columns_to_df(columns)["seen"].iloc[0] == pd.Timestamp("2023-05-01 10:20:30.123456789")
+    columns = {"seen": [neo4j.time.DateTime.from_native(datetime.fromisoformat(s))
+                        for s in ["2023-05-01T10:00:00+02:00", "2023-05-01T10:00:00+01:00"]]}
+    assert InterGraph.columns_to_df(columns)["seen"].tolist() == columns["seen"]
+
+
 
 def test_empty_dbase(db):
     # Tests of completely clearing the database
@@ -569,6 +810,43 @@ def test_drop_all_indexes(db):
 
 
 
+def test_ensure_index(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+    db.query("UNWIND range(1, 100) AS i  CREATE (:car {vin: i, color: 'red', notes: 'n' + toString(i)})")
+
+    assert db.ensure_index(label="car", key="vin") == True
+    assert db.ensure_index(label="car", key="vin") == False     # Already present
+    assert db.ensure_index(label="car", key="notes", kind="text") == True
+
+    progress = db.index_population_progress()       # The new indexes were waited upon
+    assert sorted(p["name"] for p in progress if p["name"].startswith("car.")) == ["car.notes.TEXT", "car.vin"]
+    for p in progress:
+        assert p["state"] == "ONLINE"
+        assert p["populationPercent"] == 100.
+
+    # Only missing indexes get created;  a uniqueness constraint also provides a (range) index
+    assert db.ensure_indexes([("car", "vin"), ("car", "color"), ("person", "ssn", "unique")]) == 2
+    assert db.ensure_index(label="person", key="ssn") == False
+    assert len(db.get_constraints()) == 1
+
+    # An index created by other means, which the cache won't know about
+    db.query("CREATE INDEX `person.name` FOR (p:person) ON (p.name)")
+    db.reset_index_cache()
+    assert db.ensure_index(label="person", key="name") == False
+
+    # Dropping indexes is reflected in the cache
+    db.drop_index("car.vin")
+    assert db.ensure_index(label="car", key="vin", wait=False) == True
+    db.await_indexes()
+
+    db.drop_all_indexes()
+    assert db.ensure_index(label="person", key="ssn", kind="unique") == True
+
+    with pytest.raises(Exception):
+        db.ensure_index(label="car", key="vin", kind="spatial")     # Unknown kind of index
+
+
+
 
 ###  ~ CONSTRAINTS ~
 
@@ -0,0 +1,2832 @@
+import re
+import math
+import time
+import uuid
+import random
+import numbers
+import inspect
+import functools
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import datetime, date, timezone
+import neo4j
+import neo4j.graph
+import neo4j.time
+
+
+'''
+    ----------------------------------------------------------------------------------
+	MIT License
+
+        Copyright (c) 2021-2026 Julian A. West and the BrainAnnex.org project.
+	----------------------------------------------------------------------------------
+'''
+
+
+class MemoryCypher:
+    """
+    Interpreter of the subset of Cypher used by GraphAccess, GraphSchema and the other classes of this library,
+    run against the in-memory graph store of a MemoryGraphAccess object.
+    Used by MemoryGraphAccess._execute() ; not meant to be used directly.
+
+    Each object runs just one query:
+
+        result = MemoryCypher(store, data_binding).run("MATCH (n :Car) WHERE n.year > $y RETURN n", {"y": 2010})
+
+    SUPPORTED:
+        - Clauses: [OPTIONAL] MATCH, WHERE, WITH, UNWIND, RETURN (with DISTINCT, ORDER BY, SKIP and LIMIT),
+          CREATE, MERGE (with ON CREATE SET / ON MATCH SET), SET, REMOVE, [DETACH] DELETE, FOREACH,
+          UNION [ALL], CALL { subquery } [IN TRANSACTIONS], and the procedures db.labels(), db.relationshipTypes()
+          and db.propertyKeys()
+        - Patterns with labels, property maps, relationship names, directions, variable lengths,
+          path variables and shortestPath() ;  pattern predicates, pattern comprehensions, EXISTS { } and COUNT { }
+        - Expressions: the usual operators, CASE, list comprehensions, quantifiers (all, any, none, single), reduce(),
+          map projections, aggregations (count, collect, sum, avg, min, max), and the common scalar,
+          string, list, math, path and temporal functions
+
+    NOT SUPPORTED (an Exception is raised):
+        - APOC, and the procedures not listed above
+        - Index and constraint statements (use the methods of MemoryGraphAccess instead)
+    """
+
+    # Aggregating functions
+    AGGREGATES = {"count", "collect", "sum", "avg", "min", "max"}
+
+    # Names of the neo4j counters, as returned in the query summaries
+    COUNTER_NAMES = {"nodes_created": "nodes-created", "nodes_deleted": "nodes-deleted",
+                     "relationships_created": "relationships-created", "relationships_deleted": "relationships-deleted",
+                     "properties_set": "properties-set", "labels_added": "labels-added", "labels_removed": "labels-removed"}
+
+
+    def __init__(self, store, data_binding=None, undo=None):
+        """
+        :param store:           A MemoryGraphAccess object
+        :param data_binding:    [OPTIONAL] A dictionary with the values of the query parameters
+        :param undo:            [OPTIONAL] A list to append the undo functions to (see below), shared by all the
+                                    queries of a transaction;  by default, a new list is used
+        """
+        self.store = store
+        self.params = {key: to_cypher_value(value) for key, value in (data_binding or {}).items()}
+        self.counters = dict.fromkeys(self.COUNTER_NAMES, 0)
+        self.undo = [] if undo is None else undo    # Functions that revert, in reverse order, the changes made to the store
+        self.deleted_links = {}         # The data of the links deleted so far, indexed by link ID (for paths that use them)
+
+
+
+    def run(self, q :str):
+        """
+        Run the given Cypher query.  If it fails, all the changes that it made get reverted
+
+        :param q:   A string with a Cypher query
+        :return:    A MemoryResult object
+        """
+        query = _parse_query(q)
+
+        first_undo = len(self.undo)     # Any earlier entries belong to earlier queries of the same transaction
+        try:
+            keys, rows = self.run_query(query, [{}])
+        except Exception:
+            self.rollback(first_undo)
+            raise
+
+        if keys is None:
+            rows = []       # Queries without a RETURN clause return no records
+
+        counters = {self.COUNTER_NAMES[name]: value for name, value in self.counters.items() if value}
+        if counters:
+            counters["contains-updates"] = True     # As reported by the database server
+
+        return MemoryResult(self.store, keys or [], rows, counters=counters)
+
+
+
+    def rollback(self, first_undo=0) -> None:
+        """
+        Revert the changes made to the store, from the given position in the list of undo functions onward
+
+        :param first_undo:  [OPTIONAL] Position of the first undo function to run;
+                                by default, all the changes in the list get reverted
+        :return:            None
+        """
+        while len(self.undo) > first_undo:
+            self.undo.pop()()
+
+
+
+    def run_query(self, query :dict, rows :[dict]) -> ([str], [dict]):
+        """
+        Run a (possibly compound, with UNION) query, starting from the given rows
+
+        :param query:   A dict, as returned by _parse_query()
+        :param rows:    A list of dicts, with the values of the variables in scope
+        :return:        The pair (column names, list of result rows) ;  the column names are None if the query
+                            lacks a RETURN clause
+        """
+        keys, result = self.run_single_query(query["parts"][0], rows)
+        for union_all, part in zip(query["union_all"], query["parts"][1:]):
+            part_keys, part_rows = self.run_single_query(part, rows)
+            if part_keys != keys:
+                raise Exception("MemoryGraphAccess: all the sub-queries in a UNION must have the same column names")
+            result = result + part_rows
+            if not union_all:
+                result = self.distinct_rows(result, keys)
+
+        return keys, result
+
+
+
+    def run_single_query(self, clauses :list, rows :[dict]) -> ([str], [dict]):
+        """
+        Run the given sequence of clauses, starting from the given rows
+
+        :return:    The pair (column names, list of result rows) ;  the column names are None if there's no RETURN clause
+        """
+        keys = None
+        scope = [name for name in rows[0] if self.visible(name)] if rows else []
+
+        for clause in clauses:
+            kind = clause["clause"]
+            if kind == "RETURN":
+                rows, keys = self.project(clause, rows, scope)
+            else:
+                rows, scope = getattr(self, "clause_" + kind)(clause, rows, scope)
+
+        return keys, rows
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   CLAUSES   ~                                            '''
+
+    def ________CLAUSES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def clause_MATCH(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        new_vars = [name for name in self.pattern_variables(clause["patterns"]) if name not in scope]
+        hints = self.id_hints(clause["where"], set(new_vars)) if clause["where"] is not None else {}
+
+        result = []
+        for row in rows:
+            found = False
+            for binding in self.match_patterns(clause["patterns"], row, where=clause["where"], hints=hints):
+                result.append(binding)
+                found = True
+            if clause["optional"] and not found:
+                result.append({**row, **dict.fromkeys(new_vars)})
+
+        return result, scope + [name for name in new_vars if self.visible(name)]
+
+
+
+    def clause_UNWIND(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        result = []
+        for row in rows:
+            values = self.eval(clause["expr"], row)
+            if values is None:
+                continue
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            result += [{**row, clause["name"]: value} for value in values]
+
+        return result, scope + [clause["name"]]
+
+
+
+    def clause_WITH(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        rows, keys = self.project(clause, rows, scope)
+        if clause["where"] is not None:
+            rows = [row for row in rows if self.truth(self.eval(clause["where"], row))]
+
+        return rows, keys
+
+
+
+    def clause_CREATE(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        result = []
+        for row in rows:
+            for pattern in clause["patterns"]:
+                row = self.create_pattern(pattern, row)
+            result.append(row)
+
+        new_vars = [name for name in self.pattern_variables(clause["patterns"]) if name not in scope]
+        return result, scope + [name for name in new_vars if self.visible(name)]
+
+
+
+    def clause_MERGE(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        pattern = clause["pattern"]
+        result = []
+        for row in rows:
+            matches = [binding for (binding, _) in self.match_pattern(pattern, row, used_links=frozenset(), hints={})]
+            if matches:
+                for binding in matches:
+                    self.set_items(clause["on_match"], binding)
+                result += matches
+            else:
+                binding = self.create_pattern(pattern, row, merge=True)
+                self.set_items(clause["on_create"], binding)
+                result.append(binding)
+
+        new_vars = [name for name in self.pattern_variables([pattern]) if name not in scope]
+        return result, scope + [name for name in new_vars if self.visible(name)]
+
+
+
+    def clause_SET(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        for row in rows:
+            self.set_items(clause["items"], row)
+
+        return rows, scope
+
+
+
+    def clause_REMOVE(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        for row in rows:
+            for item in clause["items"]:
+                target = self.eval(item["target"], row)
+                if target is None:
+                    continue
+                if item["kind"] == "property":
+                    self.set_property(target, item["key"], None)
+                else:
+                    for label in item["labels"]:
+                        self.remove_label(self.node_id(target), label)
+
+        return rows, scope
+
+
+
+    def clause_DELETE(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        node_ids = []
+        link_ids = []
+        for row in rows:
+            for expr in clause["exprs"]:
+                value = self.eval(expr, row)
+                for item in (value if isinstance(value, list) else [value]):
+                    if isinstance(item, NodeRef):
+                        node_ids.append(item.id)
+                    elif isinstance(item, LinkRef):
+                        link_ids.append(item.id)
+                    elif isinstance(item, PathValue):
+                        node_ids += item.nodes
+                        link_ids += item.links
+                    elif item is not None:
+                        raise Exception(f"MemoryGraphAccess: DELETE expected a node, relationship or path; got {item!r}")
+
+        store = self.store
+        for internal_id in dict.fromkeys(node_ids):
+            if internal_id not in store._nodes:
+                continue
+            attached = store._outbound[internal_id] | store._inbound[internal_id]
+            if attached and not clause["detach"] and not attached.issubset(link_ids):
+                raise Exception(f"MemoryGraphAccess: Cannot delete node<{internal_id}>, because it still has relationships. "
+                                f"To delete this node, you must first delete its relationships")
+
+        for link_id in dict.fromkeys(link_ids):
+            if link_id in store._links:
+                self.delete_link(link_id)
+
+        for internal_id in dict.fromkeys(node_ids):
+            if internal_id in store._nodes:
+                self.delete_node(internal_id)
+
+        return rows, scope
+
+
+
+    def clause_FOREACH(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        for row in rows:
+            values = self.eval(clause["expr"], row)
+            for value in (values or []):
+                self.run_single_query(clause["clauses"], [{**row, clause["name"]: value}])
+
+        return rows, scope
+
+
+
+    def clause_CALL_SUBQUERY(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        result = []
+        keys = None
+        for row in rows:
+            keys, sub_rows = self.run_query(clause["query"], [row])
+            if keys is None:
+                result.append(row)          # A "unit" subquery, which doesn't return anything
+            else:
+                result += [{**row, **{key: sub_row[key] for key in keys}} for sub_row in sub_rows]
+
+        if keys is None:
+            keys = self.query_columns(clause["query"]) or []
+
+        return result, scope + [key for key in keys if key not in scope]
+
+
+
+    def clause_CALL_PROCEDURE(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        store = self.store
+        procedure = clause["name"].lower()
+        if procedure == "db.labels":
+            column, values = "label", list(store._label_index)
+        elif procedure == "db.relationshiptypes":
+            column, values = "relationshipType", list(dict.fromkeys(link["name"] for link in store._links.values()))
+        elif procedure == "db.propertykeys":
+            column, values = "propertyKey", list(dict.fromkeys(key for node in store._nodes.values() for key in node["props"]))
+        else:
+            raise Exception(f"MemoryGraphAccess: the procedure `{clause['name']}` is not supported")
+
+        yields = clause["yields"] or [(column, column)]
+        for (field, _) in yields:
+            if field != column:
+                raise Exception(f"MemoryGraphAccess: the procedure `{clause['name']}` doesn't yield `{field}`")
+
+        result = []
+        for row in rows:
+            for value in values:
+                new_row = {**row, **{alias: value for (_, alias) in yields}}
+                if (clause["where"] is None) or self.truth(self.eval(clause["where"], new_row)):
+                    result.append(new_row)
+
+        return result, scope + [alias for (_, alias) in yields]
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                   ~   PROJECTIONS   ~                                           '''
+
+    def ________PROJECTIONS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def project(self, clause :dict, rows :[dict], scope :[str]) -> ([dict], [str]):
+        """
+        Carry out the projection of a WITH or RETURN clause, incl. any aggregation, DISTINCT, ORDER BY, SKIP and LIMIT
+
+        :return:    The pair (new rows, list of their column names)
+        """
+        items = list(clause["items"])
+        if clause["star"]:
+            items = [(("var", name), name) for name in scope] + items
+
+        keys = [alias for (_, alias) in items]
+        if len(set(keys)) < len(keys):
+            raise Exception(f"MemoryGraphAccess: multiple result columns with the same name ({keys})")
+
+        aggregates = []
+        for (expr, _) in items:
+            self.find_aggregates(expr, aggregates)
+
+        if not aggregates:
+            pairs = [(row, {alias: self.eval(expr, row) for (expr, alias) in items}) for row in rows]
+        else:
+            for (expr, _, _) in clause["order"]:
+                self.find_aggregates(expr, aggregates)      # Aggregations may also appear in ORDER BY
+            pairs = self.aggregate(items, aggregates, rows)
+
+        if clause["distinct"]:
+            seen = set()
+            unique_pairs = []
+            for (row, new_row) in pairs:
+                key = tuple(hashable(new_row[alias]) for alias in keys)
+                if key not in seen:
+                    seen.add(key)
+                    unique_pairs.append((row, new_row))
+            pairs = unique_pairs
+
+        if clause["order"]:
+            texts = {text: alias for ((_, alias), text) in zip(items, clause["item_texts"])}
+            for (expr, text, descending) in reversed(clause["order"]):
+                alias = text if text in keys else texts.get(text)
+                if alias is not None:
+                    sort_key = lambda pair, alias=alias: order_key(pair[1][alias])
+                else:
+                    sort_key = lambda pair, expr=expr: order_key(self.eval(expr, {**pair[0], **pair[1]}))
+                pairs.sort(key=sort_key, reverse=descending)
+
+        if clause["skip"] is not None:
+            pairs = pairs[self.eval_count(clause["skip"], "SKIP"):]
+
+        if clause["limit"] is not None:
+            pairs = pairs[:self.eval_count(clause["limit"], "LIMIT")]
+
+        return [new_row for (_, new_row) in pairs], keys
+
+
+
+    def aggregate(self, items :list, aggregates :list, rows :[dict]) -> [tuple]:
+        """
+        Group the given rows by the values of the non-aggregating items, and compute the aggregating ones
+
+        :return:    A list of pairs (representative row of the group, new row with the values of all items)
+        """
+        grouping = [(expr, alias) for (expr, alias) in items if not self.find_aggregates(expr, [])]
+
+        groups = {}
+        for row in rows:
+            values = {alias: self.eval(expr, row) for (expr, alias) in grouping}
+            key = tuple(hashable(value) for value in values.values())
+            if key not in groups:
+                groups[key] = (row, values, [])
+            groups[key][2].append(row)
+
+        if not groups and not grouping:
+            groups[()] = ({}, {}, [])          # Aggregating over nothing, with no grouping keys, gives 1 row
+
+        pairs = []
+        for (first_row, values, group_rows) in groups.values():
+            env = dict(first_row)
+            for call in aggregates:
+                env[("agg", id(call))] = self.compute_aggregate(call, group_rows)
+
+            new_row = {}
+            for (expr, alias) in items:
+                new_row[alias] = values[alias] if alias in values else self.eval(expr, env)
+            pairs.append((env, new_row))
+
+        return pairs
+
+
+
+    def compute_aggregate(self, call :tuple, rows :[dict]):
+        if call[0] == "count_star":
+            return len(rows)
+
+        (_, name, args, distinct) = call
+        if len(args) != 1:
+            raise Exception(f"MemoryGraphAccess: the aggregating function {name}() takes exactly 1 argument")
+
+        values = [self.eval(args[0], row) for row in rows]
+        values = [value for value in values if value is not None]
+        if distinct:
+            values = list({hashable(value): value for value in values}.values())
+
+        if name == "count":
+            return len(values)
+        if name == "collect":
+            return values
+        if name == "sum":
+            return sum(values)
+        if name == "avg":
+            return sum(values) / len(values) if values else None
+        if name == "min":
+            return min(values, key=order_key) if values else None
+        if name == "max":
+            return max(values, key=order_key) if values else None
+
+
+
+    def find_aggregates(self, expr, found :list) -> list:
+        """
+        Append to the given list all the aggregating calls in the given expression (not looking into subqueries)
+
+        :return:    The given list
+        """
+        if type(expr) != tuple:
+            return found
+
+        if expr[0] == "count_star" or (expr[0] == "call" and expr[1] in self.AGGREGATES):
+            found.append(expr)
+            return found
+
+        if expr[0] in ("exists_query", "count_query", "pattern", "pattern_list"):
+            return found
+
+        for part in expr[1:]:
+            if type(part) == tuple:
+                self.find_aggregates(part, found)
+            elif type(part) == list:
+                for element in part:
+                    self.find_aggregates(element, found)
+
+        return found
+
+
+
+    def eval_count(self, expr :tuple, clause :str) -> int:
+        value = self.eval(expr, {})
+        if type(value) != int or value < 0:
+            raise Exception(f"MemoryGraphAccess: the value of {clause} must be a non-negative integer; got {value!r}")
+        return value
+
+
+
+    def distinct_rows(self, rows :[dict], keys :[str]) -> [dict]:
+        return list({tuple(hashable(row[key]) for key in keys): row for row in reversed(rows)}.values())[::-1]
+
+
+
+    @classmethod
+    def query_columns(cls, query :dict):
+        """
+        Return the names of the columns of the RETURN clause of the given query, if any, or None
+        """
+        final = query["parts"][0][-1]
+        if final["clause"] != "RETURN" or final["star"]:
+            return None
+        return [alias for (_, alias) in final["items"]]
+
+
+
+    @staticmethod
+    def visible(name) -> bool:
+        """
+        Return False for the internal names given to anonymous pattern elements
+        """
+        return type(name) == str and not name.startswith(" ")
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                   ~   PATTERN MATCHING   ~                                      '''
+
+    def ________PATTERN_MATCHING________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    @staticmethod
+    def pattern_variables(patterns :list) -> [str]:
+        names = []
+        for pattern in patterns:
+            if pattern["path"]:
+                names.append(pattern["path"])
+            for node in pattern["nodes"]:
+                names.append(node["var"])
+            for rel in pattern["rels"]:
+                names.append(rel["var"])
+
+        return list(dict.fromkeys(names))
+
+
+
+    def id_hints(self, where :tuple, new_vars :set) -> dict:
+        """
+        Look in the given WHERE condition for terms such as  id(n) = $x  or  id(n) IN $list  or  n.key = $x ,
+        that can be used to locate the nodes without a scan
+
+        :return:    A dict indexed by variable name, whose values are lists of pairs (kind, expression),
+                        where the kind is ("id",), ("ids",) or ("property", property name)
+        """
+        hints = {}
+        conditions = [where]
+        while conditions:
+            condition = conditions.pop()
+            if condition[0] == "and":
+                conditions += [condition[1], condition[2]]
+                continue
+
+            if condition[0] == "compare" and condition[1] == "=":
+                sides = [(condition[2], condition[3]), (condition[3], condition[2])]
+            elif condition[0] == "in":
+                sides = [(condition[1], condition[2])]
+            else:
+                continue
+
+            for (target, value) in sides:
+                if free_variables(value) & new_vars:
+                    continue
+                if target[0] == "call" and target[1] == "id" and len(target[2]) == 1 and target[2][0][0] == "var":
+                    kind = ("id",) if condition[0] == "compare" else ("ids",)
+                    hints.setdefault(target[2][0][1], []).append((kind, value))
+                elif target[0] == "property" and target[1][0] == "var" and condition[0] == "compare":
+                    hints.setdefault(target[1][1], []).append((("property", target[2]), value))
+
+        return {name: terms for (name, terms) in hints.items() if name in new_vars}
+
+
+
+    def match_patterns(self, patterns :list, row :dict, where=None, hints=None):
+        """
+        Generator of all the extensions of the given row that match all the given patterns (and the WHERE condition, if any)
+        """
+        hints = hints or {}
+
+        def extend(i, binding, used_links):
+            if i == len(patterns):
+                if (where is None) or self.truth(self.eval(where, binding)):
+                    yield binding
+                return
+            for (new_binding, new_used) in self.match_pattern(patterns[i], binding, used_links, hints):
+                yield from extend(i + 1, new_binding, new_used)
+
+        yield from extend(0, row, frozenset())
+
+
+
+    def match_pattern(self, pattern :dict, row :dict, used_links :frozenset, hints :dict):
+        """
+        Generator of the pairs (extension of the given row that matches the given pattern, set of the links used so far)
+        """
+        nodes = pattern["nodes"]
+        rels = pattern["rels"]
+        node_props = [self.eval_props(node["props"], row) for node in nodes]
+        rel_props = [self.eval_props(rel["props"], row) for rel in rels]
+        if any(props is None for props in node_props + rel_props):
+            return      # A property required to be null: nothing can match
+
+        # Evaluate the hints, into sets of candidate ID's and extra required properties
+        node_ids = {}
+        extra_props = {}
+        for node in nodes:
+            for (kind, expr) in hints.get(node["var"], []):
+                value = self.eval(expr, row)
+                if kind == ("id",):
+                    ids = {value} if isinstance(value, int) else set()
+                elif kind == ("ids",):
+                    ids = {v for v in (value or []) if isinstance(v, int)}
+                else:
+                    extra_props.setdefault(node["var"], {})[kind[1]] = value
+                    continue
+                node_ids[node["var"]] = ids & node_ids.get(node["var"], ids)
+
+        # Pick the node to start from
+        start = min(range(len(nodes)),
+                    key=lambda i: self.estimate_candidates(nodes[i], row, node_props[i], node_ids, extra_props))
+        start_candidates = self.node_candidates(nodes[start], row, node_props[start], node_ids, extra_props)
+
+        steps = [(i, True) for i in range(start, len(rels))] + [(i, False) for i in range(start - 1, -1, -1)]
+        found_nodes = [None] * len(nodes)
+        found_segments = [None] * len(rels)
+
+        def bind_node(binding, i, internal_id):
+            node = nodes[i]
+            bound = binding.get(node["var"], _MISSING)
+            if (bound is not _MISSING) and not (isinstance(bound, NodeRef) and bound.id == internal_id):
+                return None
+            if not self.node_matches(internal_id, node["labels"], node_props[i]):
+                return None
+            if bound is not _MISSING:
+                return binding
+            if (node["var"] in node_ids) and (internal_id not in node_ids[node["var"]]):
+                return None
+            props = extra_props.get(node["var"])
+            if props and not self.node_matches(internal_id, (), props):
+                return None
+            return {**binding, node["var"]: NodeRef(internal_id)}
+
+        def extend(step, binding, used):
+            if step == len(steps):
+                if pattern["path"]:
+                    links = []
+                    for segment in found_segments:
+                        links += segment
+                    binding = {**binding, pattern["path"]: PathValue(self.path_nodes(found_nodes[0], links), links)}
+                yield binding, used
+                return
+
+            (i, forward) = steps[step]
+            rel = rels[i]
+            (source, target) = (i, i + 1) if forward else (i + 1, i)
+            direction = rel["dir"] if forward else {"OUT": "IN", "IN": "OUT", "BOTH": "BOTH"}[rel["dir"]]
+
+            for (links, end_id) in self.traverse(found_nodes[source], direction, rel, rel_props[i], used):
+                new_binding = bind_node(binding, target, end_id)
+                if new_binding is None:
+                    continue
+                ordered_links = links if forward else links[::-1]
+                value = [LinkRef(link_id) for link_id in ordered_links] if rel["length"] else LinkRef(ordered_links[0])
+                if rel["var"] in new_binding:
+                    if new_binding[rel["var"]] != value:
+                        continue
+                else:
+                    new_binding = {**new_binding, rel["var"]: value}
+                found_nodes[target] = end_id
+                found_segments[i] = ordered_links
+                yield from extend(step + 1, new_binding, used | set(links))
+
+        if pattern["shortest"]:
+            yield from self.shortest_paths(pattern, row, start_candidates, bind_node, extend, found_nodes, start)
+            return
+
+        for internal_id in start_candidates:
+            binding = bind_node(row, start, internal_id)
+            if binding is not None:
+                found_nodes[start] = internal_id
+                yield from extend(0, binding, used_links)
+
+
+
+    def shortest_paths(self, pattern, row, start_candidates, bind_node, extend, found_nodes, start):
+        """
+        Helper for match_pattern(), for patterns inside shortestPath() or allShortestPaths():
+        among all the matches, keep the shortest ones for each pair of end nodes
+        """
+        first_var = pattern["nodes"][0]["var"]
+        last_var = pattern["nodes"][-1]["var"]
+        best = {}
+        for internal_id in start_candidates:
+            binding = bind_node(row, start, internal_id)
+            if binding is None:
+                continue
+            found_nodes[start] = internal_id
+            for (match, used) in extend(0, binding, frozenset()):
+                length = len(used)
+                ends = (match[first_var].id, match[last_var].id)
+                if (ends not in best) or (length < best[ends][0]):
+                    best[ends] = (length, [(match, used)])
+                elif (length == best[ends][0]) and (pattern["shortest"] == "all"):
+                    best[ends][1].append((match, used))
+
+        for (_, matches) in best.values():
+            yield from matches
+
+
+
+    def estimate_candidates(self, node :dict, row :dict, props :dict, node_ids :dict, extra_props :dict) -> int:
+        store = self.store
+        if node["var"] in row:
+            return 0
+        if node["var"] in node_ids:
+            return len(node_ids[node["var"]])
+
+        all_props = {**props, **extra_props.get(node["var"], {})}
+        estimate = len(store._nodes)
+        for label in node["labels"]:
+            for key, value in all_props.items():
+                value_index = store._property_index.get((label, key))
+                if value_index is not None:
+                    estimate = min(estimate, len(value_index.get(store._index_key(value), ())))
+            estimate = min(estimate, len(store._label_index.get(label, ())))
+
+        return estimate
+
+
+
+    def node_candidates(self, node :dict, row :dict, props :dict, node_ids :dict, extra_props :dict) -> list:
+        """
+        Return the ID's of the nodes that might match the given node pattern
+        (they still need to be checked with bind_node() in match_pattern)
+        """
+        store = self.store
+        bound = row.get(node["var"], _MISSING)
+        if bound is not _MISSING:
+            return [bound.id] if isinstance(bound, NodeRef) and bound.id in store._nodes else []
+
+        if node["var"] in node_ids:
+            return sorted(i for i in node_ids[node["var"]] if i in store._nodes)
+
+        return store._matching_nodes(node["labels"], {**props, **extra_props.get(node["var"], {})})
+
+
+
+    def node_matches(self, internal_id :int, labels, props :dict) -> bool:
+        node = self.store._nodes.get(internal_id)
+        if node is None:
+            return False
+        if not all(label in node["labels"] for label in labels):
+            return False
+        return all(equal(node["props"].get(key), value) is True for key, value in props.items())
+
+
+
+    def traverse(self, start_id :int, direction :str, rel :dict, props :dict, used :frozenset):
+        """
+        Generator of the pairs (list of link ID's, ID of the end node) for all the ways to follow the given relationship
+        pattern from the given node, in the given direction ("OUT", "IN" or "BOTH"), without reusing any links
+        """
+        store = self.store
+
+        def hops(node_id, path_links):
+            links = store._links
+            if direction in ("OUT", "BOTH"):
+                for link_id in sorted(store._outbound[node_id]):
+                    if (link_id not in used) and (link_id not in path_links) and self.link_matches(links[link_id], rel, props):
+                        yield link_id, links[link_id]["to"]
+            if direction in ("IN", "BOTH"):
+                for link_id in sorted(store._inbound[node_id]):
+                    if (link_id not in used) and (link_id not in path_links) and self.link_matches(links[link_id], rel, props):
+                        yield link_id, links[link_id]["from"]
+
+        if start_id not in store._nodes:
+            return
+
+        if rel["length"] is None:
+            for (link_id, end_id) in hops(start_id, ()):
+                yield [link_id], end_id
+            return
+
+        (min_hops, max_hops) = rel["length"]
+
+        def walk(node_id, path_links):
+            if len(path_links) >= min_hops:
+                yield list(path_links), node_id
+            if (max_hops is None) or (len(path_links) < max_hops):
+                for (link_id, end_id) in hops(node_id, path_links):
+                    yield from walk(end_id, path_links + [link_id])
+
+        yield from walk(start_id, [])
+
+
+
+    def link_matches(self, link :dict, rel :dict, props :dict) -> bool:
+        if rel["types"] and link["name"] not in rel["types"]:
+            return False
+        return all(equal(link["props"].get(key), value) is True for key, value in props.items())
+
+
+
+    def path_nodes(self, start_id :int, link_ids :list) -> [int]:
+        nodes = [start_id]
+        for link_id in link_ids:
+            link = self.store._links.get(link_id) or self.deleted_links.get(link_id)
+            nodes.append(link["to"] if link["from"] == nodes[-1] else link["from"])
+        return nodes
+
+
+
+    def eval_props(self, props, row :dict) -> dict|None:
+        """
+        Evaluate the property map of a node or relationship pattern
+
+        :return:    A dict;  or None if any of the values is null (in which case, nothing can match)
+        """
+        if props is None:
+            return {}
+        values = self.eval(props, row)
+        if not isinstance(values, dict):
+            raise Exception(f"MemoryGraphAccess: expected a map of properties; got {values!r}")
+        if any(value is None for value in values.values()):
+            return None
+        return values
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                       ~   UPDATES   ~                                           '''
+
+    def ________UPDATES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def create_pattern(self, pattern :dict, row :dict, merge=False) -> dict:
+        """
+        Create all the nodes and relationships of the given pattern that aren't already bound in the given row
+
+        :return:    A new row, with the variables of the pattern bound to what was created
+        """
+        row = dict(row)
+        node_ids = []
+        for node in pattern["nodes"]:
+            bound = row.get(node["var"], _MISSING)
+            if bound is not _MISSING:
+                if not isinstance(bound, NodeRef):
+                    raise Exception(f"MemoryGraphAccess: cannot create relationships to/from a null or non-node value "
+                                    f"(variable `{node['var']}`)")
+                node_ids.append(bound.id)
+                continue
+            props = self.eval(node["props"], row) if node["props"] is not None else {}
+            if merge and any(value is None for value in props.values()):
+                raise Exception("MemoryGraphAccess: cannot MERGE a node using a null property value")
+            internal_id = self.create_node(node["labels"], props)
+            row[node["var"]] = NodeRef(internal_id)
+            node_ids.append(internal_id)
+
+        link_ids = []
+        for i, rel in enumerate(pattern["rels"]):
+            if rel["length"] is not None or len(rel["types"]) != 1:
+                raise Exception("MemoryGraphAccess: new relationships must have exactly one type, and no variable length")
+            if rel["dir"] == "BOTH" and not merge:
+                raise Exception("MemoryGraphAccess: only directed relationships can be created")
+            props = self.eval(rel["props"], row) if rel["props"] is not None else {}
+            if merge and any(value is None for value in props.values()):
+                raise Exception("MemoryGraphAccess: cannot MERGE a relationship using a null property value")
+            (from_id, to_id) = (node_ids[i + 1], node_ids[i]) if rel["dir"] == "IN" else (node_ids[i], node_ids[i + 1])
+            link_id = self.create_link(from_id, to_id, rel["types"][0], props)
+            row[rel["var"]] = LinkRef(link_id)
+            link_ids.append(link_id)
+
+        if pattern["path"]:
+            row[pattern["path"]] = PathValue(node_ids, link_ids)
+
+        return row
+
+
+
+    def set_items(self, items :list, row :dict) -> None:
+        """
+        Carry out the given items of a SET clause, for the given row
+        """
+        for item in items:
+            target = self.eval(item["target"], row)
+            if target is None:
+                continue
+            kind = item["kind"]
+            if kind == "labels":
+                for label in item["labels"]:
+                    self.add_label(self.node_id(target), label)
+                continue
+
+            value = self.eval(item["value"], row)
+            if kind == "property":
+                self.set_property(target, item["key"], value)
+                continue
+
+            # Replacing (=) or merging (+=) all the properties
+            if isinstance(value, (NodeRef, LinkRef)):
+                value = dict(self.entity(value)["props"])
+            if value is None:
+                value = {}
+            if not isinstance(value, dict):
+                raise Exception(f"MemoryGraphAccess: expected a map of properties in SET; got {value!r}")
+            if kind == "replace":
+                for key in list(self.entity(target)["props"]):
+                    if key not in value:
+                        self.set_property(target, key, None)
+            for key, new_value in value.items():
+                self.set_property(target, key, new_value)
+
+
+
+    def entity(self, target) -> dict:
+        """
+        Return the stored data of the given node or link (a dict with a "props" key)
+        """
+        if isinstance(target, NodeRef):
+            entity = self.store._nodes.get(target.id)
+        elif isinstance(target, LinkRef):
+            entity = self.store._links.get(target.id)
+        else:
+            raise Exception(f"MemoryGraphAccess: expected a node or a relationship; got {target!r}")
+        if entity is None:
+            raise Exception("MemoryGraphAccess: the node or relationship was already deleted")
+        return entity
+
+
+
+    def node_id(self, target) -> int:
+        if not isinstance(target, NodeRef):
+            raise Exception(f"MemoryGraphAccess: expected a node; got {target!r}")
+        if target.id not in self.store._nodes:
+            raise Exception(f"MemoryGraphAccess: node<{target.id}> was already deleted")
+        return target.id
+
+
+
+    def create_node(self, labels :list, props :dict) -> int:
+        props = {key: to_cypher_value(value) for key, value in props.items() if value is not None}
+        internal_id = self.store._add_node(labels, props)
+        self.undo.append(lambda: self.store._remove_node(internal_id))
+        self.counters["nodes_created"] += 1
+        self.counters["labels_added"] += len(set(labels))
+        self.counters["properties_set"] += len(props)
+        return internal_id
+
+
+
+    def delete_node(self, internal_id :int) -> None:
+        store = self.store
+        for link_id in list(store._outbound[internal_id] | store._inbound[internal_id]):
+            self.delete_link(link_id)
+
+        node = store._nodes[internal_id]
+        store._remove_node(internal_id)
+        self.undo.append(lambda: store._add_node(node["labels"], node["props"], internal_id=internal_id))
+        self.counters["nodes_deleted"] += 1
+
+
+
+    def create_link(self, from_id :int, to_id :int, name :str, props :dict) -> int:
+        props = {key: to_cypher_value(value) for key, value in props.items() if value is not None}
+        link_id = self.store._add_link(from_id, to_id, name, props)
+        self.undo.append(lambda: self.store._remove_link(link_id))
+        self.counters["relationships_created"] += 1
+        self.counters["properties_set"] += len(props)
+        return link_id
+
+
+
+    def delete_link(self, link_id :int) -> None:
+        store = self.store
+        link = store._links[link_id]
+        store._remove_link(link_id)
+        self.deleted_links[link_id] = link
+        self.undo.append(lambda: store._add_link(link["from"], link["to"], link["name"], link["props"], link_id=link_id))
+        self.counters["relationships_deleted"] += 1
+
+
+
+    def set_property(self, target, key :str, value) -> None:
+        """
+        Set the given property of the given node or link (a null value removes the property)
+        """
+        props = self.entity(target)["props"]
+        old_value = props.get(key)
+        if value is not None:
+            value = to_cypher_value(value)
+        elif key not in props:
+            return
+
+        if isinstance(target, NodeRef):
+            self.store._set_node_property(target.id, key, value)
+            self.undo.append(lambda: self.store._set_node_property(target.id, key, old_value))
+        else:
+            if value is None:
+                del props[key]
+            else:
+                props[key] = value
+            self.undo.append(lambda: props.pop(key, None) if old_value is None else props.update({key: old_value}))
+
+        self.counters["properties_set"] += 1
+
+
+
+    def add_label(self, internal_id :int, label :str) -> None:
+        if self.store._add_label(internal_id, label):
+            self.undo.append(lambda: self.store._remove_label(internal_id, label))
+            self.counters["labels_added"] += 1
+
+
+
+    def remove_label(self, internal_id :int, label :str) -> None:
+        if self.store._remove_label(internal_id, label):
+            self.undo.append(lambda: self.store._add_label(internal_id, label))
+            self.counters["labels_removed"] += 1
+
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   EXPRESSIONS   ~                                        '''
+
+    def ________EXPRESSIONS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def eval(self, expr :tuple, row :dict):
+        """
+        Evaluate the given expression (as parsed by _CypherParser), with the given values of the variables
+        """
+        return getattr(self, "eval_" + expr[0])(expr, row)
+
+
+    def eval_literal(self, expr, row):
+        return expr[1]
+
+
+    def eval_param(self, expr, row):
+        if expr[1] not in self.params:
+            raise Exception(f"MemoryGraphAccess: expected parameter(s): {expr[1]}")
+        return self.params[expr[1]]
+
+
+    def eval_var(self, expr, row):
+        try:
+            return row[expr[1]]
+        except KeyError:
+            raise Exception(f"MemoryGraphAccess: variable `{expr[1]}` not defined") from None
+
+
+    def eval_list(self, expr, row):
+        return [self.eval(element, row) for element in expr[1]]
+
+
+    def eval_map(self, expr, row):
+        return {key: self.eval(value, row) for (key, value) in expr[1]}
+
+
+    def eval_map_projection(self, expr, row):
+        base = self.eval(expr[1], row)
+        if base is None:
+            return None
+        props = self.entity(base)["props"] if isinstance(base, (NodeRef, LinkRef)) else base
+        result = {}
+        for (kind, key, value) in expr[2]:
+            if kind == "all":
+                result.update(props)
+            elif kind == "property":
+                result[key] = props.get(key)
+            elif kind == "var":
+                result[key] = self.eval(("var", key), row)
+            else:
+                result[key] = self.eval(value, row)
+        return result
+
+
+    def eval_property(self, expr, row):
+        base = self.eval(expr[1], row)
+        key = expr[2]
+        if base is None:
+            return None
+        if isinstance(base, NodeRef):
+            node = self.store._nodes.get(base.id)
+            return None if node is None else node["props"].get(key)
+        if isinstance(base, LinkRef):
+            link = self.store._links.get(base.id)
+            return None if link is None else link["props"].get(key)
+        if isinstance(base, dict):
+            return base.get(key)
+        if isinstance(base, (neo4j.time.Date, neo4j.time.DateTime, neo4j.time.Time, date)):
+            return getattr(base, key.lower() if key != "dayOfWeek" else "weekday")
+        raise Exception(f"MemoryGraphAccess: cannot access the property `{key}` of {base!r}")
+
+
+    def eval_index(self, expr, row):
+        base = self.eval(expr[1], row)
+        index = self.eval(expr[2], row)
+        if base is None or index is None:
+            return None
+        if isinstance(base, (NodeRef, LinkRef)):
+            return self.entity(base)["props"].get(index)
+        if isinstance(base, dict):
+            return base.get(index)
+        try:
+            return base[index]
+        except IndexError:
+            return None
+
+
+    def eval_slice(self, expr, row):
+        base = self.eval(expr[1], row)
+        start = self.eval(expr[2], row) if expr[2] is not None else None
+        end = self.eval(expr[3], row) if expr[3] is not None else None
+        if base is None or (expr[2] is not None and start is None) or (expr[3] is not None and end is None):
+            return None
+        return base[start:end]
+
+
+    def eval_label_check(self, expr, row):
+        base = self.eval(expr[1], row)
+        if base is None:
+            return None
+        entity = self.entity(base)
+        labels = entity["labels"] if isinstance(base, NodeRef) else [entity["name"]]
+        return all(label in labels for label in expr[2])
+
+
+    def eval_and(self, expr, row):
+        left = self.truth(self.eval(expr[1], row))
+        if left is False:
+            return False
+        right = self.truth(self.eval(expr[2], row))
+        if right is False:
+            return False
+        return None if (left is None or right is None) else True
+
+
+    def eval_or(self, expr, row):
+        left = self.truth(self.eval(expr[1], row))
+        if left is True:
+            return True
+        right = self.truth(self.eval(expr[2], row))
+        if right is True:
+            return True
+        return None if (left is None or right is None) else False
+
+
+    def eval_xor(self, expr, row):
+        left = self.truth(self.eval(expr[1], row))
+        right = self.truth(self.eval(expr[2], row))
+        return None if (left is None or right is None) else (left != right)
+
+
+    def eval_not(self, expr, row):
+        value = self.truth(self.eval(expr[1], row))
+        return None if value is None else not value
+
+
+    def eval_compare(self, expr, row):
+        (_, op, left, right) = expr
+        a = self.eval(left, row)
+        b = self.eval(right, row)
+        if op == "=":
+            return equal(a, b)
+        if op in ("<>", "!="):
+            result = equal(a, b)
+            return None if result is None else not result
+        if op == "=~":
+            if a is None or b is None:
+                return None
+            if not isinstance(a, str):
+                return None
+            return re.fullmatch(b, a, flags=re.DOTALL) is not None
+
+        result = compare(a, b)
+        if result is None:
+            return None
+        return {"<": result < 0, ">": result > 0, "<=": result <= 0, ">=": result >= 0}[op]
+
+
+    def eval_in(self, expr, row):
+        value = self.eval(expr[1], row)
+        values = self.eval(expr[2], row)
+        if values is None:
+            return None
+        if not isinstance(values, (list, tuple)):
+            raise Exception(f"MemoryGraphAccess: the right-hand side of IN must be a list; got {values!r}")
+        found_null = False
+        for element in values:
+            result = equal(value, element)
+            if result is True:
+                return True
+            if result is None:
+                found_null = True
+        return None if found_null else False
+
+
+    def eval_string_match(self, expr, row):
+        (_, op, left, right) = expr
+        a = self.eval(left, row)
+        b = self.eval(right, row)
+        if not (isinstance(a, str) and isinstance(b, str)):
+            return None
+        if op == "STARTS WITH":
+            return a.startswith(b)
+        if op == "ENDS WITH":
+            return a.endswith(b)
+        return b in a
+
+
+    def eval_is_null(self, expr, row):
+        is_null = self.eval(expr[1], row) is None
+        return (not is_null) if expr[2] else is_null
+
+
+    def eval_arithmetic(self, expr, row):
+        (_, op, left, right) = expr
+        a = self.eval(left, row)
+        b = self.eval(right, row)
+        return arithmetic(op, a, b)
+
+
+    def eval_negate(self, expr, row):
+        value = self.eval(expr[1], row)
+        return None if value is None else -value
+
+
+    def eval_case(self, expr, row):
+        (_, subject, whens, otherwise) = expr
+        if subject is not None:
+            value = self.eval(subject, row)
+            for (condition, result) in whens:
+                if equal(value, self.eval(condition, row)) is True:
+                    return self.eval(result, row)
+        else:
+            for (condition, result) in whens:
+                if self.truth(self.eval(condition, row)) is True:
+                    return self.eval(result, row)
+
+        return None if otherwise is None else self.eval(otherwise, row)
+
+
+    def eval_list_comprehension(self, expr, row):
+        (_, name, source, where, projection) = expr
+        values = self.eval(source, row)
+        if values is None:
+            return None
+        result = []
+        for value in values:
+            inner = {**row, name: value}
+            if (where is None) or self.truth(self.eval(where, inner)) is True:
+                result.append(value if projection is None else self.eval(projection, inner))
+        return result
+
+
+    def eval_quantifier(self, expr, row):
+        (_, kind, name, source, where) = expr
+        values = self.eval(source, row)
+        if values is None:
+            return None
+        results = [self.truth(self.eval(where, {**row, name: value})) for value in values]
+        trues = results.count(True)
+        unknown = None in results
+        if kind == "all":
+            return False if False in results else (None if unknown else True)
+        if kind == "any":
+            return True if trues else (None if unknown else False)
+        if kind == "none":
+            return False if trues else (None if unknown else True)
+        # "single"
+        if trues > 1:
+            return False
+        return None if unknown else (trues == 1)
+
+
+    def eval_reduce(self, expr, row):
+        (_, accumulator, initial, name, source, step) = expr
+        value = self.eval(initial, row)
+        values = self.eval(source, row)
+        if values is None:
+            return None
+        for element in values:
+            value = self.eval(step, {**row, accumulator: value, name: element})
+        return value
+
+
+    def eval_pattern(self, expr, row):
+        # A pattern used as an expression, such as  (n)-[:LINKED_TO]->(:Car) : evaluates to the list of matching paths
+        pattern = expr[1]
+        return [binding[pattern["path"]]
+                for (binding, _) in self.match_pattern(pattern, row, used_links=frozenset(), hints={})]
+
+
+    def eval_pattern_list(self, expr, row):
+        # A pattern comprehension, such as  [(n)-->(m) WHERE m.x > 0 | m.name]
+        (_, pattern, where, projection) = expr
+        result = []
+        for (binding, _) in self.match_pattern(pattern, row, used_links=frozenset(), hints={}):
+            if (where is None) or self.truth(self.eval(where, binding)) is True:
+                result.append(self.eval(projection, binding))
+        return result
+
+
+    def eval_exists_query(self, expr, row):
+        (_, rows) = self.run_query(expr[1], [row])
+        return len(rows) > 0
+
+
+    def eval_count_query(self, expr, row):
+        (_, rows) = self.run_query(expr[1], [row])
+        return len(rows)
+
+
+    def eval_count_star(self, expr, row):
+        return row[("agg", id(expr))]
+
+
+    def eval_call(self, expr, row):
+        (_, name, args, distinct) = expr
+        if name in self.AGGREGATES:
+            key = ("agg", id(expr))
+            if key not in row:
+                raise Exception(f"MemoryGraphAccess: the aggregating function {name}() cannot be used here")
+            return row[key]
+
+        if name == "exists":
+            if len(args) != 1:
+                raise Exception("MemoryGraphAccess: exists() takes exactly 1 argument")
+            value = self.eval(args[0], row)
+            if args[0][0] == "pattern":
+                return len(value) > 0
+            return value is not None
+
+        function = FUNCTIONS.get(name)
+        if function is None:
+            raise Exception(f"MemoryGraphAccess: the function {name}() is not supported")
+
+        return function(self, *[self.eval(arg, row) for arg in args])
+
+
+
+    @staticmethod
+    def truth(value) -> bool|None:
+        """
+        Interpret the given value as a boolean, in Cypher's 3-valued logic (True, False or None)
+        """
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, list):
+            return len(value) > 0       # The result of pattern expressions
+        raise Exception(f"MemoryGraphAccess: expected a boolean value; got {value!r}")
+
+
+
+
+
+###############################################################################################################
+#                                                   VALUES
+###############################################################################################################
+
+class NodeRef:
+    """
+    A node in the store, as the value of a variable
+    """
+    __slots__ = ("id",)
+
+    def __init__(self, internal_id :int):
+        self.id = internal_id
+
+    def __eq__(self, other):
+        return type(other) == NodeRef and other.id == self.id
+
+    def __hash__(self):
+        return hash(("node", self.id))
+
+    def __repr__(self):
+        return f"node<{self.id}>"
+
+
+
+class LinkRef:
+    """
+    A relationship in the store, as the value of a variable
+    """
+    __slots__ = ("id",)
+
+    def __init__(self, link_id :int):
+        self.id = link_id
+
+    def __eq__(self, other):
+        return type(other) == LinkRef and other.id == self.id
+
+    def __hash__(self):
+        return hash(("link", self.id))
+
+    def __repr__(self):
+        return f"relationship<{self.id}>"
+
+
+
+class PathValue:
+    """
+    A path in the store, as the value of a variable:  the ID's of its nodes, and of the links between them
+    """
+    __slots__ = ("nodes", "links")
+
+    def __init__(self, nodes :[int], links :[int]):
+        self.nodes = tuple(nodes)
+        self.links = tuple(links)
+
+    def __eq__(self, other):
+        return type(other) == PathValue and (other.nodes, other.links) == (self.nodes, self.links)
+
+    def __hash__(self):
+        return hash(("path", self.nodes, self.links))
+
+
+
+_MISSING = object()     # Marker for absent values
+
+
+
+def hashable(value):
+    """
+    Return a hashable version of the given value, for grouping and DISTINCT
+    """
+    if isinstance(value, (list, tuple)):
+        return ("list",) + tuple(hashable(element) for element in value)
+    if isinstance(value, dict):
+        return ("map",) + tuple(sorted((key, hashable(element)) for key, element in value.items()))
+    if isinstance(value, bool):
+        return ("bool", value)
+    return value
+
+
+
+def is_number(value) -> bool:
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+
+def equal(a, b) -> bool|None:
+    """
+    Cypher equality, in 3-valued logic
+    """
+    if a is None or b is None:
+        return None
+    if is_number(a) and is_number(b):
+        return a == b
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        if len(a) != len(b):
+            return False
+        result = True
+        for (x, y) in zip(a, b):
+            element_result = equal(x, y)
+            if element_result is False:
+                return False
+            if element_result is None:
+                result = None
+        return result
+    if isinstance(a, dict) and isinstance(b, dict):
+        if set(a) != set(b):
+            return False
+        return equal([a[key] for key in sorted(a)], [b[key] for key in sorted(a)])
+    if isinstance(a, bool) != isinstance(b, bool):
+        return False
+    if isinstance(a, str) != isinstance(b, str):
+        return False
+    try:
+        return bool(a == b)
+    except TypeError:
+        return False
+
+
+
+def compare(a, b) -> int|None:
+    """
+    Cypher ordering comparison:  -1, 0 or 1 ;  or None if the values aren't comparable
+    """
+    if a is None or b is None:
+        return None
+    if is_number(a) and is_number(b):
+        if a != a or b != b:        # NaN
+            return None
+    elif isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        for (x, y) in zip(a, b):
+            result = compare(x, y)
+            if result != 0:
+                return result
+        return (len(a) > len(b)) - (len(a) < len(b))
+    elif not (type(a) == type(b) or (isinstance(a, str) and isinstance(b, str))):
+        return None
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        return None
+
+
+
+# The ranks of the value types in the Cypher ordering (used by ORDER BY, min and max)
+_TYPE_RANKS = [(dict, 0), (NodeRef, 1), (LinkRef, 2), ((list, tuple), 3), (PathValue, 4),
+               ((neo4j.time.DateTime, datetime), 5), ((neo4j.time.Date, date), 6), (neo4j.time.Time, 7),
+               (neo4j.time.Duration, 8), (str, 9), (bool, 10)]
+
+def order_key(value) -> tuple:
+    """
+    Sort key that orders values as done by Cypher's ORDER BY (with nulls last)
+    """
+    if value is None:
+        return (13, 0)
+    if is_number(value):
+        return (12, 0, 0) if value != value else (11, value)     # NaN goes after all the other numbers
+    for (types, rank) in _TYPE_RANKS:
+        if isinstance(value, types):
+            if rank == 0:
+                return (rank, tuple(sorted((key, order_key(element)) for key, element in value.items())))
+            if rank in (1, 2):
+                return (rank, value.id)
+            if rank == 3:
+                return (rank, tuple(order_key(element) for element in value))
+            if rank == 4:
+                return (rank, value.nodes, value.links)
+            return (rank, value)
+    return (14, str(value))
+
+
+
+def arithmetic(op :str, a, b):
+    if a is None or b is None:
+        return None
+    if op == "+":
+        if isinstance(a, list) or isinstance(b, list):
+            return (a if isinstance(a, list) else [a]) + (b if isinstance(b, list) else [b])
+        if isinstance(a, str) or isinstance(b, str):
+            return to_string(a) + to_string(b)
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+            if b == 0:
+                raise Exception("MemoryGraphAccess: / by zero")
+            quotient = abs(a) // abs(b)
+            return quotient if (a >= 0) == (b >= 0) else -quotient     # Truncation toward zero, as in Cypher
+        try:
+            return a / b
+        except ZeroDivisionError:
+            return math.nan if a == 0 else math.copysign(math.inf, a)
+    if op == "%":
+        if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+            if b == 0:
+                raise Exception("MemoryGraphAccess: / by zero")
+            return int(math.fmod(a, b))
+        return math.fmod(a, b)
+    if op == "^":
+        return float(a) ** float(b)
+    raise Exception(f"MemoryGraphAccess: unknown operator `{op}`")
+
+
+
+def to_cypher_value(value):
+    """
+    Convert the given value (of a property, or of a query parameter) as done by the Neo4j driver:
+    Python dates and datetimes become neo4j.time values, tuples become lists, and numpy scalars become Python ones
+    """
+    if isinstance(value, datetime):
+        return neo4j.time.DateTime.from_native(value)
+    if isinstance(value, date):
+        return neo4j.time.Date.from_native(value)
+    if isinstance(value, (list, tuple)):
+        return [to_cypher_value(element) for element in value]
+    if isinstance(value, dict):
+        return {key: to_cypher_value(element) for key, element in value.items()}
+    if type(value).__module__ == "numpy":
+        return value.item()
+    return value
+
+
+
+def free_variables(expr) -> set:
+    """
+    Return the names of all the variables referenced in the given expression (possibly including local ones)
+    """
+    names = set()
+    pending = [expr]
+    while pending:
+        part = pending.pop()
+        if type(part) == tuple:
+            if part and part[0] == "var":
+                names.add(part[1])
+            elif part and part[0] in ("pattern", "pattern_list", "exists_query", "count_query"):
+                names.add(_MISSING)         # Too complex to analyze: treat as depending on everything
+            else:
+                pending += part[1:]
+        elif type(part) == list:
+            pending += part
+        elif type(part) == dict:
+            names.add(_MISSING)
+
+    return names
+
+
+
+
+
+###############################################################################################################
+#                                                   FUNCTIONS
+###############################################################################################################
+
+def to_string(value) -> str|None:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (neo4j.time.Date, neo4j.time.DateTime, neo4j.time.Time)):
+        return value.iso_format()
+    return str(value)
+
+
+
+def to_integer(value) -> int|None:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if is_number(value):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            try:
+                return int(float(value.strip()))
+            except ValueError:
+                return None
+    raise Exception(f"MemoryGraphAccess: cannot convert {value!r} to an integer")
+
+
+
+def to_float(value) -> float|None:
+    if value is None:
+        return None
+    if is_number(value):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return None
+    raise Exception(f"MemoryGraphAccess: cannot convert {value!r} to a float")
+
+
+
+def to_boolean(value) -> bool|None:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return {"true": True, "false": False}.get(value.strip().lower())
+    if is_number(value):
+        return value != 0
+    raise Exception(f"MemoryGraphAccess: cannot convert {value!r} to a boolean")
+
+
+
+def cypher_round(value, precision=0):
+    if value is None:
+        return None
+    if precision == 0:
+        return float(math.floor(value + 0.5))
+    return float(Decimal(repr(value)).quantize(Decimal(1).scaleb(-precision), rounding=ROUND_HALF_UP))
+
+
+
+def to_datetime(value=None):
+    if value is None:
+        return neo4j.time.DateTime.from_native(datetime.now(timezone.utc))
+    if isinstance(value, neo4j.time.DateTime):
+        return value
+    if isinstance(value, datetime):
+        return neo4j.time.DateTime.from_native(value)
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return neo4j.time.DateTime.from_native(parsed)
+    if isinstance(value, dict) and "epochMillis" in value:
+        return neo4j.time.DateTime.from_native(datetime.fromtimestamp(value["epochMillis"] / 1000, tz=timezone.utc))
+    if isinstance(value, dict) and "epochSeconds" in value:
+        return neo4j.time.DateTime.from_native(datetime.fromtimestamp(value["epochSeconds"], tz=timezone.utc))
+    if isinstance(value, dict):
+        fields = {key: value[key] for key in ("year", "month", "day", "hour", "minute", "second") if key in value}
+        return neo4j.time.DateTime.from_native(datetime(**{"month": 1, "day": 1, **fields}, tzinfo=timezone.utc))
+    raise Exception(f"MemoryGraphAccess: cannot convert {value!r} to a datetime")
+
+
+
+def to_date(value=None):
+    if value is None:
+        return neo4j.time.Date.today()
+    if isinstance(value, neo4j.time.Date):
+        return value
+    if isinstance(value, neo4j.time.DateTime):
+        return value.date()
+    if isinstance(value, datetime):
+        return neo4j.time.Date.from_native(value.date())
+    if isinstance(value, date):
+        return neo4j.time.Date.from_native(value)
+    if isinstance(value, str):
+        return neo4j.time.Date.from_native(date.fromisoformat(value[:10]))
+    if isinstance(value, dict):
+        return neo4j.time.Date(value["year"], value.get("month", 1), value.get("day", 1))
+    raise Exception(f"MemoryGraphAccess: cannot convert {value!r} to a date")
+
+
+
+def null_safe(function):
+    """
+    Wrap a function of one or more arguments so that it returns null if its first argument is null
+    """
+    @functools.wraps(function)
+    def wrapper(engine, value, *args):
+        if value is None:
+            return None
+        return function(value, *args)
+    return wrapper
+
+
+
+def entity_props(engine, value):
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return dict(value)
+    return dict(engine.entity(value)["props"])
+
+
+
+def function_labels(engine, value):
+    if value is None:
+        return None
+    return list(engine.store._nodes[engine.node_id(value)]["labels"])
+
+
+
+def function_type(engine, value):
+    if value is None:
+        return None
+    if not isinstance(value, LinkRef):
+        raise Exception(f"MemoryGraphAccess: type() expects a relationship; got {value!r}")
+    return (engine.store._links.get(value.id) or engine.deleted_links[value.id])["name"]
+
+
+
+def function_id(engine, value):
+    if value is None:
+        return None
+    if not isinstance(value, (NodeRef, LinkRef)):
+        raise Exception(f"MemoryGraphAccess: id() expects a node or a relationship; got {value!r}")
+    return value.id
+
+
+
+def function_keys(engine, value):
+    props = entity_props(engine, value)
+    return None if props is None else list(props)
+
+
+
+def function_length(engine, value):
+    if value is None:
+        return None
+    if isinstance(value, PathValue):
+        return len(value.links)
+    return len(value)
+
+
+
+def function_end_node(engine, value, end :str):
+    if value is None:
+        return None
+    link = engine.store._links.get(value.id) or engine.deleted_links[value.id]
+    return NodeRef(link[end])
+
+
+
+def function_range(engine, start, end, step=1):
+    if step == 0:
+        raise Exception("MemoryGraphAccess: the step of range() cannot be 0")
+    return list(range(start, end + (1 if step > 0 else -1), step))
+
+
+
+def function_substring(engine, value, start, length=None):
+    if value is None:
+        return None
+    return value[start:] if length is None else value[start:start + length]
+
+
+
+def function_split(engine, value, delimiter):
+    if value is None or delimiter is None:
+        return None
+    return value.split(delimiter) if delimiter else list(value)
+
+
+
+def function_replace(engine, value, search, replacement):
+    if value is None or search is None or replacement is None:
+        return None
+    return value.replace(search, replacement)
+
+
+
+def function_coalesce(engine, *values):
+    return next((value for value in values if value is not None), None)
+
+
+
+FUNCTIONS = {
+    "id":               function_id,
+    "elementid":        lambda engine, value: None if value is None else str(function_id(engine, value)),
+    "labels":           function_labels,
+    "type":             function_type,
+    "keys":             function_keys,
+    "properties":       entity_props,
+    "size":             null_safe(len),
+    "length":           function_length,
+    "coalesce":         function_coalesce,
+    "tolower":          null_safe(str.lower),
+    "toupper":          null_safe(str.upper),
+    "lower":            null_safe(str.lower),
+    "upper":            null_safe(str.upper),
+    "trim":             null_safe(str.strip),
+    "ltrim":            null_safe(str.lstrip),
+    "rtrim":            null_safe(str.rstrip),
+    "btrim":            null_safe(str.strip),
+    "replace":          function_replace,
+    "substring":        function_substring,
+    "left":             null_safe(lambda value, n: value[:n]),
+    "right":            null_safe(lambda value, n: value[len(value) - n:] if n else ""),
+    "split":            function_split,
+    "reverse":          null_safe(lambda value: value[::-1]),
+    "tostring":         lambda engine, value: to_string(value),
+    "tostringornull":   lambda engine, value: to_string(value),
+    "tointeger":        lambda engine, value: to_integer(value),
+    "tointegerornull":  lambda engine, value: to_integer(value) if isinstance(value, (str, numbers.Number)) else None,
+    "tofloat":          lambda engine, value: to_float(value),
+    "tofloatornull":    lambda engine, value: to_float(value) if isinstance(value, (str, numbers.Number)) else None,
+    "toboolean":        lambda engine, value: to_boolean(value),
+    "tobooleanornull":  lambda engine, value: to_boolean(value) if isinstance(value, (str, numbers.Number)) else None,
+    "head":             null_safe(lambda value: value[0] if value else None),
+    "last":             null_safe(lambda value: value[-1] if value else None),
+    "tail":             null_safe(lambda value: value[1:]),
+    "isempty":          null_safe(lambda value: len(value) == 0),
+    "range":            function_range,
+    "abs":              null_safe(abs),
+    "ceil":             null_safe(lambda value: float(math.ceil(value))),
+    "floor":            null_safe(lambda value: float(math.floor(value))),
+    "round":            lambda engine, value, precision=0: cypher_round(value, precision),
+    "sign":             null_safe(lambda value: (value > 0) - (value < 0)),
+    "sqrt":             null_safe(math.sqrt),
+    "exp":              null_safe(math.exp),
+    "log":              null_safe(math.log),
+    "log10":            null_safe(math.log10),
+    "rand":             lambda engine: random.random(),
+    "randomuuid":       lambda engine: str(uuid.uuid4()),
+    "timestamp":        lambda engine: int(time.time() * 1000),
+    "datetime":         lambda engine, value=None: to_datetime(value),
+    "localdatetime":    lambda engine, value=None: to_datetime(value).replace(tzinfo=None),
+    "date":             lambda engine, value=None: to_date(value),
+    "nodes":            null_safe(lambda value: [NodeRef(i) for i in value.nodes]),
+    "relationships":    null_safe(lambda value: [LinkRef(i) for i in value.links]),
+    "startnode":        lambda engine, value: function_end_node(engine, value, "from"),
+    "endnode":          lambda engine, value: function_end_node(engine, value, "to"),
+}
+
+
+
+
+
+###############################################################################################################
+#                                                   RESULTS
+###############################################################################################################
+
+class MemoryResult:
+    """
+    The result of a query run by MemoryCypher, with the methods of a neo4j.Result object used by this library:
+    keys(), data(), values(), consume() and iteration over the records (neo4j.Record objects, whose nodes,
+    relationships and paths are neo4j.graph objects, as returned by the driver)
+    """
+
+    # True for the versions of the driver whose graph objects have an "element_id" (5 and later)
+    _ELEMENT_IDS = "element_id" in inspect.signature(neo4j.graph.Node.__init__).parameters
+
+
+    def __init__(self, store, keys :[str], rows :[dict], counters :dict):
+        self._keys = list(keys)
+        self._counters = counters
+        self._graph = neo4j.graph.Graph()
+        self._store = store
+        self._nodes = {}
+        self._records = [neo4j.Record(zip(self._keys, [self._convert(row[key]) for key in self._keys])) for row in rows]
+
+
+    def keys(self) -> [str]:
+        return list(self._keys)
+
+
+    def data(self) -> [dict]:
+        return [record.data() for record in self._records]
+
+
+    def values(self) -> [list]:
+        return [list(record.values()) for record in self._records]
+
+
+    def consume(self):
+        return MemorySummary(self._counters)
+
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+
+    def __iter__(self):
+        return iter(self._records)
+
+
+
+    def _convert(self, value):
+        """
+        Turn the given value, as used by MemoryCypher, into the value that the neo4j driver would return
+        """
+        if isinstance(value, NodeRef):
+            return self._node(value.id)
+        if isinstance(value, LinkRef):
+            return self._relationship(value.id)
+        if isinstance(value, PathValue):
+            start = self._node(value.nodes[0])
+            return neo4j.graph.Path(start, *[self._relationship(link_id) for link_id in value.links])
+        if isinstance(value, (list, tuple)):
+            return [self._convert(element) for element in value]
+        if isinstance(value, dict):
+            return {key: self._convert(element) for key, element in value.items()}
+        return value
+
+
+    def _node(self, internal_id :int):
+        node = self._nodes.get(internal_id)
+        if node is None:
+            data = self._store._nodes.get(internal_id, {"labels": [], "props": {}})
+            if self._ELEMENT_IDS:
+                node = neo4j.graph.Node(self._graph, str(internal_id), internal_id, data["labels"], dict(data["props"]))
+            else:
+                node = neo4j.graph.Node(self._graph, internal_id, data["labels"], dict(data["props"]))
+            self._nodes[internal_id] = node
+        return node
+
+
+    def _relationship(self, link_id :int):
+        link = self._store._links.get(link_id)
+        if link is None:
+            raise Exception(f"MemoryGraphAccess: relationship<{link_id}> was deleted, and cannot be returned")
+        relationship_class = self._graph.relationship_type(link["name"])
+        if self._ELEMENT_IDS:
+            relationship = relationship_class(self._graph, str(link_id), link_id, dict(link["props"]))
+        else:
+            relationship = relationship_class(self._graph, link_id, dict(link["props"]))
+        relationship._start_node = self._node(link["from"])
+        relationship._end_node = self._node(link["to"])
+        return relationship
+
+
+
+class MemorySummary:
+    """
+    Stand-in for a neo4j.ResultSummary object:  only the `counters` attribute is provided
+    """
+    def __init__(self, counters :dict):
+        self.counters = neo4j.SummaryCounters(counters)
+
+
+
+
+
+###############################################################################################################
+#                                                   PARSER
+###############################################################################################################
+
+_TOKEN_PATTERN = re.compile(r"""
+      (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+    | (?P<number>\d+\.\d+(?:[eE][-+]?\d+)?|\d+[eE][-+]?\d+|0[xX][0-9a-fA-F]+|\d+)
+    | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<name>[^\W\d]\w*)
+    | (?P<quoted>`(?:[^`]|``)*`)
+    | (?P<param>\$(?:\w+|`(?:[^`]|``)*`))
+    | (?P<op>->|<-|<>|!=|<=|>=|=~|\+=|\.\.|[-+*/%^=<>(){}\[\],:.|;])
+    """, re.VERBOSE | re.DOTALL)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+# Keywords that can't be used as the names of variables without backticks
+_RESERVED = {"MATCH", "OPTIONAL", "WHERE", "WITH", "RETURN", "UNWIND", "CREATE", "MERGE", "SET", "REMOVE", "DELETE",
+             "DETACH", "FOREACH", "CALL", "UNION", "ORDER", "SKIP", "LIMIT", "AND", "OR", "XOR", "NOT", "IN", "IS",
+             "AS", "CASE", "WHEN", "THEN", "ELSE", "END", "ON", "DISTINCT", "STARTS", "ENDS", "CONTAINS", "YIELD"}
+
+# Keywords that start a clause
+_CLAUSE_STARTS = {"MATCH", "OPTIONAL", "WITH", "RETURN", "UNWIND", "CREATE", "MERGE", "SET", "REMOVE", "DELETE",
+                  "DETACH", "FOREACH", "CALL"}
+
+
+
+def _tokenize(q :str) -> [tuple]:
+    """
+    Split the given Cypher query into tokens
+
+    :return:    A list of tuples (kind, value, start position, end position),
+                    ending with a token of kind "eof"
+    """
+    tokens = []
+    position = 0
+    while position < len(q):
+        match = _TOKEN_PATTERN.match(q, position)
+        if match is None:
+            raise Exception(f"MemoryGraphAccess: invalid Cypher: unexpected character `{q[position]}` "
+                            f"at position {position}")
+        kind = match.lastgroup
+        text = match.group()
+        position = match.end()
+        if kind == "space":
+            continue
+        if kind == "number":
+            value = int(text, 16) if text[:2].lower() == "0x" else (float(text) if ("." in text or "e" in text.lower()) else int(text))
+        elif kind == "string":
+            value = re.sub(r"\\(u[0-9a-fA-F]{4}|.)",
+                           lambda m: chr(int(m.group(1)[1:], 16)) if len(m.group(1)) == 5 else _ESCAPES.get(m.group(1), m.group(1)),
+                           text[1:-1])
+        elif kind == "quoted":
+            value = text[1:-1].replace("``", "`")
+        elif kind == "param":
+            value = text[2:-1].replace("``", "`") if text[1] == "`" else text[1:]
+        else:
+            value = text
+        tokens.append((kind, value, match.start(), match.end()))
+
+    tokens.append(("eof", None, len(q), len(q)))
+    return tokens
+
+
+
+class _Backtrack(Exception):
+    """
+    Raised by the parser when a speculative parse (of a pattern, rather than an expression) fails
+    """
+
+
+
+class _CypherParser:
+    """
+    Recursive-descent parser for the subset of Cypher supported by MemoryCypher.
+    Queries are turned into dicts (for clauses and patterns) and tuples (for expressions)
+    """
+
+    def __init__(self, q :str):
+        self.q = q
+        self.tokens = _tokenize(q)
+        self.pos = 0
+        self.anonymous = 0
+
+
+    def error(self, message :str):
+        token = self.tokens[self.pos]
+        raise _Backtrack(f"MemoryGraphAccess: unsupported or invalid Cypher ({message}) "
+                         f"at position {token[2]}: `{self.q[token[2]:token[2] + 40]}`")
+
+
+    def peek(self, offset=0) -> tuple:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+
+    def advance(self) -> tuple:
+        token = self.tokens[self.pos]
+        if token[0] != "eof":
+            self.pos += 1
+        return token
+
+
+    def is_keyword(self, *words, offset=0) -> bool:
+        token = self.peek(offset)
+        return token[0] == "name" and token[1].upper() in words
+
+
+    def accept_keyword(self, *words) -> bool:
+        if self.is_keyword(*words):
+            self.advance()
+            return True
+        return False
+
+
+    def expect_keyword(self, word :str) -> None:
+        if not self.accept_keyword(word):
+            self.error(f"expected {word}")
+
+
+    def is_op(self, *ops, offset=0) -> bool:
+        token = self.peek(offset)
+        return token[0] == "op" and token[1] in ops
+
+
+    def accept_op(self, op :str) -> bool:
+        if self.is_op(op):
+            self.advance()
+            return True
+        return False
+
+
+    def expect_op(self, op :str) -> None:
+        if not self.accept_op(op):
+            self.error(f"expected `{op}`")
+
+
+    def is_name(self, offset=0) -> bool:
+        token = self.peek(offset)
+        return token[0] == "quoted" or (token[0] == "name" and token[1].upper() not in _RESERVED)
+
+
+    def name(self) -> str:
+        token = self.peek()
+        if token[0] not in ("name", "quoted"):
+            self.error("expected a name")
+        self.advance()
+        return token[1]
+
+
+    def anonymous_name(self) -> str:
+        self.anonymous += 1
+        return f"  anonymous_{self.anonymous}"      # The leading blanks make it impossible to clash with user names
+
+
+
+    ###################   QUERIES AND CLAUSES   ###################
+
+    def parse(self) -> dict:
+        query = self.parse_query()
+        self.accept_op(";")
+        if self.peek()[0] != "eof":
+            self.error("unexpected text")
+        return query
+
+
+    def parse_query(self) -> dict:
+        parts = [self.parse_single_query()]
+        union_all = []
+        while self.accept_keyword("UNION"):
+            union_all.append(self.accept_keyword("ALL"))
+            parts.append(self.parse_single_query())
+        return {"parts": parts, "union_all": union_all}
+
+
+    def parse_single_query(self) -> list:
+        clauses = []
+        while self.is_keyword(*_CLAUSE_STARTS):
+            clauses.append(self.parse_clause())
+        if not clauses:
+            self.error("expected a clause")
+        return clauses
+
+
+    def parse_clause(self) -> dict:
+        keyword = self.advance()[1].upper()
+
+        if keyword in ("MATCH", "OPTIONAL"):
+            optional = keyword == "OPTIONAL"
+            if optional:
+                self.expect_keyword("MATCH")
+            patterns = self.parse_patterns()
+            while self.accept_keyword("USING"):      # Planner hints, such as USING INDEX n:Car(vin)
+                while not (self.is_keyword("WHERE", "USING", *_CLAUSE_STARTS, "UNION") or self.peek()[0] == "eof"
+                           or self.is_op("}", ";")):
+                    self.advance()
+            where = self.parse_expression() if self.accept_keyword("WHERE") else None
+            return {"clause": "MATCH", "optional": optional, "patterns": patterns, "where": where}
+
+        if keyword == "UNWIND":
+            expr = self.parse_expression()
+            self.expect_keyword("AS")
+            return {"clause": "UNWIND", "expr": expr, "name": self.name()}
+
+        if keyword in ("WITH", "RETURN"):
+            clause = self.parse_projection(keyword)
+            if keyword == "WITH":
+                clause["where"] = self.parse_expression() if self.accept_keyword("WHERE") else None
+            return clause
+
+        if keyword == "CREATE":
+            if self.is_keyword("INDEX", "CONSTRAINT", "FULLTEXT", "RANGE", "TEXT", "POINT", "LOOKUP", "OR"):
+                self.error("index and constraint statements are not supported; use the methods of MemoryGraphAccess")
+            return {"clause": "CREATE", "patterns": self.parse_patterns()}
+
+        if keyword == "MERGE":
+            clause = {"clause": "MERGE", "pattern": self.parse_pattern(), "on_create": [], "on_match": []}
+            while self.accept_keyword("ON"):
+                kind = "on_create" if self.accept_keyword("CREATE") else None
+                if kind is None:
+                    self.expect_keyword("MATCH")
+                    kind = "on_match"
+                self.expect_keyword("SET")
+                clause[kind] += self.parse_set_items()
+            return clause
+
+        if keyword == "SET":
+            return {"clause": "SET", "items": self.parse_set_items()}
+
+        if keyword == "REMOVE":
+            items = []
+            while True:
+                target = ("var", self.name())
+                if self.accept_op("."):
+                    items.append({"kind": "property", "target": target, "key": self.name()})
+                else:
+                    items.append({"kind": "labels", "target": target, "labels": self.parse_labels()})
+                if not self.accept_op(","):
+                    return {"clause": "REMOVE", "items": items}
+
+        if keyword in ("DELETE", "DETACH"):
+            detach = keyword == "DETACH"
+            if detach:
+                self.expect_keyword("DELETE")
+            exprs = [self.parse_expression()]
+            while self.accept_op(","):
+                exprs.append(self.parse_expression())
+            return {"clause": "DELETE", "detach": detach, "exprs": exprs}
+
+        if keyword == "FOREACH":
+            self.expect_op("(")
+            name = self.name()
+            self.expect_keyword("IN")
+            expr = self.parse_expression()
+            self.expect_op("|")
+            clauses = self.parse_single_query()
+            self.expect_op(")")
+            return {"clause": "FOREACH", "name": name, "expr": expr, "clauses": clauses}
+
+        if keyword == "CALL":
+            if self.accept_op("{"):
+                query = self.parse_query()
+                self.expect_op("}")
+                if self.accept_keyword("IN"):           # CALL { ... } IN TRANSACTIONS [OF n ROWS]
+                    self.expect_keyword("TRANSACTIONS")
+                    if self.accept_keyword("OF"):
+                        self.parse_expression()
+                        self.expect_keyword("ROW") if self.is_keyword("ROW") else self.expect_keyword("ROWS")
+                return {"clause": "CALL_SUBQUERY", "query": query}
+
+            name = self.name()
+            while self.accept_op("."):
+                name += "." + self.name()
+            args = []
+            if self.accept_op("("):
+                args = self.parse_arguments()
+            yields = []
+            where = None
+            if self.accept_keyword("YIELD"):
+                while True:
+                    field = self.name()
+                    yields.append((field, self.name() if self.accept_keyword("AS") else field))
+                    if not self.accept_op(","):
+                        break
+                where = self.parse_expression() if self.accept_keyword("WHERE") else None
+            return {"clause": "CALL_PROCEDURE", "name": name, "args": args, "yields": yields, "where": where}
+
+        self.pos -= 1
+        self.error("unsupported clause")
+
+
+    def parse_projection(self, keyword :str) -> dict:
+        clause = {"clause": keyword, "distinct": self.accept_keyword("DISTINCT"), "star": False,
+                  "items": [], "item_texts": [], "order": [], "skip": None, "limit": None}
+
+        if self.accept_op("*"):
+            clause["star"] = True
+            if not self.accept_op(","):
+                return self.parse_projection_tail(clause)
+
+        while True:
+            start = self.peek()[2]
+            expr = self.parse_expression()
+            text = self.q[start:self.tokens[self.pos - 1][3]]
+            alias = self.name() if self.accept_keyword("AS") else text
+            clause["items"].append((expr, alias))
+            clause["item_texts"].append(text)
+            if not self.accept_op(","):
+                break
+
+        return self.parse_projection_tail(clause)
+
+
+    def parse_projection_tail(self, clause :dict) -> dict:
+        if self.accept_keyword("ORDER"):
+            self.expect_keyword("BY")
+            while True:
+                start = self.peek()[2]
+                expr = self.parse_expression()
+                text = self.q[start:self.tokens[self.pos - 1][3]]
+                descending = False
+                if self.accept_keyword("DESC", "DESCENDING"):
+                    descending = True
+                else:
+                    self.accept_keyword("ASC", "ASCENDING")
+                clause["order"].append((expr, text, descending))
+                if not self.accept_op(","):
+                    break
+
+        if self.accept_keyword("SKIP"):
+            clause["skip"] = self.parse_expression()
+        if self.accept_keyword("LIMIT"):
+            clause["limit"] = self.parse_expression()
+
+        return clause
+
+
+    def parse_set_items(self) -> list:
+        items = []
+        while True:
+            target = ("var", self.name())
+            if self.accept_op("."):
+                key = self.name()
+                while self.is_op(".") and not self.is_op("=", offset=1):
+                    target = ("property", target, key)
+                    self.advance()
+                    key = self.name()
+                self.expect_op("=")
+                items.append({"kind": "property", "target": target, "key": key, "value": self.parse_expression()})
+            elif self.accept_op("="):
+                items.append({"kind": "replace", "target": target, "value": self.parse_expression()})
+            elif self.accept_op("+="):
+                items.append({"kind": "merge", "target": target, "value": self.parse_expression()})
+            else:
+                items.append({"kind": "labels", "target": target, "labels": self.parse_labels()})
+            if not self.accept_op(","):
+                return items
+
+
+    def parse_labels(self) -> [str]:
+        labels = []
+        while self.accept_op(":"):
+            labels.append(self.name())
+            while self.accept_op("&"):
+                labels.append(self.name())
+        if not labels:
+            self.error("expected a label")
+        return labels
+
+
+
+    ###################   PATTERNS   ###################
+
+    def parse_patterns(self) -> list:
+        patterns = [self.parse_pattern()]
+        while self.accept_op(","):
+            patterns.append(self.parse_pattern())
+        return patterns
+
+
+    def parse_pattern(self, require_relationship=False) -> dict:
+        path = None
+        if self.is_name() and self.is_op("=", offset=1):
+            path = self.name()
+            self.advance()
+
+        shortest = None
+        if self.is_keyword("SHORTESTPATH", "ALLSHORTESTPATHS") and self.is_op("(", offset=1):
+            shortest = "all" if self.advance()[1].upper() == "ALLSHORTESTPATHS" else "one"
+            self.expect_op("(")
+
+        nodes = [self.parse_node_pattern()]
+        rels = []
+        while self.is_op("-", "<-"):
+            rels.append(self.parse_relationship_pattern())
+            nodes.append(self.parse_node_pattern())
+
+        if shortest:
+            self.expect_op(")")
+        if require_relationship and not rels:
+            self.error("expected a relationship")
+
+        return {"path": path, "nodes": nodes, "rels": rels, "shortest": shortest}
+
+
+    def parse_node_pattern(self) -> dict:
+        self.expect_op("(")
+        var = self.name() if self.is_name() else self.anonymous_name()
+        labels = self.parse_labels() if self.is_op(":") else []
+        props = None
+        if self.is_op("{"):
+            props = self.parse_map()
+        elif self.peek()[0] == "param":
+            props = ("param", self.advance()[1])
+        self.expect_op(")")
+        return {"var": var, "labels": labels, "props": props}
+
+
+    def parse_relationship_pattern(self) -> dict:
+        left = self.accept_op("<-")
+        if not left:
+            self.expect_op("-")
+
+        var = None
+        types = []
+        length = None
+        props = None
+        if self.accept_op("["):
+            if self.is_name():
+                var = self.name()
+            if self.accept_op(":"):
+                types.append(self.name())
+                while self.accept_op("|"):
+                    self.accept_op(":")
+                    types.append(self.name())
+            if self.accept_op("*"):
+                min_hops = self.advance()[1] if self.peek()[0] == "number" else None
+                if self.accept_op(".."):
+                    max_hops = self.advance()[1] if self.peek()[0] == "number" else None
+                else:
+                    max_hops = min_hops
+                length = (1 if min_hops is None else min_hops, max_hops)
+            if self.is_op("{"):
+                props = self.parse_map()
+            elif self.peek()[0] == "param":
+                props = ("param", self.advance()[1])
+            self.expect_op("]")
+
+        right = self.accept_op("->")
+        if not right:
+            self.expect_op("-")
+
+        direction = "OUT" if (right and not left) else ("IN" if (left and not right) else "BOTH")
+        return {"var": var or self.anonymous_name(), "types": types, "length": length, "props": props, "dir": direction}
+
+
+
+    ###################   EXPRESSIONS   ###################
+
+    def parse_expression(self) -> tuple:
+        expr = self.parse_xor()
+        while self.accept_keyword("OR"):
+            expr = ("or", expr, self.parse_xor())
+        return expr
+
+
+    def parse_xor(self) -> tuple:
+        expr = self.parse_and()
+        while self.accept_keyword("XOR"):
+            expr = ("xor", expr, self.parse_and())
+        return expr
+
+
+    def parse_and(self) -> tuple:
+        expr = self.parse_not()
+        while self.accept_keyword("AND"):
+            expr = ("and", expr, self.parse_not())
+        return expr
+
+
+    def parse_not(self) -> tuple:
+        if self.accept_keyword("NOT"):
+            return ("not", self.parse_not())
+        return self.parse_comparison()
+
+
+    def parse_comparison(self) -> tuple:
+        expr = self.parse_additive()
+        while True:
+            if self.is_op("=", "<>", "!=", "<", ">", "<=", ">=", "=~"):
+                op = self.advance()[1]
+                expr = ("compare", op, expr, self.parse_additive())
+            elif self.accept_keyword("IN"):
+                expr = ("in", expr, self.parse_additive())
+            elif self.is_keyword("STARTS", "ENDS") and self.is_keyword("WITH", offset=1):
+                op = self.advance()[1].upper() + " WITH"
+                self.advance()
+                expr = ("string_match", op, expr, self.parse_additive())
+            elif self.accept_keyword("CONTAINS"):
+                expr = ("string_match", "CONTAINS", expr, self.parse_additive())
+            elif self.accept_keyword("IS"):
+                negated = self.accept_keyword("NOT")
+                self.expect_keyword("NULL")
+                expr = ("is_null", expr, negated)
+            else:
+                return expr
+
+
+    def parse_additive(self) -> tuple:
+        expr = self.parse_multiplicative()
+        while self.is_op("+", "-"):
+            op = self.advance()[1]
+            expr = ("arithmetic", op, expr, self.parse_multiplicative())
+        return expr
+
+
+    def parse_multiplicative(self) -> tuple:
+        expr = self.parse_power()
+        while self.is_op("*", "/", "%"):
+            op = self.advance()[1]
+            expr = ("arithmetic", op, expr, self.parse_power())
+        return expr
+
+
+    def parse_power(self) -> tuple:
+        expr = self.parse_unary()
+        while self.accept_op("^"):
+            expr = ("arithmetic", "^", expr, self.parse_unary())
+        return expr
+
+
+    def parse_unary(self) -> tuple:
+        if self.accept_op("-"):
+            operand = self.parse_unary()
+            if operand[0] == "literal" and isinstance(operand[1], (int, float)):
+                return ("literal", -operand[1])
+            return ("negate", operand)
+        if self.accept_op("+"):
+            return self.parse_unary()
+        return self.parse_postfix()
+
+
+    def parse_postfix(self) -> tuple:
+        expr = self.parse_atom()
+        while True:
+            if self.is_op(".") and self.peek(1)[0] in ("name", "quoted"):
+                self.advance()
+                expr = ("property", expr, self.name())
+            elif self.accept_op("["):
+                if self.accept_op(".."):
+                    end = None if self.is_op("]") else self.parse_expression()
+                    expr = ("slice", expr, None, end)
+                else:
+                    index = self.parse_expression()
+                    if self.accept_op(".."):
+                        end = None if self.is_op("]") else self.parse_expression()
+                        expr = ("slice", expr, index, end)
+                    else:
+                        expr = ("index", expr, index)
+                self.expect_op("]")
+            elif self.is_op(":") and self.peek(1)[0] in ("name", "quoted"):
+                expr = ("label_check", expr, self.parse_labels())
+            else:
+                return expr
+
+
+    def parse_atom(self) -> tuple:
+        token = self.peek()
+        kind = token[0]
+
+        if kind in ("number", "string"):
+            self.advance()
+            return ("literal", token[1])
+
+        if kind == "param":
+            self.advance()
+            return ("param", token[1])
+
+        if kind == "op" and token[1] == "(":
+            pattern = self.try_parse(lambda: self.parse_pattern(require_relationship=True))
+            if pattern is not None:
+                return ("pattern", self.with_path_variable(pattern))
+            self.advance()
+            expr = self.parse_expression()
+            self.expect_op(")")
+            return expr
+
+        if kind == "op" and token[1] == "[":
+            return self.parse_list()
+
+        if kind == "op" and token[1] == "{":
+            return self.parse_map()
+
+        if kind == "quoted":
+            return self.parse_variable()
+
+        if kind != "name":
+            self.error("expected an expression")
+
+        word = token[1].upper()
+        if word in ("TRUE", "FALSE", "NULL"):
+            self.advance()
+            return ("literal", {"TRUE": True, "FALSE": False, "NULL": None}[word])
+
+        if word == "CASE":
+            return self.parse_case()
+
+        if word in ("EXISTS", "COUNT") and self.is_op("{", offset=1):
+            self.advance()
+            self.advance()
+            if self.is_keyword(*_CLAUSE_STARTS):
+                query = self.parse_query()
+            else:
+                patterns = self.parse_patterns()
+                where = self.parse_expression() if self.accept_keyword("WHERE") else None
+                query = {"parts": [[{"clause": "MATCH", "optional": False, "patterns": patterns, "where": where}]],
+                         "union_all": []}
+            self.expect_op("}")
+            return ("exists_query" if word == "EXISTS" else "count_query", query)
+
+        if word in ("ALL", "ANY", "NONE", "SINGLE") and self.is_op("(", offset=1) and self.is_keyword("IN", offset=3):
+            self.advance()
+            self.advance()
+            name = self.name()
+            self.expect_keyword("IN")
+            source = self.parse_expression()
+            self.expect_keyword("WHERE")
+            where = self.parse_expression()
+            self.expect_op(")")
+            return ("quantifier", word.lower(), name, source, where)
+
+        if word == "REDUCE" and self.is_op("(", offset=1):
+            self.advance()
+            self.advance()
+            accumulator = self.name()
+            self.expect_op("=")
+            initial = self.parse_expression()
+            self.expect_op(",")
+            name = self.name()
+            self.expect_keyword("IN")
+            source = self.parse_expression()
+            self.expect_op("|")
+            step = self.parse_expression()
+            self.expect_op(")")
+            return ("reduce", accumulator, initial, name, source, step)
+
+        # Function calls, possibly with a namespace, such as  toLower(...)  or  apoc.text.join(...)
+        offset = 1
+        while self.is_op(".", offset=offset) and self.peek(offset + 1)[0] == "name":
+            offset += 2
+        if self.is_op("(", offset=offset):
+            parts = [self.advance()[1]]
+            while self.accept_op("."):
+                parts.append(self.advance()[1])
+            self.expect_op("(")
+            name = ".".join(parts).lower()
+            if name == "count" and self.accept_op("*"):
+                self.expect_op(")")
+                return ("count_star",)
+            distinct = self.accept_keyword("DISTINCT")
+            return ("call", name, self.parse_arguments(), distinct)
+
+        return self.parse_variable()
+
+
+    def parse_variable(self) -> tuple:
+        if not self.is_name():
+            self.error("expected an expression")
+        expr = ("var", self.name())
+        if self.is_op("{"):
+            return self.parse_map_projection(expr)
+        return expr
+
+
+    def parse_arguments(self) -> list:
+        args = []
+        if not self.accept_op(")"):
+            args.append(self.parse_expression())
+            while self.accept_op(","):
+                args.append(self.parse_expression())
+            self.expect_op(")")
+        return args
+
+
+    def parse_list(self) -> tuple:
+        self.expect_op("[")
+
+        if self.is_name() and self.is_keyword("IN", offset=1):
+            # List comprehension:  [x IN list WHERE condition | expression]
+            name = self.name()
+            self.advance()
+            source = self.parse_expression()
+            where = self.parse_expression() if self.accept_keyword("WHERE") else None
+            projection = self.parse_expression() if self.accept_op("|") else None
+            self.expect_op("]")
+            return ("list_comprehension", name, source, where, projection)
+
+        def pattern_comprehension():
+            pattern = self.with_path_variable(self.parse_pattern(require_relationship=True))
+            where = self.parse_expression() if self.accept_keyword("WHERE") else None
+            self.expect_op("|")
+            projection = self.parse_expression()
+            self.expect_op("]")
+            return ("pattern_list", pattern, where, projection)
+
+        if self.is_op("(") or (self.is_name() and self.is_op("=", offset=1)):
+            expr = self.try_parse(pattern_comprehension)
+            if expr is not None:
+                return expr
+
+        elements = []
+        if not self.accept_op("]"):
+            elements.append(self.parse_expression())
+            while self.accept_op(","):
+                elements.append(self.parse_expression())
+            self.expect_op("]")
+        return ("list", elements)
+
+
+    def parse_map(self) -> tuple:
+        self.expect_op("{")
+        entries = []
+        if not self.accept_op("}"):
+            while True:
+                token = self.advance()
+                if token[0] not in ("name", "quoted", "string"):
+                    self.pos -= 1
+                    self.error("expected a map key")
+                self.expect_op(":")
+                entries.append((token[1], self.parse_expression()))
+                if not self.accept_op(","):
+                    break
+            self.expect_op("}")
+        return ("map", entries)
+
+
+    def parse_map_projection(self, base :tuple) -> tuple:
+        self.expect_op("{")
+        entries = []
+        if not self.accept_op("}"):
+            while True:
+                if self.accept_op("."):
+                    if self.accept_op("*"):
+                        entries.append(("all", None, None))
+                    else:
+                        entries.append(("property", self.name(), None))
+                else:
+                    key = self.name()
+                    if self.accept_op(":"):
+                        entries.append(("value", key, self.parse_expression()))
+                    else:
+                        entries.append(("var", key, None))
+                if not self.accept_op(","):
+                    break
+            self.expect_op("}")
+        return ("map_projection", base, entries)
+
+
+    def parse_case(self) -> tuple:
+        self.expect_keyword("CASE")
+        subject = None if self.is_keyword("WHEN") else self.parse_expression()
+        whens = []
+        while self.accept_keyword("WHEN"):
+            condition = self.parse_expression()
+            self.expect_keyword("THEN")
+            whens.append((condition, self.parse_expression()))
+        otherwise = self.parse_expression() if self.accept_keyword("ELSE") else None
+        self.expect_keyword("END")
+        return ("case", subject, whens, otherwise)
+
+
+    def try_parse(self, parse):
+        """
+        Attempt a speculative parse with the given function;  if it fails, restore the parser state and return None
+        """
+        (pos, anonymous) = (self.pos, self.anonymous)
+        try:
+            return parse()
+        except _Backtrack:
+            (self.pos, self.anonymous) = (pos, anonymous)
+            return None
+
+
+    def with_path_variable(self, pattern :dict) -> dict:
+        """
+        Make sure that the given pattern has a path variable (needed for the pattern expressions, which return paths)
+        """
+        if pattern["path"]:
+            return pattern
+        return {**pattern, "path": self.anonymous_name()}
+
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_query(q :str) -> dict:
+    """
+    Parse the given Cypher query (the results are cached, and must not be modified)
+
+    :param q:   A string with a Cypher query
+    :return:    A dict, with keys "parts" (a list of lists of clauses, one for each part of a UNION)
+                    and "union_all" (a list of booleans, one for each UNION)
+    """
+    try:
+        return _CypherParser(q).parse()
+    except _Backtrack as ex:
+        raise Exception(str(ex)) from None
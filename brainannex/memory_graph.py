@@ -0,0 +1,1479 @@
+import copy
+import itertools
+import threading
+import pandas as pd
+from brainannex.cypher_utils import CypherUtils, CypherBuilder  # Helper classes
+from brainannex.graph_access import GraphAccess
+from brainannex.memory_cypher import MemoryCypher
+
+
+'''
+    ----------------------------------------------------------------------------------
+	MIT License
+
+        Copyright (c) 2021-2026 Julian A. West and the BrainAnnex.org project.
+	----------------------------------------------------------------------------------
+'''
+
+
+class MemoryGraphAccess(GraphAccess):
+    """
+    Pure-python, in-memory graph store, with the same API as GraphAccess for node and link operations -
+    but NO database server involved.
+    Meant for unit tests, local benchmarking, and small embedded deployments.
+    All the data is lost when the object goes away.
+
+    To use it, simply instantiate this class in lieu of GraphAccess - or pass the host "memory" to GraphAccess:
+
+        db = MemoryGraphAccess()        # Same as:  db = GraphAccess(host="memory")
+        car_id = db.create_node("Car", {"vin": 123, "color": "white"})
+        db.get_nodes(db.match(labels="Car", key_name="vin", key_value=123))    # [{"vin": 123, "color": "white"}]
+
+    The store consists of nodes (with labels and properties) and directed relationships (with a name and properties),
+    plus an index of nodes by label, and optional indexes of nodes by (label, property) pairs,
+    created by create_index(), ensure_index() or create_constraint() - as done with a database.
+
+    The node and link methods are implemented directly on the store;  all the other methods
+    (incl. query(), update_query(), and the ones that GraphSchema uses) run their Cypher queries
+    on the in-memory interpreter of the MemoryCypher class - so that GraphSchema can be used as well:
+
+        GraphSchema.set_database(MemoryGraphAccess())
+
+    The queries are run by the same machinery of the base classes as with a database (incl. the query stats),
+    on the sessions and transactions handed out by a stand-in for the driver object (see MemoryDriver.)
+    Each query is atomic (if it fails, all its changes are reverted), and transaction() blocks are supported;
+    while a transaction is active, the other threads wait for it to end, before accessing the store.
+
+    LIMITATIONS:
+        - Only the subset of Cypher described in MemoryCypher is supported;  in particular, NO APOC
+        - The change log and the query cache aren't available
+        - Internal database ID's are non-negative integers, as in Neo4j
+        - Property values set by the node and link methods are stored as given;
+          the ones set by Cypher queries are converted as done by the Neo4j driver (e.g. Python datetimes to neo4j.time)
+    """
+
+    def __init__(self, host="memory", credentials=("memory", ""), apoc=False, debug=False, **kwargs):
+        """
+        No database connection is made, and no arguments are needed.
+        The arguments are the same as for GraphAccess (so that the in-memory store can be selected by its constructor),
+        but only `debug` and the ones about the query stats are used
+
+        :param debug:   [OPTIONAL] Flag indicating whether a debug mode is to be used
+        """
+        self._lock = threading.RLock()      # To protect all the data structures below
+
+        self._nodes = {}                    # Indexed by internal ID;  values are dicts with keys "labels" (a list)
+                                            #   and "props" (a dict).   EXAMPLE:  {0: {"labels": ["Car"], "props": {"vin": 123}}}
+        self._links = {}                    # Indexed by link ID;  values are dicts with keys "from", "to", "name", "props"
+        self._outbound = {}                 # Indexed by node ID;  values are sets of ID's of links that start at that node
+        self._inbound = {}                  # Indexed by node ID;  values are sets of ID's of links that end at that node
+        self._label_index = {}              # Indexed by label;  values are sets of node ID's with that label
+
+        self._indexes = {}                  # Indexed by index name;  values are dicts with keys "label", "key", "type", "unique"
+                                            #   EXAMPLE:  {"Car.vin": {"label": "Car", "key": "vin", "type": "RANGE", "unique": False}}
+        self._property_index = {}           # Indexed by pairs (label, key) that have at least one index;
+                                            #   values are dicts mapping property values to sets of node ID's
+
+        self._node_ids = itertools.count()  # Generators of internal ID's
+        self._link_ids = itertools.count()
+
+        kwargs.pop("autoconnect", None)     # The "connection" to the store is always made
+        kwargs.pop("read_replicas", None)   # The store has no replicas
+        super().__init__(host="memory", credentials=credentials or ("memory", ""), apoc=False, debug=debug, **kwargs)
+
+
+
+    def connect(self) -> None:
+        """
+        Same as the method in the base class;  the "driver" merely hands out sessions on the in-memory store
+        """
+        self.driver = MemoryDriver(self)
+
+
+    def test_dbase_connection(self) -> None:
+        pass        # The in-memory store is always available
+
+
+    def server_version(self) -> str:
+        return "memory"
+
+
+
+    def enable_cache(self, max_entries=1000, max_bytes=50_000_000, ttl=60) -> None:
+        """
+        The query cache relies on the writes going through Cypher queries (see GraphAccess.enable_cache()),
+        while most of the changes to the in-memory graph store are made without any Cypher query
+
+        :raise:     Exception, always
+        """
+        raise Exception("MemoryGraphAccess: the query cache is not supported by the in-memory graph store")
+
+
+
+    def enable_change_log(self, directory :str, max_segment_bytes=64_000_000, fsync=False):
+        """
+        The change log records the Cypher write queries sent to the database (see GraphAccess.enable_change_log()),
+        while most of the changes to the in-memory graph store are made without any Cypher query
+
+        :raise:     Exception, always
+        """
+        raise Exception("MemoryGraphAccess: the change log is not supported by the in-memory graph store")
+
+
+
+    def _snapshot(self) -> tuple:
+        """
+        Return a copy of all the data in the store (to revert to, if a transaction gets rolled back)
+
+        :return:    A tuple, to pass to _restore()
+        """
+        with self._lock:
+            return copy.deepcopy((self._nodes, self._links, self._outbound, self._inbound,
+                                  self._label_index, self._indexes, self._property_index))
+
+
+    def _restore(self, snapshot :tuple) -> None:
+        """
+        Replace all the data in the store with the given copy, as returned by _snapshot()
+
+        :return:    None
+        """
+        with self._lock:
+            (self._nodes, self._links, self._outbound, self._inbound,
+             self._label_index, self._indexes, self._property_index) = snapshot
+
+
+
+    def empty_dbase(self, keep_labels=None, drop_indexes=False, drop_constraints=False,
+                    batch_size=None, pause=0, report=False) -> None:
+        """
+        Same as GraphAccess.empty_dbase()   (the arguments `batch_size`, `pause` and `report` are ignored)
+        """
+        self.delete_nodes_by_label(keep_labels=keep_labels)
+
+        if drop_indexes:
+            self.drop_all_indexes(including_constraints=drop_constraints)
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                    ~   INTERNAL HELPERS   ~                                      '''
+
+    def ________INTERNAL_HELPERS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    @staticmethod
+    def _as_list(labels) -> [str]:
+        """
+        Turn None, a string, or a list/tuple of strings, into a (possibly empty) list of strings
+        """
+        if labels is None:
+            return []
+        if type(labels) == str:
+            return [labels] if labels else []
+        return list(labels)
+
+
+    @staticmethod
+    def _index_key(value):
+        """
+        Return a hashable version of the given property value, for use in the property indexes
+        (lists, which are allowed as property values, become tuples)
+        """
+        if type(value) == list:
+            return tuple(value)
+        return value
+
+
+
+    def _find_nodes(self, match :int|str|CypherBuilder, caller_method=None) -> [int]:
+        """
+        Locate the nodes specified by the given match data
+
+        :param match:           EITHER an integer with an internal database node id,
+                                    OR a "CypherBuilder" object, as returned by match()
+        :param caller_method:   [OPTIONAL] Name of the calling method, for error messages
+        :return:                A (possibly empty) list of internal node ID's, in order of creation
+        """
+        spec = CypherUtils.process_match_structure(match, caller_method=caller_method)
+
+        if spec.internal_id is not None:
+            internal_id = int(spec.internal_id) if str(spec.internal_id).isdigit() else spec.internal_id
+            return [internal_id] if internal_id in self._nodes else []
+
+        if spec.clause:
+            # Let the Cypher interpreter deal with the clause
+            (node, where, data_binding, dummy_node_name) = spec.unpack_match()
+            q = f"MATCH {node} {CypherUtils.prepare_where(where)} RETURN id({dummy_node_name}) AS internal_id"
+            return sorted(row["internal_id"] for row in self._execute(q, data_binding, fetch=lambda result: result.data()))
+
+        labels = self._as_list(spec.labels)
+        properties = dict(spec.properties)
+        if spec.key_name is not None:
+            properties[spec.key_name] = spec.key_value
+
+        return self._matching_nodes(labels, properties)
+
+
+
+    def _matching_nodes(self, labels :[str], properties :dict) -> [int]:
+        """
+        Locate the nodes that have all the given labels and properties
+
+        :param labels:      A (possibly empty) list of labels
+        :param properties:  A (possibly empty) dict of property values
+        :return:            A (possibly empty) list of internal node ID's, in order of creation
+        """
+        # Start from the smallest available set of candidates
+        candidates = None
+        for label in labels:
+            for key, value in properties.items():
+                value_index = self._property_index.get((label, key))
+                if value_index is not None:
+                    found = value_index.get(self._index_key(value), set())
+                    if candidates is None or len(found) < len(candidates):
+                        candidates = found
+            found = self._label_index.get(label, set())
+            if candidates is None or len(found) < len(candidates):
+                candidates = found
+
+        if candidates is None:
+            candidates = self._nodes.keys()     # No labels were given: all nodes are candidates
+
+        result = []
+        for internal_id in candidates:
+            node = self._nodes[internal_id]
+            if all(label in node["labels"] for label in labels) \
+                    and all(node["props"].get(key) == value for key, value in properties.items()):
+                result.append(internal_id)
+
+        return sorted(result)
+
+
+
+    def _node_record(self, internal_id :int, return_internal_id=False, return_labels=False) -> dict:
+        """
+        Return a new dict with the properties of the given node,
+        optionally also including the special fields "_internal_id" and "_node_labels"
+        """
+        node = self._nodes[internal_id]
+        record = dict(node["props"])
+        if return_internal_id:
+            record["_internal_id"] = internal_id
+        if return_labels:
+            record["_node_labels"] = list(node["labels"])
+
+        return record
+
+
+
+    def _index_node(self, internal_id :int, labels=None, keys=None, remove=False) -> None:
+        """
+        Add the given node to (or remove it from) the property indexes, for all of its labels and properties;
+        optionally, restricted to the given labels and/or keys
+
+        :param internal_id: The internal ID of an existing node
+        :param labels:      [OPTIONAL] List of labels to restrict the operation to
+        :param keys:        [OPTIONAL] List of property names to restrict the operation to
+        :param remove:      [OPTIONAL] If True, remove from the indexes rather than adding
+        :return:            None
+        """
+        node = self._nodes[internal_id]
+        for label in (node["labels"] if labels is None else labels):
+            for key in (node["props"] if keys is None else keys):
+                value_index = self._property_index.get((label, key))
+                if (value_index is None) or (key not in node["props"]):
+                    continue
+                value = self._index_key(node["props"][key])
+                if remove:
+                    value_index.get(value, set()).discard(internal_id)
+                else:
+                    value_index.setdefault(value, set()).add(internal_id)
+
+
+
+    def _check_unique(self, internal_id :int, props :dict) -> None:
+        """
+        Raise an Exception if setting the given properties on the given node (possibly not yet stored)
+        would violate a uniqueness constraint
+        """
+        labels = self._nodes[internal_id]["labels"] if internal_id in self._nodes else []
+        self._check_unique_for_labels(internal_id, labels, props)
+
+
+    def _check_unique_for_labels(self, internal_id, labels :[str], props :dict) -> None:
+        for index in self._indexes.values():
+            if index["unique"] and index["label"] in labels and props.get(index["key"]) is not None:
+                others = self._property_index[(index["label"], index["key"])].get(self._index_key(props[index["key"]]), set())
+                if others - {internal_id}:
+                    raise Exception(f"MemoryGraphAccess: node already exists with label `{index['label']}` "
+                                    f"and property `{index['key']}` = {props[index['key']]}")
+
+
+
+    def _add_node(self, labels, properties, internal_id=None) -> int:
+        """
+        Create a new node, and return its internal ID.  Properties with None values are dropped
+
+        :param labels:      A string, or list/tuple of strings
+        :param properties:  A dict, or None
+        :param internal_id: [OPTIONAL] The ID to give to the node (used to restore deleted nodes);
+                                by default, a new one is generated
+        :return:            The internal ID of the new node
+        """
+        labels = list(dict.fromkeys(self._as_list(labels)))
+        props = {k: v for k, v in (properties or {}).items() if v is not None}
+
+        self._check_unique_for_labels(None, labels, props)
+
+        if internal_id is None:
+            internal_id = next(self._node_ids)
+        self._nodes[internal_id] = {"labels": labels, "props": props}
+        self._outbound[internal_id] = set()
+        self._inbound[internal_id] = set()
+        for label in labels:
+            self._label_index.setdefault(label, set()).add(internal_id)
+        self._index_node(internal_id)
+
+        return internal_id
+
+
+
+    def _remove_node(self, internal_id :int) -> None:
+        """
+        Delete the given node, and all of its links (i.e. a "DETACH DELETE")
+        """
+        for link_id in list(self._outbound[internal_id] | self._inbound[internal_id]):
+            self._remove_link(link_id)
+
+        self._index_node(internal_id, remove=True)
+        for label in self._nodes[internal_id]["labels"]:
+            self._label_index[label].discard(internal_id)
+            if not self._label_index[label]:
+                del self._label_index[label]
+
+        del self._outbound[internal_id]
+        del self._inbound[internal_id]
+        del self._nodes[internal_id]
+
+
+
+    def _find_links(self, from_id :int, to_id :int, rel_name=None) -> [int]:
+        """
+        Return a list of the ID's of the links from the first to the second node, optionally with the given name
+        """
+        return [link_id for link_id in self._outbound[from_id]
+                if self._links[link_id]["to"] == to_id and (not rel_name or self._links[link_id]["name"] == rel_name)]
+
+
+
+    def _merge_link(self, from_id :int, to_id :int, rel_name :str, rel_props=None) -> bool:
+        """
+        Add a link (with the given properties) between the given nodes, unless already present - as done by a Cypher MERGE
+
+        :return:    True if a new link was created, or False otherwise
+        """
+        rel_props = {k: v for k, v in (rel_props or {}).items() if v is not None}
+        for link_id in self._find_links(from_id, to_id, rel_name):
+            if all(self._links[link_id]["props"].get(k) == v for k, v in rel_props.items()):
+                return False        # Already present
+
+        self._add_link(from_id, to_id, rel_name, rel_props)
+        return True
+
+
+
+    def _add_link(self, from_id :int, to_id :int, rel_name :str, rel_props :dict, link_id=None) -> int:
+        """
+        Add a link (with the given properties) between the given nodes - as done by a Cypher CREATE
+
+        :param link_id: [OPTIONAL] The ID to give to the link (used to restore deleted links);
+                            by default, a new one is generated
+        :return:        The ID of the new link
+        """
+        if link_id is None:
+            link_id = next(self._link_ids)
+        self._links[link_id] = {"from": from_id, "to": to_id, "name": rel_name, "props": dict(rel_props)}
+        self._outbound[from_id].add(link_id)
+        self._inbound[to_id].add(link_id)
+        return link_id
+
+
+
+    def _remove_link(self, link_id :int) -> None:
+        link = self._links.pop(link_id)
+        self._outbound[link["from"]].discard(link_id)
+        self._inbound[link["to"]].discard(link_id)
+
+
+
+    def _set_node_property(self, internal_id :int, key :str, value) -> None:
+        """
+        Set the given property of the given node, keeping the property indexes up to date;
+        a None value removes the property
+        """
+        props = self._nodes[internal_id]["props"]
+        if value is not None:
+            self._check_unique(internal_id, {key: value})
+
+        self._index_node(internal_id, keys=[key], remove=True)
+        if value is None:
+            props.pop(key, None)
+        else:
+            props[key] = value
+        self._index_node(internal_id, keys=[key])
+
+
+
+    def _add_label(self, internal_id :int, label :str) -> bool:
+        """
+        Add the given label to the given node, unless already present
+
+        :return:    True if the label was added, or False otherwise
+        """
+        node = self._nodes[internal_id]
+        if label in node["labels"]:
+            return False
+
+        self._check_unique_for_labels(internal_id, [label], node["props"])
+        node["labels"].append(label)
+        self._label_index.setdefault(label, set()).add(internal_id)
+        self._index_node(internal_id, labels=[label])
+        return True
+
+
+
+    def _remove_label(self, internal_id :int, label :str) -> bool:
+        """
+        Remove the given label from the given node, if present
+
+        :return:    True if the label was removed, or False otherwise
+        """
+        node = self._nodes[internal_id]
+        if label not in node["labels"]:
+            return False
+
+        self._index_node(internal_id, labels=[label], remove=True)
+        node["labels"].remove(label)
+        self._label_index[label].discard(internal_id)
+        if not self._label_index[label]:
+            del self._label_index[label]
+        return True
+
+
+
+    def _neighbors(self, internal_id :int, rel_name=None, rel_dir="OUT") -> [tuple]:
+        """
+        Return a list of pairs (link ID, neighbor node ID) for all the links of the given node,
+        optionally restricted to the given name, in the given direction(s): "OUT", "IN" or "BOTH"
+        """
+        result = []
+        if rel_dir in ("OUT", "BOTH"):
+            result += [(link_id, self._links[link_id]["to"]) for link_id in sorted(self._outbound[internal_id])
+                       if not rel_name or self._links[link_id]["name"] == rel_name]
+        if rel_dir in ("IN", "BOTH"):
+            result += [(link_id, self._links[link_id]["from"]) for link_id in sorted(self._inbound[internal_id])
+                       if not rel_name or self._links[link_id]["name"] == rel_name]
+        return result
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   RETRIEVE DATA   ~                                          '''
+
+    def ________RETRIEVE_DATA________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def get_nodes(self, match :int|str|CypherBuilder,
+                  return_internal_id=False, return_labels=False, order_by=None, limit=None,
+                  single_row=False, single_cell=""):
+        """
+        Same as GraphAccess.get_nodes()
+        """
+        with self._lock:
+            node_ids = self._find_nodes(match, caller_method="get_nodes")
+
+            if order_by:
+                # As in Cypher, nodes lacking the property go last
+                node_ids.sort(key=lambda i: (order_by not in self._nodes[i]["props"], self._nodes[i]["props"].get(order_by, 0)))
+
+            if limit:
+                node_ids = node_ids[:limit]
+
+            result_list = [self._node_record(i, return_internal_id=return_internal_id, return_labels=return_labels)
+                           for i in node_ids]
+
+        if len(result_list) == 0:
+            if single_row or single_cell:
+                return None
+            return []
+
+        if single_row:
+            return result_list[0]
+
+        if single_cell:
+            return result_list[0].get(single_cell)
+
+        return result_list
+
+
+
+    def get_nodes_iter(self, match :int|str|CypherBuilder,
+                       return_internal_id=False, return_labels=False, order_by=None, limit=None,
+                       chunk_size=None, fetch_size=None):
+        """
+        Same as GraphAccess.get_nodes_iter() ; the `fetch_size` argument is ignored
+        """
+        result_list = self.get_nodes(match, return_internal_id=return_internal_id, return_labels=return_labels,
+                                     order_by=order_by, limit=limit)
+        if chunk_size is None:
+            yield from result_list
+        else:
+            yield from self._chunked(result_list, chunk_size)
+
+
+
+    def get_df(self, match :int|str|CypherBuilder, order_by=None, limit=None) -> pd.DataFrame:
+        """
+        Same as GraphAccess.get_df()
+        """
+        records = self.get_nodes(match, order_by=order_by, limit=limit)
+
+        names = {}      # Used as an ordered set
+        for record in records:
+            names.update(dict.fromkeys(record))
+
+        return self.columns_to_df({name: [record.get(name) for record in records] for name in names})
+
+
+
+    def get_recordset(self, id_list :[int|str]) -> [dict]:
+        """
+        Same as GraphAccess.get_recordset()
+        """
+        assert type(id_list) == list, \
+            f"prepare_recordset(): argument `id_list` must be a list; it is of type {type(id_list)}"
+
+        with self._lock:
+            return [self._node_record(i, return_internal_id=True, return_labels=True)
+                    for i in id_list if i in self._nodes]
+
+
+
+    def get_node_internal_id(self, match :CypherBuilder) -> int|str:
+        """
+        Same as GraphAccess.get_node_internal_id()
+        """
+        with self._lock:
+            result = self._find_nodes(match, caller_method="get_node_internal_id")
+
+        assert len(result) != 0, "get_node_internal_id(): node NOT found"
+
+        assert len(result) <= 1, f"get_node_internal_id(): node NOT uniquely identified ({len(result)} matches found)"
+
+        return result[0]
+
+
+
+    def exists_by_internal_id(self, internal_id) -> bool:
+        """
+        Same as GraphAccess.exists_by_internal_id()
+        """
+        return internal_id in self._nodes
+
+
+
+    def count_nodes(self, labels=None) -> int:
+        """
+        Same as GraphAccess.count_nodes()
+        """
+        with self._lock:
+            return len(self._find_nodes(self.match(labels=labels or None), caller_method="count_nodes"))
+
+
+
+    def get_node_labels(self, internal_id :int|str) -> [str]:
+        """
+        Same as GraphAccess.get_node_labels()
+        """
+        CypherUtils.assert_valid_internal_id(internal_id)
+
+        node = self._nodes.get(internal_id)
+        return None if node is None else list(node["labels"])
+
+
+
+    def get_labels(self) -> [str]:
+        """
+        Return a list of ALL the labels present in the store, in no particular order
+
+        :return:    A list of strings
+        """
+        return list(self._label_index)
+
+
+
+    def get_label_properties(self, label :str) -> list:
+        """
+        Same as InterGraph.get_label_properties()
+        """
+        with self._lock:
+            keys = {key for i in self._label_index.get(label, set()) for key in self._nodes[i]["props"]}
+
+        return sorted(keys)
+
+
+
+    def find_first_duplicate(self, labels :str, property_name :str) -> dict|None:
+        """
+        Same as GraphAccess.find_first_duplicate()
+        """
+        assert type(labels) == str, \
+            f"find_first_duplicate(): argument `labels` must be (for now) a string, not a {type(labels)}"
+
+        with self._lock:
+            first_seen = {}     # Map of property values to the ID of the first node with that value
+            for internal_id in sorted(self._label_index.get(labels, set())):
+                value = self._nodes[internal_id]["props"].get(property_name)
+                if value is None:
+                    continue
+                if self._index_key(value) in first_seen:
+                    return {"FIRST_INTERNAL_ID": first_seen[self._index_key(value)], "SECOND_INTERNAL_ID": internal_id,
+                            property_name: value}
+                first_seen[self._index_key(value)] = internal_id
+
+        return None
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                 ~   CREATE NODES   ~                                          '''
+
+    def ________CREATE_NODES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def create_node(self, labels :str|list|tuple, properties=None) -> int|str:
+        """
+        Same as GraphAccess.create_node()
+        """
+        with self._lock:
+            return self._add_node(labels, properties)
+
+
+
+    def merge_node(self, labels, properties=None) -> dict:
+        """
+        Same as GraphAccess.merge_node()
+        """
+        with self._lock:
+            existing = self._find_nodes(self.match(labels=labels or None, properties=properties or {}),
+                                        caller_method="merge_node")
+            if existing:
+                return {"created": False, "_internal_id": existing[0]}
+
+            return {"created": True, "_internal_id": self._add_node(labels, properties)}
+
+
+
+    def create_node_with_links(self, labels :str|list|tuple, properties=None, links=None, merge=False) -> int|str:
+        """
+        Same as GraphAccess.create_node_with_links()
+        """
+        assert properties is None or type(properties) == dict, \
+            f"MemoryGraphAccess.create_node_with_links(): The argument `properties` must be a dictionary or None; instead, it's of type {type(properties)}"
+
+        assert links is None or type(links) == list, \
+            f"MemoryGraphAccess.create_node_with_links(): The argument `links` must be a list or None; instead, it's of type {type(links)}"
+
+        links = links or []
+
+        with self._lock:
+            # Verify all the links, before creating anything
+            for edge in links:
+                if edge.get("internal_id") is None:    # Caution: it might be zero
+                    raise Exception(f"MemoryGraphAccess.create_node_with_links(): Missing 'internal_id' key for the node to link to (in list element {edge})")
+                if not edge.get("rel_name"):
+                    raise Exception(f"MemoryGraphAccess.create_node_with_links(): Missing name ('rel_name' key) for the new relationship (in list element {edge})")
+                if edge["internal_id"] not in self._nodes:
+                    raise Exception("MemoryGraphAccess.create_node_with_links(): failed to create the new node "
+                                    "(check whether the requested link-to nodes exist)")
+
+            if merge:
+                internal_id = self.merge_node(labels, properties)["_internal_id"]
+            else:
+                internal_id = self._add_node(labels, properties)
+
+            number_links_created = 0
+            for edge in links:
+                if edge.get("rel_dir", "OUT") == "OUT":
+                    number_links_created += self._merge_link(internal_id, edge["internal_id"], edge["rel_name"], edge.get("rel_attrs"))
+                else:
+                    number_links_created += self._merge_link(edge["internal_id"], internal_id, edge["rel_name"], edge.get("rel_attrs"))
+
+        if number_links_created != len(links):
+            raise Exception(f"MemoryGraphAccess.create_node_with_links(): failed to create all the {len(links)} requested relationships")
+
+        return internal_id
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   DELETE NODES   ~                                     '''
+
+    def ________DELETE_NODES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def delete_nodes(self, match :int|str|CypherBuilder, batch_size=None, pause=0, report=False) -> int:
+        """
+        Same as GraphAccess.delete_nodes()   (the arguments `batch_size`, `pause` and `report` are ignored)
+        """
+        with self._lock:
+            node_ids = self._find_nodes(match, caller_method="delete_nodes")
+            for internal_id in node_ids:
+                self._remove_node(internal_id)
+
+        return len(node_ids)
+
+
+
+    def delete_nodes_by_label(self, delete_labels=None, keep_labels=None, batch_size=None, pause=0, report=False) -> None:
+        """
+        Same as InterGraph.delete_nodes_by_label()   (the arguments `batch_size`, `pause` and `report` are ignored)
+        """
+        keep_labels = self._as_list(keep_labels)
+
+        with self._lock:
+            if delete_labels is None:
+                delete_labels = list(self._label_index)
+                if not keep_labels:
+                    # Everything goes, including the nodes without labels
+                    for internal_id in list(self._nodes):
+                        self._remove_node(internal_id)
+                    return
+
+            for label in self._as_list(delete_labels):
+                if label not in keep_labels:
+                    for internal_id in list(self._label_index.get(label, set())):
+                        self._remove_node(internal_id)
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   MODIFY FIELDS   ~                                          '''
+
+    def ________MODIFY_FIELDS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def set_fields(self, match :int|str|CypherBuilder, set_dict: dict, drop_blanks=True) -> int:
+        """
+        Same as GraphAccess.set_fields()
+        """
+        if set_dict == {}:
+            return 0             # There's nothing to do
+
+        # Determine the values to set, and the fields to drop; as done by GraphAccess._set_fields_query()
+        to_set = {}
+        to_drop = []
+        for field_name, field_value in set_dict.items():
+            if type(field_value) == str:
+                field_value = field_value.strip()               # Zap all leading and trailing blanks
+            if ((field_value == "") and drop_blanks) or (field_value is None):
+                to_drop.append(field_name)
+            else:
+                to_set[field_name] = field_value
+
+        number_properties_set = 0
+        with self._lock:
+            for internal_id in self._find_nodes(match, caller_method="set_fields"):
+                props = self._nodes[internal_id]["props"]
+                self._check_unique(internal_id, to_set)
+
+                changed_keys = list(to_set) + [key for key in to_drop if key in props]
+                self._index_node(internal_id, keys=changed_keys, remove=True)
+
+                props.update(to_set)
+                number_properties_set += len(changed_keys)
+                for key in to_drop:
+                    props.pop(key, None)
+
+                self._index_node(internal_id, keys=changed_keys)
+
+        return number_properties_set
+
+
+
+    def set_fields_many(self, updates :dict|pd.DataFrame, labels=None, key_name=None, drop_blanks=True,
+                        batch_size=10000, report=False) -> dict:
+        """
+        Same as GraphAccess.set_fields_many()   (the arguments `batch_size` and `report` are ignored)
+        """
+        number_rows = 0
+        nodes_updated = 0
+        properties_set = 0
+        with self._lock:
+            for row in self._set_fields_many_rows(updates, key_name=key_name, drop_blanks=False):
+                number_rows += 1
+                if key_name is None:
+                    if (row["key"] not in self._nodes) or \
+                            not all(label in self._nodes[row["key"]]["labels"] for label in self._as_list(labels)):
+                        continue
+                    match = row["key"]
+                else:
+                    match = self.match(labels=labels, key_name=key_name, key_value=row["key"])
+
+                nodes_updated += len(self._find_nodes(match, caller_method="set_fields_many"))
+                properties_set += self.set_fields(match, set_dict=row["props"], drop_blanks=drop_blanks)
+
+        return {"rows": number_rows, "nodes_updated": nodes_updated, "properties_set": properties_set}
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                    ~   RELATIONSHIPS   ~                                      '''
+
+    def ________RELATIONSHIPS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def get_relationship_types(self) -> [str]:
+        """
+        Same as GraphAccess.get_relationship_types()
+        """
+        with self._lock:
+            return list({link["name"] for link in self._links.values()})
+
+
+
+    def add_links(self, match_from :int|str|CypherBuilder, match_to :int|str|CypherBuilder,
+                  rel_name :str) -> int:
+        """
+        Same as GraphAccess.add_links()
+        """
+        with self._lock:
+            from_ids = self._find_nodes(match_from, caller_method="add_links")
+            to_ids = self._find_nodes(match_to, caller_method="add_links")
+
+            number_relationships_added = sum(self._merge_link(from_id, to_id, rel_name)
+                                             for from_id in from_ids for to_id in to_ids)
+
+        if number_relationships_added == 0:
+            raise Exception(f"add_links(): the requested relationship ({rel_name}) was NOT added")
+
+        return number_relationships_added
+
+
+
+    def add_links_fast(self, match_from :int|str, match_to :int|str, rel_name :str, rel_props=None) -> int:
+        """
+        Same as GraphAccess.add_links_fast()
+        """
+        with self._lock:
+            if (match_from not in self._nodes) or (match_to not in self._nodes) \
+                    or not self._merge_link(match_from, match_to, rel_name, rel_props):
+                raise Exception(f"add_links_fast(): the requested relationship ({rel_name}) was NOT added")
+
+        return 1
+
+
+
+    def link_nodes_by_ids(self, node_id1:int, node_id2:int, rel:str, rel_props = None) -> None:
+        """
+        Same as GraphAccess.link_nodes_by_ids()
+        """
+        with self._lock:
+            if (node_id1 in self._nodes) and (node_id2 in self._nodes):
+                self._merge_link(node_id1, node_id2, rel, rel_props)
+
+
+
+    def remove_links(self, match_from :int|str|CypherBuilder, match_to :int|str|CypherBuilder, rel_name) -> int:
+        """
+        Same as GraphAccess.remove_links()
+        """
+        with self._lock:
+            from_ids = self._find_nodes(match_from, caller_method="remove_links")
+            to_ids = set(self._find_nodes(match_to, caller_method="remove_links"))
+
+            link_ids = [link_id for from_id in from_ids for link_id in list(self._outbound[from_id])
+                        if self._links[link_id]["to"] in to_ids and (not rel_name or self._links[link_id]["name"] == rel_name)]
+            for link_id in link_ids:
+                self._remove_link(link_id)
+
+        if len(link_ids) == 0:
+            raise Exception(f"remove_links(): no relationship named `{rel_name}` could be deleted")
+
+        return len(link_ids)
+
+
+
+    def number_of_links(self, match_from :int|str|CypherBuilder, match_to :int|str|CypherBuilder, rel_name :str) -> int:
+        """
+        Same as GraphAccess.number_of_links()
+        """
+        with self._lock:
+            from_ids = self._find_nodes(match_from, caller_method="number_of_links")
+            to_ids = self._find_nodes(match_to, caller_method="number_of_links")
+
+            return sum(len(self._find_links(from_id, to_id, rel_name)) for from_id in from_ids for to_id in to_ids)
+
+
+
+    def reattach_node(self, node :int|str, old_attachment :int|str, new_attachment :int|str,
+                      rel_name:str, rel_name_new=None) -> None:
+        """
+        Same as GraphAccess.reattach_node()
+        """
+        if rel_name_new is None:
+            rel_name_new = rel_name     # Use the default value, if not provided
+
+        with self._lock:
+            assert new_attachment in self._nodes, \
+                "reattach_node(): failed to delete the old relationship (" \
+                "probably means it doesn't exist, or the other node doesn't exist; check if they all exist)"
+
+            old_links = self._find_links(node, old_attachment, rel_name) if node in self._nodes else []
+            assert len(old_links) == 1, \
+                "reattach_node(): failed to delete the old relationship (" \
+                "probably means it doesn't exist, or the other node doesn't exist; check if they all exist)"
+
+            self._remove_link(old_links[0])
+            assert self._merge_link(node, new_attachment, rel_name_new), \
+                "reattach_node(): it deleted the old relationship but failed to create a new one"
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                    ~   FOLLOW LINKS   ~                                        '''
+
+    def ________FOLLOW_LINKS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def follow_links(self, match :int|str|CypherBuilder, rel_name :str, rel_dir ="OUT",
+                     neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> [dict]:
+        """
+        Same as GraphAccess.follow_links()
+        """
+        if limit is not None:
+            assert (type(limit) == int) and (limit >= 1), \
+                f"follow_links(): the argument `limit`, if passed, must be an integer >= 1 (value passed: {limit})"
+
+        neighbor_labels = self._as_list(neighbor_labels)
+
+        with self._lock:
+            result = []
+            for internal_id in self._find_nodes(match, caller_method="follow_links"):
+                for (_, neighbor_id) in self._neighbors(internal_id, rel_name, rel_dir):
+                    if all(label in self._nodes[neighbor_id]["labels"] for label in neighbor_labels):
+                        result.append(self._node_record(neighbor_id, return_internal_id=include_id,
+                                                        return_labels=include_labels))
+
+        if limit is not None:
+            result = result[:limit]
+
+        return self.standardize_recordset(recordset=result, already_flat=True)
+
+
+
+    def follow_links_many(self, internal_ids :[int|str], rel_name :str, rel_dir ="OUT",
+                          neighbor_labels=None, include_id=False, include_labels=False, limit=100) -> dict:
+        """
+        Same as GraphAccess.follow_links_many()
+        """
+        assert type(internal_ids) == list, \
+            f"follow_links_many(): the argument `internal_ids` must be a list (type passed: {type(internal_ids)})"
+
+        with self._lock:
+            return {given_id: self.follow_links(internal_id, rel_name=rel_name, rel_dir=rel_dir,
+                                                neighbor_labels=neighbor_labels, include_id=include_id,
+                                                include_labels=include_labels, limit=limit)
+                                if internal_id in self._nodes else []
+                    for (internal_id, given_id) in zip(self._normalize_internal_ids(internal_ids), internal_ids)}
+
+
+
+    def count_links(self, match :int|CypherBuilder, rel_name: str, rel_dir="OUT", neighbor_labels = None) -> int:
+        """
+        Same as GraphAccess.count_links()
+        """
+        if rel_dir not in ("IN", "OUT", "BOTH"):
+            raise Exception(f"count_links(): argument `rel_dir` must be one of: 'IN', 'OUT', 'BOTH'; value passed was `{rel_dir}`")
+
+        neighbor_labels = self._as_list(neighbor_labels)
+
+        with self._lock:
+            return sum(1 for internal_id in self._find_nodes(match, caller_method="count_links")
+                         for (_, neighbor_id) in self._neighbors(internal_id, rel_name, rel_dir)
+                         if all(label in self._nodes[neighbor_id]["labels"] for label in neighbor_labels))
+
+
+
+    def get_link_summary(self, internal_id :str|int, omit_names = None) -> dict:
+        """
+        Same as GraphAccess.get_link_summary()
+        """
+        if omit_names:
+            assert type(omit_names) == list, "If the `omit_names` argument is specified, it MUST be a LIST"
+        else:
+            omit_names = []
+
+        summary = {}
+        with self._lock:
+            for (direction, link_ids) in (("in", self._inbound[internal_id]), ("out", self._outbound[internal_id])):
+                counts = {}
+                for link_id in sorted(link_ids):
+                    name = self._links[link_id]["name"]
+                    if name not in omit_names:
+                        counts[name] = counts.get(name, 0) + 1
+                summary[direction] = list(counts.items())
+
+        return summary
+
+
+
+    def get_parents_and_children(self, internal_id :str|int) -> ():
+        """
+        Same as GraphAccess.get_parents_and_children()
+        """
+        with self._lock:
+            parent_list = [{"_internal_id": neighbor_id, "labels": list(self._nodes[neighbor_id]["labels"]),
+                            "rel": self._links[link_id]["name"]}
+                           for (link_id, neighbor_id) in self._neighbors(internal_id, rel_dir="IN")]
+
+            child_list = [{"_internal_id": neighbor_id, "labels": list(self._nodes[neighbor_id]["labels"]),
+                           "rel": self._links[link_id]["name"]}
+                          for (link_id, neighbor_id) in self._neighbors(internal_id, rel_dir="OUT")]
+
+        return (parent_list, child_list)
+
+
+
+    def get_parents_and_children_many(self, internal_ids :[int|str]) -> dict:
+        """
+        Same as GraphAccess.get_parents_and_children_many()
+        """
+        assert type(internal_ids) == list, \
+            f"get_parents_and_children_many(): the argument `internal_ids` must be a list (type passed: {type(internal_ids)})"
+
+        with self._lock:
+            return {given_id: self.get_parents_and_children(internal_id) if internal_id in self._nodes else ([], [])
+                    for (internal_id, given_id) in zip(self._normalize_internal_ids(internal_ids), internal_ids)}
+
+
+
+    def get_siblings(self, internal_id :str|int, rel_name: str, rel_dir="OUT", order_by=None) -> [int]:
+        """
+        Same as GraphAccess.get_siblings()
+        """
+        CypherUtils.assert_valid_internal_id(internal_id)
+
+        assert type(rel_name) == str, \
+            f"get_siblings(): argument `rel_name` must be a string; " \
+            f"the given value ({rel_name}) is of type {type(rel_name)}"
+
+        if rel_dir not in ("IN", "OUT"):
+            raise Exception(f"get_siblings(): unknown value for the `rel_dir` argument ({rel_dir}); "
+                            f"allowed values are 'IN' and 'OUT'")
+
+        reverse_dir = "IN" if rel_dir == "OUT" else "OUT"
+
+        with self._lock:
+            sibling_ids = {sibling_id for (_, parent_id) in self._neighbors(internal_id, rel_name, rel_dir)
+                                      for (_, sibling_id) in self._neighbors(parent_id, rel_name, reverse_dir)
+                                      if sibling_id != internal_id}
+            sibling_ids = sorted(sibling_ids)
+            if order_by:
+                sibling_ids.sort(key=lambda i: str(self._nodes[i]["props"].get(order_by, "")).lower())
+
+            return [self._node_record(i, return_internal_id=True, return_labels=True) for i in sibling_ids]
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                      ~   INDEXES   ~                                          '''
+
+    def ________INDEXES________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def _add_index(self, name :str, label :str, key :str, index_type="RANGE", unique=False) -> bool:
+        """
+        Register a new index, and populate the property index for its label and key (if not already present)
+
+        :return:    True if a new index was added, or False if an index by that name already exists
+        """
+        if name in self._indexes:
+            return False
+
+        if (label, key) not in self._property_index:
+            value_index = {}
+            for internal_id in self._label_index.get(label, set()):
+                props = self._nodes[internal_id]["props"]
+                if key in props:
+                    value_index.setdefault(self._index_key(props[key]), set()).add(internal_id)
+            if unique and any(len(ids) > 1 for ids in value_index.values()):
+                return False        # The existing data violates the constraint
+            self._property_index[(label, key)] = value_index
+
+        self._indexes[name] = {"label": label, "key": key, "type": index_type, "unique": unique}
+        return True
+
+
+
+    def _remove_index(self, name :str) -> bool:
+        index = self._indexes.pop(name, None)
+        if index is None:
+            return False
+
+        if not any((i["label"], i["key"]) == (index["label"], index["key"]) for i in self._indexes.values()):
+            del self._property_index[(index["label"], index["key"])]    # The last index on that label and key is gone
+        return True
+
+
+
+    def get_indexes(self) -> pd.DataFrame:
+        """
+        Same as InterGraph.get_indexes()
+        """
+        with self._lock:
+            rows = [{"name": name, "labelsOrTypes": [index["label"]], "properties": [index["key"]],
+                     "entityType": "NODE", "type": index["type"]}
+                    for name, index in self._indexes.items()]
+
+        if len(rows) > 0:
+            return pd.DataFrame(rows)
+        else:
+            return pd.DataFrame([], columns=['name'])
+
+
+
+    def create_index(self, label :str, key :str) -> bool:
+        """
+        Same as InterGraph.create_index()
+        """
+        with self._lock:
+            if any((i["label"], i["key"]) == (label, key) for i in self._indexes.values()):
+                return False
+
+            return self._add_index(f"{label}.{key}", label, key)
+
+
+
+    def drop_index(self, name :str) -> bool:
+        """
+        Same as InterGraph.drop_index()
+        """
+        with self._lock:
+            if self._indexes.get(name, {}).get("unique"):
+                return False    # The indexes of constraints can only be dropped together with their constraints
+
+            return self._remove_index(name)
+
+
+
+    def drop_all_indexes(self, including_constraints=True) -> None:
+        """
+        Same as InterGraph.drop_all_indexes()
+        """
+        with self._lock:
+            for name, index in list(self._indexes.items()):
+                if including_constraints or not index["unique"]:
+                    self._remove_index(name)
+
+
+
+    def ensure_indexes(self, specs :[tuple], wait=True, timeout=300) -> int:
+        """
+        Same as InterGraph.ensure_indexes() ; there's never a need to wait for the indexes to be populated
+        """
+        created = 0
+        with self._lock:
+            for spec in specs:
+                assert type(spec) in (tuple, list) and len(spec) in (2, 3), \
+                    f"ensure_indexes(): each index specification must be a pair (label, key) " \
+                    f"or a triplet (label, key, kind); `{spec}` is not valid"
+                (label, key) = spec[:2]
+                kind = spec[2] if len(spec) == 3 else "range"
+                assert kind in ("range", "text", "unique"), \
+                    f"ensure_indexes(): the kind of index must be one of 'range', 'text', 'unique'; not `{kind}`"
+
+                existing = [i for i in self._indexes.values() if (i["label"], i["key"]) == (label, key)]
+                if kind == "range" and any(i["type"] == "RANGE" for i in existing):
+                    continue
+                if kind == "text" and any(i["type"] == "TEXT" for i in existing):
+                    continue
+                if kind == "unique" and any(i["unique"] for i in existing):
+                    continue
+
+                if kind == "range":
+                    created += self._add_index(f"{label}.{key}", label, key)
+                elif kind == "text":
+                    created += self._add_index(f"{label}.{key}.TEXT", label, key, index_type="TEXT")
+                else:
+                    created += self.create_constraint(label, key)
+
+        return created
+
+
+
+    def reset_index_cache(self) -> None:
+        pass        # The in-memory indexes are always up-to-date
+
+
+    def await_indexes(self, timeout=300) -> None:
+        pass        # The in-memory indexes are populated upon creation
+
+
+    def index_population_progress(self) -> [dict]:
+        """
+        Same as InterGraph.index_population_progress()
+        """
+        return [{"name": name, "state": "ONLINE", "populationPercent": 100.}
+                for name in sorted(self._indexes)]
+
+
+
+
+
+    #####################################################################################################
+
+    '''                                     ~   CONSTRAINTS   ~                                        '''
+
+    def ________CONSTRAINTS________(DIVIDER):
+        pass        # Used to get a better structure view in IDEs
+    #####################################################################################################
+
+    def get_constraints(self) -> pd.DataFrame:
+        """
+        Same as InterGraph.get_constraints()
+        """
+        with self._lock:
+            rows = [{"name": name, "type": "UNIQUENESS", "labelsOrTypes": [index["label"]],
+                     "properties": [index["key"]], "entityType": "NODE", "ownedIndex": name}
+                    for name, index in self._indexes.items() if index["unique"]]
+
+        if len(rows) > 0:
+            return pd.DataFrame(rows)
+        else:
+            return pd.DataFrame([], columns=['name', 'type', 'labelsOrTypes', 'properties', 'entityType', 'ownedIndex'])
+
+
+
+    def create_constraint(self, label :str, key :str, name=None) -> bool:
+        """
+        Same as InterGraph.create_constraint()
+        """
+        cname = (name if name else f"{label}.{key}.UNIQUE")
+
+        with self._lock:
+            if any((i["label"], i["key"]) == (label, key) for i in self._indexes.values()):
+                return False    # As with the database, a constraint can't share its label and key with another index
+
+            return self._add_index(cname, label, key, unique=True)
+
+
+
+    def drop_constraint(self, name: str) -> bool:
+        """
+        Same as InterGraph.drop_constraint()
+        """
+        with self._lock:
+            if not self._indexes.get(name, {}).get("unique"):
+                return False
+
+            return self._remove_index(name)
+
+
+
+    def drop_all_constraints(self) -> None:
+        """
+        Same as InterGraph.drop_all_constraints()
+        """
+        with self._lock:
+            for name, index in list(self._indexes.items()):
+                if index["unique"]:
+                    self._remove_index(name)
+
+
+
+
+
+class MemoryDriver:
+    """
+    Stand-in for the Neo4j driver object, for the in-memory graph store of a MemoryGraphAccess object:
+    it hands out the session objects that InterGraph uses to run its queries
+    """
+
+    def __init__(self, store):
+        """
+        :param store:   A MemoryGraphAccess object
+        """
+        self.store = store
+
+
+    def session(self, **config):
+        """
+        :param config:  Not used  (EXAMPLE: fetch_size=1000)
+        :return:        A MemorySession object
+        """
+        return MemorySession(self.store)
+
+
+    def close(self) -> None:
+        pass
+
+
+
+class MemorySession:
+    """
+    Stand-in for a neo4j.Session object, for the in-memory graph store.
+    The queries run directly on the store (see MemoryCypher);  each of them is atomic
+    """
+
+    def __init__(self, store):
+        """
+        :param store:   A MemoryGraphAccess object
+        """
+        self.store = store
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self) -> None:
+        pass
+
+
+    def run(self, q :str, parameters=None, **kwparameters):
+        """
+        Run the given Cypher query in its own (auto-commit) transaction
+
+        :return:    A MemoryResult object
+        """
+        with self.store._lock:
+            return MemoryCypher(self.store, {**(parameters or {}), **kwparameters}).run(q)
+
+
+    def read_transaction(self, work, *args, **kwargs):
+        """
+        Run the given unit of work in a transaction:  if it raises an Exception, all its changes get reverted
+
+        :param work:    A function that takes a MemoryTransaction object (plus any of the given arguments)
+        :return:        Whatever the `work` function returns
+        """
+        tx = MemoryTransaction(self.store)
+        try:
+            result = work(tx, *args, **kwargs)
+            tx.commit()
+            return result
+        finally:
+            tx.close()
+
+
+    # The driver has separate methods for read and write transactions (with different names in its version 5)
+    write_transaction = read_transaction
+    execute_read = read_transaction
+    execute_write = read_transaction
+
+
+    def begin_transaction(self, **config):
+        """
+        Start an explicit transaction, which also covers the changes made to the store
+        by the methods of MemoryGraphAccess that don't use Cypher
+
+        :return:    A MemoryTransaction object
+        """
+        return MemoryTransaction(self.store, snapshot=True)
+
+
+
+class MemoryTransaction:
+    """
+    Stand-in for a neo4j.Transaction object, for the in-memory graph store.
+    Other threads wait for the transaction to end, before accessing the store
+    """
+
+    def __init__(self, store, snapshot=False):
+        """
+        :param store:       A MemoryGraphAccess object
+        :param snapshot:    [OPTIONAL] If True, a copy of all the data gets taken, to revert to in case of rollback
+                                (needed if any change might be made without Cypher);  otherwise, only the changes made
+                                by the Cypher queries run in this transaction get reverted
+        """
+        self.store = store
+        self.undo = []          # Functions that revert the changes made by the queries, in reverse order - see MemoryCypher
+        self.closed = False
+        store._lock.acquire()
+        self.snapshot = store._snapshot() if snapshot else None
+
+
+    def run(self, q :str, parameters=None, **kwparameters):
+        """
+        Run the given Cypher query in this transaction
+
+        :return:    A MemoryResult object
+        """
+        assert not self.closed, "MemoryTransaction.run(): the transaction is already closed"
+        return MemoryCypher(self.store, {**(parameters or {}), **kwparameters}, undo=self.undo).run(q)
+
+
+    def commit(self) -> None:
+        self.undo = []
+        self.snapshot = None
+        self._end()
+
+
+    def rollback(self) -> None:
+        if self.snapshot is not None:
+            self.store._restore(self.snapshot)
+        else:
+            MemoryCypher(self.store, undo=self.undo).rollback()
+        self._end()
+
+
+    def close(self) -> None:
+        """
+        Roll back the transaction, unless already committed
+        """
+        if not self.closed:
+            self.rollback()
+
+
+    def _end(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.store._lock.release()
@@ -0,0 +1,125 @@
+####  WARNING : the Neo4j database identified by the environment variables below, will get erased!!!
+
+"""
+IMPORTANT - to run the pytests in this file, the following ENVIRONMENT VARIABLES must first be set:
+                1. NEO4J_HOST
+                2. NEO4J_USER
+                3. NEO4J_PASSWORD
+
+            For example, if using PyCharm, follow the main menu to: Run > Edit Configurations
+            and then, in the template for pytest, set Environment Variable to something like:
+                    NEO4J_HOST=bolt://<your IP address>:7687;NEO4J_USER=neo4j;NEO4J_PASSWORD=<your Neo4j password>
+"""
+
+import pytest
+import asyncio
+import brainannex
+from brainannex import GraphAccess
+
+if not hasattr(brainannex, "AsyncGraphAccess"):
+    pytest.skip("AsyncGraphAccess requires the Neo4j version 5 driver (see brainannex/__init__.py)", allow_module_level=True)
+
+from brainannex import AsyncGraphAccess
+from utilities.comparisons import compare_unordered_lists
+
+
+
+# Provide a (synchronous) database connection, to prepare the data for the tests
+@pytest.fixture(scope="module")
+def db():
+    # MAKE SURE TO FIRST SET THE ENVIRONMENT VARIABLES, prior to run the pytests in this file!
+    graph_obj = GraphAccess(debug=False)     # Change the debug option to True if desired
+    yield graph_obj
+
+
+
+def run_async(test_coroutine):
+    """
+    Run the given coroutine function, passing to it a new AsyncGraphAccess object,
+    which then gets closed.
+    (Each test uses its own event loop, and the async driver cannot be shared across event loops)
+    """
+    async def wrapper():
+        async with AsyncGraphAccess() as adb:
+            await adb.test_dbase_connection()
+            return await test_coroutine(adb)
+
+    return asyncio.run(wrapper())
+
+
+
+
+def test_query(db):
+    db.empty_dbase()
+    db.query("CREATE (:car {vin: 1, make: 'Toyota'}), (:car {vin: 2, make: 'Ford'})")
+
+    async def check(adb):
+        result = await adb.query("MATCH (c:car) RETURN c.vin AS vin ORDER BY vin")
+        assert result == [{"vin": 1}, {"vin": 2}]
+
+        assert await adb.query("MATCH (c:car) RETURN c.vin AS vin ORDER BY vin", single_column="vin") == [1, 2]
+        assert await adb.query("MATCH (c:car {vin: 2}) RETURN c.make AS make", single_cell="make") == "Ford"
+        assert await adb.query("MATCH (c:car {vin: 3}) RETURN c", single_row=True) is None
+
+        # Independent queries run concurrently
+        (n_cars, makes) = await asyncio.gather(adb.count_nodes("car"),
+                                               adb.query("MATCH (c:car) RETURN c.make AS make", single_column="make"))
+        assert n_cars == 2
+        assert compare_unordered_lists(makes, ["Toyota", "Ford"])
+
+    run_async(check)
+
+
+
+def test_update_query(db):
+    db.empty_dbase()
+
+    async def check(adb):
+        stats = await adb.update_query("CREATE (:car {vin: 1}), (:car {vin: 2})")
+        assert stats["nodes_created"] == 2
+        assert stats["returned_data"] == []
+
+        result = await adb.query_extended("MATCH (c:car) RETURN c ORDER BY c.vin", flatten=True, fields_to_exclude="_internal_id")
+        assert result == [{"vin": 1, "_node_labels": ["car"]}, {"vin": 2, "_node_labels": ["car"]}]
+
+    run_async(check)
+
+
+
+def test_nodes(db):
+    db.empty_dbase()
+
+    async def check(adb):
+        car_id = await adb.create_node("car", {"vin": 123, "color": "white"})
+
+        record = await adb.get_record_by_primary_key("car", primary_key_name="vin", primary_key_value=123,
+                                                     return_internal_id=True)
+        assert record == {"vin": 123, "color": "white", "_internal_id": car_id}
+
+        assert await adb.set_fields(match=car_id, set_dict={"color": "red", "price": 7000}) == 2
+        assert await adb.get_nodes(car_id, single_cell="color") == "red"
+
+        assert await adb.delete_nodes(adb.match(labels="car")) == 1
+        assert await adb.get_nodes(car_id) == []
+
+    run_async(check)
+
+
+
+def test_links(db):
+    db.empty_dbase()
+    person_id = db.create_node("person", {"name": "Julian"})
+    car_id = db.create_node("car", {"vin": 123})
+    db.add_links(match_from=person_id, match_to=car_id, rel_name="OWNS")
+
+    async def check(adb):
+        assert await adb.count_links(match=person_id, rel_name="OWNS") == 1
+        assert await adb.follow_links(match=person_id, rel_name="OWNS") == [{"vin": 123}]
+        assert await adb.follow_links(match=car_id, rel_name="OWNS", rel_dir="IN", include_id=True) == \
+               [{"name": "Julian", "_internal_id": person_id}]
+
+        (parents, children) = await adb.get_parents_and_children(person_id)
+        assert parents == []
+        assert children == [{"_internal_id": car_id, "labels": ["car"], "rel": "OWNS"}]
+
+    run_async(check)
@@ -0,0 +1,74 @@
+# No database needed
+
+import pytest
+import neo4j.time
+from datetime import datetime
+from brainannex.change_log import ChangeLog
+
+
+
+def test_append_and_read(tmp_path):
+    log = ChangeLog(str(tmp_path / "log"))
+    assert log.last_seq() == 0
+    assert list(log.read()) == []
+
+    when = neo4j.time.DateTime(2020, 1, 2, 3, 4, 5)
+    assert log.append([{"q": "CREATE (n :Car {vin: $vin, when: $when})", "params": {"vin": 1, "when": when},
+                        "counters": {"nodes_created": 1, "properties_set": 2}}]) == [1]
+    assert log.append([{"q": "MATCH (n :Car) SET n.sold = $sold", "params": {"sold": datetime(2021, 5, 6)}, "counters": None},
+                       {"q": "MATCH (n :Car) DETACH DELETE n", "params": {}, "counters": {"nodes_deleted": 1}}]) == [2, 3]
+    assert log.last_seq() == 3
+
+    entries = list(log.read())
+    assert [e["seq"] for e in entries] == [1, 2, 3]
+    assert entries[0]["params"] == {"vin": 1, "when": when}         # The temporal values are restored
+    assert entries[1]["params"] == {"sold": datetime(2021, 5, 6)}
+    assert entries[2]["counters"] == {"nodes_deleted": 1}
+    assert [e["seq"] for e in log.read(first_seq=2, last_seq=2)] == [2]
+
+    # Entries serialized ahead of time, with the returned internal database ID's
+    encoded = ChangeLog.encode("CREATE (n :Car) RETURN id(n) AS _internal_id", None)
+    assert log.append([{"encoded": encoded, "counters": {"nodes_created": 1}, "ids": {"_internal_id": [7]}}]) == [4]
+    entry = list(log.read(first_seq=4))[0]
+    assert entry["q"] == "CREATE (n :Car) RETURN id(n) AS _internal_id"
+    assert entry["params"] == {}
+    assert entry["ids"] == {"_internal_id": [7]}
+
+    with pytest.raises(TypeError):
+        ChangeLog.encode("CREATE (n :Car {owner: $owner})", {"owner": object()})
+
+
+
+def test_segments_and_recovery(tmp_path):
+    directory = str(tmp_path / "log")
+    log = ChangeLog(directory, max_segment_bytes=200)
+    for i in range(10):
+        log.append([{"q": "CREATE (n :Car {vin: $vin})", "params": {"vin": i}, "counters": {"nodes_created": 1}}])
+
+    segments = log.segments()
+    assert len(segments) > 1
+    assert segments[0][0] == 1
+    assert [e["params"]["vin"] for e in log.read(first_seq=5)] == [4, 5, 6, 7, 8, 9]
+
+    # Simulate a crash in the middle of a write
+    log.close()
+    with open(segments[-1][1], "a") as f:
+        f.write('{"seq": 11, "q": "CRE')
+
+    log = ChangeLog(directory, max_segment_bytes=200)      # Re-open the log
+    assert log.last_seq() == 10                             # The partial line was discarded
+    assert log.append([{"q": "MATCH (n) DELETE n", "params": {}, "counters": {"nodes_deleted": 10}}]) == [11]
+    assert [e["seq"] for e in log.read(first_seq=9)] == [9, 10, 11]
+
+    # Export a range, for an incremental backup
+    export_file = str(tmp_path / "changes.jsonl.gz")
+    assert log.export_range(export_file, first_seq=4, last_seq=8) == {"entries": 5, "first_seq": 4, "last_seq": 8}
+    assert [e["seq"] for e in ChangeLog.read_file(export_file)] == [4, 5, 6, 7, 8]
+
+    # Purge the old segments
+    first_kept = log.segments()[1][0]
+    assert log.purge(before_seq=first_kept) == 1
+    assert log.segments()[0][0] == first_kept
+    assert [e["seq"] for e in log.read()][0] == first_kept
+    with pytest.raises(Exception):
+        list(log.read(first_seq=1))         # No longer available
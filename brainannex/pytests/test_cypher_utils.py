@@ -1,4 +1,6 @@
 import pytest
+import neo4j.time
+from datetime import datetime, date, timezone, timedelta
 from brainannex.cypher_utils import CypherUtils, CypherBuilder
 
 
@@ -74,9 +76,9 @@ def test_CypherBuilder():
 
     # The presence of the internal_id trumps all other criteria
     assert ns.node == "(n)"
-    assert ns.where == "id(n) = 123"
-    assert ns.data_binding == {}
-    assert ns.cypher == "MATCH (n) WHERE id(n) = 123"
+    assert ns.where == "id(n) = $n_internal_id"
+    assert ns.data_binding == {"n_internal_id": 123}
+    assert ns.cypher == "MATCH (n) WHERE id(n) = $n_internal_id"
 
 
     # Same, but without internal_id
@@ -178,9 +180,9 @@ def test_finalize_dummy_name():
     assert ns.clause_binding == {}
     assert ns.dummy_node_name == "n"
     assert ns.node == "(n)"
-    assert ns.where == "id(n) = 123"
-    assert ns.data_binding == {}
-    assert ns.cypher == "MATCH (n) WHERE id(n) = 123"
+    assert ns.where == "id(n) = $n_internal_id"
+    assert ns.data_binding == {"n_internal_id": 123}
+    assert ns.cypher == "MATCH (n) WHERE id(n) = $n_internal_id"
 
     with pytest.raises(Exception):
         ns.build_cypher_elements("dummy")     # Can't change dummy name when a clause is present
@@ -298,9 +300,9 @@ def test_process_match_structure():
     assert ns.dummy_node_name == "n"
 
     assert ns.node == "(n)"
-    assert ns.where == "id(n) = 123"
-    assert ns.data_binding == {}
-    assert ns.cypher == "MATCH (n) WHERE id(n) = 123"
+    assert ns.where == "id(n) = $n_internal_id"
+    assert ns.data_binding == {"n_internal_id": 123}
+    assert ns.cypher == "MATCH (n) WHERE id(n) = $n_internal_id"
 
 
     ns = CypherBuilder(
@@ -554,4 +556,39 @@ def test_avoid_in_path():
 
     assert CypherUtils.avoid_in_path(avoid_label="Bad Wolf", avoid_links=["r1", "r2"], prefix_and=True) \
         == "AND NONE(r IN relationships(p) WHERE type(r) = 'r1' OR type(r) = 'r2')" \
-           " AND NONE(node_to_avoid IN nodes(p) WHERE 'Bad Wolf' IN labels(node_to_avoid))"
\ No newline at end of file
+           " AND NONE(node_to_avoid IN nodes(p) WHERE 'Bad Wolf' IN labels(node_to_avoid))"
+
+
+
+def test_keyset_clause():
+    assert CypherUtils.keyset_clause() == ("", "id(n)", {})
+    assert CypherUtils.keyset_clause(order_key="name", dummy_node_name="p") == ("p.`name` IS NOT NULL", "p.`name`, id(p)", {})
+
+    cursor = CypherUtils.encode_cursor(None, key_value=None, internal_id=123)
+    assert CypherUtils.keyset_clause(cursor=cursor) == ("id(n) > $cursor_id", "id(n)", {"cursor_id": 123})
+
+    cursor = CypherUtils.encode_cursor("name", key_value="Julian", internal_id=45)
+    assert CypherUtils.decode_cursor(cursor, order_key="name") == ("Julian", 45)
+    assert CypherUtils.keyset_clause(order_key="name", cursor=cursor) == \
+           ("(n.`name` > $cursor_key OR (n.`name` = $cursor_key AND id(n) > $cursor_id))",
+            "n.`name`, id(n)",
+            {"cursor_key": "Julian", "cursor_id": 45})
+
+    with pytest.raises(Exception):
+        CypherUtils.decode_cursor(cursor, order_key="age")      # Cursor for a different ordering
+
+    with pytest.raises(Exception):
+        CypherUtils.decode_cursor("not a cursor")
+
+    with pytest.raises(Exception):
+        CypherUtils.encode_cursor("name", key_value=[1, 2], internal_id=45)    # Unsuitable value for ordering
+
+    # Dates and times are stored as ISO strings, and get back their original types
+    for key_value in [neo4j.time.DateTime(2023, 5, 1, 10, 20, 30, 123456789),
+                      neo4j.time.DateTime(2023, 5, 1, 10, 20, 30, tzinfo=timezone(timedelta(hours=2))),
+                      neo4j.time.Date(2023, 5, 1), neo4j.time.Time(10, 20, 30),
+                      datetime(2023, 5, 1, 10, 20, 30, tzinfo=timezone.utc), date(2023, 5, 1)]:
+        cursor = CypherUtils.encode_cursor("sold", key_value=key_value, internal_id=45)
+        (decoded_value, decoded_id) = CypherUtils.decode_cursor(cursor, order_key="sold")
+        assert (type(decoded_value), decoded_value, decoded_id) == (type(key_value), key_value, 45)
+
@@ -572,6 +572,18 @@ def test_delete_class(db):
     assert db.query(q, single_cell="number_orphaned") == 1  # Now there's an "orphaned" data node
 
 
+    # Delete a Class along with its data nodes, in batches
+    db.empty_dbase()
+    create_sample_schema_2()
+    for i in range(5):
+        GraphSchema.create_data_node(class_name="quotes", properties={"quote": f"Quote {i}"})
+
+    GraphSchema.delete_class("quotes", delete_data_nodes=True, batch_size=2)
+    assert not GraphSchema.class_name_exists("quotes")
+    assert db.count_nodes("quotes") == 0
+    assert GraphSchema.class_name_exists("Category")
+
+
 
 def test_is_link_allowed(db):
     db.empty_dbase()
@@ -1667,6 +1679,34 @@ def test_get_nodes_by_filter(db):
 
 
 
+def test_get_nodes_by_filter_page(db):
+    db.empty_dbase()
+
+    for i in range(5):
+        db.create_node(labels="Car", properties={"color": "red" if i % 2 else "blue", "year": 2000 + i})
+
+    (recordset, cursor, total) = GraphSchema.get_nodes_by_filter_page(labels="Car", order_key="year", limit=2)
+    assert recordset == [{"color": "blue", "year": 2000}, {"color": "red", "year": 2001}]
+    assert total == 5
+
+    (recordset, cursor, total) = GraphSchema.get_nodes_by_filter_page(labels="Car", order_key="year", limit=2,
+                                                                      cursor=cursor, approx_count=False)
+    assert recordset == [{"color": "blue", "year": 2002}, {"color": "red", "year": 2003}]
+    assert total is None
+
+    (recordset, cursor, _) = GraphSchema.get_nodes_by_filter_page(labels="Car", order_key="year", limit=2, cursor=cursor)
+    assert recordset == [{"color": "blue", "year": 2004}]
+    assert cursor is None
+
+    # The filter applies, but the approximate count doesn't take it into account
+    (recordset, cursor, total) = GraphSchema.get_nodes_by_filter_page(labels="Car", key_names="color", key_value="RED",
+                                                                      case_sensitive=False, limit=10, include_labels=True)
+    assert recordset == [{"color": "red", "year": 2001, "_node_labels": ["Car"]}, {"color": "red", "year": 2003, "_node_labels": ["Car"]}]
+    assert cursor is None
+    assert total == 5
+
+
+
 def test__process_key_name_value():
     with pytest.raises(Exception):
         GraphSchema._process_key_name_value(key_name=123, key_value=22)   # key_name is not a string
@@ -2338,6 +2378,27 @@ def test_update_data_node(db):
 
 
 
+def test_update_data_nodes_many(db):
+    db.empty_dbase()
+
+    GraphSchema.create_class_with_properties("Car", properties=["vin", "color", "price"], strict=True)
+    car_1 = GraphSchema.create_data_node(class_name="Car", properties={"vin": "A-1", "color": "white"}, new_entity_id="car-1")
+    car_2 = GraphSchema.create_data_node(class_name="Car", properties={"vin": "A-2", "color": "red"}, new_entity_id="car-2")
+
+    result = GraphSchema.update_data_nodes_many("Car", {"car-1": {"color": "blue", "price": 7000}, "car-2": {"color": ""}})
+    assert result == {"rows": 2, "nodes_updated": 2, "properties_set": 3}
+    assert db.get_nodes(car_1) == [{"vin": "A-1", "color": "blue", "price": 7000, "entity_id": "car-1", "_CLASS": "Car"}]
+    assert db.get_nodes(car_2) == [{"vin": "A-2", "entity_id": "car-2", "_CLASS": "Car"}]
+
+    with pytest.raises(Exception):
+        GraphSchema.update_data_nodes_many("Car", {"car-1": {"mileage": 100}})     # Not allowed by the Schema
+
+    result = GraphSchema.update_data_nodes_many("Car", {car_1: {"mileage": 100, "price": 8000}}, key_name=None, silently_drop=True)
+    assert result["properties_set"] == 1
+    assert db.get_nodes(car_1, single_cell="price") == 8000
+
+
+
 def test_add_data_node_merge(db):
     db.empty_dbase()
 
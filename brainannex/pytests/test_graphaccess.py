@@ -282,6 +282,68 @@ def test_get_nodes(db):
 
 
 
+def test_get_nodes_iter(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    for i in range(5):
+        db.create_node("car", {'vin': i})
+
+    match = db.match(labels="car")
+    result = list(db.get_nodes_iter(match, order_by="vin"))
+    assert result == [{'vin': 0}, {'vin': 1}, {'vin': 2}, {'vin': 3}, {'vin': 4}]
+    assert result == db.get_nodes(match, order_by="vin")
+
+    result = list(db.get_nodes_iter(match, order_by="vin", chunk_size=2, fetch_size=1))
+    assert result == [[{'vin': 0}, {'vin': 1}], [{'vin': 2}, {'vin': 3}], [{'vin': 4}]]
+
+    result = list(db.get_nodes_iter(match, return_labels=True, order_by="vin", limit=1))
+    assert result == [{'vin': 0, '_node_labels': ['car']}]
+
+    match = db.match(labels="non-existing label")
+    assert list(db.get_nodes_iter(match)) == []
+
+
+
+def test_get_nodes_page(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    car_ids = [db.create_node("car", {'vin': i % 3, 'n': i}) for i in range(5)]    # Note: duplicate values of `vin`
+    db.create_node("car", {'n': 5})                                               # Lacks a `vin` value
+
+    match = db.match(labels="car")
+    (records, cursor) = db.get_nodes_page(match, page_size=2)
+    assert records == [{'vin': 0, 'n': 0}, {'vin': 1, 'n': 1}]
+    (records, cursor) = db.get_nodes_page(match, page_size=2, cursor=cursor, return_internal_id=True)
+    assert records == [{'vin': 2, 'n': 2, '_internal_id': car_ids[2]}, {'vin': 0, 'n': 3, '_internal_id': car_ids[3]}]
+    (records, cursor) = db.get_nodes_page(match, page_size=2, cursor=cursor)
+    assert records == [{'vin': 1, 'n': 4}, {'n': 5}]
+    assert cursor is None
+
+    # Order by `vin`, with ties broken by internal database ID
+    all_pages = []
+    cursor = None
+    while True:
+        (records, cursor) = db.get_nodes_page(match, page_size=2, cursor=cursor, order_key="vin")
+        all_pages.append([r["n"] for r in records])
+        if cursor is None:
+            break
+    assert all_pages == [[0, 3], [1, 4], [2]]      # The node lacking `vin` is left out
+
+    (_, cursor) = db.get_nodes_page(match, page_size=1, order_key="vin")
+    with pytest.raises(Exception):
+        db.get_nodes_page(match, page_size=1, cursor=cursor, order_key="n")     # The cursor was for a different ordering
+
+    # Order by a date property
+    for day in [3, 1, 2]:
+        db.create_node("sale", {'date': neo4j.time.Date(2023, 5, day)})
+    (records, cursor) = db.get_nodes_page(db.match(labels="sale"), page_size=2, order_key="date")
+    assert records == [{'date': neo4j.time.Date(2023, 5, 1)}, {'date': neo4j.time.Date(2023, 5, 2)}]
+    (records, cursor) = db.get_nodes_page(db.match(labels="sale"), page_size=2, cursor=cursor, order_key="date")
+    assert records == [{'date': neo4j.time.Date(2023, 5, 3)}]
+    assert cursor is None
+
+
+
 def test_get_df(db):
     db.empty_dbase(drop_indexes=True, drop_constraints=True)
 
@@ -301,6 +363,18 @@ def test_get_df(db):
 
     assert df_original_sorted.equals(df_new_sorted)
 
+    # Neo4j dates and datetimes are returned as Pandas datetime columns;  missing values as NaN's or NaT's
+    db.create_node("B", {"vin": 1, "sold": neo4j.time.Date(2023, 5, 1),
+                         "seen": neo4j.time.DateTime(2023, 5, 1, 10, 20, 30, 123456789)})
+    db.create_node("B", {"vin": 2, "make": "Ford"})
+    df = db.get_df(match=db.match(labels="B"), order_by="vin")
+    assert pd.api.types.is_datetime64_any_dtype(df["sold"].dtype)
+    assert df["sold"].tolist()[0] == pd.Timestamp("2023-05-01")
+    assert df["seen"].tolist()[0] == pd.Timestamp("2023-05-01 10:20:30.123456789")
+    assert pd.isna(df["sold"].iloc[1]) and pd.isna(df["seen"].iloc[1])
+    assert pd.isna(df["make"].iloc[0])
+    assert df["vin"].tolist() == [1, 2]
+
 
 
 def test_get_recordset(db):
@@ -471,6 +545,42 @@ def test_follow_links(db):
 
 
 
+def test_follow_links_many(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    person_1 = db.create_node("person", {"name": "Julian"})
+    person_2 = db.create_node("person", {"name": "Val"})
+    person_3 = db.create_node("person", {"name": "Ada"})
+    car_1 = db.create_node("car", {"vin": 1})
+    car_2 = db.create_node(["car", "used"], {"vin": 2})
+    db.add_links(match_from=person_1, match_to=db.match(labels="car"), rel_name="OWNS")
+    db.add_links(match_from=person_2, match_to=car_2, rel_name="OWNS")
+
+    result = db.follow_links_many([person_1, person_2, person_3], rel_name="OWNS")
+    assert compare_recordsets(result[person_1], [{"vin": 1}, {"vin": 2}])
+    assert result[person_2] == [{"vin": 2}]
+    assert result[person_3] == []
+
+    result = db.follow_links_many([person_1, person_2], rel_name="OWNS", neighbor_labels="used", include_id=True, include_labels=True)
+    assert result == {person_1: [{"vin": 2, "_internal_id": car_2, "_node_labels": ["car", "used"]}],
+                      person_2: [{"vin": 2, "_internal_id": car_2, "_node_labels": ["car", "used"]}]}
+
+    result = db.follow_links_many([car_1, car_2], rel_name="OWNS", rel_dir="IN", limit=1)
+    assert result[car_1] == [{"name": "Julian"}]
+    assert len(result[car_2]) == 1      # Only 1 of its 2 owners
+
+    assert db.follow_links_many([], rel_name="OWNS") == {}
+
+    # String ID's are matched, and are returned as given
+    result = db.follow_links_many([str(person_2), str(person_3)], rel_name="OWNS")
+    assert result == {str(person_2): [{"vin": 2}], str(person_3): []}
+
+    # The same node, given both as an integer and as a string
+    result = db.follow_links_many([person_2, str(person_2)], rel_name="OWNS")
+    assert result == {person_2: [{"vin": 2}], str(person_2): [{"vin": 2}]}
+
+
+
 def test_count_links(db):
     db.empty_dbase()
 
@@ -562,6 +672,37 @@ def test_get_parents_and_children(db):
 
 
 
+def test_get_parents_and_children_many(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    node_id = db.create_node("mid generation", {'age': 42})
+    parent_id = db.create_node("parent", {'age': 62})
+    child_id = db.create_node("child", {'age': 13})
+    db.link_nodes_by_ids(parent_id, node_id, "PARENT_OF")
+    db.link_nodes_by_ids(node_id, child_id, "PARENT_OF")
+
+    result = db.get_parents_and_children_many([node_id, child_id, parent_id])
+    assert result[node_id] == db.get_parents_and_children(node_id)
+    assert result[child_id] == ([{'_internal_id': node_id, 'labels': ['mid generation'], 'rel': 'PARENT_OF'}], [])
+    assert result[parent_id] == ([], [{'_internal_id': node_id, 'labels': ['mid generation'], 'rel': 'PARENT_OF'}])
+
+    # String ID's are matched, and are returned as given
+    result = db.get_parents_and_children_many([str(child_id)])
+    assert result == {str(child_id): ([{'_internal_id': node_id, 'labels': ['mid generation'], 'rel': 'PARENT_OF'}], [])}
+
+    # The same node, given both as an integer and as a string
+    result = db.get_parents_and_children_many([child_id, str(child_id)])
+    assert result == {child_id:      ([{'_internal_id': node_id, 'labels': ['mid generation'], 'rel': 'PARENT_OF'}], []),
+                      str(child_id): ([{'_internal_id': node_id, 'labels': ['mid generation'], 'rel': 'PARENT_OF'}], [])}
+
+    # The grouping of the query results, by itself
+    rows = [{"_internal_id": 3, "parents": [{"_internal_id": 1}], "children": []}]
+    assert GraphAccess._group_parents_and_children([3, "3", "4", 3], rows) == \
+           {3: ([{"_internal_id": 1}], []), "3": ([{"_internal_id": 1}], []), "4": ([], [])}
+    assert GraphAccess._given_ids_by_normalized_id([3, "4", "3", 3]) == {3: [3, "3"], 4: ["4"]}
+
+
+
 def test_get_siblings(db):
     db.empty_dbase()
 
@@ -1580,6 +1721,41 @@ def test_delete_nodes_by_label(db):
 
 
 
+def test_delete_in_batches(db):
+    db.empty_dbase()
+
+    db.load_pandas(pd.DataFrame({"vin": range(25)}), labels="car")
+    db.create_node("boat", {"brand": "Juneau"})
+    db.add_links(match_from=db.match(labels="boat"), match_to=db.match(labels="car", clause="n.vin < 3"), rel_name="TOWS")
+
+    # Delete the cars with vin >= 10, in batches of up to 4
+    result = db.delete_in_batches("MATCH (n :car) WHERE n.vin >= $min_vin", data_binding={"min_vin": 10}, batch_size=4)
+    assert result == {"batches": 4, "total": 15}
+    assert db.count_nodes("car") == 10
+
+    assert db.delete_nodes(db.match(labels="car", clause="n.vin >= 5"), batch_size=2, pause=0.01) == 5
+    assert db.count_nodes("car") == 5
+
+    # Linked nodes get deleted as well, along with their relationships
+    assert db.delete_nodes(db.match(labels="car"), batch_size=5) == 5
+    assert db.count_nodes("car") == 0
+    assert db.count_links(match=db.match(labels="boat"), rel_name="TOWS") == 0
+
+    assert db.bulk_delete_by_label("boat") == {"batches": 1, "total": 1}
+
+    db.load_pandas(pd.DataFrame({"vin": range(7)}), labels="car")
+    db.create_node("boat", {"brand": "Juneau"})
+    db.empty_dbase(keep_labels="boat", batch_size=3)
+    assert db.count_nodes() == 1
+    db.empty_dbase(batch_size=3)
+    assert db.count_nodes() == 0
+
+    with db.transaction():
+        with pytest.raises(Exception):
+            db.delete_nodes(db.match(labels="car"), batch_size=10)     # Batches can't be committed separately
+
+
+
 
 
 ###  ~ MODIFY FIELDS ~
@@ -1640,6 +1816,35 @@ def test_set_fields(db):
 
 
 
+def test_set_fields_many(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    car_1 = db.create_node("car", {"vin": "A-1", "color": "white", "notes": "new"})
+    car_2 = db.create_node("car", {"vin": "A-2", "color": "red"})
+    db.create_node("boat", {"vin": "A-3"})
+
+    # Locate the nodes by internal ID
+    result = db.set_fields_many({car_1: {"color": "blue", "notes": "  "}, car_2: {"price": 7000}, -1: {"color": "pink"}})
+    assert result == {"rows": 3, "nodes_updated": 2, "properties_set": 3}
+    assert db.get_nodes(car_1) == [{"vin": "A-1", "color": "blue"}]     # The blank field got dropped
+    assert db.get_nodes(car_2) == [{"vin": "A-2", "color": "red", "price": 7000}]
+
+    # Locate the nodes by key property, with data from a dataframe; missing values are left untouched
+    df = pd.DataFrame({"vin": ["A-1", "A-2", "A-3"], "price": [8000, None, 100], "year": [2020, 2021, 2022]})
+    result = db.set_fields_many(df, labels="car", key_name="vin", batch_size=2)
+    assert result == {"rows": 3, "nodes_updated": 2, "properties_set": 3}
+    assert db.get_nodes(car_1) == [{"vin": "A-1", "color": "blue", "price": 8000, "year": 2020}]
+    assert db.get_nodes(car_2) == [{"vin": "A-2", "color": "red", "price": 7000, "year": 2021}]
+    assert db.get_nodes(db.match(labels="boat")) == [{"vin": "A-3"}]      # Not a car
+
+    result = db.set_fields_many({"A-2": {"color": ""}}, labels="car", key_name="vin", drop_blanks=False)
+    assert result["properties_set"] == 1
+    assert db.get_nodes(car_2, single_cell="color") == ""
+
+
+
+
+
 ###  ~ RELATIONSHIPS ~
 
 def test_get_relationship_types(db):
@@ -2149,6 +2354,81 @@ def test_link_nodes_on_matching_property(db):
 
 
 
+######   ~ BATCHED WRITES ~  ######
+
+def test_is_create_only_query(db):
+    assert db.is_create_only_query("UNWIND $rows AS record CREATE (n :Car) SET n = record")
+    assert db.is_create_only_query("MATCH (cl :CLASS) WITH cl UNWIND $rows AS record CREATE (n :Car) SET n = record")
+    assert not db.is_create_only_query("UNWIND $rows AS record MERGE (n :Car {vin: record.vin})")
+    assert not db.is_create_only_query("UNWIND $rows AS r MATCH (a {id: r.a}), (b {id: r.b}) CREATE (a)-[:LINK]->(b)")
+    assert not db.is_create_only_query("MATCH (n :Car) DETACH DELETE n")
+    assert not db.is_create_only_query("MATCH (n :Car) RETURN n")
+
+
+
+def test_run_batched(db):
+    db.empty_dbase()
+
+    q = "UNWIND $rows AS record CREATE (n :Car) SET n = record, n.make = $make RETURN record.vin AS vin"
+    rows = ({"vin": i} for i in range(10))      # A generator
+    result = db.run_batched(q, rows, batch_size=3, data_binding={"make": "Toyota"}, report=False)
+    assert result["batches"] == 4
+    assert result["rows"] == 10
+    assert result["counters"]["nodes_created"] == 10
+    assert result["returned_data"] == [{"vin": i} for i in range(10)]
+    assert result["next_batch"] == 4
+    assert db.query("MATCH (n :Car {make: 'Toyota'}) RETURN count(n) AS n", single_cell="n") == 10
+
+    # Concurrent batches
+    db.empty_dbase()
+    result = db.run_batched(q, [{"vin": i} for i in range(100)], batch_size=7, data_binding={"make": "Ford"},
+                            workers=4, report=False)
+    assert result["counters"]["nodes_created"] == 100
+    assert result["returned_data"] == [{"vin": i} for i in range(100)]     # In the order of the batches
+    assert db.count_nodes("Car") == 100
+
+    # Resume from a given batch
+    db.empty_dbase()
+    result = db.run_batched(q, [{"vin": i} for i in range(10)], batch_size=3, data_binding={"make": "Ford"},
+                            start_batch=2, report=False)
+    assert result["returned_data"] == [{"vin": 6}, {"vin": 7}, {"vin": 8}, {"vin": 9}]
+    assert result["next_batch"] == 4
+
+    # A failing batch (the 3rd one, which contains a null in a MERGE key)
+    q = "UNWIND $rows AS record MERGE (n :Truck {vin: record.vin})"
+    rows = [{"vin": 1}, {"vin": 2}, {"vin": 3}, {"vin": 4}, {"vin": None}, {"vin": 6}]
+    with pytest.raises(Exception, match="start_batch=2"):
+        db.run_batched(q, rows, batch_size=2, report=False)
+    assert db.count_nodes("Truck") == 4
+
+    # A failing batch among concurrent ones: resuming must not re-run the batches completed after it
+    db.empty_dbase()
+    q = "UNWIND $rows AS record CREATE (n :Car) SET n.vin = record.vin, n.ratio = 1 / record.divisor"
+    rows = [{"vin": i, "divisor": 0 if i == 12 else 1} for i in range(100)]     # The batch # 2 fails
+    with pytest.raises(Exception, match="start_batch=2") as exc_info:
+        db.run_batched(q, rows, batch_size=5, workers=4, report=False)
+    assert exc_info.value.failed_batch == 2
+    assert exc_info.value.start_batch == 2
+    assert db.count_nodes("Car") == 5 * (2 + len(exc_info.value.skip_batches))
+
+    rows[12]["divisor"] = 1
+    result = db.run_batched(q, rows, batch_size=5, workers=4, report=False,
+                            start_batch=exc_info.value.start_batch, skip_batches=exc_info.value.skip_batches)
+    assert result["next_batch"] == 20
+    assert db.count_nodes("Car") == 100
+    assert db.query("MATCH (n :Car) RETURN count(DISTINCT n.vin) AS n", single_cell="n") == 100     # No duplicates
+
+    # Checks at the end of each batch
+    q = "UNWIND $rows AS record MERGE (n :Truck {vin: record.vin})"
+    batch_sizes = []
+    db.run_batched(q, [{"vin": i} for i in range(5)], batch_size=2, report=False,
+                   on_batch=lambda batch_number, batch, result: batch_sizes.append(len(batch)))
+    assert batch_sizes == [2, 2, 1]
+
+
+
+
+
 ######   ~ READ IN DATA from PANDAS ~  ######
 
 def test_load_pandas_1(db):
@@ -2487,6 +2767,70 @@ def test_load_pandas_8(db):
 
 
 
+def test_load_links(db):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    db.load_pandas(pd.DataFrame({"person_id": [1, 2, 3]}), labels="person")
+    car_ids = db.load_pandas(pd.DataFrame({"vin": ["A-1", "B-7", "C-3"]}), labels="car")
+
+    df = pd.DataFrame({"person_id": [1, 1, 2, 9, 3], "vin": ["A-1", "B-7", "C-3", "A-1", "Z-0"],
+                       "since": [2020, None, 2022, 2023, 2024]})
+    result = db.load_links(df, from_key="person_id", to_key="vin", rel_name="OWNS", rel_props_cols="since",
+                           key_labels=("person", "car"), batch_size=2)
+    assert result["rows"] == 5
+    assert result["links_created"] == 3
+    assert result["properties_set"] == 2        # The missing value was skipped
+    assert result["unmatched"] == [3, 4]        # No person 9, and no car Z-0
+
+    q = "MATCH (p:person)-[r:OWNS]->(c:car) RETURN p.person_id AS p, c.vin AS c, r.since AS since ORDER BY p, c"
+    assert db.query(q) == [{"p": 1, "c": "A-1", "since": 2020}, {"p": 1, "c": "B-7", "since": None},
+                           {"p": 2, "c": "C-3", "since": 2022}]
+
+    # Loading again doesn't duplicate the links (but updates their properties)
+    df["since"] = 1999
+    result = db.load_links(df, from_key="person_id", to_key="vin", rel_name="OWNS", rel_props_cols=["since"],
+                           key_labels="person", to_column="vin", workers=2)     # No label restriction on the cars
+    assert result["links_created"] == 0
+    assert result["unmatched"] == [3, 4]
+    assert db.query("MATCH (:person)-[r:OWNS]->(:car) RETURN collect(DISTINCT r.since) AS s", single_cell="s") == [1999]
+
+    # Locate the cars by internal database ID
+    df = pd.DataFrame({"person_id": [3, 3], "car": [car_ids[0], car_ids[2]]})
+    result = db.load_links(df, from_key="person_id", to_key=None, to_column="car", rel_name="DRIVES",
+                           key_labels=("person", None), merge=False)
+    assert result["links_created"] == 2
+    assert result["unmatched"] == []
+    assert db.count_links(match=db.match(labels="person", key_name="person_id", key_value=3), rel_name="DRIVES") == 2
+
+    with pytest.raises(Exception):
+        db.load_links(df, from_key="person_id", to_key=None, rel_name="DRIVES")    # The column for the cars is needed
+
+
+
+def test_load_links_self_referencing(db, monkeypatch):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    db.load_pandas(pd.DataFrame({"person_id": range(10)}), labels="person")
+
+    # The same nodes are at either end of the links: the partitioned (concurrent) loading mustn't be used
+    def no_partitioning(*args, **kwargs):
+        raise Exception("Concurrent batches could lock the same nodes")
+
+    monkeypatch.setattr(db, "_load_links_partitioned", no_partitioning)
+
+    df = pd.DataFrame({"from_id": [0, 1, 2, 3, 4], "to_id": [1, 2, 3, 4, 0]})
+    result = db.load_links(df, from_key="person_id", to_key="person_id", from_column="from_id", to_column="to_id",
+                           rel_name="KNOWS", key_labels="person", batch_size=1, workers=4)
+    assert result["links_created"] == 5
+
+    person_ids = db.query("MATCH (p:person) RETURN id(p) AS id ORDER BY p.person_id", single_column="id")
+    df = pd.DataFrame({"a": person_ids[:5], "b": person_ids[5:]})
+    result = db.load_links(df, from_key=None, to_key=None, from_column="a", to_column="b",
+                           rel_name="LIKES", batch_size=1, workers=4)
+    assert result["links_created"] == 5
+
+
+
 def test_pd_datetime_to_neo4j_datetime(db):
     # Prepare a dataframe with group of dates, turned into a datetime column
     df = pd.DataFrame({"name": ["A", "B", "C"], "my_date": ["2023-01-01", np.nan, "2023-01-21"]})
@@ -2798,6 +3142,81 @@ def test_standardize_recordset(db):
 
 
 
+######  ~ QUERY CACHE ~
+
+def test_query_cache(db):
+    db.empty_dbase()
+    car_id = db.create_node("car", {"vin": 123, "color": "white"})
+    db.create_node("person", {"name": "Julian"})
+
+    db.enable_cache(max_entries=10, ttl=60)
+    try:
+        assert db.count_nodes("car") == 1
+        assert db.count_nodes("car") == 1       # From the cache
+        assert db.get_record_by_primary_key("car", primary_key_name="vin", primary_key_value=123) == {"vin": 123, "color": "white"}
+        assert compare_unordered_lists(db.get_labels(), ["car", "person"])
+        assert db.get_node_labels(car_id) == ["car"]
+        assert db.cache_stats()["hits"] == 1
+        assert db.cache_stats()["entries"] == 4
+
+        db.create_node("person", {"name": "Val"})   # Only the results that depend on "person" (or on everything) get discarded
+        assert db.cache_stats()["entries"] == 3
+        assert db.count_nodes("car") == 1
+        assert db.count_nodes("person") == 2
+
+        db.set_fields(db.match(labels="car", key_name="vin", key_value=123), {"color": "red"})
+        assert db.get_record_by_primary_key("car", primary_key_name="vin", primary_key_value=123) == {"vin": 123, "color": "red"}
+
+        # A node with several labels, changed through a match by just one of them
+        db.create_node(["car", "antique"], {"vin": 1})
+        assert db.get_record_by_primary_key("antique", primary_key_name="vin", primary_key_value=1) == {"vin": 1}
+        db.set_fields(db.match(labels="car", key_name="vin", key_value=1), {"color": "black"})
+        assert db.get_record_by_primary_key("antique", primary_key_name="vin", primary_key_value=1) == {"vin": 1, "color": "black"}
+        db.set_fields_many({1: {"color": "green"}}, labels="car", key_name="vin")
+        assert db.get_record_by_primary_key("antique", primary_key_name="vin", primary_key_value=1) == {"vin": 1, "color": "green"}
+
+        db.update_query("CREATE (:car {vin: 456})")     # Unknown scope: everything gets discarded
+        assert db.cache_stats()["entries"] == 0
+        assert db.count_nodes("car") == 3
+
+        with db.transaction():
+            db.create_node("car", {"vin": 789})
+            assert db.count_nodes("car") == 4       # Inside transactions, the cache is bypassed
+        assert db.count_nodes("car") == 4
+    finally:
+        db.disable_cache()
+
+    assert db.cache_stats() is None
+
+
+
+def test_query_stats_callers(db):
+    # The queries get attributed to the GraphAccess methods that requested them, with or without the cache
+    db.empty_dbase()
+    db.create_node("car", {"vin": 123})
+
+    db.reset_query_stats()
+    db.count_nodes("car")
+    db.get_nodes(db.match(labels="car"))
+    db.enable_cache()
+    try:
+        db.count_nodes("person")
+        db.get_labels()
+    finally:
+        db.disable_cache()
+
+    stats = db.query_stats()        # Keys such as "GraphAccess.count_nodes" (just "count_nodes" before Python 3.11)
+    stats = {caller.split(".")[-1]: caller_stats for (caller, caller_stats) in stats.items()}
+    assert stats["count_nodes"]["count"] == 2
+    assert stats["get_nodes"]["count"] == 1
+    assert "get_labels" in stats
+    assert "_execute" not in stats
+    assert "_cached_read" not in stats
+
+
+
+
+
 ######  ~ DEBUGGING SUPPORT ~
 
 
@@ -2,6 +2,9 @@
 ####  WARNING : the database will get erased!!!
 
 import pytest
+import neo4j.time
+import pandas as pd
+from datetime import datetime, timezone, timedelta
 from brainannex import graph_access as neo_access
 from utilities.comparisons import *
 
@@ -212,3 +215,245 @@ def test_create_nodes_from_python_data_6(db):
     result = db.query(q, single_row=True)
     print(result)
     assert compare_unordered_lists(result.values() , new_id_list)
+
+
+
+
+def test_create_nodes_from_python_data_bulk(db):
+    db.empty_dbase()
+
+    # The same data as in test_create_nodes_from_python_data_4() and _6(), created with the `bulk` option
+    data = {"name": "Stephanie",
+            "results": [{"biomarker": "insulin", "value": 123.}, {"biomarker": "bilirubin", "value": 0.8}],
+            "address": {"city": "Berkeley", "zip": None},
+            "scores": [10, [20, 30]],
+            "notes": []
+            }
+    new_id_list = db.create_nodes_from_python_data(data, root_labels="bulk_dict", bulk=True, batch_size=1)
+    assert len(new_id_list) == 1
+
+    q = '''
+        MATCH (root :bulk_dict {name: "Stephanie"})
+                    -[:results]->(:results {biomarker: "insulin", value: 123.0}),
+              (root)-[:results]->(:results {biomarker: "bilirubin", value: 0.8}),
+              (root)-[:address]->(:address {city: "Berkeley"}),
+              (root)-[:scores]->(:scores {value: 10}),
+              (root)-[:scores]->(s :scores)-[:scores]->(:scores {value: 20}),
+                                (s)-[:scores]->(:scores {value: 30})
+        RETURN id(root) AS id_root
+        '''
+    assert db.query(q, single_row=True) == {"id_root": new_id_list[0]}
+    assert db.count_nodes() == 8
+    assert db.query("MATCH ()-[r]->() RETURN count(r) AS n", single_cell="n") == 7
+
+    # A top-level list
+    data = [1, {"a": 123}, None, [10, 20]]
+    new_id_list = db.create_nodes_from_python_data(data, root_labels="bulk_list", bulk=True)
+    assert len(new_id_list) == 3
+    assert db.get_nodes(new_id_list[0]) == [{"value": 1}]
+    assert db.get_nodes(new_id_list[1]) == [{"a": 123}]
+    assert compare_unordered_lists(db.follow_links(match=new_id_list[2], rel_name="bulk_list"),
+                                   [{"value": 10}, {"value": 20}])
+
+    assert db.import_json('{"x": {"y": 1}}', root_labels="bulk_json", bulk=True, provenance="test") != []
+    assert db.get_nodes(db.match(labels="bulk_json")) == [{"source": "test"}]
+
+
+def test_import_csv_nodes(db, tmp_path):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    filename = tmp_path / "cars.csv"
+    filename.write_text("vin,year,price,zip,sold on,used\n"
+                        "A-1,2020,7000.5,02134,2023-01-15,true\n"
+                        "A-2,2021,,94110,,false\n"
+                        " A-3 ,,8000,10001,2024-03-01 10:30:00,\n"
+                        ",,,,,\n"
+                        "A-4,2019,500,00501,,yes\n")
+
+    result = db.import_csv_nodes(str(filename), labels="Car", rename={"sold on": "sold_on"},
+                                 field_types={"zip": "str", "used": "bool"}, datetime_cols="sold_on",
+                                 chunk_size=2, batch_size=2, report=False)
+    assert result["rows_read"] == 5
+    assert result["rows_skipped"] == 1         # The row with no values
+    assert result["nodes_created"] == 4
+    assert result["next_row"] == 5
+    assert result["field_types"] == {"vin": "str", "year": "float", "price": "float", "zip": "str",
+                                     "sold_on": "datetime", "used": "bool"}
+
+    q = "MATCH (c:Car) RETURN c ORDER BY c.vin"
+    records = [r["c"] for r in db.query(q)]
+    assert records[0] == {"vin": "A-1", "year": 2020., "price": 7000.5, "zip": "02134",
+                          "sold_on": neo4j.time.DateTime(2023, 1, 15, 0, 0, 0, 0), "used": True}
+    assert records[1] == {"vin": "A-2", "year": 2021., "zip": "94110", "used": False}     # Missing values dropped
+    assert records[2] == {"vin": "A-3", "price": 8000., "zip": "10001",
+                          "sold_on": neo4j.time.DateTime(2024, 3, 1, 10, 30, 0, 0)}      # Blanks zapped
+    assert records[3]["zip"] == "00501"
+
+    # Merge on a primary key, resuming from the 4th data row, with integer years
+    result = db.import_csv_nodes(str(filename), labels="Car", merge_primary_key="vin", start_row=3,
+                                 field_types={"year": "int", "zip": "int"}, csv_options={"usecols": ["vin", "year", "zip"]},
+                                 report=False)
+    assert result["rows_read"] == 2
+    assert result["nodes_created"] == 0
+    assert result["next_row"] == 5
+    assert db.query("MATCH (c:Car {vin: 'A-4'}) RETURN c.year AS year, c.zip AS zip, c.price AS price", single_row=True) \
+           == {"year": 2019, "zip": 501, "price": 500.}
+    assert db.count_nodes("Car") == 4
+
+    # Values that don't match the type of their column
+    with pytest.raises(Exception):
+        db.import_csv_nodes(str(filename), labels="Car", field_types={"vin": "int"}, report=False)
+
+    result = db.import_csv_nodes(str(filename), labels="Truck", field_types={"vin": "int"}, strict_types=False,
+                                 csv_options={"usecols": ["vin"]}, report=False)
+    assert result["nodes_created"] == 0
+    assert result["rows_skipped"] == 5
+
+
+
+def test_import_csv_nodes_mixed_datetimes(db, tmp_path):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    filename = tmp_path / "sales.csv"
+    filename.write_text("id,sold_on\n"
+                        "1,2015-08-15 01:02:03\n"
+                        "2,2016-01-02\n"
+                        "3,2017-03-04T05:06:07\n"
+                        "4,not a date\n")
+
+    with pytest.raises(Exception):     # Strict types
+        db.import_csv_nodes(str(filename), labels="Sale", datetime_cols="sold_on", report=False)
+
+    # All the ISO shapes get parsed, even if they don't match the shape of the first value in the chunk
+    result = db.import_csv_nodes(str(filename), labels="Sale", datetime_cols="sold_on", strict_types=False,
+                                 report=False)
+    assert result["nodes_created"] == 4
+
+    q = "MATCH (s:Sale) RETURN s.sold_on AS sold_on ORDER BY s.id"
+    assert [r["sold_on"] for r in db.query(q)] == [neo4j.time.DateTime(2015, 8, 15, 1, 2, 3, 0),
+                                                   neo4j.time.DateTime(2016, 1, 2, 0, 0, 0, 0),
+                                                   neo4j.time.DateTime(2017, 3, 4, 5, 6, 7, 0),
+                                                   None]
+
+
+
+def test_import_csv_nodes_resume(db, tmp_path, monkeypatch):
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    filename = tmp_path / "numbers.csv"
+    filename.write_text("n\n" + "".join(f"{i}\n" for i in range(40)))
+
+    # Make the batch with the row for the number 4 fail
+    original_update_query = db.update_query
+
+    def failing_update_query(q, data_binding=None):
+        if any(row["props"]["n"] == 4 for row in data_binding["rows"]):
+            raise Exception("Simulated failure")
+        return original_update_query(q, data_binding)
+
+    monkeypatch.setattr(db, "update_query", failing_update_query)
+
+    with pytest.raises(Exception) as excinfo:
+        db.import_csv_nodes(str(filename), labels="Number", batch_size=2, workers=4, report=False)
+
+    error = excinfo.value
+    assert error.start_row == 4
+    assert "Simulated failure" in str(error.__cause__)
+    for (first, end) in error.skip_rows:    # Batches completed after the failed one, if any
+        assert first >= 6
+
+    monkeypatch.setattr(db, "update_query", original_update_query)
+
+    db.import_csv_nodes(str(filename), labels="Number", batch_size=2, workers=4, report=False,
+                        start_row=error.start_row, skip_rows=error.skip_rows)
+    assert db.count_nodes("Number") == 40       # No duplicates
+    q = "MATCH (x:Number) RETURN count(DISTINCT x.n) AS n"
+    assert db.query(q, single_cell="n") == 40
+
+
+
+def test_parse_iso_datetimes():
+    column = pd.Series(['2015-08-15 01:02:03', '2016-01-02', None, '2017-03-04T05:06:07'])
+    result = neo_access.GraphAccess.parse_iso_datetimes(column)
+    assert list(result.iloc[[0, 1, 3]]) == [datetime(2015, 8, 15, 1, 2, 3), datetime(2016, 1, 2),
+                                            datetime(2017, 3, 4, 5, 6, 7)]
+    assert pd.isna(result.iloc[2])
+
+    # Different UTC offsets: each value keeps its own
+    column = pd.Series(['2015-08-15 01:02:03+02:00', '2016-01-02T00:00:00-05:00', '2016-01-02'])
+    result = neo_access.GraphAccess.parse_iso_datetimes(column)
+    assert list(result) == [datetime(2015, 8, 15, 1, 2, 3, tzinfo=timezone(timedelta(hours=2))),
+                            datetime(2016, 1, 2, tzinfo=timezone(timedelta(hours=-5))),
+                            datetime(2016, 1, 2)]
+
+    column = pd.Series(['2015-08-15', 'junk'])
+    with pytest.raises(Exception):
+        neo_access.GraphAccess.parse_iso_datetimes(column)
+    result = neo_access.GraphAccess.parse_iso_datetimes(column, errors="coerce")
+    assert pd.isna(result.iloc[1])
+
+
+
+def test_load_parquet(db, tmp_path):
+    pa = pytest.importorskip("pyarrow")     # Optional dependency
+    import pyarrow.parquet as pq
+
+    db.empty_dbase(drop_indexes=True, drop_constraints=True)
+
+    table = pa.table({"vin": ["A-1", " A-2 ", "A-3", None],
+                      "year": [2020., float("nan"), 2022., 2023.],
+                      "color": ["white", "", None, "red"]})
+    filename = str(tmp_path / "cars.parquet")
+    pq.write_table(table, filename, row_group_size=2)
+
+    assert db.arrow_column_names(filename) == ["vin", "year", "color"]
+
+    result = db.load_parquet(filename, labels="Car", int_cols="year", batch_size=3)
+    assert result["rows"] == 4
+    assert result["nodes_created"] == 4
+
+    q = "MATCH (c:Car) RETURN c ORDER BY c.year, c.vin"
+    assert [r["c"] for r in db.query(q)] == [{"vin": "A-1", "year": 2020, "color": "white"},
+                                             {"vin": "A-3", "year": 2022},
+                                             {"year": 2023, "color": "red"},
+                                             {"vin": "A-2"}]
+
+    # Merge on a primary key, from an Arrow table, renaming a column
+    table = pa.table({"VIN": ["A-1", "A-9", None], "color": ["blue", "green", "pink"]})
+    result = db.load_parquet(table, labels="Car", merge_primary_key="vin", rename={"VIN": "vin"})
+    assert result["rows"] == 2      # The row without a primary key is skipped
+    assert result["nodes_created"] == 1
+    assert db.query("MATCH (c:Car {vin: 'A-1'}) RETURN c", single_cell="c") == {"vin": "A-1", "year": 2020, "color": "blue"}
+    assert db.count_nodes("Car") == 5
+
+    # Rows without any values are skipped, rather than becoming empty nodes
+    table = pa.table({"vin": ["A-5", None, " "], "color": ["grey", None, None]})
+    result = db.load_parquet(table, labels="Car")
+    assert result["rows"] == 1
+    assert result["nodes_created"] == 1
+    assert db.count_nodes("Car") == 6
+
+
+
+def test_arrow_records(db):
+    pa = pytest.importorskip("pyarrow")     # Optional dependency
+
+    batch = pa.table({"vin": ["A-1", " A-2 ", "", None],
+                      "year": [2020., float("nan"), 2022., None],
+                      "sold": ["2015-08-15 01:02:03", None, "2016-01-02", None]})
+    assert db.arrow_records(batch, int_cols="year", datetime_cols="sold", rename={"vin": "VIN"}) == \
+           [{"VIN": "A-1", "year": 2020, "sold": datetime(2015, 8, 15, 1, 2, 3)},
+            {"VIN": "A-2"},
+            {"year": 2022, "sold": datetime(2016, 1, 2)}]      # The last row, without any values, is skipped
+
+    # Datetime strings with UTC offsets, each keeping its own
+    batch = pa.table({"sold": ["2018-01-01T10:00:00+02:00", "2018-06-01 08:30:00-05:00", None]})
+    assert db.arrow_records(batch, datetime_cols="sold") == \
+           [{"sold": datetime(2018, 1, 1, 10, 0, 0, tzinfo=timezone(timedelta(hours=2)))},
+            {"sold": datetime(2018, 6, 1, 8, 30, 0, tzinfo=timezone(timedelta(hours=-5)))}]
+
+    # Values with the same UTC offset
+    batch = pa.table({"sold": ["2018-01-01T10:00:00+02:00", "2018-01-02T10:00:00+02:00"]})
+    assert db.arrow_records(batch, datetime_cols="sold") == \
+           [{"sold": datetime(2018, 1, 1, 10, 0, 0, tzinfo=timezone(timedelta(hours=2)))},
+            {"sold": datetime(2018, 1, 2, 10, 0, 0, tzinfo=timezone(timedelta(hours=2)))}]
@@ -3,6 +3,8 @@
 
 import pytest
 import json
+import gzip
+import neo4j.time
 from brainannex import graph_access as neo_access
 from utilities.comparisons import compare_recordsets
 
@@ -146,6 +148,57 @@ def test_export_dbase_json(db):
 
 
 
+def test_export_dbase_json_iter(db, tmp_path):
+    db.empty_dbase()
+
+    assert b"".join(db.export_dbase_json_iter(as_array=True)) == b"[]\n"
+
+    node_id_eve = db.create_node("User", {'name': 'Eve', 'born': neo4j.time.DateTime(2015, 8, 15, 1, 2, 3)})
+    node_id_adam = db.create_node("User", {'name': 'Adam', 'age': 30})
+    db.link_nodes_by_ids(node_id_eve, node_id_adam, "LOVES")
+    db.link_nodes_by_ids(node_id_eve, node_id_adam, "KNOWS", {'since': 1976})
+    rel_ids = db.query("MATCH ()-[r]->() RETURN type(r) AS name, id(r) AS rel_id")
+    rel_ids = {r["name"]: r["rel_id"] for r in rel_ids}
+
+    expected = [{"type": "node", "id": str(node_id_eve), "labels": ["User"],
+                 "properties": {"name": "Eve", "born": "2015-08-15T01:02:03.000000000"}},
+                {"type": "node", "id": str(node_id_adam), "labels": ["User"], "properties": {"name": "Adam", "age": 30}},
+                {"type": "relationship", "id": str(rel_ids["LOVES"]), "label": "LOVES",
+                 "start": {"id": str(node_id_eve), "labels": ["User"]}, "end": {"id": str(node_id_adam), "labels": ["User"]}},
+                {"type": "relationship", "id": str(rel_ids["KNOWS"]), "label": "KNOWS", "properties": {"since": 1976},
+                 "start": {"id": str(node_id_eve), "labels": ["User"]}, "end": {"id": str(node_id_adam), "labels": ["User"]}}
+               ]
+
+    # JSON Lines, read with tiny pages of internal id's
+    json_lines = b"".join(db.export_dbase_json_iter(page_size=1)).decode("utf-8")
+    assert compare_recordsets([json.loads(line) for line in json_lines.splitlines()], expected)
+
+    # A compressed JSON array, as expected by import_json_dump()
+    json_array = gzip.decompress(b"".join(db.export_dbase_json_iter(as_array=True, compress=True)))
+    assert compare_recordsets(json.loads(json_array), expected)
+
+    filename = str(tmp_path / "dbase.jsonl.gz")
+    result = db.export_dbase_json_file(filename)
+    assert result["nodes"] == 2
+    assert result["relationships"] == 2
+    assert result["properties"] == 5
+    with gzip.open(filename, "rt") as f:
+        assert compare_recordsets([json.loads(line) for line in f], expected)
+
+    # Large gaps in the internal id's, left by deleted nodes, don't lead to empty pages
+    filler_ids = [db.create_node("Filler", {"i": i}) for i in range(20)]
+    node_id_last = db.create_node("User", {'name': 'Cain'})
+    db.delete_nodes(db.match(labels="Filler"))
+    expected.append({"type": "node", "id": str(node_id_last), "labels": ["User"], "properties": {"name": "Cain"}})
+    assert node_id_last > max(filler_ids)
+
+    db.reset_query_stats()
+    json_lines = b"".join(db.export_dbase_json_iter(page_size=2)).decode("utf-8")
+    assert compare_recordsets([json.loads(line) for line in json_lines.splitlines()], expected)
+    assert sum(stats["count"] for stats in db.query_stats().values()) == 4     # 2 pages of nodes, and 2 of relationships
+
+
+
 def test_export_nodes_rels_json(db):
     db.empty_dbase()
 
@@ -470,3 +523,211 @@ def test_import_json_data(db):
     match = db.match(properties={"description":"Node without labels"})
     retrieved_records = db.get_nodes(match)
     assert len(retrieved_records) == 1
+
+
+
+def test_import_json_dump_file(db, tmp_path):
+    db.empty_dbase()
+    for i in range(10):
+        db.create_node(["User", "Client"] if i % 3 else "User", {"name": f"user_{i}", "rank": i})
+    db.query("MATCH (a :User), (b :User) WHERE a.rank + 1 = b.rank CREATE (a)-[:NEXT {gap: 1}]->(b)")
+    db.query("MATCH (a :Client), (b :User {rank: 0}) CREATE (a)-[:KNOWS]->(b)")
+
+    dump_file = str(tmp_path / "dump.jsonl.gz")
+    db.export_dbase_json_file(dump_file)
+
+    db.empty_dbase()
+    id_map_file = str(tmp_path / "id_map.sqlite")
+    result = db.import_json_dump_file(dump_file, id_map_file=id_map_file, batch_size=3)
+    assert result["nodes"] == 10
+    assert result["relationships"] == 15
+
+    assert db.count_nodes("User") == 10
+    assert db.count_nodes("Client") == 6
+    q = "MATCH (a :User)-[r :NEXT]->(b :User) WHERE a.rank + 1 = b.rank AND r.gap = 1 RETURN count(r) AS n"
+    assert db.query(q, single_cell="n") == 9
+    assert db.query("MATCH (:Client)-[r :KNOWS]->(:User {rank: 0}) RETURN count(r) AS n", single_cell="n") == 6
+
+    with pytest.raises(Exception):
+        db.import_json_dump_file(dump_file, id_map_file=id_map_file)    # The import was already completed
+
+    # A relationship to a node not in the dump
+    bad_dump = tmp_path / "bad_dump.json"
+    bad_dump.write_text('[{"type":"node","id":"1","labels":["User"]},\n'
+                        ' {"type":"relationship","id":"1","label":"KNOWS","start":{"id":"1"},"end":{"id":"2"}}\n]')
+    db.empty_dbase()
+    with pytest.raises(Exception):
+        db.import_json_dump_file(str(bad_dump))
+    assert db.count_nodes("User") == 1      # The nodes get imported first
+
+
+
+def test_export_import_snapshot(db, tmp_path):
+    pytest.importorskip("msgpack")
+
+    db.empty_dbase()
+    for i in range(10):
+        db.create_node(["User", "Client"] if i % 3 else "User",
+                       {"name": f"user_{i}", "rank": i, "since": neo4j.time.Date(2020, 1, i + 1), "tags": ["a", "b"]})
+    db.create_node("Empty")
+    db.query("MATCH (a :User), (b :User) WHERE a.rank + 1 = b.rank CREATE (a)-[:NEXT {gap: 1.5}]->(b)")
+    db.query("MATCH (a :Client), (b :User {rank: 0}) CREATE (a)-[:KNOWS]->(b)")
+
+    snapshot_file = str(tmp_path / "dbase.snapshot")
+    result = db.export_snapshot(snapshot_file, segment_size=4, page_size=3)
+    assert result["nodes"] == 11
+    assert result["relationships"] == 15
+
+    db.empty_dbase()
+    result = db.import_snapshot(snapshot_file, workers=3)
+    assert result["nodes"] == 11
+    assert result["relationships"] == 15
+
+    assert db.count_nodes("User") == 10
+    assert db.count_nodes("Client") == 6
+    assert db.count_nodes("Empty") == 1
+    assert db.get_record_by_primary_key("User", primary_key_name="rank", primary_key_value=4) == \
+           {"name": "user_4", "rank": 4, "since": neo4j.time.Date(2020, 1, 5), "tags": ["a", "b"]}
+    q = "MATCH (a :User)-[r :NEXT]->(b :User) WHERE a.rank + 1 = b.rank AND r.gap = 1.5 RETURN count(r) AS n"
+    assert db.query(q, single_cell="n") == 9
+    assert db.query("MATCH (:Client)-[r :KNOWS]->(:User {rank: 0}) RETURN count(r) AS n", single_cell="n") == 6
+
+    bad_file = tmp_path / "not_a_snapshot"
+    bad_file.write_bytes(b"some other content")
+    with pytest.raises(Exception):
+        db.import_snapshot(str(bad_file))
+
+
+
+def test_change_log(db, tmp_path):
+    db.empty_dbase()
+    log = db.enable_change_log(str(tmp_path / "change_log"))
+    try:
+        db.create_node("Car", {"vin": 1, "color": "white", "sold": neo4j.time.Date(2020, 1, 31)})
+        db.create_node("Car", {"vin": 2, "color": "red"})
+        db.create_node("Person", {"name": "Julian"})
+        db.query("MATCH (n :Car {vin: 3}) SET n.color = 'blue'")   # No changes: not logged
+        db.set_fields(match=db.match(labels="Car", key_name="vin", key_value=2), set_dict={"color": "blue"})
+        db.add_links(match_from=db.match(labels="Person"), match_to=db.match(labels="Car"), rel_name="OWNS")
+        with pytest.raises(Exception):
+            with db.transaction():
+                db.create_node("Car", {"vin": 99})
+                raise Exception("Rolled back: not logged")
+        db.delete_nodes(db.match(labels="Car", key_name="vin", key_value=1))
+    finally:
+        db.disable_change_log()
+
+    assert log.last_seq() == 6
+    export_file = str(tmp_path / "changes.jsonl.gz")
+    assert log.export_range(export_file, first_seq=1)["last_seq"] == 6
+
+    # Replay all the changes onto an empty database
+    db.empty_dbase()
+    stats = db.apply_changes(export_file, batch_size=4)
+    assert (stats["applied"], stats["last_seq"]) == (6, 6)
+
+    assert db.get_nodes(db.match(labels="Car")) == [{"vin": 2, "color": "blue"}]
+    assert db.count_nodes("Person") == 1
+    assert db.number_of_links(match_from=db.match(labels="Person"), match_to=db.match(labels="Car"), rel_name="OWNS") == 1
+
+    # Replaying them again, on top of the current data, gives different results
+    with pytest.raises(Exception):
+        db.apply_changes(export_file)
+
+
+
+def test_change_log_id_translation(db, tmp_path):
+    db.empty_dbase()
+    log = db.enable_change_log(str(tmp_path / "change_log"))
+    try:
+        with pytest.raises(Exception):
+            db.create_node("Car", {"vin": 1, "owner": object()})    # Cannot be logged: never created
+        assert db.count_nodes("Car") == 0
+
+        car_1 = db.create_node("Car", {"vin": 1})
+        car_2 = db.create_node("Car", {"vin": 2})
+        db.set_fields(match=car_2, set_dict={"color": "red"})       # Located by internal ID
+        db.delete_nodes(car_1)
+        car_3 = db.create_node("Car", {"vin": 3})                   # Might re-use the ID of the deleted node
+        db.set_fields(match=car_3, set_dict={"color": "green"})
+    finally:
+        db.disable_change_log()
+
+    # Replay onto a database where the new nodes get different internal ID's
+    db.empty_dbase()
+    for i in range(5):
+        db.create_node("Filler", {"i": i})
+
+    id_map = {}
+    stats = db.apply_changes(log, id_map=id_map)
+    assert stats["applied"] == 6
+    assert set(id_map) == {car_1, car_2, car_3}
+    q = "MATCH (c :Car) RETURN c.vin AS vin, c.color AS color ORDER BY vin"
+    assert db.query(q) == [{"vin": 2, "color": "red"}, {"vin": 3, "color": "green"}]
+    assert db.count_nodes("Filler") == 5        # Untouched
+
+    # Nodes created without logging their ID's make the later ID-based changes unreplayable
+    db.empty_dbase()
+    log = db.enable_change_log(str(tmp_path / "change_log_2"))
+    try:
+        db.query("UNWIND [1, 2] AS vin CREATE (:Car {vin: vin})")
+        car_id = db.get_node_internal_id(db.match(labels="Car", key_name="vin", key_value=1))
+        db.set_fields(match=car_id, set_dict={"color": "blue"})
+    finally:
+        db.disable_change_log()
+
+    db.empty_dbase()
+    with pytest.raises(Exception):
+        db.apply_changes(log)
+    assert db.count_nodes("Car") == 0     # The batch was rolled back
+
+
+
+def test_change_log_replay_onto_another_database(db, tmp_path):
+    db.empty_dbase()
+    log = db.enable_change_log(str(tmp_path / "change_log"))
+    try:
+        car = db.create_node("Car", {"vin": 1})
+        db.set_fields(match=car, set_dict={"color": "red"})        # Located by internal ID
+        person = db.create_node("Person", {"name": "Julian"})
+        db.add_links_fast(match_from=person, match_to=car, rel_name="OWNS")
+    finally:
+        db.disable_change_log()
+
+    # A second database, whose own nodes take up the first internal ID's
+    replica = neo_access.GraphAccess(host="memory")
+    for i in range(3):
+        replica.create_node("Filler", {"i": i})
+
+    id_map = {}
+    stats = replica.apply_changes(log, id_map=id_map)
+    assert stats["applied"] == 4
+    assert set(id_map) == {car, person}
+
+    assert replica.get_nodes(id_map[car]) == [{"vin": 1, "color": "red"}]
+    assert replica.number_of_links(match_from=id_map[person], match_to=id_map[car], rel_name="OWNS") == 1
+    assert replica.get_nodes(replica.match(labels="Filler", key_name="i", key_value=0)) == [{"i": 0}]    # Untouched
+
+
+
+def test_translate_ids():
+    lookup = {10: 20, 11: 21}.get
+
+    q = "MATCH (n) WHERE id(n) = $n_internal_id SET n.color = $color"
+    assert neo_access.GraphAccess._translate_ids(q, {"n_internal_id": 10, "color": 10}, lookup) == \
+           ({"n_internal_id": 20, "color": 10}, set())
+
+    q = "UNWIND $rows AS row MATCH (n) WHERE id(n) = row.id SET n.x = row.x"
+    rows = [{"id": 11, "x": 11}, {"id": 12, "x": 12}]
+    assert neo_access.GraphAccess._translate_ids(q, {"rows": rows}, lookup) == \
+           ({"rows": [{"id": 21, "x": 11}, {"id": 12, "x": 12}]}, {12})
+    assert rows[0]["id"] == 11      # The original parameters are left untouched
+
+    q = "MATCH (n) WHERE id(n) IN $ids DETACH DELETE n"
+    assert neo_access.GraphAccess._translate_ids(q, {"ids": [10, 12]}, lookup) == ({"ids": [20, 12]}, {12})
+
+    # ID's written in the text of the query are never rewritten
+    q = "MATCH (n) WHERE id(n) = 12 SET n.x = 1"
+    assert neo_access.GraphAccess._translate_ids(q, {}, lookup) == ({}, {12})
+    with pytest.raises(Exception):
+        neo_access.GraphAccess._translate_ids("MATCH (n) WHERE id(n) = 10 SET n.x = 1", {}, lookup)
@@ -7,6 +7,8 @@
 import pytest
 import pandas as pd
 import numpy as np
+import neo4j.time
+from datetime import datetime, timezone, timedelta
 from brainannex import GraphAccess, GraphSchema, SchemaCache
 from test_graph_schema import create_sample_schema_1, create_sample_schema_2
 from utilities.comparisons import *
@@ -475,6 +477,51 @@ def test_import_pandas_nodes_7(db):
 
 
 
+def test_import_parquet_nodes(db, tmp_path):
+    pa = pytest.importorskip("pyarrow")     # Optional dependency
+    import pyarrow.parquet as pq
+
+    db.empty_dbase()
+
+    GraphSchema.create_class_with_properties(name="Motor Vehicle",
+                                             properties=["VID", "manufacturer", "year", "sold"], strict=True)
+
+    table = pa.table({"VID": ["c1", " c2 ", "c3", ""],
+                      "make": ["Honda", "Toyota", "", "Ford"],
+                      "year": [2003., float("nan"), 2023., 2024.],
+                      "sold": ["2015-08-15 01:02:03", None, "2024-01-01 00:00:00", None],
+                      "notes": ["a", "b", "c", "d"]})
+    filename = str(tmp_path / "vehicles.parquet")
+    pq.write_table(table, filename, row_group_size=2)
+
+    with pytest.raises(Exception):
+        GraphSchema.import_parquet_nodes(filename, class_name="Motor Vehicle")    # "notes" isn't in the Schema
+
+    result = GraphSchema.import_parquet_nodes(filename, class_name="Motor Vehicle", drop="notes",
+                                              rename={"make": "manufacturer"}, int_cols="year", datetime_cols="sold",
+                                              max_batch_size=3)
+    assert result["number_nodes_created"] == 4
+
+    q = "MATCH (v :`Motor Vehicle`) RETURN v ORDER BY v.year"
+    records = [r["v"] for r in db.query(q)]
+    assert records[0] == {"VID": "c1", "manufacturer": "Honda", "year": 2003, "_CLASS": "Motor Vehicle",
+                          "sold": neo4j.time.DateTime(2015, 8, 15, 1, 2, 3, 0)}
+    assert records[1] == {"VID": "c3", "year": 2023, "_CLASS": "Motor Vehicle",
+                          "sold": neo4j.time.DateTime(2024, 1, 1, 0, 0, 0, 0)}
+    assert records[2] == {"manufacturer": "Ford", "year": 2024, "_CLASS": "Motor Vehicle"}
+    assert records[3] == {"VID": "c2", "manufacturer": "Toyota", "_CLASS": "Motor Vehicle"}
+
+    # Merge on a primary key, from an Arrow table; the row without a VID is skipped
+    table = pa.table({"VID": ["c1", "c9", None], "year": [1999, 2000, 2001]})
+    result = GraphSchema.import_parquet_nodes(table, class_name="Motor Vehicle", primary_key="VID")
+    assert result["number_nodes_created"] == 1
+    assert len(result["affected_nodes_ids"]) == 2
+    assert db.query("MATCH (v :`Motor Vehicle` {VID: 'c1'}) RETURN v.year AS year, v.manufacturer AS m",
+                    single_row=True) == {"year": 1999, "m": "Honda"}
+    assert GraphSchema.count_data_nodes_of_class(class_name="Motor Vehicle") == 5
+
+
+
 def test_import_pandas_nodes_1_OLD(db):
     db.empty_dbase()
 
@@ -2016,3 +2063,35 @@ def test_scrub_dict():
                       "b": 3.5,
                       "d": "some value", "e": "needs  cleaning!",
                       "h": (1, 2)}
+
+
+
+def test__scrubbed_records():
+    df = pd.DataFrame({"name": ["  Julian ", "   ", None, "Val"],
+                       "born": ["2015-08-15 01:02:03", np.nan, "", "2020-01-01 10:00:00"],
+                       "rank": [4.0, 7.9, np.nan, 2],
+                       "tags": [(1, 2), "", 3.5, np.nan]})
+
+    result = list(GraphSchema._scrubbed_records(df, datetime_cols="born", int_cols="rank", chunk_size=3))
+    assert result == [{"name": "Julian", "born": datetime(2015, 8, 15, 1, 2, 3), "rank": 4, "tags": (1, 2)},
+                      {"rank": 7},
+                      {"tags": 3.5},
+                      {"name": "Val", "born": datetime(2020, 1, 1, 10, 0, 0), "rank": 2}]
+
+    # Same outcome as scrub_dict(), row by row, when no conversions are requested
+    df = pd.DataFrame({"a": [1, 2], "b": [3.5, np.nan], "c": ["  x", ""]})
+    assert list(GraphSchema._scrubbed_records(df)) == [GraphSchema.scrub_dict(d) for d in df.to_dict(orient="records")]
+
+    assert list(GraphSchema._scrubbed_records(pd.DataFrame({"a": []}))) == []
+
+    # Datetimes in a mix of ISO shapes, and with different UTC offsets
+    df = pd.DataFrame({"sold": ["2015-08-15 01:02:03", "2016-01-02", "2017-03-04T05:06:07", None],
+                       "shipped": ["2015-08-15T01:02:03+02:00", "2016-01-02T00:00:00-05:00", None, "2017-03-04"]})
+    result = list(GraphSchema._scrubbed_records(df, datetime_cols=["sold", "shipped"]))
+    assert result == [{"sold": datetime(2015, 8, 15, 1, 2, 3),
+                       "shipped": datetime(2015, 8, 15, 1, 2, 3, tzinfo=timezone(timedelta(hours=2)))},
+                      {"sold": datetime(2016, 1, 2),
+                       "shipped": datetime(2016, 1, 2, tzinfo=timezone(timedelta(hours=-5)))},
+                      {"sold": datetime(2017, 3, 4, 5, 6, 7)},
+                      {"shipped": datetime(2017, 3, 4)}]
+    assert result[1]["shipped"].utcoffset() == timedelta(hours=-5)     # The original offset is kept
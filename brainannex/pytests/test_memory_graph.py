@@ -0,0 +1,242 @@
+# No database needed: these tests use the in-memory graph store
+
+import pytest
+from brainannex import GraphAccess, MemoryGraphAccess
+from utilities.comparisons import compare_unordered_lists
+
+
+
+# Provide a new, empty, in-memory store to each test
+@pytest.fixture()
+def db():
+    yield MemoryGraphAccess()
+
+
+
+
+def test_create_and_get_nodes(db):
+    car_id = db.create_node("car", {"vin": 123, "color": "white"})
+    db.create_node(["car", "used"], {"vin": 456, "color": "red", "notes": None})
+    db.create_node("person", {"name": "Julian"})
+
+    assert db.count_nodes() == 3
+    assert db.count_nodes("car") == 2
+    assert db.count_nodes(["car", "used"]) == 1
+    assert compare_unordered_lists(db.get_labels(), ["car", "used", "person"])
+
+    assert db.get_nodes(car_id) == [{"vin": 123, "color": "white"}]
+    assert db.get_nodes(db.match(labels="car", key_name="vin", key_value=456), return_labels=True) == \
+           [{"vin": 456, "color": "red", "_node_labels": ["car", "used"]}]      # The None value wasn't stored
+    assert db.get_nodes(db.match(labels="car", properties={"color": "white"}), single_cell="vin") == 123
+    assert db.get_nodes(db.match(labels="car"), order_by="vin", limit=1, return_internal_id=True) == \
+           [{"vin": 123, "color": "white", "_internal_id": car_id}]
+    assert db.get_nodes(db.match(labels="boat"), single_row=True) is None
+
+    assert db.get_record_by_primary_key("car", primary_key_name="vin", primary_key_value=123) == {"vin": 123, "color": "white"}
+    assert db.exists_by_key("car", key_name="vin", key_value=999) == False
+    assert db.exists_by_internal_id(car_id)
+    assert db.get_node_internal_id(db.match(labels="person")) == db.get_nodes(db.match(labels="person"), return_internal_id=True)[0]["_internal_id"]
+
+    result = db.merge_node("car", {"vin": 123, "color": "white"})
+    assert result == {"created": False, "_internal_id": car_id}
+    assert db.merge_node("car", {"vin": 789})["created"] == True
+    assert db.count_nodes("car") == 3
+
+    assert db.get_nodes(db.match(labels="car", clause="n.vin > 200"), order_by="vin") == [{"vin": 456, "color": "red"}, {"vin": 789}]
+
+
+
+def test_set_fields_and_delete(db):
+    car_id = db.create_node("car", {"vin": 123, "color": "white", "price": 7000})
+    db.create_node("car", {"vin": 456, "color": "white"})
+
+    assert db.set_fields(match=car_id, set_dict={"color": "red", "price": "", "year": 2020}) == 3
+    assert db.get_nodes(car_id) == [{"vin": 123, "color": "red", "year": 2020}]
+
+    assert db.set_fields(match=db.match(labels="car"), set_dict={"sold": True}) == 2
+
+    result = db.set_fields_many({456: {"color": "blue", "sold": ""}, 999: {"color": "pink"}}, labels="car", key_name="vin")
+    assert result == {"rows": 2, "nodes_updated": 1, "properties_set": 2}
+    assert db.get_nodes(db.match(labels="car", key_name="vin", key_value=456)) == [{"vin": 456, "color": "blue"}]
+
+    assert db.delete_nodes(db.match(labels="car", key_name="vin", key_value=456)) == 1
+    assert db.count_nodes("car") == 1
+
+    db.create_node("person", {"name": "Julian"})
+    db.empty_dbase(keep_labels="person")
+    assert db.count_nodes() == 1
+    db.empty_dbase()
+    assert db.count_nodes() == 0
+
+
+
+def test_links(db):
+    person_id = db.create_node("person", {"name": "Julian"})
+    car_1 = db.create_node("car", {"vin": 1})
+    car_2 = db.create_node(["car", "used"], {"vin": 2})
+
+    assert db.add_links(match_from=person_id, match_to=db.match(labels="car"), rel_name="OWNS") == 2
+    with pytest.raises(Exception):
+        db.add_links(match_from=person_id, match_to=car_1, rel_name="OWNS")   # Already present
+
+    assert db.get_relationship_types() == ["OWNS"]
+    assert db.links_exist(match_from=person_id, match_to=car_2, rel_name="OWNS")
+    assert db.number_of_links(match_from=person_id, match_to=db.match(labels="car"), rel_name="OWNS") == 2
+
+    assert db.follow_links(match=person_id, rel_name="OWNS", neighbor_labels="used") == [{"vin": 2}]
+    assert db.follow_links(match=car_1, rel_name="OWNS", rel_dir="IN", include_id=True) == \
+           [{"name": "Julian", "_internal_id": person_id}]
+    assert db.count_links(match=person_id, rel_name="OWNS") == 2
+    assert db.count_links(match=car_1, rel_name="OWNS", rel_dir="BOTH") == 1
+
+    (parents, children) = db.get_parents_and_children(car_2)
+    assert parents == [{"_internal_id": person_id, "labels": ["person"], "rel": "OWNS"}]
+    assert children == []
+
+    assert db.get_link_summary(person_id) == {"in": [], "out": [("OWNS", 2)]}
+    assert db.get_siblings(car_1, rel_name="OWNS", rel_dir="IN") == \
+           [{"vin": 2, "_internal_id": car_2, "_node_labels": ["car", "used"]}]
+
+    assert db.follow_links_many([person_id, car_1], rel_name="OWNS") == {person_id: [{"vin": 1}, {"vin": 2}], car_1: []}
+    assert db.get_parents_and_children_many([car_2]) == {car_2: (parents, children)}
+    assert db.follow_links_many([str(person_id)], rel_name="OWNS") == {str(person_id): [{"vin": 1}, {"vin": 2}]}
+    assert db.get_parents_and_children_many([str(car_2)]) == {str(car_2): (parents, children)}
+
+    new_id = db.create_node_with_links("person", {"name": "Val"},
+                                       links=[{"internal_id": car_1, "rel_name": "DRIVES", "rel_attrs": {"since": 2022}}])
+    assert db.follow_links(match=new_id, rel_name="DRIVES") == [{"vin": 1}]
+
+    assert db.remove_links(match_from=person_id, match_to=car_1, rel_name="OWNS") == 1
+    assert db.count_links(match=person_id, rel_name="OWNS") == 1
+
+    db.delete_nodes(car_2)      # Its links go, too
+    assert db.count_links(match=person_id, rel_name="OWNS") == 0
+
+
+
+def test_indexes(db):
+    for i in range(10):
+        db.create_node("car", {"vin": i, "color": "red" if i % 2 else "blue"})
+
+    assert db.ensure_index(label="car", key="vin") == True
+    assert db.ensure_index(label="car", key="vin") == False
+    assert db.get_nodes(db.match(labels="car", key_name="vin", key_value=7)) == [{"vin": 7, "color": "red"}]
+
+    db.set_fields(db.match(labels="car", key_name="vin", key_value=7), {"vin": 70})    # The index gets updated
+    assert db.get_nodes(db.match(labels="car", key_name="vin", key_value=7)) == []
+    assert db.count_nodes("car") == 10
+    assert db.get_nodes(db.match(labels="car", key_name="vin", key_value=70), single_cell="color") == "red"
+
+    assert db.create_constraint(label="car", key="color") == False      # Duplicate values are present
+    assert db.create_constraint(label="person", key="name") == True
+    db.create_node("person", {"name": "Julian"})
+    with pytest.raises(Exception):
+        db.create_node("person", {"name": "Julian"})                    # The constraint is enforced
+
+    assert [p["name"] for p in db.index_population_progress()] == ["car.vin", "person.name.UNIQUE"]
+
+    db.drop_all_indexes()
+    assert db.index_population_progress() == []
+    db.create_node("person", {"name": "Julian"})
+    assert db.count_nodes("person") == 2
+
+
+
+def test_cypher_read_queries(db):
+    db.query("CREATE (:car {vin: 1, color: 'red', price: 1000}), (:car {vin: 2, color: 'red', price: 3000}), "
+             "(:car {vin: 3, color: 'blue'}), (:person {name: 'Julian'})")
+
+    assert db.query("MATCH (c:car) WHERE c.vin > $min RETURN c.vin AS vin ORDER BY vin DESC", {"min": 1}) == \
+           [{"vin": 3}, {"vin": 2}]
+    assert db.query("MATCH (c:car) RETURN c.color AS color, count(c) AS n, sum(c.price) AS total ORDER BY color") == \
+           [{"color": "blue", "n": 1, "total": 0}, {"color": "red", "n": 2, "total": 4000}]
+    assert db.query("MATCH (c:car) RETURN collect(DISTINCT c.color) AS colors", single_cell="colors") in \
+           (["red", "blue"], ["blue", "red"])
+    assert db.query("MATCH (c:car {color: 'red'}) RETURN c.vin AS vin ORDER BY vin SKIP 1 LIMIT 5") == [{"vin": 2}]
+    assert db.query("MATCH (c:car) WHERE c.price IS NULL RETURN c", single_cell="c") == {"vin": 3, "color": "blue"}
+    assert db.query("MATCH (n) WHERE n:person OR n.vin IN [1, 3] RETURN count(n) AS n", single_cell="n") == 3
+    assert db.query("UNWIND range(1, 3) AS x WITH x * 2 AS y WHERE y > 2 RETURN collect(y) AS ys", single_cell="ys") == [4, 6]
+    assert db.query("MATCH (p:person) RETURN toUpper(p.name) + '!' AS s, labels(p) AS l") == \
+           [{"s": "JULIAN!", "l": ["person"]}]
+    assert db.query("MATCH (c:car {vin: 99}) RETURN c") == []
+
+
+
+def test_cypher_patterns(db):
+    db.query("CREATE (p:person {name: 'Julian'})-[:OWNS {since: 2020}]->(c:car {vin: 1}), "
+             "(p)-[:OWNS]->(:car {vin: 2}), (c)-[:MADE_BY]->(:company {name: 'Acme'})")
+
+    assert db.query("MATCH (:person)-[r:OWNS]->(c:car) RETURN c.vin AS vin, r.since AS since ORDER BY vin") == \
+           [{"vin": 1, "since": 2020}, {"vin": 2, "since": None}]
+    assert db.query("MATCH (c:company)<-[:MADE_BY]-(:car)<-[:OWNS]-(p) RETURN p.name AS name", single_cell="name") == "Julian"
+    assert db.query("MATCH (p:person)-[*1..2]->(x) RETURN count(DISTINCT x) AS n", single_cell="n") == 3
+    assert db.query("MATCH (c:car) OPTIONAL MATCH (c)-[:MADE_BY]->(m) RETURN c.vin AS vin, m.name AS maker ORDER BY vin") == \
+           [{"vin": 1, "maker": "Acme"}, {"vin": 2, "maker": None}]
+    assert db.query("MATCH (c:car) WHERE NOT (c)-[:MADE_BY]->() RETURN c.vin AS vin") == [{"vin": 2}]
+    assert db.query("MATCH (c:car) RETURN c.vin AS vin, size([(c)<-[:OWNS]-() | 1]) AS owners ORDER BY vin") == \
+           [{"vin": 1, "owners": 1}, {"vin": 2, "owners": 1}]
+
+
+
+def test_cypher_updates(db):
+    result = db.update_query("CREATE (:car {vin: 1}), (:car {vin: 2})")
+    assert result["nodes_created"] == 2
+    assert result["properties_set"] == 2
+    assert result["labels_added"] == 2
+
+    result = db.update_query("MERGE (c:car {vin: 1}) ON MATCH SET c.color = 'red' ON CREATE SET c.color = 'blue'")
+    assert result.get("nodes_created", 0) == 0
+    assert db.query("MATCH (c:car {vin: 1}) RETURN c.color AS color", single_cell="color") == "red"
+
+    result = db.update_query("MATCH (a:car {vin: 1}), (b:car {vin: 2}) MERGE (a)-[:NEXT]->(b)")
+    assert result["relationships_created"] == 1
+    result = db.update_query("MATCH (a:car {vin: 1}), (b:car {vin: 2}) MERGE (a)-[:NEXT]->(b)")
+    assert result.get("relationships_created", 0) == 0     # Already present
+
+    result = db.update_query("MATCH (c:car {vin: 2}) SET c:used, c.price = 100 REMOVE c.vin")
+    assert result["labels_added"] == 1
+    assert db.get_nodes(db.match(labels="used"), return_labels=True) == [{"price": 100, "_node_labels": ["car", "used"]}]
+
+    with pytest.raises(Exception):
+        db.update_query("MATCH (c:car {vin: 1}) DELETE c")          # It still has a link
+
+    result = db.update_query("MATCH (c:car {vin: 1}) DETACH DELETE c")
+    assert result["nodes_deleted"] == 1
+    assert result["relationships_deleted"] == 1
+    assert db.count_nodes() == 1
+
+
+
+def test_cypher_atomicity(db):
+    db.create_node("car", {"vin": 1})
+
+    with pytest.raises(Exception):
+        db.update_query("UNWIND [2, 3, 0] AS x CREATE (:car {vin: x, ratio: 6 / x})")     # Fails on the 3rd row
+    assert db.count_nodes("car") == 1       # The whole query was rolled back
+
+    with pytest.raises(Exception):
+        with db.transaction():
+            db.create_node("car", {"vin": 2})
+            assert db.count_nodes("car") == 2
+            raise Exception("Abort the transaction")
+    assert db.count_nodes("car") == 1       # The whole transaction was rolled back
+
+    with db.transaction():
+        db.create_node("car", {"vin": 2})
+    assert db.count_nodes("car") == 2
+
+    with pytest.raises(Exception):
+        db.query("MATCH (n) RETURN n ORDER")    # Malformed Cypher
+
+
+
+def test_constructor():
+    db = GraphAccess(host="memory")     # The in-memory store can be selected by the constructor of GraphAccess
+    assert type(db) == MemoryGraphAccess
+
+    db.query("CREATE (:car {vin: 1})")
+    assert db.count_nodes("car") == 1
+    assert db.query_stats()             # The queries are run by the machinery of the base classes
+
+    with pytest.raises(Exception):
+        db.enable_change_log("change_log")
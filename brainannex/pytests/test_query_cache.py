@@ -0,0 +1,51 @@
+# No database needed
+
+import time
+from brainannex.query_cache import QueryCache
+
+
+
+def test_get_and_put():
+    cache = QueryCache(max_entries=2)
+    assert cache.get("a") == (False, None)
+
+    cache.put("a", [1, 2], tags=["Car"])
+    cache.put("b", 3, tags=["Person"])
+    assert cache.get("a") == (True, [1, 2])
+
+    cache.put("c", 4)       # "b" is now the least-recently used entry, and gets evicted
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 4)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 2, 1, 2)
+
+
+
+def test_invalidate():
+    cache = QueryCache()
+    cache.put("cars", 1, tags=["Car"])
+    cache.put("people", 2, tags=["Person"])
+    cache.put("both", 3, tags=["Car", "Person"])
+    cache.put("all_labels", ["Car", "Person"])      # No tags: it depends on everything
+
+    assert cache.invalidate(["Car"]) == 3
+    assert cache.get("people") == (True, 2)
+    assert cache.get("both") == (False, None)
+    assert cache.get("all_labels") == (False, None)
+
+    assert cache.invalidate() == 1
+    assert cache.stats()["entries"] == 0
+
+
+
+def test_limits():
+    cache = QueryCache(max_bytes=2000, ttl=0.05)
+    cache.put("big", list(range(1000)))     # Too big to be cached
+    assert cache.get("big") == (False, None)
+
+    cache.put("small", [1, 2, 3])
+    assert cache.get("small") == (True, [1, 2, 3])
+    time.sleep(0.1)
+    assert cache.get("small") == (False, None)      # Expired
+    assert cache.stats()["expirations"] == 1
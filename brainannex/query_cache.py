@@ -0,0 +1,217 @@
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+
+'''
+    ----------------------------------------------------------------------------------
+	MIT License
+
+        Copyright (c) 2021-2026 Julian A. West and the BrainAnnex.org project.
+	----------------------------------------------------------------------------------
+'''
+
+
+class QueryCache:
+    """
+    In-memory LRU cache of query results, with optional expiration (TTL) and memory bound,
+    meant for use by GraphAccess - see GraphAccess.enable_cache()
+
+    Each entry is stored under a hashable key (typically, made from a Cypher query and its parameters),
+    and is tagged with the names of the node labels (or relationship types) that its data depends on;
+    invalidate() discards all the entries that carry any of the given tags.
+    Entries tagged with ANY_TAG depend on the whole database
+    (for example, the list of all labels), and get discarded by any invalidation.
+
+    All methods are thread-safe.
+
+    EXAMPLE:
+        cache = QueryCache(max_entries=100, ttl=60)
+        cache.put(("MATCH (n :Car) RETURN count(n)", ""), 12, tags=["Car"])
+        cache.get(("MATCH (n :Car) RETURN count(n)", ""))     # (True, 12)
+        cache.invalidate(["Car"])
+        cache.get(("MATCH (n :Car) RETURN count(n)", ""))     # (False, None)
+    """
+
+    ANY_TAG = "*"       # Tag for entries that depend on the entire database
+
+
+    def __init__(self, max_entries=1000, max_bytes=50_000_000, ttl=None):
+        """
+
+        :param max_entries: [OPTIONAL] Max number of entries to keep; the least-recently used ones get evicted
+        :param max_bytes:   [OPTIONAL] Approximate bound on the memory used by the cached values (see _approx_size);
+                                None means no bound.  Values larger than this are never cached
+        :param ttl:         [OPTIONAL] Number of seconds after which entries expire;  None means never
+        """
+        assert type(max_entries) == int and max_entries >= 1, \
+            "QueryCache(): argument `max_entries` must be an integer >= 1"
+        assert (max_bytes is None) or max_bytes > 0, \
+            "QueryCache(): argument `max_bytes`, if passed, must be a positive number"
+        assert (ttl is None) or ttl > 0, \
+            "QueryCache(): argument `ttl`, if passed, must be a positive number of seconds"
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._lock = threading.Lock()   # To protect all the data structures below
+        self._entries = OrderedDict()   # Indexed by key; the values are triplets (value, tags, expiration time).
+                                        #   Ordered from the least- to the most-recently used
+        self._sizes = {}                # Approximate size of the value of each entry, indexed by key
+        self._by_tag = {}               # Sets of keys, indexed by tag
+        self._total_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+
+
+    def get(self, key) -> (bool, object):
+        """
+        Look up the given key
+
+        :param key: Any hashable value
+        :return:    The pair (True, cached value) if found and not expired;  or (False, None) otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return (False, None)
+
+            (value, _, expiration) = entry
+            if (expiration is not None) and (time.monotonic() > expiration):
+                self._discard(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return (False, None)
+
+            self._entries.move_to_end(key)      # Now it's the most-recently used
+            self._stats["hits"] += 1
+            return (True, value)
+
+
+
+    def put(self, key, value, tags=None) -> None:
+        """
+        Store the given value under the given key, evicting the least-recently used entries as needed
+
+        :param key:     Any hashable value
+        :param value:   The value to cache
+        :param tags:    [OPTIONAL] List or set of strings with the labels (or relationship types) that the value depends on;
+                            if None or empty, the value is regarded as dependent on the entire database
+        :return:        None
+        """
+        tags = frozenset(tags) if tags else frozenset([self.ANY_TAG])
+        size = self._approx_size(value)
+
+        if (self.max_bytes is not None) and (size > self.max_bytes):
+            return          # Too big to be cached
+
+        expiration = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+
+            self._entries[key] = (value, tags, expiration)
+            self._sizes[key] = size
+            self._total_bytes += size
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+
+            # Evict the least-recently used entries, as needed
+            while (len(self._entries) > self.max_entries) or \
+                    ((self.max_bytes is not None) and (self._total_bytes > self.max_bytes)):
+                oldest_key = next(iter(self._entries))
+                self._discard(oldest_key)
+                self._stats["evictions"] += 1
+
+
+
+    def invalidate(self, tags=None) -> int:
+        """
+        Discard all the entries that depend on any of the given tags,
+        as well as all the entries that depend on the entire database.
+        If no tags are given, discard everything
+
+        :param tags:    [OPTIONAL] List or set of strings with the names of labels (or relationship types)
+                            affected by a database change;  None means: unknown, or everything
+        :return:        The number of entries discarded
+        """
+        with self._lock:
+            if tags is None:
+                keys = list(self._entries)
+            else:
+                keys = set(self._by_tag.get(self.ANY_TAG, set()))
+                for tag in tags:
+                    keys |= self._by_tag.get(tag, set())
+
+            for key in keys:
+                self._discard(key)
+
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+
+
+
+    def clear(self) -> None:
+        """
+        Discard all the entries, and reset the statistics
+
+        :return:    None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._by_tag.clear()
+            self._total_bytes = 0
+            self._stats = {name: 0 for name in self._stats}
+
+
+
+    def stats(self) -> dict:
+        """
+        Return the usage statistics of the cache
+
+        EXAMPLE:    {"hits": 37, "misses": 12, "evictions": 0, "expirations": 2, "invalidations": 5,
+                     "entries": 9, "bytes": 5370, "hit_rate": 0.755}
+
+        :return:    A dict
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return self._stats | {"entries": len(self._entries), "bytes": self._total_bytes,
+                                  "hit_rate": self._stats["hits"] / lookups if lookups else None}
+
+
+
+    def _discard(self, key) -> None:
+        """
+        Remove the entry with the given key (which must be present.)  The caller must hold the lock
+        """
+        (_, tags, _) = self._entries.pop(key)
+        self._total_bytes -= self._sizes.pop(key)
+        for tag in tags:
+            keys = self._by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._by_tag[tag]
+
+
+
+    @classmethod
+    def _approx_size(cls, value) -> int:
+        """
+        Estimate the memory used by the given value, including the contents of lists, tuples, sets and dicts
+
+        :param value:   Any python value
+        :return:        An approximate number of bytes
+        """
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(cls._approx_size(k) + cls._approx_size(v) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(cls._approx_size(v) for v in value)
+
+        return size
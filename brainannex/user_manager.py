@@ -27,7 +27,7 @@ class UserManager:
         :return:    None
         """
 
-        assert type(db) == GraphAccess, \
+        assert isinstance(db, GraphAccess), \
             "UserManager.set_database(): argument passed isn't a valid GraphAccess object"
 
         cls.db = db
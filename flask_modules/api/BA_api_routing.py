@@ -2508,6 +2508,72 @@ class ApiRouting:
 
 
 
+        @bp.route('/db-pool-stats')
+        @login_required
+        def db_pool_stats():
+            """
+            Report the current utilization of the pool of connections to the database,
+            as well as the counts of re-attempted queries
+
+            EXAMPLE invocation:
+                http://localhost:5000/BA/api/db-pool-stats
+
+            :return:    A Flask Response response object containing a JSON string.
+                            EXAMPLE of "payload":
+                                {"pool": {"max_size": 100, "in_use": 3, "idle": 5, "waiting": 0,
+                                          "active_queries": 3, "peak_active_queries": 12, "acquisition_timeout": null},
+                                 "retries": {"retries": 0, "retried_queries": 0, "recovered_queries": 0, "failed_queries": 0}
+                                }
+            """
+            try:
+                db = current_app.config['DATABASE']
+                payload = {"pool": db.pool_stats(), "retries": db.retry_stats()}
+                response_data = {"status": "ok", "payload": payload}                # Successful termination
+            except Exception as ex:
+                err_details = f"/db-pool-stats : Unable to obtain the database pool statistics.  " \
+                              f"{exceptions.exception_helper(ex)}"
+                response_data = {"status": "error", "error_message": err_details}   # Error termination
+
+            return jsonify(response_data)   # This function also takes care of the Content-Type header
+
+
+
+        @bp.route('/db-query-stats')
+        @login_required
+        def db_query_stats():
+            """
+            Report the stats of the database queries run so far, broken down by the calling method,
+            as well as the slow-query log.
+            If the optional "reset" parameter is set to "yes", all the stats get cleared afterward
+
+            EXAMPLES of invocation:
+                http://localhost:5000/BA/api/db-query-stats
+                http://localhost:5000/BA/api/db-query-stats?reset=yes
+
+            :return:    A Flask Response response object containing a JSON string.
+                            EXAMPLE of "payload":
+                                {"methods": {"GraphAccess.get_nodes": {"count": 12, "total_time": 0.84, "server_time": 0.31,
+                                                                       "rows": 40, "db_hits": 0, "mean": 0.07, "p50": 0.05,
+                                                                       "p95": 0.2, "max": 0.2, "histogram": {...}}},
+                                 "slow_queries": [{"time": "2026-10-16 10:02:11", "caller": "GraphAccess.get_nodes",
+                                                   "call_chain": [...], "query": "MATCH ...", "elapsed": 1.3, ...}]
+                                }
+            """
+            try:
+                db = current_app.config['DATABASE']
+                payload = {"methods": db.query_stats(), "slow_queries": db.slow_queries()}
+                if request.args.get("reset") == "yes":
+                    db.reset_query_stats()
+                response_data = {"status": "ok", "payload": payload}                # Successful termination
+            except Exception as ex:
+                err_details = f"/db-query-stats : Unable to obtain the database query statistics.  " \
+                              f"{exceptions.exception_helper(ex)}"
+                response_data = {"status": "error", "error_message": err_details}   # Error termination
+
+            return jsonify(response_data)   # This function also takes care of the Content-Type header
+
+
+
 
         #####################################################################################################
 
@@ -2646,6 +2712,10 @@ class ApiRouting:
                                     each name may optionally be followed by "DESC"
                     skip        The number of initial entries (in the context of specified order) to skip
                     limit       The max number of entries to return.  Default: 25
+                    cursor      [OPTIONAL] If this key is present, cursor-based pagination is used instead of `skip`:
+                                    pass null for the first page, and then the `next_cursor` value returned with each page.
+                                    In this mode, `order_by` may only be a single field name (nodes lacking it are left out),
+                                    and the cost of a page doesn't grow with its depth
 
             RETURNED JSON PAYLOAD:
                 recordset:   A list of dicts with the filtered data; each dict contains the data for a node,
@@ -2656,7 +2726,8 @@ class ApiRouting:
                                             _internal_id: 59, _node_labels: Array [ "BA", "French Vocabulary" ]
                                            }]
                 total_count: The total number of nodes in the database with the given label - NOT considering the remainder of the filter
-                                if no label was provided, None
+                                if no label was provided, None.  In cursor mode, only returned with the first page
+                next_cursor: Only in cursor mode: the value to pass as `cursor` to get the next page; null if there are no more pages
             """
             #TODO: provide a way to only return specific fields
 
@@ -2708,7 +2779,10 @@ class ApiRouting:
 
 
             try:
-                recordset, total_count = DataManager.get_filtered(json_data)
+                if "cursor" in json_data:
+                    recordset, next_cursor, total_count = DataManager.get_filtered_page(json_data)
+                else:
+                    recordset, total_count = DataManager.get_filtered(json_data)
                 # `recordset` is a list of dicts, with all the fields of the search results
                 # `total_count` is what the length of `recordset` would have been, in the absence of limit/skip value
                 #print("    recordset: ", recordset)
@@ -2723,8 +2797,11 @@ class ApiRouting:
                                             if (type(v) == str or type(v) == int or type(v) == bool or type(v) == list or type(v) == float) }
                                        for record in recordset]
 
-                response = {"status": "ok",
-                            "payload": {"recordset": sanitized_recordset, "total_count": total_count}}   # Successful termination
+                payload = {"recordset": sanitized_recordset, "total_count": total_count}
+                if "cursor" in json_data:
+                    payload["next_cursor"] = next_cursor
+
+                response = {"status": "ok", "payload": payload}     # Successful termination
                 #print(f"get_filtered() is returning successfully: `{response}`")
                 return jsonify(response)        # This function also takes care of the Content-Type header
                                                 #   Note: jsonify() may fail if any parts of the response are not JSON serializable
@@ -3350,6 +3427,7 @@ class ApiRouting:
         
             EXAMPLES invocation:
                 http://localhost:5000/BA/api/download_dbase_json/full
+                http://localhost:5000/BA/api/download_dbase_json/full?gzip=1
                 http://localhost:5000/BA/api/download_dbase_json/schema
 
             EXAMPLE of exported file:
@@ -3360,17 +3438,27 @@ class ApiRouting:
                 {"type":"relationship","id":"1","label":"KNOWS","properties":{"since":2003},"start":{"id":"3","labels":["User"]},"end":{"id":"4","labels":["User"]}}\n
             ]
 
-            If database is large, it may lead to errors:  java.lang.OutOfMemoryError: Java heap space.
+            The full export is streamed to the client a chunk at a time, as it's read from the database (no APOC needed),
+            so that databases of any size can be downloaded.
+            The schema export still relies on APOC, and gets assembled in memory;
+            if the database is large, it may lead to errors:  java.lang.OutOfMemoryError: Java heap space.
             See manual: https://neo4j.com/docs/operations-manual/4.4/performance/memory-configuration/
         
             :param download_type:   Either "full" (default) or "schema"
             :return:                A Flask response object, with HTTP headers that will initiate a download
             """
+            if download_type == "full":
+                # Stream the export; the optional "gzip" query-string parameter requests a compressed file
+                compress = request.args.get("gzip", "0").lower() in ["1", "true", "yes"]
+                export_filename = "exported_dbase.json.gz" if compress else "exported_dbase.json"
+
+                response = current_app.response_class(DataManager.export_full_dbase_iter(compress=compress))
+                response.headers['Content-Type'] = 'application/gzip' if compress else 'application/save'
+                response.headers['Content-Disposition'] = f'attachment; filename=\"{export_filename}\"'
+                return response     # Note: errors occurring after the start of the streaming will truncate the download
+
             try:
-                if download_type == "full":
-                    result = DataManager.export_full_dbase()
-                    export_filename = "exported_dbase.json"
-                elif download_type == "schema":
+                if download_type == "schema":
                     result = GraphSchema.export_schema()
                     export_filename = "exported_schema.json"
                 else:
@@ -3392,7 +3480,6 @@ class ApiRouting:
                   f"{result.get('relationships')} relationships, and {result.get('properties')} properties")
 
             # Note that we're only returning the value of the "data" key
-            # TODO: move this part to DataManager.export_full_dbase()
             data = result["data"]
 
             response = make_response(data)
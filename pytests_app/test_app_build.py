@@ -36,3 +36,24 @@ def test_create_app():
     new_db.test_dbase_connection()
     assert GraphSchema.db == new_db
     assert MediaManager.MEDIA_FOLDER == 'my_test/'
+
+
+
+def test_driver_options():
+    assert app_build.driver_options({'DB_COUNT': 1}) == {}
+
+    config = {'DB_COUNT': 1, 'DB_MAX_CONNECTION_POOL_SIZE': 200, 'DB_FETCH_SIZE': 500, 'DB_KEEP_ALIVE': False}
+    assert app_build.driver_options(config) == {"max_connection_pool_size": 200, "fetch_size": 500, "keep_alive": False}
+
+    config = {'DB_COUNT': 1, 'DB_SLOW_QUERY_THRESHOLD': 0.5}
+    assert app_build.driver_options(config) == {"slow_query_threshold": 0.5}
+
+
+
+def test_read_replicas():
+    assert app_build.read_replicas({'DB_COUNT': 1}) == []
+
+    config = {'DB_COUNT': 2, 'DB_DEFAULT_INDEX': 1, 'DB_READ_REPLICAS': [2],
+              'DB_HOST_1': 'bolt://10.0.0.1:7687', 'DB_USERNAME_1': 'neo4j', 'DB_PASSWORD_1': 'pass1',
+              'DB_HOST_2': 'bolt://10.0.0.2:7687', 'DB_USERNAME_2': 'reader', 'DB_PASSWORD_2': 'pass2'}
+    assert app_build.read_replicas(config) == [('bolt://10.0.0.2:7687', ('reader', 'pass2'))]
@@ -26,3 +26,13 @@ def test__extract_par():
 
     assert read_config._extract_par("DB_COUNT", SETTINGS) == "2"
     assert read_config._extract_par("BRANDING", SETTINGS) == "Brain Annex"
+
+
+
+def test__extract_optional_par():
+    config = ConfigParser()
+    config.read(['config.defaults.ini', 'config.ini'])
+    SETTINGS = config['SETTINGS']
+
+    assert read_config._extract_optional_par("DB_COUNT", SETTINGS) == "2"
+    assert read_config._extract_optional_par("SOME_MISSING_PARAMETER", SETTINGS) is None
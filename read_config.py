@@ -72,6 +72,52 @@ def load_config_data(config) -> dict:
         config_data[f"DB_NICKNAME_{i}"] = _extract_par(f"DB_NICKNAME_{i}", SETTINGS)
 
 
+    # Optional read replicas of the default database
+    DB_READ_REPLICAS = _extract_optional_par("DB_READ_REPLICAS", SETTINGS)
+    if DB_READ_REPLICAS is not None:
+        try:
+            replica_indexes = [int(item.strip()) for item in DB_READ_REPLICAS.split(",") if item.strip()]
+        except Exception:
+            raise Exception(f"The passed configuration value for DB_READ_REPLICAS ({DB_READ_REPLICAS}) is not "
+                            f"a comma-separated list of integers as expected")
+
+        for i in replica_indexes:
+            assert 1 <= i <= config_data["DB_COUNT"], \
+                f"The configuration value DB_READ_REPLICAS refers to database {i}, but only {config_data['DB_COUNT']} databases are specified"
+            assert i != config_data["DB_DEFAULT_INDEX"], \
+                f"The configuration value DB_READ_REPLICAS cannot include the default database (DB_DEFAULT_INDEX = {i})"
+
+        config_data['DB_READ_REPLICAS'] = replica_indexes
+
+    # Optional tuning of the database driver; only the parameters present in the config file(s) are included
+    for name in ["DB_MAX_CONNECTION_POOL_SIZE", "DB_FETCH_SIZE"]:
+        value = _extract_optional_par(name, SETTINGS)
+        if value is not None:
+            try:
+                config_data[name] = int(value)
+            except Exception:
+                raise Exception(f"The passed configuration value for {name} ({value}) is not an integer as expected")
+
+    for name in ["DB_CONNECTION_ACQUISITION_TIMEOUT", "DB_MAX_CONNECTION_LIFETIME", "DB_READ_YOUR_WRITES_WINDOW",
+                 "DB_SLOW_QUERY_THRESHOLD"]:
+        value = _extract_optional_par(name, SETTINGS)
+        if value is not None:
+            try:
+                config_data[name] = float(value)
+            except Exception:
+                raise Exception(f"The passed configuration value for {name} ({value}) is not a number of seconds as expected")
+
+    keep_alive = _extract_optional_par("DB_KEEP_ALIVE", SETTINGS)
+    if keep_alive is not None:
+        if keep_alive.lower() == "true":
+            config_data['DB_KEEP_ALIVE'] = True
+        elif keep_alive.lower() == "false":
+            config_data['DB_KEEP_ALIVE'] = False
+        else:
+            raise Exception(f"The only valid values for the "
+                            f"configuration parameter `DB_KEEP_ALIVE` are True or False ; the value you provided was: `{keep_alive}`")
+
+
 
     ###  PART 2 : deployment parameters  ###
 
@@ -162,3 +208,24 @@ def _extract_par(name :str, parser_dict, display=True) -> str:
         print(f"{name}: *********")
 
     return value
+
+
+
+def _extract_optional_par(name :str, parser_dict, display=True) -> str|None:
+    """
+    Extract the parameter with the given name, if present,
+    from a "configparser" object containing the parameters and their values.
+    If not found, None is returned
+
+    :param name:    Name of the config parameter of interest.  EXAMPLE: "DB_FETCH_SIZE"
+    :param parser_dict:Object of type "configparser.SectionProxy" ;
+                        can be treated as a python dict
+    :param display: Flag indicating whether to show the value of the parameter
+                        in the printout; if False, "*********" will be shown instead of the value
+    :return:        A string with the value of the requested parameter,
+                        or None if the parameter isn't present
+    """
+    if name not in parser_dict:
+        return None
+
+    return _extract_par(name, parser_dict, display=display)
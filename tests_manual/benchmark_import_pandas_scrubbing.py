@@ -0,0 +1,85 @@
+# Micro-benchmark of the clean-up of Pandas dataframe rows done by GraphSchema.import_pandas_nodes(),
+# comparing the former row-by-row approach with the current column-wise one.
+# No database needed.  To run it:   python tests_manual/benchmark_import_pandas_scrubbing.py  [NUMBER_OF_ROWS]
+
+import sys
+import time
+from datetime import datetime
+import neo4j.time
+import numpy as np
+import pandas as pd
+from brainannex import GraphAccess, GraphSchema
+
+
+
+def make_dataframe(n_rows :int) -> pd.DataFrame:
+    """
+    Create a synthetic dataframe with a mix of strings (some of them blank or padded), floats with NaN's,
+    integers stored as floats, and datetime strings in a mix of ISO shapes and UTC offsets
+    """
+    rng = np.random.default_rng(seed=0)
+    names = np.array(["Julian", "  Val ", "", "Jill", "   "], dtype=object)
+    timestamps = pd.date_range("2015-01-01", periods=n_rows, freq="min")
+
+    # Timezone-naive datetimes, with and without a time of day, and with either separator
+    shapes = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M"]
+    shape_choice = rng.integers(0, len(shapes), n_rows)
+    dates = pd.Series(timestamps.strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+    for i, shape in enumerate(shapes):
+        dates[shape_choice == i] = timestamps[shape_choice == i].strftime(shape)
+    dates[rng.random(n_rows) < 0.1] = np.nan
+
+    # Timezone-aware datetimes, with different UTC offsets
+    offsets = np.array(["+00:00", "+02:00", "-05:00"])
+    shipped = pd.Series(timestamps.strftime("%Y-%m-%dT%H:%M:%S"), dtype=object) \
+              + offsets[rng.integers(0, len(offsets), n_rows)]
+    shipped[rng.random(n_rows) < 0.1] = np.nan
+
+    return pd.DataFrame({"name": names[rng.integers(0, len(names), n_rows)],
+                         "price": np.where(rng.random(n_rows) < 0.2, np.nan, rng.random(n_rows) * 100),
+                         "quantity": np.where(rng.random(n_rows) < 0.2, np.nan, rng.integers(0, 1000, n_rows)),
+                         "notes": np.where(rng.random(n_rows) < 0.5, "  some notes ", ""),
+                         "sold": dates,
+                         "shipped": shipped})
+
+
+
+def row_by_row_records(df :pd.DataFrame, datetime_cols :[str], int_cols :[str], chunk_size=10000):
+    """
+    The former approach of import_pandas_nodes(): scrub_dict() on each row, and per-cell conversions
+    """
+    for d in GraphAccess.df_records(df, chunk_size=chunk_size):
+        d_scrubbed = GraphSchema.scrub_dict(d)
+
+        for dt_col in datetime_cols:
+            if dt_col in d_scrubbed:
+                d_scrubbed[dt_col] = neo4j.time.DateTime.from_native(datetime.fromisoformat(d_scrubbed[dt_col]))
+
+        for col in int_cols:
+            if col in d_scrubbed:
+                d_scrubbed[col] = int(d_scrubbed[col])
+
+        yield d_scrubbed
+
+
+
+def time_it(label :str, records, n_rows :int) -> list:
+    start = time.perf_counter()
+    result = list(records)
+    elapsed = time.perf_counter() - start
+    print(f"    {label:<14}  {elapsed:8.3f} sec   {n_rows / elapsed:>12,.0f} rows/sec")
+    return result
+
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_dataframe(n_rows)
+    print(f"Scrubbing {n_rows:,} rows x {len(df.columns)} columns:")
+
+    before = time_it("row by row", row_by_row_records(df, datetime_cols=["sold", "shipped"], int_cols=["quantity"]), n_rows)
+    after = time_it("column-wise", GraphSchema._scrubbed_records(df, datetime_cols=["sold", "shipped"], int_cols=["quantity"]), n_rows)
+
+    # The former approach produced Neo4j datetimes, and the current one python datetimes (that the driver converts)
+    before = [{k: v.to_native() if isinstance(v, neo4j.time.DateTime) else v for k, v in d.items()} for d in before]
+    assert after == before, "The two approaches produced different records!"